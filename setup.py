@@ -356,7 +356,9 @@ ext_data = dict(
               "sources" : []},
     _hamilton_filter = {"name" : "statsmodels/tsa/regime_switching/_hamilton_filter.c",
               "depends" : [],
-              "include_dirs": [],
+              "include_dirs": ["statsmodels/src"] + npymath_info['include_dirs'],
+              "libraries": npymath_info['libraries'],
+              "library_dirs": npymath_info['library_dirs'],
               "sources" : []},
     _kim_smoother = {"name" : "statsmodels/tsa/regime_switching/_kim_smoother.c",
               "depends" : [],
@@ -440,6 +442,18 @@ statespace_ext_data = dict(
               "libraries": npymath_info['libraries'],
               "library_dirs": npymath_info['library_dirs'],
               "sources": []},
+    _kalman_batch_filter = {"name" : "statsmodels/tsa/statespace/_batch_filter.c",
+              "filename": "_batch_filter",
+              "include_dirs": ['statsmodels/src'] + npymath_info['include_dirs'],
+              "libraries": npymath_info['libraries'],
+              "library_dirs": npymath_info['library_dirs'],
+              "sources": []},
+    _kalman_tangent_filter = {"name" : "statsmodels/tsa/statespace/_tangent_filter.c",
+              "filename": "_tangent_filter",
+              "include_dirs": ['statsmodels/src'] + npymath_info['include_dirs'],
+              "libraries": npymath_info['libraries'],
+              "library_dirs": npymath_info['library_dirs'],
+              "sources": []},
     _kalman_tools = {"name" : "statsmodels/tsa/statespace/_tools.c",
               "filename": "_tools",
               "sources": []},
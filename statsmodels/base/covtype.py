@@ -64,6 +64,8 @@ def get_robustcov_results(self, cov_type='HC1', use_t=None, **kwds):
 
         - `groups` array_like, integer (required) :
               index of clusters or groups
+              If 2-dim, then each column is a cluster variable and the
+              multiway cluster robust covariance is computed.
         - `use_correction` bool (optional) :
               If True the sandwich covariance is calulated with a small
               sample correction.
@@ -194,7 +196,7 @@ def get_robustcov_results(self, cov_type='HC1', use_t=None, **kwds):
                                              weights_func=weights_func,
                                              use_correction=use_correction)
     elif cov_type.lower() == 'cluster':
-        #cluster robust standard errors, one- or two-way
+        #cluster robust standard errors, one- or multi-way
         groups = kwds['groups']
         if not hasattr(groups, 'shape'):
             groups = np.asarray(groups).T
@@ -220,16 +222,18 @@ def get_robustcov_results(self, cov_type='HC1', use_t=None, **kwds):
             if adjust_df:
                 # need to find number of groups
                 # duplicate work
-                n_groups0 = len(np.unique(groups[:,0]))
-                n_groups1 = len(np.unique(groups[:, 1]))
-                self.n_groups = (n_groups0, n_groups1)
-                n_groups = min(n_groups0, n_groups1) # use for adjust_df
-
-            # Note: sw.cov_cluster_2groups has 3 returns
-            res.cov_params_default = sw.cov_cluster_2groups(self, groups,
-                                         use_correction=use_correction)[0]
+                self.n_groups = tuple(len(np.unique(g)) for g in groups.T)
+                n_groups = min(self.n_groups) # use for adjust_df
+
+            if groups.shape[1] == 2:
+                # Note: sw.cov_cluster_2groups has 3 returns
+                res.cov_params_default = sw.cov_cluster_2groups(self, groups,
+                                             use_correction=use_correction)[0]
+            else:
+                res.cov_params_default = sw.cov_cluster_multi(self, groups,
+                                             use_correction=use_correction)
         else:
-            raise ValueError('only two groups are supported')
+            raise ValueError('groups needs to be 1-dim or 2-dim')
         res.cov_kwds['description'] = ('Standard Errors are robust to' +
                             'cluster correlation ' + '(' + cov_type + ')')
 
@@ -567,6 +567,62 @@ class PandasData(ModelData):
         else:
             return DataFrame(result, columns=self.ynames)
 
+class SparseData(ModelData):
+    """
+    Data handling for a scipy.sparse exog
+
+    exog is converted to a float CSR matrix and is not densified. endog has
+    to be dense, it can be an ndarray or a pandas Series.
+    """
+
+    @classmethod
+    def handle_missing(cls, endog, exog, missing, **kwargs):
+        raise ValueError("missing='%s' is not supported with a sparse "
+                         "exog, only missing='none'" % missing)
+
+    def _get_xarr(self, exog):
+        from scipy import sparse
+        return sparse.csr_matrix(exog, dtype=np.float64)
+
+    def _handle_constant(self, hasconst):
+        if hasconst is not None:
+            super(SparseData, self)._handle_constant(hasconst)
+            return
+
+        exog = self.exog
+        col_max = exog.max(0).toarray().ravel()
+        col_min = exog.min(0).toarray().ravel()
+        const_idx = np.where((col_max == col_min) & (col_max != 0))[0]
+        if len(const_idx) > 0:
+            # prefer a column of ones
+            ones_idx = const_idx[col_max[const_idx] == 1]
+            if len(ones_idx) > 0:
+                const_idx = ones_idx
+            self.k_constant = 1
+            self.const_idx = const_idx[0]
+        else:
+            # look for an implicit constant, e.g. a full set of dummies
+            from scipy.sparse.linalg import lsmr
+            ones = np.ones(exog.shape[0])
+            b = lsmr(exog, ones, atol=1e-12, btol=1e-12)[0]
+            resid = ones - exog.dot(b)
+            self.k_constant = int(np.sqrt(np.mean(resid**2)) < 1e-7)
+            self.const_idx = None
+
+    @cache_writable()
+    def xnames(self):
+        k_vars = self.exog.shape[1]
+        if self.const_idx is None:
+            return ['x%d' % i for i in range(1, k_vars + 1)]
+        xnames = ['x%d' % i for i in range(1, k_vars)]
+        xnames.insert(self.const_idx, 'const')
+        return xnames
+
+    def _check_integrity(self):
+        if self.exog.shape[0] != len(self.endog):
+            raise ValueError("endog and exog matrices are different sizes")
+
+
 def _make_endog_names(endog):
     if endog.ndim == 1 or endog.shape[1] == 1:
         ynames = ['y']
@@ -603,7 +659,9 @@ def handle_data_class_factory(endog, exog):
     """
     Given inputs
     """
-    if data_util._is_using_ndarray_type(endog, exog):
+    if data_util._is_sparse(exog):
+        klass = SparseData
+    elif data_util._is_using_ndarray_type(endog, exog):
         klass = ModelData
     elif data_util._is_using_pandas(endog, exog):
         klass = PandasData
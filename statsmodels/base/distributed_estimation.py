@@ -3,7 +3,9 @@ from statsmodels.stats.regularized_covariance import _calc_nodewise_row, \
     _calc_nodewise_weight, _calc_approx_inv_cov
 from statsmodels.base.model import LikelihoodModelResults
 from statsmodels.regression.linear_model import OLS
+from statsmodels.tools.parallel import _get_n_jobs
 import numpy as np
+import os
 
 """
 Distributed estimation routines. Currently, we support several
@@ -11,6 +13,14 @@ methods of distribution
 
 - sequential, has no extra dependencies
 - parallel
+    - with a thread pool, has no extra dependencies
+        The partitions are shared with the worker threads, this
+        works best if the estimation releases the GIL, e.g. in
+        the BLAS/LAPACK calls of numpy.
+    - with a process pool, has no extra dependencies
+        The partitions are written to memory-mapped files in a
+        temporary directory and each worker process maps only its
+        own partition, instead of receiving a pickled copy.
     - with joblib
         A variety of backends are supported through joblib
         This allows for different types of clusters besides
@@ -362,6 +372,54 @@ def _helper_fit_partition(self, pnum, endog, exog, fit_kwds,
     return results
 
 
+def _helper_fit_partition_memmap(self, pnum, endog_fname, exog_fname,
+                                 fit_kwds, init_kwds_e={}):
+    """handles the model fitting for a partition that is stored in
+    memory-mapped files.  This is used by the process pool so that
+    the partition data is not pickled and sent to the worker.
+
+    Parameters
+    ----------
+    self : DistributedModel class instance
+        An instance of DistributedModel.
+    pnum : scalar
+        index of current partition.
+    endog_fname : str
+        name of the .npy file with the endogenous data for the current
+        partition.
+    exog_fname : str
+        name of the .npy file with the exogenous data for the current
+        partition.
+    fit_kwds : dict-like
+        Keywords needed for the model fitting.
+    init_kwds_e : dict-like
+        Additional init_kwds to add for each partition.
+
+    Returns
+    -------
+    estimation_method result.  For the default,
+    _est_regularized_debiased, a tuple.
+    """
+
+    # copy-on-write, models can modify their data without changing the files
+    endog = np.load(endog_fname, mmap_mode="c")
+    exog = np.load(exog_fname, mmap_mode="c")
+    return _helper_fit_partition(self, pnum, endog, exog, fit_kwds,
+                                 init_kwds_e)
+
+
+def _gen_partitions(data_generator, init_kwds_generator=None):
+    """yields pnum, endog, exog, init_kwds_e for each partition"""
+
+    if init_kwds_generator is None:
+        for pnum, (endog, exog) in enumerate(data_generator):
+            yield pnum, endog, exog, {}
+    else:
+        tup_gen = enumerate(zip(data_generator, init_kwds_generator))
+        for pnum, ((endog, exog), init_kwds_e) in tup_gen:
+            yield pnum, endog, exog, init_kwds_e
+
+
 class DistributedModel(object):
     __doc__ = """
     Distributed model class
@@ -474,7 +532,7 @@ class DistributedModel(object):
             self.results_kwds = results_kwds
 
     def fit(self, data_generator, fit_kwds=None, parallel_method="sequential",
-            parallel_backend=None, init_kwds_generator=None):
+            parallel_backend=None, init_kwds_generator=None, n_jobs=None):
         """Performs the distributed estimation using the corresponding
         DistributedModel
 
@@ -488,7 +546,9 @@ class DistributedModel(object):
             Keywords needed for the model fitting.
         parallel_method : str
             type of distributed estimation to be used, currently
-            "sequential", "joblib" and "dask" are supported.
+            "sequential", "threads", "processes" and "joblib" are
+            supported.  "dask" and other clusters are available through
+            "joblib" and `parallel_backend`.
         parallel_backend : None or joblib parallel_backend object
             used to allow support for more complicated backends,
             ex: dask.distributed
@@ -496,6 +556,12 @@ class DistributedModel(object):
             Additional keyword generator that produces model init_kwds
             that may vary based on data partition.  The current usecase
             is for WLS and GLS
+        n_jobs : int or None
+            The number of workers for the "threads", "processes" and
+            "joblib" methods.  If None, then the number of partitions is
+            used, limited to the number of cpus for "threads" and
+            "processes".  Negative values follow the joblib convention,
+            -1 uses all cpus.
 
         Returns
         -------
@@ -510,10 +576,18 @@ class DistributedModel(object):
             results_l = self.fit_sequential(data_generator, fit_kwds,
                                             init_kwds_generator)
 
+        elif parallel_method == "threads":
+            results_l = self.fit_threads(data_generator, fit_kwds,
+                                         init_kwds_generator, n_jobs)
+
+        elif parallel_method == "processes":
+            results_l = self.fit_processes(data_generator, fit_kwds,
+                                           init_kwds_generator, n_jobs)
+
         elif parallel_method == "joblib":
             results_l = self.fit_joblib(data_generator, fit_kwds,
                                         parallel_backend,
-                                        init_kwds_generator)
+                                        init_kwds_generator, n_jobs)
 
         else:
             raise ValueError("parallel_method: %s is currently not supported"
@@ -577,8 +651,128 @@ class DistributedModel(object):
 
         return results_l
 
+    def fit_threads(self, data_generator, fit_kwds,
+                    init_kwds_generator=None, n_jobs=None):
+        """Performs the distributed estimation in parallel using a
+        pool of threads
+
+        Parameters
+        ----------
+        data_generator : generator
+            A generator that produces a sequence of tuples where the first
+            element in the tuple corresponds to an endog array and the
+            element corresponds to an exog array.
+        fit_kwds : dict-like
+            Keywords needed for the model fitting.
+        init_kwds_generator : generator or None
+            Additional keyword generator that produces model init_kwds
+            that may vary based on data partition.  The current usecase
+            is for WLS and GLS
+        n_jobs : int or None
+            The number of threads.  If None, then the minimum of the
+            number of partitions and the number of cpus is used.
+
+        Returns
+        -------
+        join_method result.  For the default, _join_debiased, it returns a
+        p length array.
+
+        Notes
+        -----
+        The data of the partitions is shared with the threads without
+        copying.  The speedup depends on how much of the estimation
+        releases the GIL.
+        """
+
+        from multiprocessing.pool import ThreadPool
+
+        pool = ThreadPool(_get_n_jobs(n_jobs, self.partitions))
+        try:
+            async_l = [pool.apply_async(_helper_fit_partition,
+                                        (self, pnum, endog, exog, fit_kwds,
+                                         init_kwds_e))
+                       for pnum, endog, exog, init_kwds_e
+                       in _gen_partitions(data_generator,
+                                          init_kwds_generator)]
+            results_l = [res.get() for res in async_l]
+        finally:
+            pool.terminate()
+            pool.join()
+
+        return results_l
+
+    def fit_processes(self, data_generator, fit_kwds,
+                      init_kwds_generator=None, n_jobs=None):
+        """Performs the distributed estimation in parallel using a
+        pool of processes
+
+        Parameters
+        ----------
+        data_generator : generator
+            A generator that produces a sequence of tuples where the first
+            element in the tuple corresponds to an endog array and the
+            element corresponds to an exog array.
+        fit_kwds : dict-like
+            Keywords needed for the model fitting.
+        init_kwds_generator : generator or None
+            Additional keyword generator that produces model init_kwds
+            that may vary based on data partition.  The current usecase
+            is for WLS and GLS
+        n_jobs : int or None
+            The number of processes.  If None, then the minimum of the
+            number of partitions and the number of cpus is used.
+
+        Returns
+        -------
+        join_method result.  For the default, _join_debiased, it returns a
+        p length array.
+
+        Notes
+        -----
+        Each partition is written to memory-mapped .npy files in a
+        temporary directory as soon as it is produced by
+        `data_generator`, and the worker process maps the files of its
+        partition.  The data is not pickled and only one partition at a
+        time needs to be held in memory by the main process.  The
+        temporary directory is removed at the end.
+
+        The data of each partition is converted to numpy arrays, the
+        models for the partitions are created without pandas metadata.
+        The model class, `init_kwds`, `fit_kwds` and the estimation
+        and join methods need to be picklable.
+        """
+
+        import multiprocessing
+        import shutil
+        import tempfile
+
+        tmp_dir = tempfile.mkdtemp(prefix="sm_distributed_")
+        pool = multiprocessing.Pool(_get_n_jobs(n_jobs, self.partitions))
+        try:
+            async_l = []
+            for pnum, endog, exog, init_kwds_e in _gen_partitions(
+                    data_generator, init_kwds_generator):
+
+                endog_fname = os.path.join(tmp_dir, "endog_%d.npy" % pnum)
+                exog_fname = os.path.join(tmp_dir, "exog_%d.npy" % pnum)
+                np.save(endog_fname, np.asarray(endog))
+                np.save(exog_fname, np.asarray(exog))
+
+                async_l.append(pool.apply_async(
+                    _helper_fit_partition_memmap,
+                    (self, pnum, endog_fname, exog_fname, fit_kwds,
+                     init_kwds_e)))
+
+            results_l = [res.get() for res in async_l]
+        finally:
+            pool.terminate()
+            pool.join()
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        return results_l
+
     def fit_joblib(self, data_generator, fit_kwds, parallel_backend,
-                   init_kwds_generator=None):
+                   init_kwds_generator=None, n_jobs=None):
         """Performs the distributed estimation in parallel using joblib
 
         Parameters
@@ -596,16 +790,26 @@ class DistributedModel(object):
             Additional keyword generator that produces model init_kwds
             that may vary based on data partition.  The current usecase
             is for WLS and GLS
+        n_jobs : int or None
+            The number of jobs.  If None, then the number of partitions
+            is used.
 
         Returns
         -------
         join_method result.  For the default, _join_debiased, it returns a
         p length array.
+
+        Notes
+        -----
+        joblib automatically memory-maps large arrays that are sent to
+        worker processes.
         """
 
         from statsmodels.tools.parallel import parallel_func
 
-        par, f, n_jobs = parallel_func(_helper_fit_partition, self.partitions)
+        if n_jobs is None:
+            n_jobs = self.partitions
+        par, f, n_jobs = parallel_func(_helper_fit_partition, n_jobs)
 
         if parallel_backend is None and init_kwds_generator is None:
             results_l = par(f(self, pnum, endog, exog, fit_kwds)
@@ -655,6 +655,39 @@ class TestConstant(object):
         np.testing.assert_equal(data.const_idx, None)
 
 
+def test_sparse_exog():
+    from scipy import sparse
+    from statsmodels.tools.grouputils import dummy_sparse
+    np.random.seed(1234)
+    groups = np.repeat(np.arange(4), 5)
+    endog = np.random.randn(20)
+    dummies = dummy_sparse(groups)
+    x = np.random.randn(20, 2)
+
+    # implicit constant from a full set of dummies
+    data = sm_data.handle_data(endog, sparse.hstack([dummies, x]))
+    assert_(isinstance(data, sm_data.SparseData))
+    assert_(sparse.isspmatrix_csr(data.exog))
+    assert_equal(data.exog.dtype, np.float64)
+    assert_equal(data.k_constant, 1)
+    assert_equal(data.const_idx, None)
+    assert_equal(data.xnames, ['x%d' % i for i in range(1, 7)])
+
+    exog = sparse.hstack([dummies[:, 1:], np.ones((20, 1)), x])
+    data = sm_data.handle_data(pandas.Series(endog, name='y1'), exog)
+    assert_equal(data.k_constant, 1)
+    assert_equal(data.const_idx, 3)
+    assert_equal(data.xnames, ['x1', 'x2', 'x3', 'const', 'x4', 'x5'])
+    assert_equal(data.ynames, 'y1')
+
+    data = sm_data.handle_data(endog, sparse.hstack([dummies[:, 1:], x]))
+    assert_equal(data.k_constant, 0)
+
+    assert_raises(ValueError, sm_data.handle_data, endog, exog,
+                  missing='drop')
+    assert_raises(ValueError, sm_data.handle_data, endog[:10], exog)
+
+
 class TestHandleMissing(object):
 
     def test_pandas(self):
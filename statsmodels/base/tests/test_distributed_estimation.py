@@ -313,6 +313,72 @@ def test_fit_joblib():
                     atol=1e-6, rtol=0)
 
 
+def test_fit_pools():
+
+    # tests that the thread and process pools give the same results
+    # as the sequential fit, does this for OLS and GLM and a variety
+    # of model sizes
+
+    np.random.seed(435265)
+    X = np.random.normal(size=(50, 3))
+    y = np.random.randint(0, 2, size=50)
+
+    for parallel_method in ["threads", "processes"]:
+        for partitions in [1, 3]:
+            mod = DistributedModel(partitions, model_class=OLS)
+            fit = mod.fit(_data_gen(y, X, partitions),
+                          parallel_method="sequential",
+                          fit_kwds={"alpha": 0.5})
+            fit_p = mod.fit(_data_gen(y, X, partitions),
+                            parallel_method=parallel_method,
+                            fit_kwds={"alpha": 0.5}, n_jobs=2)
+            assert_allclose(fit_p.params, fit.params, atol=1e-12, rtol=0)
+
+            mod = DistributedModel(partitions, model_class=GLM,
+                                   init_kwds={"family": Binomial()})
+            fit = mod.fit(_data_gen(y, X, partitions),
+                          parallel_method="sequential",
+                          fit_kwds={"alpha": 0.5})
+            fit_p = mod.fit(_data_gen(y, X, partitions),
+                            parallel_method=parallel_method,
+                            fit_kwds={"alpha": 0.5})
+            assert_allclose(fit_p.params, fit.params, atol=1e-12, rtol=0)
+
+    # regression test, see test_fit_sequential
+    mod = DistributedModel(2, model_class=OLS)
+    fit = mod.fit(_data_gen(y, X, 2), parallel_method="processes",
+                  fit_kwds={"alpha": 0.5})
+    assert_allclose(fit.params, np.array([-0.157416, -0.029643, -0.471653]),
+                    atol=1e-6, rtol=0)
+
+
+def test_fit_pools_init_kwds_generator():
+
+    # tests that the partition specific init_kwds are used by the pools
+
+    np.random.seed(435265)
+    X = np.random.normal(size=(60, 3))
+    y = np.random.normal(size=60)
+    weights = np.random.uniform(0.5, 2, size=60)
+
+    def _weights_gen():
+        for ii in range(3):
+            yield {"weights": weights[ii * 20:(ii + 1) * 20]}
+
+    from statsmodels.regression.linear_model import WLS
+    mod = DistributedModel(3, model_class=WLS,
+                           estimation_method=_est_regularized_naive,
+                           join_method=_join_naive)
+    fit = mod.fit(_data_gen(y, X, 3), parallel_method="sequential",
+                  fit_kwds={"alpha": 0.1},
+                  init_kwds_generator=_weights_gen())
+    for parallel_method in ["threads", "processes"]:
+        fit_p = mod.fit(_data_gen(y, X, 3), parallel_method=parallel_method,
+                        fit_kwds={"alpha": 0.1},
+                        init_kwds_generator=_weights_gen())
+        assert_allclose(fit_p.params, fit.params, atol=1e-12, rtol=0)
+
+
 def test_single_partition():
 
     # tests that the results make sense if we have a single partition
@@ -139,12 +139,10 @@ class PHSurvivalTime(object):
                              "after event or censoring times")
 
         # Get the row indices for the cases in each stratum
-        stu = np.unique(strata)
-        #sth = {x: [] for x in stu} # needs >=2.7
-        sth = dict([(x, []) for x in stu])
-        for i,k in enumerate(strata):
-            sth[k].append(i)
-        stratum_rows = [np.asarray(sth[k], dtype=np.int32) for k in stu]
+        stu, strata_ix = np_new_unique(strata, return_inverse=True)
+        ii = np.argsort(strata_ix, kind="mergesort").astype(np.int32)
+        nrows = np.bincount(strata_ix, minlength=len(stu))
+        stratum_rows = np.split(ii, np.cumsum(nrows)[:-1])
         stratum_names = stu
 
         # Remove strata with no events
@@ -163,18 +161,13 @@ class PHSurvivalTime(object):
             last_failure = max(time[ix][status[ix] == 1])
 
             # Stata uses < here, R uses <=
-            ii = [i for i,t in enumerate(entry[ix]) if
-                  t <= last_failure]
-            stratum_rows[stx] = stratum_rows[stx][ii]
+            stratum_rows[stx] = ix[entry[ix] <= last_failure]
 
         # Remove subjects who are censored before the first event in
         # their stratum.
         for stx,ix in enumerate(stratum_rows):
             first_failure = min(time[ix][status[ix] == 1])
-
-            ii = [i for i,t in enumerate(time[ix]) if
-                  t >= first_failure]
-            stratum_rows[stx] = stratum_rows[stx][ii]
+            stratum_rows[stx] = ix[time[ix] >= first_failure]
 
         # Order by time within each stratum
         for stx,ix in enumerate(stratum_rows):
@@ -207,19 +200,33 @@ class PHSurvivalTime(object):
 
         # Precalculate some indices needed to fit Cox models.
         # Distinct failure times within a stratum are always taken to
-        # be sorted in ascending order.
+        # be sorted in ascending order.  Moving backward through the
+        # distinct failure times, subjects enter the risk set at the
+        # last failure time not after their own time, and exit it
+        # after the first failure time not before their entry time.
         #
-        # ufailt_ix[stx][k] is a list of indices for subjects who fail
-        # at the k^th sorted unique failure time in stratum stx
+        # uft_enter[stx][i] is the index of the unique failure time at
+        # which subject i of stratum stx enters the risk set.  Since
+        # the subjects are ordered by time it is nondecreasing, and
+        # uft_enter_starts[stx][k] is the first subject entering at the
+        # k^th unique failure time.
         #
-        # risk_enter[stx][k] is a list of indices for subjects who
-        # enter the risk set at the k^th sorted unique failure time in
-        # stratum stx
+        # uft_exit[stx][i] is the index of the unique failure time at
+        # which subject i of stratum stx exits the risk set.  The
+        # subjects exiting after the first failure time, ordered by
+        # exit, are uft_exit_rows[stx], and uft_exit_starts[stx] are
+        # the positions in uft_exit_rows[stx] of the first subject
+        # exiting at each of the failure times uft_exit_ix[stx].
         #
-        # risk_exit[stx][k] is a list of indices for subjects who exit
-        # the risk set at the k^th sorted unique failure time in
-        # stratum stx
-        self.ufailt_ix, self.risk_enter, self.risk_exit, self.ufailt =\
+        # fail_ix[stx] are the subjects who fail, fail_uft[stx] their
+        # unique failure time index, fail_count[stx][k] the number of
+        # failures at the k^th unique failure time and fail_rank[stx]
+        # the position of each failure among those tied with it.
+        self.ufailt = []
+        self.uft_enter, self.uft_enter_starts = [], []
+        self.uft_exit, self.uft_exit_rows = [], []
+        self.uft_exit_starts, self.uft_exit_ix = [], []
+        self.fail_ix, self.fail_uft, self.fail_count, self.fail_rank = \
             [], [], [], []
 
         for stx in range(self.nstrat):
@@ -232,32 +239,128 @@ class PHSurvivalTime(object):
             uft = np.unique(ft)
             nuft = len(uft)
 
-            # Indices of cases that fail at each unique failure time
-            #uft_map = {x:i for i,x in enumerate(uft)} # requires >=2.7
-            uft_map = dict([(x, i) for i,x in enumerate(uft)]) # 2.6
-            uft_ix = [[] for k in range(nuft)]
-            for ix,ti in zip(ift,ft):
-                uft_ix[uft_map[ti]].append(ix)
-
-            # Indices of cases (failed or censored) that enter the
-            # risk set at each unique failure time.
-            risk_enter1 = [[] for k in range(nuft)]
-            for i,t in enumerate(self.time_s[stx]):
-                ix = np.searchsorted(uft, t, "right") - 1
-                if ix >= 0:
-                    risk_enter1[ix].append(i)
-
-            # Indices of cases (failed or censored) that exit the
-            # risk set at each unique failure time.
-            risk_exit1 = [[] for k in range(nuft)]
-            for i,t in enumerate(self.entry_s[stx]):
-                ix = np.searchsorted(uft, t)
-                risk_exit1[ix].append(i)
+            uft_enter = np.searchsorted(uft, self.time_s[stx], "right") - 1
+            uft_exit = np.searchsorted(uft, self.entry_s[stx])
+
+            ii = np.flatnonzero(uft_exit > 0)
+            ii = ii[np.argsort(uft_exit[ii], kind="mergesort")]
+            exit_ix, exit_starts = np_new_unique(uft_exit[ii],
+                                                 return_index=True)
+
+            fail_uft = uft_enter[ift]
+            fail_count = np.bincount(fail_uft, minlength=nuft)
+            fail_starts = np.cumsum(fail_count) - fail_count
 
             self.ufailt.append(uft)
-            self.ufailt_ix.append([np.asarray(x, dtype=np.int32) for x in uft_ix])
-            self.risk_enter.append([np.asarray(x, dtype=np.int32) for x in risk_enter1])
-            self.risk_exit.append([np.asarray(x, dtype=np.int32) for x in risk_exit1])
+            self.uft_enter.append(uft_enter)
+            self.uft_enter_starts.append(
+                np.searchsorted(uft_enter, np.arange(nuft)))
+            self.uft_exit.append(uft_exit)
+            self.uft_exit_rows.append(ii)
+            self.uft_exit_starts.append(exit_starts)
+            self.uft_exit_ix.append(exit_ix)
+            self.fail_ix.append(ift)
+            self.fail_uft.append(fail_uft)
+            self.fail_count.append(fail_count)
+            self.fail_rank.append(np.arange(len(ift), dtype=np.float64) -
+                                  fail_starts[fail_uft])
+
+    def risk_sums(self, stx, values):
+        """
+        Returns the sums of `values` over the risk set at each unique
+        failure time of a stratum.
+
+        Parameters
+        ----------
+        stx : int
+            The stratum index.
+        values : ndarray
+            An array whose rows correspond to the subjects of the
+            stratum.
+
+        Returns
+        -------
+        An array whose k^th row is the sum of the rows of `values`
+        over the subjects at risk at the k^th unique failure time.
+        """
+
+        # Subjects that entered the risk set at or after each failure
+        # time, less those that exited it after that time.
+        sums = np.add.reduceat(values, self.uft_enter_starts[stx], axis=0)
+        sums = np.cumsum(sums[::-1], axis=0)[::-1]
+
+        rows = self.uft_exit_rows[stx]
+        if len(rows) > 0:
+            exits = np.zeros_like(sums)
+            exits[self.uft_exit_ix[stx] - 1] = np.add.reduceat(
+                values[rows], self.uft_exit_starts[stx], axis=0)
+            sums -= np.cumsum(exits[::-1], axis=0)[::-1]
+
+        return sums
+
+    def risk_window_sums(self, stx, values):
+        """
+        Returns the sums of `values` over the unique failure times at
+        which each subject of a stratum is at risk.
+
+        Parameters
+        ----------
+        stx : int
+            The stratum index.
+        values : ndarray
+            An array whose rows correspond to the unique failure times
+            of the stratum.
+
+        Returns
+        -------
+        An array whose i^th row is the sum of the rows of `values`
+        over the unique failure times at which the i^th subject is
+        in the risk set.
+        """
+
+        csum = np.cumsum(values, axis=0)
+        csum = np.concatenate((np.zeros_like(csum[0:1]), csum))
+        return csum[self.uft_enter[stx] + 1] - csum[self.uft_exit[stx]]
+
+    def _split(self, stx, keys, rows=None):
+        # Returns the subjects in `rows` grouped by the unique failure
+        # time indices in `keys`.
+        nuft = len(self.ufailt[stx])
+        ii = np.argsort(keys, kind="mergesort")
+        if rows is not None:
+            ii = rows[ii]
+        counts = np.bincount(keys, minlength=nuft)[0:nuft]
+        return [np.asarray(x, dtype=np.int32) for x in
+                np.split(ii, np.cumsum(counts)[:-1])]
+
+    @cache_readonly
+    def ufailt_ix(self):
+        """
+        ufailt_ix[stx][k] contains the indices of subjects who fail at
+        the k^th sorted unique failure time in stratum stx.
+        """
+        return [self._split(stx, self.fail_uft[stx], self.fail_ix[stx])
+                for stx in range(self.nstrat)]
+
+    @cache_readonly
+    def risk_enter(self):
+        """
+        risk_enter[stx][k] contains the indices of subjects who enter
+        the risk set at the k^th sorted unique failure time in stratum
+        stx.
+        """
+        return [self._split(stx, self.uft_enter[stx])
+                for stx in range(self.nstrat)]
+
+    @cache_readonly
+    def risk_exit(self):
+        """
+        risk_exit[stx][k] contains the indices of subjects who exit
+        the risk set at the k^th sorted unique failure time in stratum
+        stx.
+        """
+        return [self._split(stx, self.uft_exit[stx])
+                for stx in range(self.nstrat)]
 
 
 
@@ -575,9 +678,7 @@ class PHReg(model.LikelihoodModel):
         # Loop over strata
         for stx in range(surv.nstrat):
 
-            uft_ix = surv.ufailt_ix[stx]
             exog_s = surv.exog_s[stx]
-            nuft = len(uft_ix)
 
             linpred = np.dot(exog_s, params)
             if surv.offset_s is not None:
@@ -585,22 +686,12 @@ class PHReg(model.LikelihoodModel):
             linpred -= linpred.max()
             e_linpred = np.exp(linpred)
 
-            xp0 = 0.
+            # Sums over the risk sets at the unique failure times.
+            xp0 = surv.risk_sums(stx, e_linpred)
 
-            # Iterate backward through the unique failure times.
-            for i in range(nuft)[::-1]:
-
-                # Update for new cases entering the risk set.
-                ix = surv.risk_enter[stx][i]
-                xp0 += e_linpred[ix].sum()
-
-                # Account for all cases that fail at this point.
-                ix = uft_ix[i]
-                like += (linpred[ix] - np.log(xp0)).sum()
-
-                # Update for cases leaving the risk set.
-                ix = surv.risk_exit[stx][i]
-                xp0 -= e_linpred[ix].sum()
+            # Account for all cases that fail at these times.
+            like += linpred[surv.fail_ix[stx]].sum()
+            like -= np.dot(surv.fail_count[stx], np.log(xp0))
 
         return like
 
@@ -626,29 +717,18 @@ class PHReg(model.LikelihoodModel):
             linpred -= linpred.max()
             e_linpred = np.exp(linpred)
 
-            xp0 = 0.
-
-            # Iterate backward through the unique failure times.
-            uft_ix = surv.ufailt_ix[stx]
-            nuft = len(uft_ix)
-            for i in range(nuft)[::-1]:
-
-                # Update for new cases entering the risk set.
-                ix = surv.risk_enter[stx][i]
-                xp0 += e_linpred[ix].sum()
-                xp0f = e_linpred[uft_ix[i]].sum()
+            # Sums over the risk sets and the failures at the unique
+            # failure times.
+            ixf, uftf = surv.fail_ix[stx], surv.fail_uft[stx]
+            xp0 = surv.risk_sums(stx, e_linpred)
+            xp0f = np.bincount(uftf, weights=e_linpred[ixf],
+                               minlength=len(xp0))
 
-                # Account for all cases that fail at this point.
-                ix = uft_ix[i]
-                like += linpred[ix].sum()
+            # Account for all cases that fail at these times.
+            like += linpred[ixf].sum()
 
-                m = len(ix)
-                J = np.arange(m, dtype=np.float64) / m
-                like -= np.log(xp0 - J*xp0f).sum()
-
-                # Update for cases leaving the risk set.
-                ix = surv.risk_exit[stx][i]
-                xp0 -= e_linpred[ix].sum()
+            J = surv.fail_rank[stx] / surv.fail_count[stx][uftf]
+            like -= np.log(xp0[uftf] - J*xp0f[uftf]).sum()
 
         return like
 
@@ -665,13 +745,6 @@ class PHReg(model.LikelihoodModel):
         # Loop over strata
         for stx in range(surv.nstrat):
 
-            # Indices of subjects in the stratum
-            strat_ix = surv.stratum_rows[stx]
-
-            # Unique failure times in the stratum
-            uft_ix = surv.ufailt_ix[stx]
-            nuft = len(uft_ix)
-
             # exog and linear predictor for the stratum
             exog_s = surv.exog_s[stx]
             linpred = np.dot(exog_s, params)
@@ -680,28 +753,14 @@ class PHReg(model.LikelihoodModel):
             linpred -= linpred.max()
             e_linpred = np.exp(linpred)
 
-            xp0, xp1 = 0., 0.
+            # Account for all cases that fail.
+            grad += exog_s[surv.fail_ix[stx], :].sum(0)
 
-            # Iterate backward through the unique failure times.
-            for i in range(nuft)[::-1]:
-
-                # Update for new cases entering the risk set.
-                ix = surv.risk_enter[stx][i]
-                if len(ix) > 0:
-                    v = exog_s[ix,:]
-                    xp0 += e_linpred[ix].sum()
-                    xp1 += (e_linpred[ix][:,None] * v).sum(0)
-
-                # Account for all cases that fail at this point.
-                ix = uft_ix[i]
-                grad += (exog_s[ix,:] - xp1 / xp0).sum(0)
-
-                # Update for cases leaving the risk set.
-                ix = surv.risk_exit[stx][i]
-                if len(ix) > 0:
-                    v = exog_s[ix,:]
-                    xp0 -= e_linpred[ix].sum()
-                    xp1 -= (e_linpred[ix][:,None] * v).sum(0)
+            # The sum over failure times of xp1 / xp0 is a weighted
+            # sum over cases of the terms of xp1.
+            xp0 = surv.risk_sums(stx, e_linpred)
+            wts = surv.risk_window_sums(stx, surv.fail_count[stx] / xp0)
+            grad -= np.dot(e_linpred * wts, exog_s)
 
         return grad
 
@@ -718,9 +777,6 @@ class PHReg(model.LikelihoodModel):
         # Loop over strata
         for stx in range(surv.nstrat):
 
-            # Indices of cases in the stratum
-            strat_ix = surv.stratum_rows[stx]
-
             # exog and linear predictor of the stratum
             exog_s = surv.exog_s[stx]
             linpred = np.dot(exog_s, params)
@@ -729,42 +785,23 @@ class PHReg(model.LikelihoodModel):
             linpred -= linpred.max()
             e_linpred = np.exp(linpred)
 
-            xp0, xp1 = 0., 0.
-
-            # Iterate backward through the unique failure times.
-            uft_ix = surv.ufailt_ix[stx]
-            nuft = len(uft_ix)
-            for i in range(nuft)[::-1]:
-
-                # Update for new cases entering the risk set.
-                ix = surv.risk_enter[stx][i]
-                if len(ix) > 0:
-                    v = exog_s[ix,:]
-                    xp0 += e_linpred[ix].sum()
-                    xp1 += (e_linpred[ix][:,None] * v).sum(0)
-                ixf = uft_ix[i]
-                if len(ixf) > 0:
-                    v = exog_s[ixf,:]
-                    xp0f = e_linpred[ixf].sum()
-                    xp1f = (e_linpred[ixf][:,None] * v).sum(0)
-
-                    # Consider all cases that fail at this point.
-                    grad += v.sum(0)
-
-                    m = len(ixf)
-                    J = np.arange(m, dtype=np.float64) / m
-                    numer = xp1 - np.outer(J, xp1f)
-                    denom = xp0 - np.outer(J, xp0f)
-                    ratio = numer / denom
-                    rsum = ratio.sum(0)
-                    grad -= rsum
-
-                # Update for cases leaving the risk set.
-                ix = surv.risk_exit[stx][i]
-                if len(ix) > 0:
-                    v = exog_s[ix,:]
-                    xp0 -= e_linpred[ix].sum()
-                    xp1 -= (e_linpred[ix][:,None] * v).sum(0)
+            ixf, uftf = surv.fail_ix[stx], surv.fail_uft[stx]
+            xp0 = surv.risk_sums(stx, e_linpred)
+            xp0f = np.bincount(uftf, weights=e_linpred[ixf],
+                               minlength=len(xp0))
+
+            # Consider all cases that fail.
+            v = exog_s[ixf, :]
+            grad += v.sum(0)
+
+            # Sums over the tied failures of the Efron weights
+            J = surv.fail_rank[stx] / surv.fail_count[stx][uftf]
+            c0 = xp0[uftf] - J*xp0f[uftf]
+            a = np.bincount(uftf, weights=1 / c0, minlength=len(xp0))
+            b = np.bincount(uftf, weights=J / c0, minlength=len(xp0))
+
+            grad -= np.dot(e_linpred * surv.risk_window_sums(stx, a), exog_s)
+            grad += np.dot(e_linpred[ixf] * b[uftf], v)
 
         return grad
 
@@ -781,9 +818,6 @@ class PHReg(model.LikelihoodModel):
         # Loop over strata
         for stx in range(surv.nstrat):
 
-            uft_ix = surv.ufailt_ix[stx]
-            nuft = len(uft_ix)
-
             exog_s = surv.exog_s[stx]
 
             linpred = np.dot(exog_s, params)
@@ -792,32 +826,16 @@ class PHReg(model.LikelihoodModel):
             linpred -= linpred.max()
             e_linpred = np.exp(linpred)
 
-            xp0, xp1, xp2 = 0., 0., 0.
-
-            # Iterate backward through the unique failure times.
-            for i in range(nuft)[::-1]:
-
-                # Update for new cases entering the risk set.
-                ix = surv.risk_enter[stx][i]
-                if len(ix) > 0:
-                    xp0 += e_linpred[ix].sum()
-                    v = exog_s[ix,:]
-                    xp1 += (e_linpred[ix][:,None] * v).sum(0)
-                    elx = e_linpred[ix]
-                    xp2 += np.einsum("ij,ik,i->jk", v, v, elx)
-
-                # Account for all cases that fail at this point.
-                m = len(uft_ix[i])
-                hess += m*(xp2 / xp0  - np.outer(xp1, xp1) / xp0**2)
-
-                # Update for new cases entering the risk set.
-                ix = surv.risk_exit[stx][i]
-                if len(ix) > 0:
-                    xp0 -= e_linpred[ix].sum()
-                    v = exog_s[ix,:]
-                    xp1 -= (e_linpred[ix][:,None] * v).sum(0)
-                    elx = e_linpred[ix]
-                    xp2 -= np.einsum("ij,ik,i->jk", v, v, elx)
+            m = surv.fail_count[stx]
+            xp0 = surv.risk_sums(stx, e_linpred)
+            xp1 = surv.risk_sums(stx, e_linpred[:, None] * exog_s)
+
+            # The sum over failure times of m * xp2 / xp0 is a weighted
+            # sum over cases of the terms of xp2.
+            wts = e_linpred * surv.risk_window_sums(stx, m / xp0)
+            hess += np.dot(exog_s.T, wts[:, None] * exog_s)
+            hess -= np.dot(xp1.T, (m / xp0**2)[:, None] * xp1)
+
         return -hess
 
     def efron_hessian(self, params):
@@ -842,47 +860,35 @@ class PHReg(model.LikelihoodModel):
             linpred -= linpred.max()
             e_linpred = np.exp(linpred)
 
-            xp0, xp1, xp2 = 0., 0., 0.
-
-            # Iterate backward through the unique failure times.
-            uft_ix = surv.ufailt_ix[stx]
-            nuft = len(uft_ix)
-            for i in range(nuft)[::-1]:
-
-                # Update for new cases entering the risk set.
-                ix = surv.risk_enter[stx][i]
-                if len(ix) > 0:
-                    xp0 += e_linpred[ix].sum()
-                    v = exog_s[ix,:]
-                    xp1 += (e_linpred[ix][:,None] * v).sum(0)
-                    elx = e_linpred[ix]
-                    xp2 += np.einsum("ij,ik,i->jk", v, v, elx)
-
-                ixf = uft_ix[i]
-                if len(ixf) > 0:
-                    v = exog_s[ixf,:]
-                    xp0f = e_linpred[ixf].sum()
-                    xp1f = (e_linpred[ixf][:,None] * v).sum(0)
-                    elx = e_linpred[ixf]
-                    xp2f = np.einsum("ij,ik,i->jk", v, v, elx)
-
-                # Account for all cases that fail at this point.
-                m = len(uft_ix[i])
-                J = np.arange(m, dtype=np.float64) / m
-                c0 = xp0 - J*xp0f
-                hess += xp2 * np.sum(1 / c0)
-                hess -= xp2f * np.sum(J / c0)
-                mat = (xp1[None, :] - np.outer(J, xp1f)) / c0[:, None]
-                hess -= np.einsum("ij,ik->jk", mat, mat)
-
-                # Update for new cases entering the risk set.
-                ix = surv.risk_exit[stx][i]
-                if len(ix) > 0:
-                    xp0 -= e_linpred[ix].sum()
-                    v = exog_s[ix,:]
-                    xp1 -= (e_linpred[ix][:,None] * v).sum(0)
-                    elx = e_linpred[ix]
-                    xp2 -= np.einsum("ij,ik,i->jk", v, v, elx)
+            ixf, uftf = surv.fail_ix[stx], surv.fail_uft[stx]
+            nuft = len(surv.ufailt[stx])
+            v = exog_s[ixf, :]
+            elx = e_linpred[ixf]
+            xp0 = surv.risk_sums(stx, e_linpred)
+            xp1 = surv.risk_sums(stx, e_linpred[:, None] * exog_s)
+            xp0f = np.bincount(uftf, weights=elx, minlength=nuft)
+            xp1f = np.add.reduceat(elx[:, None] * v,
+                                   np.flatnonzero(surv.fail_rank[stx] == 0))
+
+            # Sums over the tied failures of the Efron weights
+            J = surv.fail_rank[stx] / surv.fail_count[stx][uftf]
+            c0 = xp0[uftf] - J*xp0f[uftf]
+            a = np.bincount(uftf, weights=1 / c0, minlength=nuft)
+            b = np.bincount(uftf, weights=J / c0, minlength=nuft)
+            a2 = np.bincount(uftf, weights=1 / c0**2, minlength=nuft)
+            b2 = np.bincount(uftf, weights=J / c0**2, minlength=nuft)
+            c2 = np.bincount(uftf, weights=J**2 / c0**2, minlength=nuft)
+
+            # Terms in xp2 and xp2f
+            wts = e_linpred * surv.risk_window_sums(stx, a)
+            hess += np.dot(exog_s.T, wts[:, None] * exog_s)
+            hess -= np.dot(v.T, (elx * b[uftf])[:, None] * v)
+
+            # Terms in the outer products of xp1 - J * xp1f
+            mat = np.dot(xp1.T, b2[:, None] * xp1f)
+            hess -= np.dot(xp1.T, a2[:, None] * xp1)
+            hess += mat + mat.T
+            hess -= np.dot(xp1f.T, c2[:, None] * xp1f)
 
         return -hess
 
@@ -967,51 +973,34 @@ class PHReg(model.LikelihoodModel):
         # Loop over strata
         for stx in range(surv.nstrat):
 
-            uft_ix = surv.ufailt_ix[stx]
             exog_s = surv.exog_s[stx]
-            nuft = len(uft_ix)
             strat_ix = surv.stratum_rows[stx]
 
-            xp0 = 0.
-
             linpred = np.dot(exog_s, params)
             if surv.offset_s is not None:
                 linpred += surv.offset_s[stx]
             linpred -= linpred.max()
             e_linpred = np.exp(linpred)
 
-            at_risk_ix = set([])
-
-            # Iterate backward through the unique failure times.
-            for i in range(nuft)[::-1]:
-
-                # Update for new cases entering the risk set.
-                ix = surv.risk_enter[stx][i]
-                at_risk_ix |= set(ix)
-                xp0 += e_linpred[ix].sum()
+            # The increments in the cumulative hazard
+            xp0 = surv.risk_sums(stx, e_linpred)
+            dchaz = surv.fail_count[stx] / xp0
 
-                atr_ix = list(at_risk_ix)
-                leverage = exog_s[atr_ix, :] - w_avg[stx][i, :]
+            # Each failure contributes its leverage at its own failure
+            # time, and each case at risk contributes the leverage at
+            # every failure time weighted by its hazard increment.
+            ixf = surv.fail_ix[stx]
+            resid = np.zeros(exog_s.shape, dtype=np.float64)
+            resid[ixf, :] = exog_s[ixf, :] - w_avg[stx][surv.fail_uft[stx], :]
+            chaz = surv.risk_window_sums(stx, dchaz)
+            chaz_avg = surv.risk_window_sums(stx, dchaz[:, None] * w_avg[stx])
+            resid -= e_linpred[:, None] * (exog_s * chaz[:, None] - chaz_avg)
 
-                # Event indicators
-                d = np.zeros(exog_s.shape[0])
-                d[uft_ix[i]] = 1
+            score_resid[strat_ix, :] = resid
 
-                # The increment in the cumulative hazard
-                dchaz = len(uft_ix[i]) / xp0
-
-                # Piece of the martingale residual
-                mrp = d[atr_ix] - e_linpred[atr_ix] * dchaz
-
-                # Update the score residuals
-                ii = strat_ix[atr_ix]
-                score_resid[ii,:] += leverage * mrp[:, None]
-                mask[ii] = 1
-
-                # Update for cases leaving the risk set.
-                ix = surv.risk_exit[stx][i]
-                at_risk_ix -= set(ix)
-                xp0 -= e_linpred[ix].sum()
+            # Cases that are at risk at some failure time
+            ii = surv.uft_exit[stx] <= surv.uft_enter[stx]
+            mask[strat_ix[ii]] = 1
 
         jj = np.flatnonzero(mask == 0)
         if len(jj) > 0:
@@ -1045,17 +1034,11 @@ class PHReg(model.LikelihoodModel):
         surv = self.surv
 
         averages = []
-        xp0, xp1 = 0., 0.
 
         # Loop over strata
         for stx in range(surv.nstrat):
 
-            uft_ix = surv.ufailt_ix[stx]
             exog_s = surv.exog_s[stx]
-            nuft = len(uft_ix)
-
-            average_s = np.zeros((len(uft_ix), exog_s.shape[1]),
-                                  dtype=np.float64)
 
             linpred = np.dot(exog_s, params)
             if surv.offset_s is not None:
@@ -1063,22 +1046,9 @@ class PHReg(model.LikelihoodModel):
             linpred -= linpred.max()
             e_linpred = np.exp(linpred)
 
-            # Iterate backward through the unique failure times.
-            for i in range(nuft)[::-1]:
-
-                # Update for new cases entering the risk set.
-                ix = surv.risk_enter[stx][i]
-                xp0 += e_linpred[ix].sum()
-                xp1 += np.dot(e_linpred[ix], exog_s[ix, :])
-
-                average_s[i, :] = xp1 / xp0
-
-                # Update for cases leaving the risk set.
-                ix = surv.risk_exit[stx][i]
-                xp0 -= e_linpred[ix].sum()
-                xp1 -= np.dot(e_linpred[ix], exog_s[ix, :])
-
-            averages.append(average_s)
+            xp0 = surv.risk_sums(stx, e_linpred)
+            xp1 = surv.risk_sums(stx, e_linpred[:, None] * exog_s)
+            averages.append(xp1 / xp0[:, None])
 
         return averages
 
@@ -1113,32 +1083,15 @@ class PHReg(model.LikelihoodModel):
         for stx in range(surv.nstrat):
 
             uft = surv.ufailt[stx]
-            uft_ix = surv.ufailt_ix[stx]
             exog_s = surv.exog_s[stx]
-            nuft = len(uft_ix)
 
             linpred = np.dot(exog_s, params)
             if surv.offset_s is not None:
                 linpred += surv.offset_s[stx]
             e_linpred = np.exp(linpred)
 
-            xp0 = 0.
-            h0 = np.zeros(nuft, dtype=np.float64)
-
-            # Iterate backward through the unique failure times.
-            for i in range(nuft)[::-1]:
-
-                # Update for new cases entering the risk set.
-                ix = surv.risk_enter[stx][i]
-                xp0 += e_linpred[ix].sum()
-
-                # Account for all cases that fail at this point.
-                ix = uft_ix[i]
-                h0[i] = len(ix) / xp0
-
-                # Update for cases leaving the risk set.
-                ix = surv.risk_exit[stx][i]
-                xp0 -= e_linpred[ix].sum()
+            xp0 = surv.risk_sums(stx, e_linpred)
+            h0 = surv.fail_count[stx] / xp0
 
             cumhaz = np.cumsum(h0) - h0
             current_strata_surv = np.exp(-cumhaz)
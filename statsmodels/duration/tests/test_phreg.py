@@ -257,6 +257,54 @@ class TestPHReg(object):
 
             assert_allclose(rslt2.params, rslt1.params[1:])
 
+    def test_risk_sets(self):
+        # The risk set sums and the derivatives of the log likelihood,
+        # with tied times, entry times, strata and offsets.
+
+        np.random.seed(34234)
+        n = 300
+        time = np.round(5 * np.random.uniform(size=n), 1)
+        status = np.random.randint(0, 2, n).astype(np.float64)
+        entry = np.where(np.random.uniform(size=n) < 0.5, 0,
+                         time * np.random.uniform(size=n))
+        strata = np.random.randint(0, 3, n)
+        offset = 0.1 * np.random.normal(size=n)
+        exog = np.random.normal(size=(n, 3))
+
+        mod = PHReg(time, exog, status, entry=entry, strata=strata,
+                    offset=offset)
+        surv = mod.surv
+        for stx in range(surv.nstrat):
+            time_s, entry_s = surv.time_s[stx], surv.entry_s[stx]
+            uft = surv.ufailt[stx]
+            at_risk = ((entry_s[None, :] <= uft[:, None]) &
+                       (time_s[None, :] >= uft[:, None]))
+            exog_s = surv.exog_s[stx]
+            assert_allclose(surv.risk_sums(stx, exog_s),
+                            np.dot(at_risk, exog_s))
+            c = np.random.normal(size=len(uft))
+            assert_allclose(surv.risk_window_sums(stx, c),
+                            np.dot(c, at_risk))
+
+            # The index lists agree with the risk sets
+            for k in range(len(uft)):
+                ix = surv.ufailt_ix[stx][k]
+                assert_equal(np.all(time_s[ix] == uft[k]), True)
+                assert_equal(len(ix), surv.fail_count[stx][k])
+            enter = np.concatenate(surv.risk_enter[stx])
+            assert_equal(np.sort(enter), np.arange(len(time_s)))
+
+        from statsmodels.tools.numdiff import approx_fprime
+        params = np.r_[0.2, -0.3, 0.1]
+        for ties in "breslow", "efron":
+            mod.ties = ties
+            assert_allclose(mod.score(params),
+                            approx_fprime(params, mod.loglike,
+                                          centered=True), rtol=1e-6)
+            assert_allclose(mod.hessian(params),
+                            approx_fprime(params, mod.score,
+                                          centered=True), rtol=1e-6)
+
     def test_post_estimation(self):
         # All regression tests
         np.random.seed(34234)
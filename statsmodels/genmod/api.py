@@ -1,4 +1,5 @@
 from .generalized_linear_model import GLM
+from .batch_glm import BatchGLM
 from .generalized_estimating_equations import GEE, OrdinalGEE, NominalGEE
 from . import families
 from . import cov_struct
@@ -0,0 +1,420 @@
+"""
+Fit the same generalized linear model to many response variables
+
+`BatchGLM` estimates one GLM for each column of a two-dimensional `endog`.
+All models share the design matrix, the family and link, and the offset,
+exposure and frequency weights. The iteratively reweighted least squares
+iterations run for all columns at the same time. In each iteration the
+weighted normal equations of all responses are computed with one matrix
+product per column of `exog` and are solved in a single batched call to
+`numpy.linalg.solve`. Responses whose deviance has converged are removed
+from the active set, so that the iterations of each column are the same
+as in `GLM.fit`.
+"""
+import copy
+
+import numpy as np
+from scipy import stats
+
+from statsmodels.base.data import handle_data
+from statsmodels.compat.python import string_types
+from statsmodels.compat.numpy import np_matrix_rank
+from statsmodels.genmod import families
+from statsmodels.genmod.generalized_linear_model import (GLM, GLMResults,
+                                                          GLMResultsWrapper)
+from statsmodels.tools.decorators import cache_readonly
+from statsmodels.tools.sm_exceptions import PerfectSeparationError
+
+__all__ = ['BatchGLM', 'BatchGLMResults']
+
+
+def _weighted_gram(exog, weights):
+    """
+    Compute exog.T * diag(weights[:, j]) * exog for each column j
+
+    Returns an array with shape (m, k, k), where m is the number of columns
+    of `weights` and k is the number of columns of `exog`.
+    """
+    k_vars = exog.shape[1]
+    gram = np.empty((weights.shape[1], k_vars, k_vars))
+    for i in range(k_vars):
+        gram[:, i, :] = np.dot((exog[:, i:i+1] * weights).T, exog)
+    return gram
+
+
+class BatchGLM(object):
+    __doc__ = """
+    Generalized linear models for many response variables and one design
+
+    Parameters
+    ----------
+    endog : array-like
+        2-d array with shape (nobs, k_endog). Each column is the response
+        variable of one model. For the Binomial family each column has to
+        be binary or a proportion, i.e. the number of trials is one.
+    exog : array-like
+        A nobs x k array that is shared by all models. It needs to have
+        full column rank. An intercept is not included by default and
+        should be added by the user. See `statsmodels.tools.add_constant`.
+    family : family class instance
+        The default is Gaussian.  To specify the binomial distribution
+        family = sm.family.Binomial()
+        Each family can take a link instance as an argument.  See
+        statsmodels.family.family for more information.
+    offset : array-like or None
+        1-d offset that is shared by all models.
+    exposure : array-like or None
+        1-d exposure that is shared by all models. The log of `exposure`
+        is added to the offset, and requires a log link.
+    freq_weights : array-like
+        1-d array of frequency weights that is shared by all models.
+    hasconst : None or bool
+        Indicates whether `exog` includes a user-supplied constant, see
+        `statsmodels.base.model.Model`.
+
+    Attributes
+    ----------
+    k_endog : int
+        The number of response variables, i.e. of models.
+    df_model : float
+        Model degrees of freedom, the same for all models.
+    df_resid : float
+        Residual degrees of freedom, the same for all models.
+
+    Notes
+    -----
+    The weighted least squares problems of the iteratively reweighted
+    least squares iterations are solved with the normal equations. The
+    design matrix does not change between the models and iterations, so
+    the weighted cross product for all responses is a sequence of k matrix
+    products with the (nobs, k_endog) array of weights. This is much faster
+    than fitting one `GLM` after the other if there are many response
+    variables, but it is less accurate than the QR or pinv based solution
+    if `exog` is badly conditioned.
+
+    `get_result` returns the `GLMResults` instance of a single response.
+
+    Examples
+    --------
+    >>> mod = BatchGLM(counts, exog, family=sm.families.Poisson())
+    >>> res = mod.fit()
+    >>> res.params      # one column per response
+    >>> res.get_result(0).summary()
+    """
+
+    def __init__(self, endog, exog, family=None, offset=None, exposure=None,
+                 freq_weights=None, hasconst=None):
+        self.data = handle_data(endog, exog, 'none', hasconst)
+        self.endog = np.asarray(self.data.endog, dtype=np.float64)
+        self.exog = np.asarray(self.data.exog, dtype=np.float64)
+        if self.endog.ndim == 1:
+            self.endog = self.endog[:, None]
+        nobs, k_vars = self.exog.shape
+        if self.endog.shape[0] != nobs:
+            raise ValueError("endog and exog need to have the same number "
+                             "of observations")
+        self.nobs = nobs
+        self.k_endog = self.endog.shape[1]
+        self.k_constant = self.data.k_constant
+
+        if family is None:
+            family = families.Gaussian()
+        if isinstance(family, families.Binomial):
+            # only Bernoulli and proportions with one trial, the family of
+            # the caller is not changed
+            family = copy.copy(family)
+            family.n = 1
+        self.family = family
+
+        if np_matrix_rank(self.exog) < k_vars:
+            raise ValueError("exog does not have full column rank")
+
+        if freq_weights is None:
+            freq_weights = np.ones(nobs)
+        self.freq_weights = np.asarray(freq_weights, dtype=np.float64)
+
+        self.offset = offset
+        self.exposure = exposure
+        offset_exposure = np.zeros(nobs)
+        if offset is not None:
+            offset_exposure += np.asarray(offset)
+        if exposure is not None:
+            if not isinstance(family.link, families.links.Log):
+                raise ValueError("exposure can only be used with the log "
+                                 "link function")
+            offset_exposure += np.log(exposure)
+        self._offset_exposure = offset_exposure
+
+        self.df_model = k_vars - 1
+        self.wnobs = self.freq_weights.sum()
+        self.df_resid = self.wnobs - self.df_model - 1
+
+    @property
+    def endog_names(self):
+        return self.data.ynames
+
+    @property
+    def exog_names(self):
+        return self.data.xnames
+
+    def _deviance(self, endog, mu):
+        # per column deviance, the squared deviance residuals add up to the
+        # deviance
+        resid_dev = self.family.resid_dev(endog, mu)
+        return np.dot(self.freq_weights, resid_dev**2)
+
+    def _estimate_scale(self, endog, mu, scale):
+        # vectorized version of GLM.estimate_scale
+        k_endog = endog.shape[1]
+        if not scale:
+            if isinstance(self.family, (families.Binomial,
+                                        families.Poisson)):
+                return np.ones(k_endog)
+            scale = 'x2'
+
+        if np.isscalar(scale) and not isinstance(scale, string_types):
+            return float(scale) * np.ones(k_endog)
+
+        if isinstance(scale, string_types):
+            if scale.lower() == 'x2':
+                resid = endog - mu
+                pearson = resid**2 / self.family.variance(mu)
+                return np.dot(self.freq_weights, pearson) / self.df_resid
+            elif scale.lower() == 'dev':
+                return self._deviance(endog, mu) / self.df_resid
+
+        raise ValueError("Scale %s with type %s not understood" %
+                         (scale, type(scale)))
+
+    def fit(self, start_params=None, maxiter=100, tol=1e-8, scale=None,
+            atol=None, rtol=0., tol_criterion='deviance'):
+        """
+        Fit all models with iteratively reweighted least squares
+
+        Parameters
+        ----------
+        start_params : array-like, optional
+            Starting values, either a 1-d array that is used for all models
+            or a (k_vars, k_endog) array. The default uses
+            ``family.starting_mu`` for each response.
+        maxiter : int, optional
+            Maximum number of iterations. Default is 100.
+        tol : float
+            Convergence tolerance.  Default is 1e-8.
+        scale : string or float, optional
+            The scale estimate, see `GLM.fit`.
+        atol : float, optional
+            The absolute tolerance criterion. Defaults to ``tol``.
+        rtol : float, optional
+            The relative tolerance criterion. Defaults to 0.
+        tol_criterion : str, optional
+            Defaults to ``'deviance'``. Can optionally be ``'params'``.
+
+        Returns
+        -------
+        results : BatchGLMResults
+
+        Notes
+        -----
+        Convergence is checked separately for each response, using the
+        same criterion as `GLM.fit`.
+        """
+        if tol_criterion not in ('deviance', 'params'):
+            raise ValueError("tol_criterion has to be 'deviance' or 'params'")
+        if maxiter < 1:
+            raise ValueError("maxiter has to be at least one")
+        atol = tol if atol is None else atol
+
+        family = self.family
+        endog = self.endog
+        exog = self.exog
+        offset_exposure = self._offset_exposure[:, None]
+        k_vars = exog.shape[1]
+        k_endog = self.k_endog
+
+        if start_params is None:
+            params = np.zeros((k_vars, k_endog))
+            mu = np.column_stack([family.starting_mu(endog[:, j])
+                                  for j in range(k_endog)])
+            lin_pred = family.predict(mu)
+        else:
+            params = np.asarray(start_params, dtype=np.float64)
+            if params.ndim == 1:
+                params = np.tile(params[:, None], (1, k_endog))
+            else:
+                params = params.copy()
+            lin_pred = np.dot(exog, params) + offset_exposure
+            mu = family.fitted(lin_pred)
+
+        deviance = self._deviance(endog, mu)
+        if np.isnan(deviance).any():
+            raise ValueError("The first guess on the deviance function "
+                             "returned a nan.  This could be a boundary "
+                             " problem and should be reported.")
+
+        gram = np.empty((k_endog, k_vars, k_vars))
+        converged = np.zeros(k_endog, dtype=bool)
+        iterations = np.zeros(k_endog, dtype=int)
+        active = np.arange(k_endog)
+        for iteration in range(maxiter):
+            y = endog[:, active]
+            mu_a = mu[:, active]
+            weights = (self.freq_weights[:, None] * family.weights(mu_a))
+            wlsendog = (lin_pred[:, active] +
+                        family.link.deriv(mu_a) * (y - mu_a) -
+                        offset_exposure)
+            gram_a = _weighted_gram(exog, weights)
+            xwz = np.dot((weights * wlsendog).T, exog)
+            params_a = np.linalg.solve(gram_a, xwz[:, :, None])[:, :, 0].T
+
+            lin_pred_a = np.dot(exog, params_a) + offset_exposure
+            mu_a = family.fitted(lin_pred_a)
+            if np.any(np.all(np.abs(mu_a - y) < 1e-8, axis=0)):
+                msg = "Perfect separation detected, results not available"
+                raise PerfectSeparationError(msg)
+
+            deviance_a = self._deviance(y, mu_a)
+            if tol_criterion == 'deviance':
+                conv_a = np.isclose(deviance[active], deviance_a,
+                                    atol=atol, rtol=rtol)
+            else:
+                conv_a = np.isclose(params[:, active], params_a,
+                                    atol=atol, rtol=rtol).all(0)
+
+            deviance[active] = deviance_a
+            params[:, active] = params_a
+            lin_pred[:, active] = lin_pred_a
+            mu[:, active] = mu_a
+            gram[active] = gram_a
+            iterations[active] = iteration + 1
+            converged[active] = conv_a
+            active = active[~conv_a]
+            if len(active) == 0:
+                break
+
+        scale = self._estimate_scale(endog, mu, scale)
+        normalized_cov_params = np.linalg.inv(gram)
+        res = BatchGLMResults(self, params, normalized_cov_params, scale)
+        res.converged = converged
+        res.iterations = iterations
+        res.deviance = deviance
+        res.mu = mu
+        return res
+
+
+class BatchGLMResults(object):
+    """
+    Results of fitting a GLM to many response variables
+
+    Array attributes that are estimated for each response have the
+    responses in the last axis. If `exog` and `endog` are pandas objects,
+    then `params`, `bse`, `tvalues` and `pvalues` are DataFrames with the
+    exog names as index and the endog names as columns.
+
+    Attributes
+    ----------
+    model : BatchGLM
+    params : array
+        (k_vars, k_endog) array of parameter estimates.
+    normalized_cov_params : array
+        (k_endog, k_vars, k_vars) array, the inverse of the weighted cross
+        product of `exog` at the last iteration for each response.
+    scale : array
+        The scale of each model.
+    deviance : array
+        The deviance of each model.
+    converged : array
+        Boolean array, True if the iterations of a response converged.
+    iterations : array
+        The number of iterations of each response.
+    mu : array
+        (nobs, k_endog) array of the fitted mean of each response.
+    """
+
+    def __init__(self, model, params, normalized_cov_params, scale):
+        self.model = model
+        self._params = params
+        self.normalized_cov_params = normalized_cov_params
+        self.scale = scale
+        self.nobs = model.nobs
+        self.df_model = model.df_model
+        self.df_resid = model.df_resid
+        self._cache = {}
+
+    def _wrap(self, result):
+        return self.model.data.wrap_output(result, how='columns_eq')
+
+    @property
+    def params(self):
+        return self._wrap(self._params)
+
+    def cov_params(self):
+        """
+        (k_endog, k_vars, k_vars) array of parameter covariance matrices
+        """
+        return self.normalized_cov_params * self.scale[:, None, None]
+
+    @cache_readonly
+    def _bse(self):
+        diag = np.diagonal(self.normalized_cov_params, axis1=1, axis2=2)
+        return np.sqrt(diag * self.scale[:, None]).T
+
+    @property
+    def bse(self):
+        return self._wrap(self._bse)
+
+    @property
+    def tvalues(self):
+        return self._wrap(self._params / self._bse)
+
+    @property
+    def pvalues(self):
+        tvalues = self._params / self._bse
+        return self._wrap(stats.norm.sf(np.abs(tvalues)) * 2)
+
+    @cache_readonly
+    def llf(self):
+        """
+        The log-likelihood of each model
+        """
+        model = self.model
+        endog, mu = model.endog, self.mu
+        return np.array([model.family.loglike(endog[:, j], mu[:, j],
+                                              model.freq_weights,
+                                              self.scale[j])
+                         for j in range(model.k_endog)])
+
+    @cache_readonly
+    def aic(self):
+        return -2 * self.llf + 2 * (self.df_model + 1)
+
+    def get_result(self, idx):
+        """
+        Results instance of one response
+
+        Parameters
+        ----------
+        idx : int
+            The column of `endog`.
+
+        Returns
+        -------
+        results : GLMResultsWrapper
+            The same results instance as returned by `GLM.fit`.
+        """
+        model = self.model
+        orig_endog = model.data.orig_endog
+        if hasattr(orig_endog, 'iloc'):
+            endog = orig_endog.iloc[:, idx]
+        else:
+            endog = model.endog[:, idx]
+        mod = GLM(endog, model.data.orig_exog, family=model.family,
+                  offset=model.offset, exposure=model.exposure,
+                  freq_weights=model.freq_weights)
+        mod.mu = self.mu[:, idx]
+        res = GLMResults(mod, self._params[:, idx],
+                         self.normalized_cov_params[idx], self.scale[idx])
+        res.method = "IRLS"
+        res.converged = self.converged[idx]
+        res.fit_history = {'iteration': self.iterations[idx]}
+        return GLMResultsWrapper(res)
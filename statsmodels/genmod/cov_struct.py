@@ -172,6 +172,32 @@ class CovStruct(object):
         soln = [spl.cho_solve(vco, x) for x in rhs]
         return soln
 
+    def covariance_matrix_solve_stacked(self, expval, stdev, rhs):
+        """
+        Solves the matrix equations of `covariance_matrix_solve` for a
+        stack of clusters of equal size.
+
+        Parameters
+        ----------
+        expval: array-like
+           The expected values of endog, an m x k array for m clusters
+           of size k.
+        stdev : array-like
+            The standard deviations of endog, an m x k array.
+        rhs : list/tuple of array-like
+            A set of right-hand sides, each an m x k or m x k x p
+            array.
+
+        Returns
+        -------
+        soln : list/tuple of array-like
+            The solutions to the matrix equations, or None if the
+            dependence structure has no closed form solution.  In that
+            case the clusters are solved one at a time using
+            `covariance_matrix_solve`.
+        """
+        return None
+
     def summary(self):
         """
         Returns a text summary of the current estimate of the
@@ -203,9 +229,15 @@ class Independence(CovStruct):
                 rslt.append(x / v[:, None])
         return rslt
 
+    def covariance_matrix_solve_stacked(self, expval, stdev, rhs):
+        v = stdev ** 2
+        return [x / v.reshape(v.shape + (1,) * (x.ndim - 2)) for x in rhs]
+
     update.__doc__ = CovStruct.update.__doc__
     covariance_matrix.__doc__ = CovStruct.covariance_matrix.__doc__
     covariance_matrix_solve.__doc__ = CovStruct.covariance_matrix_solve.__doc__
+    covariance_matrix_solve_stacked.__doc__ = (
+        CovStruct.covariance_matrix_solve_stacked.__doc__)
 
     def summary(self):
         return ("Observations within a cluster are modeled "
@@ -235,25 +267,43 @@ class Exchangeable(CovStruct):
         cached_means = self.model.cached_means
 
         has_weights = self.model.weights is not None
-        weights_li = self.model.weights
+        if has_weights:
+            weights_li = self.model.weights_li
 
         residsq_sum, scale = 0, 0
         fsum1, fsum2, n_pairs = 0., 0., 0.
-        for i in range(self.model.num_group):
-            expval, _ = cached_means[i]
-            stdev = np.sqrt(varfunc(expval))
-            resid = (endog[i] - expval) / stdev
-            f = weights_li[i] if has_weights else 1.
+        if self.model._buckets is not None:
+            for bucket in self.model._buckets:
+                expval = bucket["expval"]
+                stdev = np.sqrt(varfunc(expval))
+                resid = (bucket["endog"] - expval) / stdev
+                f = bucket["weights"]
+                m, ngrp = resid.shape
+
+                ssr = np.sum(resid * resid, 1)
+                scale += np.dot(f, ssr)
+                fsum1 += f.sum() * ngrp
+
+                residsq_sum += np.dot(f, resid.sum(1) ** 2 - ssr) / 2
+                npr = 0.5 * ngrp * (ngrp - 1)
+                fsum2 += f.sum() * npr
+                n_pairs += m * npr
+        else:
+            for i in range(self.model.num_group):
+                expval, _ = cached_means[i]
+                stdev = np.sqrt(varfunc(expval))
+                resid = (endog[i] - expval) / stdev
+                f = weights_li[i] if has_weights else 1.
 
-            ssr = np.sum(resid * resid)
-            scale += f * ssr
-            fsum1 += f * len(endog[i])
+                ssr = np.sum(resid * resid)
+                scale += f * ssr
+                fsum1 += f * len(endog[i])
 
-            residsq_sum += f * (resid.sum() ** 2 - ssr) / 2
-            ngrp = len(resid)
-            npr = 0.5 * ngrp * (ngrp - 1)
-            fsum2 += f * npr
-            n_pairs += npr
+                residsq_sum += f * (resid.sum() ** 2 - ssr) / 2
+                ngrp = len(resid)
+                npr = 0.5 * ngrp * (ngrp - 1)
+                fsum2 += f * npr
+                n_pairs += npr
 
         ddof = self.model.ddof_scale
         scale /= (fsum1 * (nobs - ddof) / float(nobs))
@@ -289,9 +339,28 @@ class Exchangeable(CovStruct):
 
         return rslt
 
+    def covariance_matrix_solve_stacked(self, expval, stdev, rhs):
+
+        k = expval.shape[1]
+        c = self.dep_params / (1. - self.dep_params)
+        c /= 1. + self.dep_params * (k - 1)
+
+        rslt = []
+        for x in rhs:
+            sd = stdev.reshape(stdev.shape + (1,) * (x.ndim - 2))
+            x1 = x / sd
+            y = x1 / (1. - self.dep_params)
+            y -= c * x1.sum(1, keepdims=True)
+            y /= sd
+            rslt.append(y)
+
+        return rslt
+
     update.__doc__ = CovStruct.update.__doc__
     covariance_matrix.__doc__ = CovStruct.covariance_matrix.__doc__
     covariance_matrix_solve.__doc__ = CovStruct.covariance_matrix_solve.__doc__
+    covariance_matrix_solve_stacked.__doc__ = (
+        CovStruct.covariance_matrix_solve_stacked.__doc__)
 
     def summary(self):
         return ("The correlation between two observations in the " +
@@ -411,6 +480,11 @@ class Nested(CovStruct):
         self.designx = np.concatenate(designx, axis=0)
         self.ilabels = ilabels
 
+        # The position of the first pair of each group in designx
+        ngrp = np.asarray([len(y) for y in endog])
+        npair = ngrp * (ngrp - 1) // 2
+        self.pair_start = np.cumsum(npair) - npair
+
         svd = np.linalg.svd(self.designx, 0)
         self.designx_u = svd[0]
         self.designx_s = svd[1]
@@ -430,21 +504,38 @@ class Nested(CovStruct):
 
         varfunc = self.model.family.variance
 
-        dvmat = []
         scale = 0.
-        for i in range(self.model.num_group):
+        if self.model._buckets is not None:
+            dvmat = np.empty(self.designx.shape[0])
+            for bucket in self.model._buckets:
 
-            expval, _ = cached_means[i]
+                expval = bucket["expval"]
 
-            stdev = np.sqrt(varfunc(expval))
-            resid = (endog[i] - expval) / stdev
+                stdev = np.sqrt(varfunc(expval))
+                resid = (bucket["endog"] - expval) / stdev
+
+                ix1, ix2 = np.tril_indices(resid.shape[1], -1)
+                pos = (self.pair_start[bucket["ix"]][:, None] +
+                       np.arange(len(ix1)))
+                dvmat[pos] = resid[:, ix1] * resid[:, ix2]
+
+                scale += np.sum(resid ** 2)
+        else:
+            dvmat = []
+            for i in range(self.model.num_group):
 
-            ix1, ix2 = np.tril_indices(len(resid), -1)
-            dvmat.append(resid[ix1] * resid[ix2])
+                expval, _ = cached_means[i]
 
-            scale += np.sum(resid ** 2)
+                stdev = np.sqrt(varfunc(expval))
+                resid = (endog[i] - expval) / stdev
+
+                ix1, ix2 = np.tril_indices(len(resid), -1)
+                dvmat.append(resid[ix1] * resid[ix2])
+
+                scale += np.sum(resid ** 2)
+
+            dvmat = np.concatenate(dvmat)
 
-        dvmat = np.concatenate(dvmat)
         scale /= (nobs - dim)
 
         # Use least squares regression to estimate the variance
@@ -674,6 +765,7 @@ class Autoregressive(CovStruct):
             self.dist_func = lambda x, y: np.abs(x - y).sum()
         else:
             self.dist_func = dist_func
+        self._default_dist = dist_func is None
 
         self.designx = None
 
@@ -690,9 +782,23 @@ class Autoregressive(CovStruct):
         endog = self.model.endog_li
         time = self.model.time_li
 
+        # The pairs within the clusters of each size are formed at once
+        # for the default distance function.
+        buckets = self.model._buckets
+        if not self._default_dist:
+            buckets = None
+
         # Only need to compute this once
         if self.designx is not None:
             designx = self.designx
+        elif buckets is not None:
+            designx = []
+            for bucket in buckets:
+                j1, j2 = np.tril_indices(bucket["endog"].shape[1], -1)
+                tm = bucket["time"]
+                designx.append(np.abs(tm[:, j1, :] - tm[:, j2, :]).sum(2))
+            designx = np.concatenate([x.ravel() for x in designx])
+            self.designx = designx
         else:
             designx = []
             for i in range(self.model.num_group):
@@ -721,18 +827,29 @@ class Autoregressive(CovStruct):
         wts /= wts.sum()
 
         residmat = []
-        for i in range(self.model.num_group):
+        if buckets is not None:
+            for bucket in buckets:
+                expval = bucket["expval"]
+                stdev = np.sqrt(scale * varfunc(expval))
+                resid = (bucket["endog"] - expval) / stdev
+
+                j1, j2 = np.tril_indices(resid.shape[1], -1)
+                residmat.append(np.column_stack((resid[:, j1].ravel(),
+                                                 resid[:, j2].ravel())))
+            residmat = np.concatenate(residmat)
+        else:
+            for i in range(self.model.num_group):
 
-            expval, _ = cached_means[i]
-            stdev = np.sqrt(scale * varfunc(expval))
-            resid = (endog[i] - expval) / stdev
+                expval, _ = cached_means[i]
+                stdev = np.sqrt(scale * varfunc(expval))
+                resid = (endog[i] - expval) / stdev
 
-            ngrp = len(resid)
-            for j1 in range(ngrp):
-                for j2 in range(j1):
-                    residmat.append([resid[j1], resid[j2]])
+                ngrp = len(resid)
+                for j1 in range(ngrp):
+                    for j2 in range(j1):
+                        residmat.append([resid[j1], resid[j2]])
 
-        residmat = np.array(residmat)
+            residmat = np.array(residmat)
 
         # Need to minimize this
         def fitfunc(a):
@@ -813,13 +930,13 @@ class Autoregressive(CovStruct):
                 flatten = True
             x1 = x / stdev[:, None]
 
-            z0 = np.zeros((1, x.shape[1]))
-            rhs1 = np.concatenate((x[1:, :], z0), axis=0)
-            rhs2 = np.concatenate((z0, x[0:-1, :]), axis=0)
+            z0 = np.zeros((1, x1.shape[1]))
+            rhs1 = np.concatenate((x1[1:, :], z0), axis=0)
+            rhs2 = np.concatenate((z0, x1[0:-1, :]), axis=0)
 
-            y = c0 * x + c2 * rhs1 + c2 * rhs2
-            y[0, :] = c1 * x[0, :] + c2 * x[1, :]
-            y[-1, :] = c1 * x[-1, :] + c2 * x[-2, :]
+            y = c0 * x1 + c2 * rhs1 + c2 * rhs2
+            y[0, :] = c1 * x1[0, :] + c2 * x1[1, :]
+            y[-1, :] = c1 * x1[-1, :] + c2 * x1[-2, :]
 
             y /= stdev[:, None]
 
@@ -830,9 +947,36 @@ class Autoregressive(CovStruct):
 
         return soln
 
+    def covariance_matrix_solve_stacked(self, expval, stdev, rhs):
+        # The tri-diagonal inverse of covariance_matrix_solve, which
+        # also covers clusters of size 2.
+
+        k = expval.shape[1]
+        c0 = (1. + self.dep_params ** 2) / (1. - self.dep_params ** 2)
+        c1 = 1. / (1. - self.dep_params ** 2)
+        c2 = -self.dep_params / (1. - self.dep_params ** 2)
+
+        soln = []
+        for x in rhs:
+            sd = stdev.reshape(stdev.shape + (1,) * (x.ndim - 2))
+            x1 = x / sd
+            if k == 1:
+                y = x1
+            else:
+                y = c0 * x1
+                y[:, 1:] += c2 * x1[:, :-1]
+                y[:, :-1] += c2 * x1[:, 1:]
+                y[:, 0] = c1 * x1[:, 0] + c2 * x1[:, 1]
+                y[:, -1] = c1 * x1[:, -1] + c2 * x1[:, -2]
+            soln.append(y / sd)
+
+        return soln
+
     update.__doc__ = CovStruct.update.__doc__
     covariance_matrix.__doc__ = CovStruct.covariance_matrix.__doc__
     covariance_matrix_solve.__doc__ = CovStruct.covariance_matrix_solve.__doc__
+    covariance_matrix_solve_stacked.__doc__ = (
+        CovStruct.covariance_matrix_solve_stacked.__doc__)
 
     def summary(self):
 
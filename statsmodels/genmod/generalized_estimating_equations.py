@@ -587,6 +587,8 @@ class GEE(base.Model):
 
         self.family = family
 
+        self._buckets = self._make_buckets()
+
         self.cov_struct.initialize(self)
 
         # Total sample size
@@ -699,6 +701,87 @@ class GEE(base.Model):
             return [np.array(array[self.group_indices[k], :])
                     for k in self.group_labels]
 
+    def _make_buckets(self):
+        """
+        Returns the clusters stacked by size, or None if the mean
+        structure cannot be evaluated on stacked clusters.
+
+        Each element of the returned list is a dictionary for the `m`
+        clusters of size `k`, holding the cluster indices `ix` and the
+        arrays `endog` (m x k), `exog` (m x k x p), `time` (m x k x q),
+        `offset` (m x k, or None) and `weights` (m, ones if the model
+        is unweighted).  `update_cached_means` adds the stacked mean
+        values `expval` and linear predictors `lpr`.
+        """
+
+        # The multinomial mean is not an elementwise function of the
+        # linear predictor.
+        if isinstance(self.family, _Multinomial):
+            return None
+
+        sizes = np.asarray([len(y) for y in self.endog_li])
+        buckets = []
+        for k in np.unique(sizes):
+            if k == 0:
+                continue
+            ix = np.flatnonzero(sizes == k)
+            bucket = {"ix": ix}
+            bucket["endog"] = np.asarray([self.endog_li[i] for i in ix])
+            bucket["exog"] = np.asarray([self.exog_li[i] for i in ix])
+            bucket["time"] = np.asarray([self.time_li[i] for i in ix])
+            if self.offset_li is not None:
+                bucket["offset"] = np.asarray([self.offset_li[i]
+                                               for i in ix])
+            else:
+                bucket["offset"] = None
+            if self.weights is not None:
+                bucket["weights"] = self.weights_li[ix]
+            else:
+                bucket["weights"] = np.ones(len(ix))
+            buckets.append(bucket)
+
+        return buckets
+
+    def _stacked_deriv(self, bucket):
+        """
+        Returns the derivatives of the mean with respect to the
+        parameters (m x k x p) and the standard deviations of endog
+        (m x k) for a bucket of clusters.
+        """
+
+        m, k, p = bucket["exog"].shape
+        dmat = self.mean_deriv(bucket["exog"].reshape(-1, p),
+                               bucket["lpr"].ravel())
+        sdev = np.sqrt(self.family.variance(bucket["expval"]))
+        return dmat.reshape(m, k, p), sdev
+
+    def _stacked_solve(self, bucket, sdev, rhs):
+        """
+        Solves the working covariance equations for a bucket of
+        clusters, returns None if the solver fails.
+
+        The solver of the dependence structure for stacked clusters is
+        used if it has one, otherwise the clusters are solved one at a
+        time.
+        """
+
+        expval = bucket["expval"]
+        rslt = self.cov_struct.covariance_matrix_solve_stacked(
+            expval, sdev, rhs)
+        if rslt is not None:
+            return rslt
+
+        rslt = [np.empty_like(x) for x in rhs]
+        for j, i in enumerate(bucket["ix"]):
+            soln = self.cov_struct.covariance_matrix_solve(
+                expval[j], i, sdev[j], [x[j] for x in rhs])
+            if soln is None:
+                return None
+            for x, y in zip(rslt, soln):
+                x[j] = y
+
+        return rslt
+
     def estimate_scale(self):
         """
         Returns an estimate of the scale parameter at the current
@@ -716,6 +799,16 @@ class GEE(base.Model):
 
         scale = 0.
         fsum = 0.
+        if self._buckets is not None:
+            for bucket in self._buckets:
+                expval = bucket["expval"]
+                resid = (bucket["endog"] - expval) / np.sqrt(varfunc(expval))
+                f = bucket["weights"]
+                scale += np.dot(f, np.sum(resid ** 2, 1))
+                fsum += f.sum() * resid.shape[1]
+            scale /= (fsum * (nobs - self.ddof_scale) / float(nobs))
+            return scale
+
         for i in range(self.num_group):
 
             if len(endog[i]) == 0:
@@ -810,23 +903,37 @@ class GEE(base.Model):
         varfunc = self.family.variance
 
         bmat, score = 0, 0
-        for i in range(self.num_group):
+        if self._buckets is not None:
+            for bucket in self._buckets:
+                dmat, sdev = self._stacked_deriv(bucket)
+                resid = bucket["endog"] - bucket["expval"]
+                rslt = self._stacked_solve(bucket, sdev, (dmat, resid))
+                if rslt is None:
+                    return None, None
+                vinv_d, vinv_resid = tuple(rslt)
+
+                fdmat = dmat * bucket["weights"][:, None, None]
+                bmat += np.tensordot(fdmat, vinv_d, axes=((0, 1), (0, 1)))
+                score += np.tensordot(fdmat, vinv_resid,
+                                      axes=((0, 1), (0, 1)))
+        else:
+            for i in range(self.num_group):
 
-            expval, lpr = cached_means[i]
-            resid = endog[i] - expval
-            dmat = self.mean_deriv(exog[i], lpr)
-            sdev = np.sqrt(varfunc(expval))
+                expval, lpr = cached_means[i]
+                resid = endog[i] - expval
+                dmat = self.mean_deriv(exog[i], lpr)
+                sdev = np.sqrt(varfunc(expval))
 
-            rslt = self.cov_struct.covariance_matrix_solve(expval, i,
-                                                           sdev, (dmat, resid))
-            if rslt is None:
-                return None, None
-            vinv_d, vinv_resid = tuple(rslt)
+                rslt = self.cov_struct.covariance_matrix_solve(
+                    expval, i, sdev, (dmat, resid))
+                if rslt is None:
+                    return None, None
+                vinv_d, vinv_resid = tuple(rslt)
 
-            f = self.weights_li[i] if self.weights is not None else 1.
+                f = self.weights_li[i] if self.weights is not None else 1.
 
-            bmat += f * np.dot(dmat.T, vinv_d)
-            score += f * np.dot(dmat.T, vinv_resid)
+                bmat += f * np.dot(dmat.T, vinv_d)
+                score += f * np.dot(dmat.T, vinv_resid)
 
         update = np.linalg.solve(bmat, score)
 
@@ -849,6 +956,18 @@ class GEE(base.Model):
 
         linkinv = self.family.link.inverse
 
+        if self._buckets is not None:
+            self.cached_means = [None] * self.num_group
+            for bucket in self._buckets:
+                lpr = np.dot(bucket["exog"], mean_params)
+                if bucket["offset"] is not None:
+                    lpr += bucket["offset"]
+                expval = linkinv(lpr)
+                bucket["expval"], bucket["lpr"] = expval, lpr
+                for i, ev, lp in zip(bucket["ix"], expval, lpr):
+                    self.cached_means[i] = (ev, lp)
+            return
+
         self.cached_means = []
 
         for i in range(self.num_group):
@@ -891,24 +1010,38 @@ class GEE(base.Model):
         # Calculate the naive (model-based) and robust (sandwich)
         # covariances.
         bmat, cmat = 0, 0
-        for i in range(self.num_group):
+        if self._buckets is not None:
+            for bucket in self._buckets:
+                dmat, sdev = self._stacked_deriv(bucket)
+                resid = bucket["endog"] - bucket["expval"]
+                rslt = self._stacked_solve(bucket, sdev, (dmat, resid))
+                if rslt is None:
+                    return None, None, None, None
+                vinv_d, vinv_resid = tuple(rslt)
+
+                fdmat = dmat * bucket["weights"][:, None, None]
+                bmat += np.tensordot(fdmat, vinv_d, axes=((0, 1), (0, 1)))
+                dvinv_resid = np.einsum("ijk,ij->ik", fdmat, vinv_resid)
+                cmat += np.dot(dvinv_resid.T, dvinv_resid)
+        else:
+            for i in range(self.num_group):
 
-            expval, lpr = cached_means[i]
-            resid = endog[i] - expval
-            dmat = self.mean_deriv(exog[i], lpr)
-            sdev = np.sqrt(varfunc(expval))
+                expval, lpr = cached_means[i]
+                resid = endog[i] - expval
+                dmat = self.mean_deriv(exog[i], lpr)
+                sdev = np.sqrt(varfunc(expval))
 
-            rslt = self.cov_struct.covariance_matrix_solve(
-                expval, i, sdev, (dmat, resid))
-            if rslt is None:
-                return None, None, None, None
-            vinv_d, vinv_resid = tuple(rslt)
+                rslt = self.cov_struct.covariance_matrix_solve(
+                    expval, i, sdev, (dmat, resid))
+                if rslt is None:
+                    return None, None, None, None
+                vinv_d, vinv_resid = tuple(rslt)
 
-            f = self.weights_li[i] if self.weights is not None else 1.
+                f = self.weights_li[i] if self.weights is not None else 1.
 
-            bmat += f * np.dot(dmat.T, vinv_d)
-            dvinv_resid = f * np.dot(dmat.T, vinv_resid)
-            cmat += np.outer(dvinv_resid, dvinv_resid)
+                bmat += f * np.dot(dmat.T, vinv_d)
+                dvinv_resid = f * np.dot(dmat.T, vinv_resid)
+                cmat += np.outer(dvinv_resid, dvinv_resid)
 
         scale = self.estimate_scale()
 
@@ -932,33 +1065,53 @@ class GEE(base.Model):
         scale = self.estimate_scale()
 
         bcm = 0
-        for i in range(self.num_group):
+        if self._buckets is not None:
+            for bucket in self._buckets:
+                dmat, sdev = self._stacked_deriv(bucket)
+                resid = bucket["endog"] - bucket["expval"]
+                rslt = self._stacked_solve(bucket, sdev, (dmat,))
+                if rslt is None:
+                    return None
+                vinv_d = rslt[0] / scale
+
+                hmat = np.einsum('gij,jk,glk->gli', vinv_d, cov_naive,
+                                 dmat)
+                imat = np.eye(resid.shape[1]) - hmat
+                aresid = np.linalg.solve(imat, resid[:, :, None])[:, :, 0]
+                rslt = self._stacked_solve(bucket, sdev, (aresid,))
+                if rslt is None:
+                    return None
+                srt = np.einsum("ijk,ij->ik", dmat, rslt[0])
+                srt *= bucket["weights"][:, None] / scale
+                bcm += np.dot(srt.T, srt)
+        else:
+            for i in range(self.num_group):
 
-            expval, lpr = cached_means[i]
-            resid = endog[i] - expval
-            dmat = self.mean_deriv(exog[i], lpr)
-            sdev = np.sqrt(varfunc(expval))
+                expval, lpr = cached_means[i]
+                resid = endog[i] - expval
+                dmat = self.mean_deriv(exog[i], lpr)
+                sdev = np.sqrt(varfunc(expval))
 
-            rslt = self.cov_struct.covariance_matrix_solve(
-                expval, i, sdev, (dmat,))
-            if rslt is None:
-                return None
-            vinv_d = rslt[0]
-            vinv_d /= scale
+                rslt = self.cov_struct.covariance_matrix_solve(
+                    expval, i, sdev, (dmat,))
+                if rslt is None:
+                    return None
+                vinv_d = rslt[0]
+                vinv_d /= scale
 
-            hmat = np.dot(vinv_d, cov_naive)
-            hmat = np.dot(hmat, dmat.T).T
+                hmat = np.dot(vinv_d, cov_naive)
+                hmat = np.dot(hmat, dmat.T).T
 
-            f = self.weights_li[i] if self.weights is not None else 1.
+                f = self.weights_li[i] if self.weights is not None else 1.
 
-            aresid = np.linalg.solve(np.eye(len(resid)) - hmat, resid)
-            rslt = self.cov_struct.covariance_matrix_solve(
-                expval, i, sdev, (aresid,))
-            if rslt is None:
-                return None
-            srt = rslt[0]
-            srt = f * np.dot(dmat.T, srt) / scale
-            bcm += np.outer(srt, srt)
+                aresid = np.linalg.solve(np.eye(len(resid)) - hmat, resid)
+                rslt = self.cov_struct.covariance_matrix_solve(
+                    expval, i, sdev, (aresid,))
+                if rslt is None:
+                    return None
+                srt = rslt[0]
+                srt = f * np.dot(dmat.T, srt) / scale
+                bcm += np.outer(srt, srt)
 
         cov_robust_bc = np.dot(cov_naive, np.dot(bcm, cov_naive))
         cov_robust_bc *= self.scaling_factor
@@ -1228,9 +1381,12 @@ class GEE(base.Model):
         full_p = self.constraint.lhs.shape[1]
         mean_params0 = np.r_[mean_params, np.zeros(full_p - red_p)]
 
-        # Get the score vector under the full model.
+        # Get the score vector under the full model, the stacked
+        # clusters hold the reduced exog so they are not used.
         save_exog_li = self.exog_li
+        save_buckets = self._buckets
         self.exog_li = self.constraint.exog_fulltrans_li
+        self._buckets = None
         import copy
         save_cached_means = copy.deepcopy(self.cached_means)
         self.update_cached_means(mean_params0)
@@ -1275,6 +1431,7 @@ class GEE(base.Model):
         bcov = self.constraint.unpack_cov(bcov)
 
         self.exog_li = save_exog_li
+        self._buckets = save_buckets
         self.cached_means = save_cached_means
         self.exog = self.constraint.restore_exog()
 
@@ -20,6 +20,7 @@ McCullagh, P. and Nelder, J.A.  1989.  "Generalized Linear Models." 2nd ed.
 from statsmodels.compat.numpy import np_matrix_rank
 
 import numpy as np
+from scipy import sparse
 from . import families
 from statsmodels.tools.decorators import cache_readonly, resettable_cache
 
@@ -293,11 +294,16 @@ class GLM(base.LikelihoodModel):
                         'params' : [np.inf],
                         'deviance' : [np.inf]}
 
-        self.pinv_wexog = np.linalg.pinv(self.exog)
-        self.normalized_cov_params = np.dot(self.pinv_wexog,
-                                            np.transpose(self.pinv_wexog))
+        # pinv_wexog and normalized_cov_params are computed when they are
+        # first used, so that they are not created by fit with low_memory
+        self._pinv_wexog = None
+        self._normalized_cov_params = None
 
-        self.df_model = np_matrix_rank(self.exog) - 1
+        if sparse.issparse(self.exog):
+            # full column rank is assumed for a sparse exog
+            self.df_model = self.exog.shape[1] - 1
+        else:
+            self.df_model = np_matrix_rank(self.exog) - 1
 
 
         if (self.freq_weights is not None) and \
@@ -308,6 +314,37 @@ class GLM(base.LikelihoodModel):
             self.wnobs = self.exog.shape[0]
             self.df_resid = self.exog.shape[0] - self.df_model - 1
 
+    @property
+    def pinv_wexog(self):
+        """
+        The pseudoinverse of the design matrix, computed when first used.
+        """
+        pinv_wexog = getattr(self, '_pinv_wexog', None)
+        if pinv_wexog is None and self.exog is not None:
+            pinv_wexog = self._pinv_wexog = np.linalg.pinv(self.exog)
+        return pinv_wexog
+
+    @pinv_wexog.setter
+    def pinv_wexog(self, value):
+        self._pinv_wexog = value
+
+    @property
+    def normalized_cov_params(self):
+        """
+        ``pinv_wexog`` times its transpose, computed when first used.
+        """
+        ncp = getattr(self, '_normalized_cov_params', None)
+        if ncp is None:
+            pinv_wexog = self.pinv_wexog
+            if pinv_wexog is not None:
+                ncp = np.dot(pinv_wexog, np.transpose(pinv_wexog))
+                self._normalized_cov_params = ncp
+        return ncp
+
+    @normalized_cov_params.setter
+    def normalized_cov_params(self, value):
+        self._normalized_cov_params = value
+
     def _check_inputs(self, family, offset, exposure, endog, freq_weights):
 
         # Default family is Gaussian
@@ -361,7 +398,7 @@ class GLM(base.LikelihoodModel):
         """
         Evaluate the log-likelihood for a generalized linear model.
         """
-        lin_pred = np.dot(self.exog, params) + self._offset_exposure
+        lin_pred = self.exog.dot(params) + self._offset_exposure
         expval = self.family.link.inverse(lin_pred)
         if scale is None:
             scale = self.estimate_scale(expval)
@@ -774,7 +811,10 @@ class GLM(base.LikelihoodModel):
         if exog is None:
             exog = self.exog
 
-        linpred = np.dot(exog, params) + offset + exposure
+        if sparse.issparse(exog):
+            linpred = exog.dot(params) + offset + exposure
+        else:
+            linpred = np.dot(exog, params) + offset + exposure
         if linear:
             return linpred
         else:
@@ -838,7 +878,8 @@ class GLM(base.LikelihoodModel):
 
     def fit(self, start_params=None, maxiter=100, method='IRLS', tol=1e-8,
             scale=None, cov_type='nonrobust', cov_kwds=None, use_t=None,
-            full_output=True, disp=False, max_start_irls=3, **kwargs):
+            full_output=True, disp=False, max_start_irls=3,
+            low_memory=False, **kwargs):
         """
         Fits a generalized linear model for a given family.
 
@@ -882,6 +923,12 @@ class GLM(base.LikelihoodModel):
             The number of IRLS iterations used to obtain starting
             values for gradient optimization.  Only relevant if
             `method` is set to something other than 'IRLS'.
+        low_memory : bool, optional
+            If True and `method` is 'IRLS', then the weighted least squares
+            problems are solved with a QR factorization that is updated
+            with blocks of rows.  This avoids creating copies of the
+            weighted design matrix and its pseudoinverse, which have the
+            same size as `exog`.  See `RegressionModel.fit`.
 
         If IRLS fitting used, the following additional parameters are
         available:
@@ -897,13 +944,29 @@ class GLM(base.LikelihoodModel):
             :math:`rtol * prior + atol > abs(current - prior)`
         tol_criterion : str, optional
             Defaults to ``'deviance'``. Can optionally be ``'params'``.
+        wls_method : str, optional
+            The method for the weighted least squares problems if `exog` is
+            a scipy.sparse matrix, "normal" (default), "lsmr" or "lsqr", see
+            `RegressionModel.fit`. The iterative solvers are less accurate
+            than the sparse LU factorization of the normal equations, which
+            can prevent convergence with a small `tol`.
+
+        Notes
+        -----
+        If `exog` is a scipy.sparse matrix, then only IRLS is available and
+        the design matrix is assumed to have full column rank. The dense k
+        by k `normalized_cov_params` is computed only when it is needed.
         """
         self.scaletype = scale
+        if sparse.issparse(self.exog) and method.lower() != "irls":
+            raise ValueError("only method='IRLS' is available for a sparse "
+                             "exog")
 
         if method.lower() == "irls":
             return self._fit_irls(start_params=start_params, maxiter=maxiter,
                                   tol=tol, scale=scale, cov_type=cov_type,
-                                  cov_kwds=cov_kwds, use_t=use_t, **kwargs)
+                                  cov_kwds=cov_kwds, use_t=use_t,
+                                  low_memory=low_memory, **kwargs)
         else:
             return self._fit_gradient(start_params=start_params,
                                       method=method,
@@ -963,11 +1026,17 @@ class GLM(base.LikelihoodModel):
 
     def _fit_irls(self, start_params=None, maxiter=100, tol=1e-8,
                   scale=None, cov_type='nonrobust', cov_kwds=None,
-                  use_t=None, **kwargs):
+                  use_t=None, low_memory=False, **kwargs):
         """
         Fits a generalized linear model for a given family using
         iteratively reweighted least squares (IRLS).
         """
+        if sparse.issparse(self.exog):
+            wls_method = kwargs.get('wls_method', 'normal')
+        elif low_memory:
+            wls_method = 'qr_blocked'
+        else:
+            wls_method = 'lstsq'
         atol = kwargs.get('atol')
         rtol = kwargs.get('rtol', 0.)
         tol_criterion = kwargs.get('tol_criterion', 'deviance')
@@ -980,7 +1049,7 @@ class GLM(base.LikelihoodModel):
             mu = self.family.starting_mu(self.endog)
             lin_pred = self.family.predict(mu)
         else:
-            lin_pred = np.dot(wlsexog, start_params) + self._offset_exposure
+            lin_pred = wlsexog.dot(start_params) + self._offset_exposure
             mu = self.family.fitted(lin_pred)
         dev = self.family.deviance(self.endog, mu, self.freq_weights)
         if np.isnan(dev):
@@ -1005,8 +1074,9 @@ class GLM(base.LikelihoodModel):
                             self.family.weights(mu))
             wlsendog = (lin_pred + self.family.link.deriv(mu) * (self.endog-mu)
                         - self._offset_exposure)
-            wls_results = reg_tools._MinimalWLS(wlsendog, wlsexog, self.weights).fit(method='lstsq')
-            lin_pred = np.dot(self.exog, wls_results.params) + self._offset_exposure
+            wls_mod = reg_tools._MinimalWLS(wlsendog, wlsexog, self.weights)
+            wls_results = wls_mod.fit(method=wls_method)
+            lin_pred = self.exog.dot(wls_results.params) + self._offset_exposure
             mu = self.family.fitted(lin_pred)
             history = self._update_history(wls_results, mu, history)
             self.scale = self.estimate_scale(mu)
@@ -1019,11 +1089,17 @@ class GLM(base.LikelihoodModel):
                 break
         self.mu = mu
 
-        if maxiter > 0:  # Only if iterative used
-            wls_results = lm.WLS(wlsendog, wlsexog, self.weights).fit()
+        if sparse.issparse(self.exog):
+            # computed by GLMResults if needed
+            normalized_cov_params = None
+        else:
+            if maxiter > 0:  # Only if iterative used
+                wls_model = lm.WLS(wlsendog, wlsexog, self.weights)
+                wls_results = wls_model.fit(low_memory=low_memory)
+            normalized_cov_params = wls_results.normalized_cov_params
 
         glm_results = GLMResults(self, wls_results.params,
-                                 wls_results.normalized_cov_params,
+                                 normalized_cov_params,
                                  self.scale,
                                  cov_type=cov_type, cov_kwds=cov_kwds,
                                  use_t=use_t)
@@ -1258,6 +1334,9 @@ class GLMResults(base.LikelihoodModelResults):
 
     def __init__(self, model, params, normalized_cov_params, scale,
                  cov_type='nonrobust', cov_kwds=None, use_t=None):
+        if sparse.issparse(model.exog):
+            # IRLS weights for normalized_cov_params
+            self._irls_weights = getattr(model, 'weights', None)
         super(GLMResults, self).__init__(model, params,
                                          normalized_cov_params=
                                          normalized_cov_params, scale=scale)
@@ -1271,7 +1350,6 @@ class GLMResults(base.LikelihoodModelResults):
             self._n_trials = 1
         self.df_resid = model.df_resid
         self.df_model = model.df_model
-        self.pinv_wexog = model.pinv_wexog
         self._cache = resettable_cache()
         # are these intermediate results needed or can we just
         # call the model's attributes?
@@ -1279,7 +1357,7 @@ class GLMResults(base.LikelihoodModelResults):
         # for remove data and pickle without large arrays
         self._data_attr.extend(['results_constrained', '_freq_weights'])
         self.data_in_cache = getattr(self, 'data_in_cache', [])
-        self.data_in_cache.extend(['null', 'mu'])
+        self.data_in_cache.extend(['null', 'mu', 'pinv_wexog'])
         self._data_attr_model = getattr(self, '_data_attr_model', [])
         self._data_attr_model.append('mu')
 
@@ -1352,6 +1430,26 @@ class GLMResults(base.LikelihoodModelResults):
         return self.model.predict(self.params)
 
 
+    @cache_readonly
+    def pinv_wexog(self):
+        return self.model.pinv_wexog
+
+    @property
+    def normalized_cov_params(self):
+        ncp = self.__dict__.get('normalized_cov_params')
+        weights = getattr(self, '_irls_weights', None)
+        if ncp is None and weights is not None:
+            # not computed in fit for a sparse exog
+            wexog = sparse.diags(np.sqrt(weights)).dot(self.model.exog)
+            ncp = reg_tools._sparse_normalized_cov_params(wexog)
+            self.__dict__['normalized_cov_params'] = ncp
+        return ncp
+
+    @normalized_cov_params.setter
+    def normalized_cov_params(self, value):
+        self.__dict__['normalized_cov_params'] = value
+
+
     @cache_readonly
     def null(self):
         endog = self._endog
@@ -0,0 +1,159 @@
+"""
+Tests for BatchGLM, compared to fitting GLM for each response
+"""
+import numpy as np
+import pandas as pd
+from numpy.testing import assert_allclose, assert_equal, assert_raises, assert_
+
+import statsmodels.api as sm
+from statsmodels.genmod.batch_glm import BatchGLM
+from statsmodels.genmod.generalized_linear_model import GLM
+
+
+class CheckBatchGLM(object):
+
+    @classmethod
+    def setup_data(cls):
+        np.random.seed(98765)
+        nobs, k_endog = 200, 5
+        cls.exog = sm.add_constant(np.random.randn(nobs, 2))
+        cls.lin_pred = 0.3 * cls.exog.dot(np.random.rand(3, k_endog))
+
+    @classmethod
+    def setupClass(cls):
+        cls.setup_data()
+        cls.endog = cls.get_endog()
+        kwds = getattr(cls, 'kwds', {})
+        cls.res1 = BatchGLM(cls.endog, cls.exog, family=cls.family,
+                            **kwds).fit(**getattr(cls, 'fit_kwds', {}))
+        cls.res2 = [GLM(cls.endog[:, j], cls.exog, family=cls.family,
+                        **kwds).fit(**getattr(cls, 'fit_kwds', {}))
+                    for j in range(cls.endog.shape[1])]
+
+    def test_params(self):
+        params = np.column_stack([r.params for r in self.res2])
+        bse = np.column_stack([r.bse for r in self.res2])
+        assert_allclose(self.res1.params, params, rtol=1e-8, atol=1e-12)
+        assert_allclose(self.res1.bse, bse, rtol=1e-8)
+        assert_allclose(self.res1.tvalues, params / bse, rtol=1e-8)
+        pvalues = np.column_stack([r.pvalues for r in self.res2])
+        assert_allclose(self.res1.pvalues, pvalues, rtol=1e-6, atol=1e-14)
+
+    def test_other(self):
+        res1, res2 = self.res1, self.res2
+        assert_allclose(res1.scale, [r.scale for r in res2], rtol=1e-8)
+        assert_allclose(res1.deviance, [r.deviance for r in res2], rtol=1e-8)
+        assert_allclose(res1.llf, [r.llf for r in res2], rtol=1e-8)
+        assert_allclose(res1.aic, [r.aic for r in res2], rtol=1e-8)
+        assert_equal(res1.iterations,
+                     [r.fit_history['iteration'] for r in res2])
+        assert_(res1.converged.all())
+        assert_allclose(res1.mu, np.column_stack([r.mu for r in res2]),
+                        rtol=1e-8)
+        cov = np.array([r.cov_params() for r in res2])
+        assert_allclose(res1.cov_params(), cov, rtol=1e-8, atol=1e-14)
+
+    def test_get_result(self):
+        res1 = self.res1.get_result(2)
+        res2 = self.res2[2]
+        assert_allclose(res1.params, res2.params, rtol=1e-8)
+        assert_allclose(res1.bse, res2.bse, rtol=1e-8)
+        assert_allclose(res1.llf, res2.llf, rtol=1e-8)
+        assert_allclose(res1.resid_pearson, res2.resid_pearson, rtol=1e-8)
+        res1.summary()
+
+
+class TestBatchGLMPoisson(CheckBatchGLM):
+    family = sm.families.Poisson()
+
+    @classmethod
+    def get_endog(cls):
+        return np.random.poisson(np.exp(cls.lin_pred)).astype(float)
+
+
+class TestBatchGLMPoissonExposure(CheckBatchGLM):
+    family = sm.families.Poisson()
+    fit_kwds = {'tol_criterion': 'params'}
+
+    @classmethod
+    def get_endog(cls):
+        exposure = np.random.uniform(1, 3, size=cls.lin_pred.shape[0])
+        offset = np.random.uniform(size=cls.lin_pred.shape[0])
+        cls.kwds = {'exposure': exposure, 'offset': offset}
+        mean = np.exp(cls.lin_pred + offset[:, None]) * exposure[:, None]
+        return np.random.poisson(mean).astype(float)
+
+
+class TestBatchGLMBinomial(CheckBatchGLM):
+    family = sm.families.Binomial()
+
+    @classmethod
+    def get_endog(cls):
+        prob = 1 / (1 + np.exp(-cls.lin_pred))
+        return (np.random.rand(*prob.shape) < prob).astype(float)
+
+
+class TestBatchGLMGamma(CheckBatchGLM):
+    family = sm.families.Gamma(sm.families.links.log)
+
+    @classmethod
+    def get_endog(cls):
+        cls.kwds = {'freq_weights': np.random.randint(1, 4,
+                                                      size=len(cls.exog))}
+        return np.random.gamma(2, np.exp(cls.lin_pred) / 2)
+
+
+class TestBatchGLMGaussianScale(CheckBatchGLM):
+    family = sm.families.Gaussian()
+    fit_kwds = {'scale': 'dev'}
+
+    @classmethod
+    def get_endog(cls):
+        return cls.lin_pred + np.random.randn(*cls.lin_pred.shape)
+
+
+def test_family_not_changed():
+    np.random.seed(1234)
+    exog = sm.add_constant(np.random.randn(50, 2))
+    endog = (np.random.rand(50, 3) < 0.5).astype(float)
+    family = sm.families.Binomial()
+    family.n = 5
+    mod = BatchGLM(endog, exog, family=family)
+    assert_equal(family.n, 5)
+    assert_equal(mod.family.n, 1)
+
+
+def test_pandas():
+    np.random.seed(1234)
+    exog = pd.DataFrame(sm.add_constant(np.random.randn(50, 2)),
+                        columns=['const', 'a', 'b'])
+    endog = pd.DataFrame(np.random.poisson(2, size=(50, 3)),
+                         columns=['y1', 'y2', 'y3'])
+    res = BatchGLM(endog, exog, family=sm.families.Poisson()).fit()
+    assert_equal(list(res.params.index), ['const', 'a', 'b'])
+    assert_equal(list(res.bse.columns), ['y1', 'y2', 'y3'])
+    res2 = GLM(endog['y2'], exog, family=sm.families.Poisson()).fit()
+    res1 = res.get_result(1)
+    assert_allclose(res1.params, res2.params, rtol=1e-8)
+    assert_equal(res1.model.endog_names, 'y2')
+    assert_equal(list(res1.params.index), ['const', 'a', 'b'])
+
+
+def test_fixed_scale():
+    np.random.seed(1234)
+    exog = sm.add_constant(np.random.randn(30, 2))
+    endog = np.random.randn(30, 3)
+    for scale in [1, 2.5, np.int64(2)]:
+        res = BatchGLM(endog, exog).fit(scale=scale)
+        assert_allclose(res.scale, float(scale) * np.ones(3))
+        res2 = GLM(endog[:, 1], exog).fit(scale=float(scale))
+        assert_allclose(res.bse[:, 1], res2.bse, rtol=1e-8)
+
+
+def test_errors():
+    np.random.seed(1234)
+    exog = np.random.randn(20, 2)
+    endog = np.random.randn(20, 3)
+    assert_raises(ValueError, BatchGLM, endog, np.column_stack((exog, exog)))
+    assert_raises(ValueError, BatchGLM, endog[:10], exog)
+    assert_raises(ValueError, BatchGLM(endog, exog).fit, scale='unknown')
@@ -277,6 +277,58 @@ class TestGEE(object):
                     cov_struct=sm.cov_struct.Exchangeable())
         result = model.fit(ddof_scale=0)
 
+    def test_stacked(self):
+        # Fitting on the clusters stacked by size agrees with fitting
+        # one cluster at a time, for unequal cluster sizes, weights,
+        # offsets and dependence structures with and without a solver
+        # for stacked clusters.  The autoregressive parameter is found
+        # by a line search on sums taken in a different order.
+
+        np.random.seed(3423)
+        n_grp = 50
+        sizes = np.random.randint(1, 6, size=n_grp)
+        groups = np.repeat(np.arange(n_grp), sizes)
+        n = len(groups)
+        exog = np.column_stack((np.ones(n), np.random.normal(size=(n, 2))))
+        offset = np.random.uniform(-0.2, 0.2, size=n)
+        re = np.repeat(np.random.normal(size=n_grp), sizes)
+        endog = np.random.poisson(np.exp(0.3 * exog[:, 1] + 0.4 * re))
+        dep_data = np.random.randint(0, 2, size=n)
+        weights = np.repeat(np.random.uniform(1, 2, size=n_grp), sizes)
+
+        for cov_struct, kwargs in [
+                (Independence, dict(weights=weights)),
+                (Exchangeable, dict(weights=weights)),
+                (Autoregressive, {}),
+                (Nested, dict(dep_data=dep_data)),
+                (lambda: Stationary(max_lag=1, grid=True), {})]:
+            for family in Gaussian(), Poisson():
+                results = []
+                for stacked in True, False:
+                    model = GEE(endog, exog, groups, family=family,
+                                offset=offset, cov_struct=cov_struct(),
+                                **kwargs)
+                    if not stacked:
+                        model._buckets = None
+                    with warnings.catch_warnings():
+                        warnings.simplefilter("ignore")
+                        results.append(model.fit(cov_type="bias_reduced"))
+                rslt1, rslt2 = results
+                assert_allclose(rslt1.params, rslt2.params, rtol=1e-6)
+                assert_allclose(rslt1.scale, rslt2.scale, rtol=1e-6)
+                assert_allclose(rslt1.cov_robust, rslt2.cov_robust,
+                                rtol=1e-6)
+                assert_allclose(rslt1.cov_naive, rslt2.cov_naive, rtol=1e-6)
+                assert_allclose(rslt1.cov_robust_bc, rslt2.cov_robust_bc,
+                                rtol=1e-6)
+                if cov_struct is not Independence:
+                    assert_allclose(rslt1.cov_struct.dep_params,
+                                    rslt2.cov_struct.dep_params, rtol=1e-6)
+
+        # The multinomial mean is evaluated one cluster at a time
+        model = NominalGEE(np.random.randint(0, 3, size=n), exog, groups)
+        assert_equal(model._buckets, None)
+
     # This is in the release announcement for version 0.6.
     def test_poisson_epil(self):
 
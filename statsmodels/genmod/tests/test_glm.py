@@ -804,6 +804,57 @@ def test_glm_start_params():
     np.testing.assert_almost_equal(res.params, [-4.60305022, -5.29634545], 6)
 
 
+def test_low_memory():
+    np.random.seed(4321)
+    nobs = 300
+    exog = add_constant(np.random.normal(size=(nobs, 3)))
+    endog = np.random.poisson(np.exp(0.2 * exog.sum(1)))
+    res1 = GLM(endog, exog, family=sm.families.Poisson()).fit()
+    model = GLM(endog, exog, family=sm.families.Poisson())
+    res2 = model.fit(low_memory=True)
+    # pinv_wexog is only computed on demand
+    assert_(model._pinv_wexog is None)
+    assert_allclose(res2.params, res1.params, rtol=1e-10)
+    assert_allclose(res2.bse, res1.bse, rtol=1e-10)
+    assert_allclose(res2.llf, res1.llf, rtol=1e-10)
+    assert_equal(res2.fit_history['iteration'],
+                 res1.fit_history['iteration'])
+
+    res2 = model.fit(low_memory=True, cov_type='HC0')
+    res1 = GLM(endog, exog, family=sm.families.Poisson()).fit(cov_type='HC0')
+    assert_allclose(res2.bse, res1.bse, rtol=1e-8)
+    assert_(model._pinv_wexog is None)
+    assert_allclose(res2.pinv_wexog, np.linalg.pinv(exog), rtol=1e-10)
+
+
+def test_sparse():
+    from scipy import sparse
+    from statsmodels.tools.grouputils import dummy_sparse
+    np.random.seed(4321)
+    nobs = 300
+    groups = np.random.randint(0, 10, size=nobs)
+    x = np.random.normal(size=(nobs, 2))
+    exog_sparse = sparse.hstack([dummy_sparse(groups), x]).tocsr()
+    exog = exog_sparse.toarray()
+    endog = np.random.poisson(np.exp(0.1 * groups + 0.3 * x.sum(1)))
+    exposure = np.random.uniform(1, 2, size=nobs)
+    family = sm.families.Poisson()
+    res1 = GLM(endog, exog, family=family, exposure=exposure).fit()
+    for wls_method in ['normal', 'lsmr']:
+        model = GLM(endog, exog_sparse, family=family, exposure=exposure)
+        res2 = model.fit(wls_method=wls_method)
+        assert_(sparse.issparse(model.exog))
+        assert_allclose(res2.params, res1.params, rtol=1e-7)
+        assert_allclose(res2.bse, res1.bse, rtol=1e-7)
+        assert_allclose(res2.llf, res1.llf, rtol=1e-10)
+        assert_equal(res2.df_model, res1.df_model)
+    assert_equal(res2.model.k_constant, 1)
+    assert_allclose(res2.predict(exog_sparse[:5], exposure=exposure[:5]),
+                    res1.predict(exog[:5], exposure=exposure[:5]), rtol=1e-7)
+    res2.summary()
+    assert_raises(ValueError, model.fit, method='bfgs')
+
+
 def test_loglike_no_opt():
     # see 1728
 
@@ -4,6 +4,7 @@ regression, plus some utilities.
 """
 from statsmodels.compat.python import range, string_types
 import copy
+import itertools
 
 import numpy as np
 from scipy import optimize
@@ -245,6 +246,7 @@ class GenericKDE (object):
         self.efficient = defaults.efficient
         self.return_only_bw = defaults.return_only_bw
         self.n_jobs = defaults.n_jobs
+        self.loo_tol = defaults.loo_tol
 
     def _normal_reference(self):
         """
@@ -375,6 +377,15 @@ class EstimatorSettings(object):
         ``n_cores`` the number of available CPU cores.
         See the `joblib documentation
         <https://pythonhosted.org/joblib/parallel.html>`_ for more details.
+    loo_tol : float, optional
+        If given, the leave-one-out kernel sums of cross-validation bandwidth
+        selection are approximated over the continuous variables (Gaussian
+        kernel only): pairs of observations for which the
+        continuous kernel is smaller than `loo_tol` times its maximum are
+        ignored, so that each leave-one-out density has an absolute error of
+        at most `loo_tol` times the maximum of the kernel.  Useful for large
+        samples, in which most pairs are far apart relative to the
+        bandwidth.  Default is None, meaning exact sums.
 
     Examples
     --------
@@ -383,7 +394,8 @@ class EstimatorSettings(object):
 
     """
     def __init__(self, efficient=False, randomize=False, n_res=25, n_sub=50,
-                 return_median=True, return_only_bw=False, n_jobs=-1):
+                 return_median=True, return_only_bw=False, n_jobs=-1,
+                 loo_tol=None):
         self.efficient = efficient
         self.randomize = randomize
         self.n_res = n_res
@@ -391,6 +403,7 @@ class EstimatorSettings(object):
         self.return_median = return_median
         self.return_only_bw = return_only_bw  # TODO: remove this?
         self.n_jobs = n_jobs
+        self.loo_tol = loo_tol
 
 
 class LeaveOneOut(object):
@@ -516,3 +529,298 @@ def gpke(bw, data, data_predict, var_type, ckertype='gaussian',
         return dens.sum(axis=0)
     else:
         return dens
+
+
+def _loo_num_levels(data):
+    """Number of levels of a discrete variable without each observation."""
+    levels, index, counts = np.unique(data, return_inverse=True,
+                                      return_counts=True)
+    return levels.size - (counts[index] == 1)
+
+
+# Kernels that can be evaluated between all observations and a column of
+# points by broadcasting
+_broadcast_kernels = ['gaussian', 'gauss_convolution', 'd_gaussian',
+                      'gaussian_cdf', 'wangryzin', 'wangryzin_reg']
+
+
+def _product_kernel_pairs(bw, data, rows, cols, var_type, kertypes,
+                          num_levels, skip_cont=False):
+    """Product kernel of the pairs ``(data[rows], data[cols])``."""
+    Kval = np.ones(rows.shape)
+    for ii, vtype in enumerate(var_type):
+        if skip_cont and vtype == 'c':
+            continue
+        func = kernel_func[kertypes[vtype]]
+        if func is kernels.aitchison_aitken:
+            Kval *= func(bw[ii], data[cols, ii], data[rows, ii],
+                         num_levels=num_levels[ii][rows])
+        else:
+            Kval *= func(bw[ii], data[cols, ii], data[rows, ii])
+    return Kval
+
+
+def _product_kernel_block(bw, data, rows, cols, var_type, kertypes,
+                          num_levels, skip_cont=False):
+    """Product kernel between ``data[rows]`` and ``data[cols]``."""
+    Kval = np.ones((rows.size, cols.size))
+    for ii, vtype in enumerate(var_type):
+        if skip_cont and vtype == 'c':
+            continue
+        func = kernel_func[kertypes[vtype]]
+        if func is kernels.aitchison_aitken:
+            Kval *= func(bw[ii], data[cols, ii], data[rows, ii, None],
+                         num_levels=num_levels[ii][rows, None])
+        elif kertypes[vtype] in _broadcast_kernels:
+            Kval *= func(bw[ii], data[cols, ii], data[rows, ii, None])
+        else:
+            Kval *= _product_kernel_pairs(
+                bw[ii:ii + 1], data[:, ii:ii + 1], np.repeat(rows, cols.size),
+                np.tile(cols, rows.size), vtype, kertypes,
+                None).reshape(Kval.shape)
+    return Kval
+
+
+def gpke_loo(bw, data, var_type, weights=None, ckertype='gaussian',
+             okertype='wangryzin', ukertype='aitchisonaitken',
+             leave_one_out=True, tol=None, block_size=2**20):
+    r"""
+    Returns the leave-one-out sums of the Generalized Product Kernel Estimator
+
+    Computes, for every observation ``i``, the sum over the other
+    observations ``j`` of the (non-normalized) product kernel between ``i``
+    and ``j``, optionally multiplied by weights of ``j``.  This equals
+    ``gpke(bw, data=X_not_i, data_predict=data[i], ...)`` for each
+    leave-one-out sample ``X_not_i``, but is computed blockwise without a
+    loop over the observations.
+
+    Parameters
+    ----------
+    bw: 1-D ndarray
+        The user-specified bandwidth parameters.
+    data: 2-D ndarray
+        The training data, of shape (nobs, k_vars).
+    var_type: str
+        The variable type (continuous, ordered, unordered).
+    weights: ndarray, optional
+        Weights of shape (nobs,) or (nobs, m).  Default is ones.
+    ckertype: str, optional
+        The kernel used for the continuous variables.
+    okertype: str, optional
+        The kernel used for the ordered discrete variables.
+    ukertype: str, optional
+        The kernel used for the unordered discrete variables.
+    leave_one_out: bool, optional
+        Whether or not to leave out the observation itself.  Default is True.
+        If False, the sums are over all observations.
+    tol: float, optional
+        If given, and if `ckertype` is 'gaussian', the pairs of observations
+        for which the kernel of the continuous variables is smaller than
+        `tol` times its maximum are ignored.  The observations are sorted
+        on the continuous variable with the largest range relative to its
+        bandwidth, so that each block of rows is only compared with the
+        window of observations that are close in that variable.
+        Default is None, meaning exact sums.
+    block_size: int, optional
+        The approximate number of pairs of observations for which the kernel
+        is evaluated at the same time.
+
+    Returns
+    -------
+    sums: ndarray
+        The sums, of shape (nobs,) or (nobs, m).
+
+    Notes
+    -----
+    The discrete kernels are at most one, so that with `tol` the absolute
+    error of each sum divided by ``nobs - 1`` is at most `tol` times the
+    maximum of the kernel.
+    """
+    data = np.asarray(data)
+    nobs = data.shape[0]
+    W = np.ones(nobs) if weights is None else np.asarray(weights)
+    kertypes = dict(c=ckertype, o=okertype, u=ukertype)
+    ix_cont = np.array([c == 'c' for c in var_type])
+    bw_cont_prod = np.prod(bw[ix_cont])
+
+    # The number of levels of unordered variables, in each leave-one-out
+    # sample if required, as in `kernels.aitchison_aitken`
+    num_levels = [None] * len(var_type)
+    for ii, vtype in enumerate(var_type):
+        if vtype == 'u' and leave_one_out:
+            num_levels[ii] = _loo_num_levels(data[:, ii])
+        elif vtype == 'u':
+            num_levels[ii] = np.repeat(np.unique(data[:, ii]).size, nobs)
+
+    sums = np.zeros(W.shape)
+    gaussian = ckertype == 'gaussian' and ix_cont.any()
+    if gaussian:
+        # The Gaussian kernel of the continuous variables is computed from
+        # the squared distances of the scaled data
+        scaled = data[:, ix_cont] / bw[ix_cont]
+        scaled -= scaled.mean(axis=0)
+        sumsq = (scaled**2).sum(axis=1)
+        const = (2 * np.pi)**(-0.5 * ix_cont.sum())
+
+    def block_sums(rows, cols, diag):
+        Kval = _product_kernel_block(bw, data, rows, cols, var_type,
+                                     kertypes, num_levels,
+                                     skip_cont=gaussian)
+        if gaussian:
+            sqdist = (sumsq[rows, None] + sumsq[cols] -
+                      2 * np.dot(scaled[rows], scaled[cols].T))
+            Kval *= const * np.exp(-0.5 * np.maximum(sqdist, 0))
+        if leave_one_out:
+            Kval[np.arange(rows.size), diag] = 0
+        return Kval.dot(W[cols]), Kval.any(axis=1)
+
+    order = np.arange(nobs)
+    approx = tol is not None and gaussian
+    if approx:
+        # Pairs farther apart than `radius` in any continuous variable have a
+        # kernel smaller than `tol` times its maximum
+        radius = np.sqrt(-2 * np.log(tol))
+        axis = np.ptp(scaled, axis=0).argmax()
+        order = np.argsort(scaled[:, axis], kind='mergesort')
+        coord = scaled[order, axis]
+
+    n_rows = max(1, block_size // nobs)
+    for start in range(0, nobs, n_rows):
+        stop = min(start + n_rows, nobs)
+        rows = order[start:stop]
+        lo, hi = 0, nobs
+        if approx:
+            lo = np.searchsorted(coord, coord[start] - radius, side='left')
+            hi = np.searchsorted(coord, coord[stop - 1] + radius,
+                                 side='right')
+        block, nonzero = block_sums(rows, order[lo:hi],
+                                    np.arange(start - lo, stop - lo))
+        sums[rows] = block
+        if approx and not nonzero.all():
+            # Isolated observations get their exact sums
+            isolated = rows[~nonzero]
+            sums[isolated] = block_sums(isolated, np.arange(nobs),
+                                        isolated)[0]
+
+    return sums / bw_cont_prod
+
+
+def _grid_corners(points, low, delta, gridsize):
+    """
+    Yields the flat grid indices and the weights of the linear binning, or
+    equivalently of the multilinear interpolation, of `points`.
+    """
+    pos = (points - low) / delta
+    lower = np.clip(np.floor(pos).astype(int), 0, gridsize - 2)
+    frac = pos - lower
+    shape = (gridsize,) * points.shape[1]
+    for corner in itertools.product([0, 1], repeat=points.shape[1]):
+        corner = np.array(corner, dtype=bool)
+        idx = np.ravel_multi_index(tuple((lower + corner).T), shape)
+        wts = np.where(corner, frac, 1 - frac).prod(axis=1)
+        yield idx, wts
+
+
+def gpke_binned(bw, data, data_predict, var_type, weights=None,
+                ckertype='gaussian', gridsize=None):
+    r"""
+    Returns the Generalized Product Kernel Estimator on binned data.
+
+    The data are linearly binned on a regular grid, the kernel sums at the
+    grid points are computed as a convolution with the FFT, and the sums at
+    `data_predict` are interpolated from the grid.  The cost is
+    O(nobs + G log G), where G is the number of grid points, instead of
+    O(nobs * n_predict) for `gpke`.
+
+    Parameters
+    ----------
+    bw: 1-D ndarray
+        The user-specified bandwidth parameters.
+    data: 2-D ndarray
+        The training data, of shape (nobs, k_vars).
+    data_predict: 2-D ndarray
+        The evaluation points, of shape (n_predict, k_vars).
+    var_type: str
+        The variable types.  Only continuous variables are supported.
+    weights: ndarray, optional
+        Weights of shape (nobs,) or (nobs, m).  Default is ones.
+    ckertype: str, optional
+        The kernel used for the continuous variables.
+    gridsize: int, optional
+        The number of grid points for each variable, between the minimum
+        and the maximum of the data and evaluation points.  Default is 1024,
+        512, 64 and 32 for one to four variables.
+
+    Returns
+    -------
+    dens: ndarray
+        The kernel sums at `data_predict`, divided by the product of the
+        bandwidths as in `gpke`, of shape (n_predict,) or (n_predict, m).
+
+    Notes
+    -----
+    The error of linear binning is of the order of the squared ratio of the
+    grid spacing to the bandwidth, see Wand (1994), so that `gridsize`
+    should be larger if the bandwidths are small relative to the range of
+    the data.  If a variable is constant in the data and evaluation points,
+    then there is no grid and the exact sums of `gpke` are returned.
+
+    References
+    ----------
+    Fan, J. and J.S. Marron. (1994) `Fast implementations of nonparametric
+        curve estimators`. Journal of Computational and Graphical Statistics.
+        3.1, 35-56.
+    Wand, M.P. (1994) `Fast computation of multivariate kernel estimators`.
+        Journal of Computational and Graphical Statistics. 3.4, 433-445.
+    """
+    if any(vtype != 'c' for vtype in var_type):
+        raise ValueError('Binned kernel estimation requires continuous '
+                         'variables only.')
+    bw = np.asarray(bw)
+    data = np.asarray(data)
+    data_predict = np.asarray(data_predict)
+    k_vars = len(var_type)
+    W = np.ones(data.shape[0]) if weights is None else np.asarray(weights)
+    W2 = W.reshape(W.shape[0], -1)
+    if gridsize is None:
+        gridsize = min(1024, 2**int(np.ceil(18. / k_vars)))
+    gridsize = int(gridsize)
+
+    low = np.minimum(data.min(axis=0), data_predict.min(axis=0))
+    high = np.maximum(data.max(axis=0), data_predict.max(axis=0))
+    delta = (high - low) / (gridsize - 1)
+    if np.any(delta == 0):
+        # A constant variable has no grid spacing, use the exact sums
+        dens = np.array([np.dot(gpke(bw, data, x, var_type,
+                                     ckertype=ckertype, tosum=False), W2)
+                         for x in data_predict])
+        return dens.reshape((-1,) + W.shape[1:])
+
+    binned = np.zeros((gridsize**k_vars, W2.shape[1]))
+    for idx, wts in _grid_corners(data, low, delta, gridsize):
+        for jj in range(W2.shape[1]):
+            binned[:, jj] += np.bincount(idx, weights=wts * W2[:, jj],
+                                         minlength=gridsize**k_vars)
+    sums = binned.reshape((gridsize,) * k_vars + (-1,))
+
+    # The product kernel is separable, so that the convolution is done one
+    # variable at a time, as a linear convolution with the FFT over the
+    # differences between all grid points
+    func = kernel_func[ckertype]
+    offsets = np.arange(1 - gridsize, gridsize)
+    for ii in range(k_vars):
+        kern_fft = np.fft.rfft(func(bw[ii], -offsets * delta[ii], 0.),
+                               2 * gridsize)
+        kern_fft = kern_fft.reshape((-1,) + (1,) * (k_vars - ii))
+        conv = np.fft.irfft(np.fft.rfft(sums, 2 * gridsize, axis=ii) *
+                            kern_fft, 2 * gridsize, axis=ii)
+        sums = np.take(conv, np.arange(gridsize - 1, 2 * gridsize - 1),
+                       axis=ii)
+    sums = sums.reshape(gridsize**k_vars, -1)
+
+    dens = np.zeros((data_predict.shape[0], W2.shape[1]))
+    for idx, wts in _grid_corners(data_predict, low, delta, gridsize):
+        dens += wts[:, None] * sums[idx]
+
+    dens /= np.prod(bw)
+    return dens.reshape((-1,) + W.shape[1:])
@@ -33,9 +33,8 @@ from __future__ import division
 from statsmodels.compat.python import range, next
 import numpy as np
 
-from . import kernels
 from ._kernel_base import GenericKDE, EstimatorSettings, gpke, \
-    LeaveOneOut, _adjust_shape
+    gpke_loo, gpke_binned, LeaveOneOut, _adjust_shape
 
 
 __all__ = ['KDEMultivariate', 'KDEMultivariateConditional', 'EstimatorSettings']
@@ -152,17 +151,16 @@ class KDEMultivariate(GenericKDE):
 
         .. math:: K_{h}(X_{i},X_{j}) =
             \prod_{s=1}^{q}h_{s}^{-1}k\left(\frac{X_{is}-X_{js}}{h_{s}}\right)
-        """
-        LOO = LeaveOneOut(self.data)
-        L = 0
-        for i, X_not_i in enumerate(LOO):
-            f_i = gpke(bw, data=-X_not_i, data_predict=-self.data[i, :],
-                       var_type=self.var_type)
-            L += func(f_i)
 
-        return -L
+        The leave-one-out estimators of all observations are computed at once
+        by `gpke_loo`, approximately if the ``loo_tol`` setting is given
+        (see `EstimatorSettings`).
+        """
+        f = gpke_loo(np.asarray(bw), self.data, self.var_type,
+                     tol=self.loo_tol)
+        return -np.sum(func(f))
 
-    def pdf(self, data_predict=None):
+    def pdf(self, data_predict=None, fft=False, gridsize=None):
         r"""
         Evaluate the probability density function.
 
@@ -170,6 +168,12 @@ class KDEMultivariate(GenericKDE):
         ----------
         data_predict: array_like, optional
             Points to evaluate at.  If unspecified, the training data is used.
+        fft: bool, optional
+            If True, the density is computed on linearly binned data with the
+            FFT and interpolated at the evaluation points (see
+            `gpke_binned`).  Only for continuous variables.  Default is False.
+        gridsize: int, optional
+            The number of grid points for each variable if `fft` is True.
 
         Returns
         -------
@@ -189,6 +193,11 @@ class KDEMultivariate(GenericKDE):
         else:
             data_predict = _adjust_shape(data_predict, self.k_vars)
 
+        if fft:
+            pdf_est = gpke_binned(self.bw, self.data, data_predict,
+                                  self.var_type, gridsize=gridsize)
+            return np.squeeze(pdf_est / self.nobs)
+
         pdf_est = []
         for i in range(np.shape(data_predict)[0]):
             pdf_est.append(gpke(self.bw, data=self.data,
@@ -198,7 +207,7 @@ class KDEMultivariate(GenericKDE):
         pdf_est = np.squeeze(pdf_est)
         return pdf_est
 
-    def cdf(self, data_predict=None):
+    def cdf(self, data_predict=None, fft=False, gridsize=None):
         r"""
         Evaluate the cumulative distribution function.
 
@@ -206,6 +215,12 @@ class KDEMultivariate(GenericKDE):
         ----------
         data_predict: array_like, optional
             Points to evaluate at.  If unspecified, the training data is used.
+        fft: bool, optional
+            If True, the cdf is computed on linearly binned data with the
+            FFT and interpolated at the evaluation points (see
+            `gpke_binned`).  Only for continuous variables.  Default is False.
+        gridsize: int, optional
+            The number of grid points for each variable if `fft` is True.
 
         Returns
         -------
@@ -234,6 +249,12 @@ class KDEMultivariate(GenericKDE):
         else:
             data_predict = _adjust_shape(data_predict, self.k_vars)
 
+        if fft:
+            cdf_est = gpke_binned(self.bw, self.data, data_predict,
+                                  self.var_type, ckertype='gaussian_cdf',
+                                  gridsize=gridsize)
+            return np.squeeze(cdf_est / self.nobs)
+
         cdf_est = []
         for i in range(np.shape(data_predict)[0]):
             cdf_est.append(gpke(self.bw, data=self.data,
@@ -281,55 +302,17 @@ class KDEMultivariate(GenericKDE):
         .. [2] Racine, J., Li, Q. "Nonparametric Estimation of Distributions
                 with Categorical and Continuous Data." Working Paper. (2000)
         """
-        #F = 0
-        #for i in range(self.nobs):
-        #    k_bar_sum = gpke(bw, data=-self.data,
-        #                     data_predict=-self.data[i, :],
-        #                     var_type=self.var_type,
-        #                     ckertype='gauss_convolution',
-        #                     okertype='wangryzin_convolution',
-        #                     ukertype='aitchisonaitken_convolution')
-        #    F += k_bar_sum
-        ## there is a + because loo_likelihood returns the negative
-        #return (F / self.nobs**2 + self.loo_likelihood(bw) * \
-        #        2 / ((self.nobs) * (self.nobs - 1)))
-
-        # The code below is equivalent to the commented-out code above.  It's
-        # about 20% faster due to some code being moved outside the for-loops
-        # and shared by gpke() and loo_likelihood().
-        F = 0
-        kertypes = dict(c=kernels.gaussian_convolution,
-                        o=kernels.wang_ryzin_convolution,
-                        u=kernels.aitchison_aitken_convolution)
+        bw = np.asarray(bw)
         nobs = self.nobs
-        data = -self.data
-        var_type = self.var_type
-        ix_cont = np.array([c == 'c' for c in var_type])
-        _bw_cont_product = bw[ix_cont].prod()
-        Kval = np.empty(data.shape)
-        for i in range(nobs):
-            for ii, vtype in enumerate(var_type):
-                Kval[:, ii] = kertypes[vtype](bw[ii],
-                                              data[:, ii],
-                                              data[i, ii])
-
-            dens = Kval.prod(axis=1) / _bw_cont_product
-            k_bar_sum = dens.sum(axis=0)
-            F += k_bar_sum  # sum of prod kernel over nobs
-
-        kertypes = dict(c=kernels.gaussian,
-                        o=kernels.wang_ryzin,
-                        u=kernels.aitchison_aitken)
-        LOO = LeaveOneOut(self.data)
-        L = 0   # leave-one-out likelihood
-        Kval = np.empty((data.shape[0]-1, data.shape[1]))
-        for i, X_not_i in enumerate(LOO):
-            for ii, vtype in enumerate(var_type):
-                Kval[:, ii] = kertypes[vtype](bw[ii],
-                                              -X_not_i[:, ii],
-                                              data[i, ii])
-            dens = Kval.prod(axis=1) / _bw_cont_product
-            L += dens.sum(axis=0)
+        # Sum of the product convolution kernel over all pairs
+        F = gpke_loo(bw, self.data, self.var_type,
+                     ckertype='gauss_convolution',
+                     okertype='wangryzin_convolution',
+                     ukertype='aitchisonaitken_convolution',
+                     leave_one_out=False).sum()
+        # Sum of the leave-one-out likelihoods
+        L = gpke_loo(bw, self.data, self.var_type,
+                     tol=self.loo_tol).sum()
 
         # CV objective function, eq. (2.4) of Ref. [3]
         return (F / nobs**2 - 2 * L / (nobs * (nobs - 1)))
@@ -463,22 +446,15 @@ class KDEMultivariateConditional(GenericKDE):
         Similar to ``KDE.loo_likelihood`, but substitute ``f(y|x)=f(x,y)/f(x)``
         for ``f(x)``.
         """
-        yLOO = LeaveOneOut(self.data)
-        xLOO = LeaveOneOut(self.exog).__iter__()
-        L = 0
-        for i, Y_j in enumerate(yLOO):
-            X_not_i = next(xLOO)
-            f_yx = gpke(bw, data=-Y_j, data_predict=-self.data[i, :],
-                        var_type=(self.dep_type + self.indep_type))
-            f_x = gpke(bw[self.k_dep:], data=-X_not_i,
-                       data_predict=-self.exog[i, :],
-                       var_type=self.indep_type)
-            f_i = f_yx / f_x
-            L += func(f_i)
-
-        return -L
-
-    def pdf(self, endog_predict=None, exog_predict=None):
+        bw = np.asarray(bw)
+        tol = self.loo_tol
+        f_yx = gpke_loo(bw, self.data, self.dep_type + self.indep_type,
+                        tol=tol)
+        f_x = gpke_loo(bw[self.k_dep:], self.exog, self.indep_type, tol=tol)
+        return -np.sum(func(f_yx / f_x))
+
+    def pdf(self, endog_predict=None, exog_predict=None, fft=False,
+            gridsize=None):
         r"""
         Evaluate the probability density function.
 
@@ -489,6 +465,13 @@ class KDEMultivariateConditional(GenericKDE):
             training data is used.
         exog_predict: array_like, optional
             Evaluation data for the independent variables.
+        fft: bool, optional
+            If True, the joint and marginal densities are computed on
+            linearly binned data with the FFT and interpolated at the
+            evaluation points (see `gpke_binned`).  Only for continuous
+            variables.  Default is False.
+        gridsize: int, optional
+            The number of grid points for each variable if `fft` is True.
 
         Returns
         -------
@@ -517,8 +500,16 @@ class KDEMultivariateConditional(GenericKDE):
         else:
             exog_predict = _adjust_shape(exog_predict, self.k_indep)
 
-        pdf_est = []
         data_predict = np.column_stack((endog_predict, exog_predict))
+        if fft:
+            f_yx = gpke_binned(self.bw, self.data, data_predict,
+                               self.dep_type + self.indep_type,
+                               gridsize=gridsize)
+            f_x = gpke_binned(self.bw[self.k_dep:], self.exog, exog_predict,
+                              self.indep_type, gridsize=gridsize)
+            return np.squeeze(f_yx / f_x)
+
+        pdf_est = []
         for i in range(np.shape(data_predict)[0]):
             f_yx = gpke(self.bw, data=self.data,
                         data_predict=data_predict[i, :],
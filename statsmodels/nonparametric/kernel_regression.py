@@ -39,13 +39,61 @@ from scipy import optimize
 from scipy.stats.mstats import mquantiles
 
 from ._kernel_base import GenericKDE, EstimatorSettings, gpke, \
-    LeaveOneOut, _get_type_pos, _adjust_shape, _compute_min_std_IQR
+    gpke_loo, gpke_binned, LeaveOneOut, _get_type_pos, _adjust_shape, \
+    _compute_min_std_IQR
 
 
 
 __all__ = ['KernelReg', 'KernelCensoredReg']
 
 
+def _loc_linear_weights(exog, endog):
+    """
+    Functions of the observations whose kernel-weighted sums give the moments
+    of the local linear estimator: 1, X, XX', y and yX.
+    """
+    nobs = exog.shape[0]
+    exog_outer = (exog[:, :, None] * exog[:, None, :]).reshape(nobs, -1)
+    return np.column_stack((np.ones(nobs), exog, exog_outer, endog,
+                            endog[:, None] * exog))
+
+
+def _loc_linear_from_sums(sums, data_predict):
+    """
+    Local linear estimators from the kernel-weighted sums of
+    `_loc_linear_weights` at the points `data_predict`.
+
+    The moments of the differences ``X_j - x`` in `KernelReg._est_loc_linear`
+    are expanded in terms of the sums, and ``pinv(M) V`` is computed for all
+    points at once.  Returns the mean in the first column and the marginal
+    effects in the others.
+    """
+    nobs, k_vars = data_predict.shape
+    x = data_predict
+    S0 = sums[:, 0]
+    SX = sums[:, 1:1 + k_vars]
+    SXX = sums[:, 1 + k_vars:1 + k_vars + k_vars**2].reshape(
+        nobs, k_vars, k_vars)
+    Sy = sums[:, 1 + k_vars + k_vars**2]
+    SyX = sums[:, 2 + k_vars + k_vars**2:]
+
+    M = np.empty((nobs, k_vars + 1, k_vars + 1))
+    M[:, 0, 0] = S0
+    M[:, 0, 1:] = M[:, 1:, 0] = SX - S0[:, None] * x
+    M[:, 1:, 1:] = (SXX - x[:, :, None] * SX[:, None, :]
+                    - SX[:, :, None] * x[:, None, :]
+                    + S0[:, None, None] * x[:, :, None] * x[:, None, :])
+    V = np.column_stack((Sy, SyX - Sy[:, None] * x))
+
+    u, sv, vt = np.linalg.svd(M)
+    cutoff = 1e-15 * sv.max(axis=1, keepdims=True)
+    sv_inv = np.zeros(sv.shape)
+    large = sv > cutoff
+    sv_inv[large] = 1. / sv[large]
+    return np.einsum('nbc,nb->nc', vt,
+                     sv_inv * np.einsum('nbc,nb->nc', u, V))
+
+
 class KernelReg(GenericKDE):
     """
     Nonparametric kernel regression class.
@@ -306,18 +354,67 @@ class KernelReg(GenericKDE):
         where :math:`g_{-i}(X_{i})` is the leave-one-out estimator of g(X)
         and :math:`h` is the vector of bandwidths
 
+        For the local constant and local linear estimators, the leave-one-out
+        estimators are computed at once from kernel-weighted sums by
+        `gpke_loo`, approximately if the ``loo_tol`` setting is given (see
+        `EstimatorSettings`).
         """
-        LOO_X = LeaveOneOut(self.exog)
-        LOO_Y = LeaveOneOut(self.endog).__iter__()
-        L = 0
-        for ii, X_not_i in enumerate(LOO_X):
-            Y = next(LOO_Y)
-            G = func(bw, endog=Y, exog=-X_not_i,
-                     data_predict=-self.exog[ii, :])[0]
-            L += (self.endog[ii] - G) ** 2
-
-        # Note: There might be a way to vectorize this. See p.72 in [1]
-        return L / self.nobs
+        if func == self._est_loc_constant:
+            G = self._loo_loc_constant(bw)
+        elif func == self._est_loc_linear:
+            G = self._loo_loc_linear(bw)
+        else:
+            LOO_X = LeaveOneOut(self.exog)
+            LOO_Y = LeaveOneOut(self.endog).__iter__()
+            L = 0
+            for ii, X_not_i in enumerate(LOO_X):
+                Y = next(LOO_Y)
+                G = func(bw, endog=Y, exog=-X_not_i,
+                         data_predict=-self.exog[ii, :])[0]
+                L += (self.endog[ii] - G) ** 2
+            return L / self.nobs
+
+        return ((self.endog[:, 0] - G) ** 2).sum() / self.nobs
+
+    def _loo_loc_constant(self, bw):
+        """Leave-one-out local constant estimators at the observations."""
+        endog = self.endog[:, 0]
+        sums = gpke_loo(np.asarray(bw), self.exog, self.var_type,
+                        weights=np.column_stack((np.ones(self.nobs), endog)),
+                        tol=self.loo_tol)
+        return sums[:, 1] / sums[:, 0]
+
+    def _loo_loc_linear(self, bw):
+        """Leave-one-out local linear estimators at the observations."""
+        endog = self.endog[:, 0]
+        exog = self.exog - self.exog.mean(axis=0)
+        sums = gpke_loo(np.asarray(bw), self.exog, self.var_type,
+                        weights=_loc_linear_weights(exog, endog),
+                        tol=self.loo_tol)
+        return _loc_linear_from_sums(sums, exog)[:, 0]
+
+    def _fit_binned(self, data_predict, gridsize):
+        """Mean and marginal effects from kernel sums on binned data."""
+        endog = self.endog[:, 0]
+        if self.reg_type == 'll':
+            # Centered for accuracy
+            center = self.exog.mean(axis=0)
+            sums = gpke_binned(self.bw, self.exog, data_predict,
+                               self.var_type, gridsize=gridsize,
+                               weights=_loc_linear_weights(
+                                   self.exog - center, endog))
+            mean_mfx = _loc_linear_from_sums(sums, data_predict - center)
+            return mean_mfx[:, 0], mean_mfx[:, 1:]
+
+        weights = np.column_stack((np.ones(self.nobs), endog))
+        S0, Sy = gpke_binned(self.bw, self.exog, data_predict, self.var_type,
+                             weights=weights, gridsize=gridsize).T
+        D0, Dy = gpke_binned(self.bw, self.exog, data_predict, self.var_type,
+                             weights=weights, ckertype='d_gaussian',
+                             gridsize=gridsize).T
+        # The marginal effects as in `_est_loc_constant`
+        mfx = (S0 * Dy - Sy * D0) / (self.nobs * S0**2)
+        return Sy / S0, np.repeat(mfx[:, None], self.k_vars, axis=1)
 
     def r_squared(self):
         r"""
@@ -344,7 +441,7 @@ class KernelReg(GenericKDE):
                    ((Yhat - Y_bar)**2).sum(axis=0)
         return R2_numer / R2_denom
 
-    def fit(self, data_predict=None):
+    def fit(self, data_predict=None, fft=False, gridsize=None):
         """
         Returns the mean and marginal effects at the `data_predict` points.
 
@@ -353,6 +450,12 @@ class KernelReg(GenericKDE):
         data_predict : array_like, optional
             Points at which to return the mean and marginal effects.  If not
             given, ``data_predict == exog``.
+        fft : bool, optional
+            If True, the kernel sums are computed on linearly binned data with
+            the FFT and interpolated at the `data_predict` points (see
+            `gpke_binned`).  Only for continuous variables.  Default is False.
+        gridsize : int, optional
+            The number of grid points for each variable if `fft` is True.
 
         Returns
         -------
@@ -368,6 +471,9 @@ class KernelReg(GenericKDE):
         else:
             data_predict = _adjust_shape(data_predict, self.k_vars)
 
+        if fft:
+            return self._fit_binned(data_predict, gridsize)
+
         N_data_predict = np.shape(data_predict)[0]
         mean = np.empty((N_data_predict,))
         mfx = np.empty((N_data_predict, self.k_vars))
@@ -5,6 +5,8 @@ import numpy.testing.decorators as dec
 from unittest import TestCase
 
 import statsmodels.api as sm
+from statsmodels.nonparametric._kernel_base import (LeaveOneOut, gpke,
+                                                     gpke_loo)
 nparam = sm.nonparametric
 
 
@@ -389,6 +391,98 @@ class TestKDEMultivariateConditional(KDETestBase):
                                                           n_sub=100))
         npt.assert_equal(dens.bw, bw_user)
 
+
+class TestLeaveOneOut(KDETestBase):
+
+    def loo_likelihood_loop(self, dens, bw, func=np.log):
+        # Leave-one-out likelihood from one `gpke` call per observation
+        L = 0
+        for i, X_not_i in enumerate(LeaveOneOut(dens.data)):
+            L += func(gpke(bw, data=-X_not_i, data_predict=-dens.data[i, :],
+                           var_type=dens.var_type))
+        return -L
+
+    def test_loo_likelihood(self):
+        # Includes an unordered variable with a level observed only once
+        u = np.random.binomial(2, 0.5, size=(self.o.shape[0], 1))
+        u[0] = 3
+        bw = np.array([0.5, 0.6, 0.4, 0.2])
+        dens = nparam.KDEMultivariate(data=[self.c1, self.c2, self.o, u],
+                                      var_type='ccou', bw=bw)
+        npt.assert_allclose(dens.loo_likelihood(bw, np.log),
+                            self.loo_likelihood_loop(dens, bw))
+
+        # Approximate sums: each leave-one-out density has an absolute error
+        # of at most loo_tol times the maximum of the kernel
+        dens.loo_tol = 1e-6
+        f_max = (2 * np.pi)**-1 / np.prod(bw[:2])
+        f_loo = gpke_loo(bw, dens.data, 'ccou')
+        f_approx = gpke_loo(bw, dens.data, 'ccou', tol=1e-6)
+        assert np.all(np.abs(f_loo - f_approx) <= 1e-6 * f_max * dens.nobs)
+        npt.assert_allclose(dens.loo_likelihood(bw, np.log),
+                            self.loo_likelihood_loop(dens, bw), rtol=1e-4)
+
+    def test_cv_ml_tol(self):
+        dens = nparam.KDEMultivariate(data=[self.c1, self.c2],
+                                      var_type='cc', bw='cv_ml')
+        dens_tol = nparam.KDEMultivariate(
+            data=[self.c1, self.c2], var_type='cc', bw='cv_ml',
+            defaults=nparam.EstimatorSettings(loo_tol=1e-10))
+        npt.assert_allclose(dens_tol.bw, dens.bw, rtol=1e-4)
+
+    def test_conditional_loo_likelihood(self):
+        bw = np.array([0.5, 0.6, 0.3])
+        dens = nparam.KDEMultivariateConditional(
+            endog=[self.c1], exog=[self.c2, self.o], dep_type='c',
+            indep_type='co', bw=bw)
+        L = 0
+        for i, (Y, X) in enumerate(zip(LeaveOneOut(dens.data),
+                                       LeaveOneOut(dens.exog))):
+            f_yx = gpke(bw, data=-Y, data_predict=-dens.data[i, :],
+                        var_type='cco')
+            f_x = gpke(bw[1:], data=-X, data_predict=-dens.exog[i, :],
+                       var_type='co')
+            L += np.log(f_yx / f_x)
+        npt.assert_allclose(dens.loo_likelihood(bw, np.log), -L)
+
+
+class TestBinned(KDETestBase):
+
+    def test_pdf_cdf(self):
+        dens = nparam.KDEMultivariate(data=[self.c1, self.c2],
+                                      var_type='cc', bw='normal_reference')
+        data_predict = dens.data[:20] * 0.9
+        npt.assert_allclose(dens.pdf(data_predict, fft=True),
+                            dens.pdf(data_predict), rtol=1e-3)
+        npt.assert_allclose(dens.cdf(data_predict, fft=True),
+                            dens.cdf(data_predict), rtol=1e-3)
+
+    def test_three_vars(self):
+        dens = nparam.KDEMultivariate(data=[self.c1, self.c2, self.c3],
+                                      var_type='ccc', bw='normal_reference')
+        npt.assert_allclose(dens.pdf(fft=True, gridsize=128), dens.pdf(),
+                            rtol=1e-2)
+
+    def test_conditional_pdf(self):
+        dens = nparam.KDEMultivariateConditional(
+            endog=[self.c1], exog=[self.c2], dep_type='c', indep_type='c',
+            bw='normal_reference')
+        npt.assert_allclose(dens.pdf(fft=True), dens.pdf(), rtol=1e-3)
+
+    def test_constant_var(self):
+        # A constant variable has no grid, the exact sums are used
+        const = np.ones(self.c1.shape)
+        dens = nparam.KDEMultivariate(data=[self.c1, const], var_type='cc',
+                                      bw=[0.5, 0.5])
+        npt.assert_allclose(dens.pdf(fft=True), dens.pdf(), rtol=1e-12)
+        npt.assert_allclose(dens.cdf(fft=True), dens.cdf(), rtol=1e-12)
+
+    def test_discrete_raises(self):
+        dens = nparam.KDEMultivariate(data=[self.c1, self.o], var_type='co',
+                                      bw='normal_reference')
+        npt.assert_raises(ValueError, dens.pdf, fft=True)
+
+
 if __name__ == "__main__":
     import nose
     nose.runmodule(argv=[__file__,'-vvs','-x','--pdb'],
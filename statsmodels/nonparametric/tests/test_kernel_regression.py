@@ -5,6 +5,7 @@ import numpy.testing as npt
 import numpy.testing.decorators as dec
 
 import statsmodels.api as sm
+from statsmodels.nonparametric._kernel_base import LeaveOneOut
 nparam = sm.nonparametric
 
 
@@ -330,6 +331,41 @@ class TestKernelReg(KernelRegressionTestBase):
         # Bandwidth
         npt.assert_equal(model.bw, bw_user)
 
+    def test_cv_loo(self):
+        # Vectorized leave-one-out estimators against one estimation per
+        # observation
+        bw = np.array([0.5, 0.4])
+        exog = np.column_stack((self.c1,
+                                np.random.binomial(3, 0.5, size=self.c1.shape)))
+        for reg_type in ['lc', 'll']:
+            model = nparam.KernelReg(endog=[self.y], exog=exog,
+                                     reg_type=reg_type, var_type='co', bw=bw)
+            func = model.est[reg_type]
+            L = 0
+            for ii, X_not_i in enumerate(LeaveOneOut(model.exog)):
+                Y = np.delete(model.endog, ii, axis=0)
+                G = func(bw, endog=Y, exog=-X_not_i,
+                         data_predict=-model.exog[ii, :])[0]
+                L += (model.endog[ii] - G) ** 2
+            npt.assert_allclose(model.cv_loo(bw, func), L / model.nobs)
+
+            # Approximate sums
+            model.loo_tol = 1e-12
+            npt.assert_allclose(model.cv_loo(bw, func), L / model.nobs,
+                                rtol=1e-6)
+
+    def test_fit_fft(self):
+        exog = np.column_stack((self.c1, self.c2))
+        data_predict = exog[:20] * 0.9
+        for reg_type in ['lc', 'll']:
+            model = nparam.KernelReg(endog=[self.y], exog=exog,
+                                     reg_type=reg_type, var_type='cc',
+                                     bw=[0.5, 0.4])
+            mean, mfx = model.fit(data_predict)
+            mean_fft, mfx_fft = model.fit(data_predict, fft=True)
+            npt.assert_allclose(mean_fft, mean, rtol=1e-3)
+            npt.assert_allclose(mfx_fft, mfx, rtol=1e-2, atol=1e-4)
+
 
 if __name__ == "__main__":
     import nose
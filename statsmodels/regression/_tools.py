@@ -1,10 +1,150 @@
 from collections import namedtuple
+import warnings
+
 import numpy as np
+from scipy import sparse
 from statsmodels.tools.tools import Bunch
+from statsmodels.tools.sm_exceptions import ConvergenceWarning
 
 _MinimalWLSModel = namedtuple('_MinimalWLSModel', ['weights'])
 
 
+def _row_blocks(nobs, k_vars, block_size=None):
+    """
+    Slices for iterating over row blocks of a nobs x k_vars array
+
+    The default block size keeps blocks at about 2**17 elements (1MB for
+    float64).
+    """
+    if block_size is None:
+        block_size = max(1, 2**17 // max(k_vars, 1))
+    for start in range(0, nobs, block_size):
+        yield slice(start, min(start + block_size, nobs))
+
+
+def _qr_r_update(R, wexog, wendog):
+    """
+    Update the R factor of the QR decomposition of ``[wexog, wendog]``
+
+    Parameters
+    ----------
+    R : ndarray
+        The current R factor with k + 1 columns. It has zero rows at the
+        start.
+    wexog : ndarray
+        A new block of rows of the whitened design matrix, 2-d with k
+        columns.
+    wendog : ndarray
+        The corresponding block of the whitened endogenous variable.
+
+    Returns
+    -------
+    R : ndarray
+        The R factor of the data that was used in the previous updates and
+        the new block.
+    """
+    k_vars = wexog.shape[1]
+    n_R = R.shape[0]
+    stacked = np.empty((n_R + wexog.shape[0], k_vars + 1))
+    stacked[:n_R] = R
+    stacked[n_R:, :k_vars] = wexog
+    stacked[n_R:, k_vars] = wendog
+    return np.linalg.qr(stacked, mode='r')
+
+
+def _qr_r_blocked(wendog, exog, w_half=None, block_size=None):
+    """
+    R factor of the QR decomposition of ``[wexog, wendog]`` in row blocks
+
+    Parameters
+    ----------
+    wendog : ndarray
+        The whitened endogenous variable, 1-d.
+    exog : ndarray
+        The design matrix. If `w_half` is None, then this is the whitened
+        design matrix.
+    w_half : None or ndarray
+        Square root of the weights that are used to whiten `exog`, one block
+        at a time. The full whitened design matrix is never formed.
+    block_size : None or int
+        Number of rows in each block.
+
+    Returns
+    -------
+    R : ndarray
+        Upper triangular, (k + 1) x (k + 1) if nobs > k.
+    """
+    nobs, k_vars = exog.shape
+    R = np.zeros((0, k_vars + 1))
+    for sl in _row_blocks(nobs, k_vars, block_size):
+        wexog = exog[sl]
+        if w_half is not None:
+            wexog = w_half[sl, None] * wexog
+        R = _qr_r_update(R, wexog, wendog[sl])
+    return R
+
+
+def _sparse_lstsq(wexog, wendog, method='lsmr'):
+    """
+    Least squares solution for a sparse design matrix
+
+    Parameters
+    ----------
+    wexog : scipy.sparse matrix
+        The whitened design matrix.
+    wendog : ndarray
+        The whitened endogenous variable, 1-d or 2-d.
+    method : str
+        "lsmr" or "lsqr" use the iterative solvers of scipy.sparse.linalg,
+        "normal" solves the sparse normal equations with a sparse LU
+        factorization.
+
+    Returns
+    -------
+    params : ndarray
+    """
+    from scipy.sparse import linalg as splinalg
+    if method == 'normal':
+        xtx = wexog.T.dot(wexog).tocsc()
+        xty = wexog.T.dot(wendog)
+        return splinalg.splu(xtx).solve(xty)
+
+    # the default iteration limit of lsmr, min(nobs, k_vars), is too small
+    maxiter = 10 * wexog.shape[1]
+    if method == 'lsmr':
+        def solver(y):
+            return splinalg.lsmr(wexog, y, atol=1e-12, btol=1e-12,
+                                 conlim=1e12, maxiter=maxiter)
+    elif method == 'lsqr':
+        def solver(y):
+            return splinalg.lsqr(wexog, y, atol=1e-12, btol=1e-12,
+                                 conlim=1e12, iter_lim=maxiter)
+    else:
+        raise ValueError("method has to be 'lsmr', 'lsqr' or 'normal' for a "
+                         "sparse exog, got %s" % method)
+
+    def solve(y):
+        res = solver(y)
+        if res[1] == 7:
+            warnings.warn("%s reached the iteration limit" % method,
+                          ConvergenceWarning)
+        return res[0]
+
+    if wendog.ndim == 1:
+        return solve(wendog)
+    return np.column_stack([solve(wendog[:, i])
+                            for i in range(wendog.shape[1])])
+
+
+def _sparse_normalized_cov_params(wexog):
+    """
+    Inverse of the cross product of a sparse whitened design matrix
+
+    Returns a dense array, the cross product itself is computed sparse.
+    """
+    return np.linalg.pinv(wexog.T.dot(wexog).toarray())
+
+
 class _MinimalWLS(object):
     """
     Minimal implementation of WLS optimized for performance.
@@ -43,10 +183,20 @@ class _MinimalWLS(object):
         w_half = np.sqrt(weights)
 
         self.wendog = w_half * endog
-        if np.isscalar(weights):
-            self.wexog = w_half * exog
-        else:
-            self.wexog = w_half[:, None] * exog
+        # wexog is created in fit if the method needs it
+        self.wexog = None
+        self._w_half = w_half
+
+    def _get_wexog(self):
+        if self.wexog is None:
+            if sparse.issparse(self.exog):
+                w_half = self._w_half * np.ones(self.exog.shape[0])
+                self.wexog = sparse.diags(w_half).dot(self.exog)
+            elif np.isscalar(self._w_half):
+                self.wexog = self._w_half * self.exog
+            else:
+                self.wexog = self._w_half[:, None] * self.exog
+        return self.wexog
 
     def fit(self, method='pinv'):
         """
@@ -55,12 +205,19 @@ class _MinimalWLS(object):
         Parameters
         ----------
         method : str, optional
-            Method to use to estimate parameters.  "pinv", "qr" or "lstsq"
+            Method to use to estimate parameters.  "pinv", "qr", "lstsq" or
+            "qr_blocked"
 
               * "pinv" uses the Moore-Penrose pseudoinverse
                  to solve the least squares problem.
               * "qr" uses the QR factorization.
               * "lstsq" uses the least squares implementation in numpy.linalg
+              * "qr_blocked" uses the QR factorization of the whitened
+                 data, which is updated with blocks of rows so that the
+                 whitened exog is not created.
+              * "lsmr", "lsqr" and "normal" are the methods for a sparse
+                 exog, see `RegressionModel.fit`. The dense methods are
+                 replaced by "lsmr" if exog is sparse.
 
         Returns
         -------
@@ -82,19 +239,33 @@ class _MinimalWLS(object):
         --------
         statsmodels.regression.linear_model.WLS
         """
-        if method == 'pinv':
-            pinv_wexog = np.linalg.pinv(self.wexog)
+        if sparse.issparse(self.exog):
+            if method in ('pinv', 'qr', 'qr_blocked', 'lstsq'):
+                method = 'lsmr'
+            params = _sparse_lstsq(self._get_wexog(), self.wendog, method)
+        elif method == 'qr_blocked':
+            w_half = self._w_half
+            if np.isscalar(w_half):
+                w_half = np.repeat(w_half, self.exog.shape[0])
+            k_vars = self.exog.shape[1]
+            R = _qr_r_blocked(self.wendog, self.exog, w_half)
+            params = np.linalg.pinv(R[:, :k_vars]).dot(R[:, k_vars])
+        elif method == 'pinv':
+            pinv_wexog = np.linalg.pinv(self._get_wexog())
             params = pinv_wexog.dot(self.wendog)
         elif method == 'qr':
-            Q, R = np.linalg.qr(self.wexog)
+            Q, R = np.linalg.qr(self._get_wexog())
             params = np.linalg.solve(R, np.dot(Q.T, self.wendog))
         else:
-            params, _, _, _ = np.linalg.lstsq(self.wexog, self.wendog)
+            params, _, _, _ = np.linalg.lstsq(self._get_wexog(), self.wendog)
 
         fitted_values = self.exog.dot(params)
         resid = self.endog - fitted_values
-        wresid = self.wendog - self.wexog.dot(params)
-        df_resid = self.wexog.shape[0] - self.wexog.shape[1]
+        if self.wexog is None:
+            wresid = self._w_half * resid
+        else:
+            wresid = self.wendog - self.wexog.dot(params)
+        df_resid = self.exog.shape[0] - self.exog.shape[1]
         scale = np.dot(wresid, wresid) / df_resid
 
         return Bunch(params=params, fittedvalues=fitted_values, resid=resid,
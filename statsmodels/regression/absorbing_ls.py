@@ -0,0 +1,258 @@
+"""
+Least squares with absorbed high-dimensional fixed effects
+
+The fixed effects of one or several factors, e.g. firm, year and region, are
+swept out of endog and exog by alternating projections, the within
+transformation, and the regression is estimated on the transformed data.
+The dummy variables of the factors are never created, so the number of
+levels of the factors can be of the same order as the number of
+observations.
+
+By the Frisch-Waugh-Lovell theorem the parameters, residuals and the
+nonrobust and cluster robust covariances of the slope parameters are the same
+as in the regression that includes the dummy variables, provided that the
+degrees of freedom used by the fixed effects are taken into account.
+
+References
+----------
+Gaure, S. 2013. OLS with multiple high dimensional category variables.
+    Computational Statistics & Data Analysis, 66, 8-18.
+Correia, S. 2016. Linear Models with High-Dimensional Fixed Effects: An
+    Efficient and Feasible Estimator. Working Paper.
+"""
+from __future__ import division
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+
+import statsmodels.base.model as base
+from statsmodels.compat.numpy import np_matrix_rank
+from statsmodels.regression.linear_model import (WLS, RegressionResults,
+                                                 RegressionResultsWrapper)
+from statsmodels.regression._tools import _row_blocks
+from statsmodels.tools.decorators import cache_readonly
+from statsmodels.tools.grouputils import Group, within_transform
+
+
+__all__ = ['AbsorbingLS', 'AbsorbingLSResults']
+
+
+def _get_groups(absorb):
+    """
+    Convert the factors to absorb to a list of Group instances.
+    """
+    if isinstance(absorb, Group):
+        return [absorb]
+    if isinstance(absorb, pd.DataFrame):
+        return [Group(np.asarray(absorb[col]), name=str(col))
+                for col in absorb.columns]
+    if isinstance(absorb, pd.Series):
+        return [Group(np.asarray(absorb), name=str(absorb.name))]
+    if isinstance(absorb, (list, tuple)):
+        return [g if isinstance(g, Group) else Group(np.asarray(g))
+                for g in absorb]
+
+    absorb = np.asarray(absorb)
+    if absorb.ndim == 1:
+        return [Group(absorb)]
+    elif absorb.ndim == 2:
+        return [Group(absorb[:, i]) for i in range(absorb.shape[1])]
+    raise ValueError('absorb needs to be 1d or 2d')
+
+
+def _absorbed_dof(groups):
+    """
+    Number of parameters of the fixed effects.
+
+    The number of levels of all factors minus the redundant levels. For the
+    first two factors the redundant levels are counted exactly as the number
+    of connected components of the bipartite graph of the levels that occur
+    together. Each further factor is assumed to have one redundant level,
+    which overstates the number of parameters if further levels are
+    collinear, so that the degrees of freedom are conservative in this case.
+    """
+    dof = sum(g.n_groups for g in groups) - (len(groups) - 1)
+    if len(groups) > 1:
+        g0, g1 = groups[:2]
+        n_levels = g0.n_groups + g1.n_groups
+        ones = np.ones(len(g0.group_int))
+        adjacency = sparse.coo_matrix(
+            (ones, (g0.group_int, g1.group_int + g0.n_groups)),
+            shape=(n_levels, n_levels))
+        n_components = connected_components(adjacency, directed=False)[0]
+        dof -= n_components - 1
+    return dof
+
+
+class AbsorbingLS(WLS):
+    __doc__ = """
+    Least squares with absorbed fixed effects of one or several factors
+
+    The fixed effects are removed from endog and exog by alternating
+    projections, so that only the parameters of exog are estimated.
+
+    %(params)s
+    absorb : array-like, DataFrame, Group or list
+        The factors whose fixed effects are absorbed. Either a 1d array for
+        one factor, a 2d array or DataFrame with one column for each factor,
+        or a list of Group instances or 1d arrays.
+    weights : array-like, optional
+        1d array of weights, as in WLS.
+    tol : float
+        Convergence tolerance of the alternating projections, see
+        `statsmodels.tools.grouputils.within_transform`.
+    maxiter : int
+        Maximum number of sweeps of the alternating projections.
+    missing : str
+        Only 'none' is supported. Rows with missing values need to be
+        removed before the model is created.
+    %(extra_params)s
+
+    Attributes
+    ----------
+    absorb : list
+        List of Group instances of the absorbed factors.
+    k_absorbed : int
+        The number of parameters of the absorbed fixed effects that is
+        subtracted from the residual degrees of freedom.
+
+    Notes
+    -----
+    `exog` must not include a constant, it is absorbed by the fixed effects.
+    Columns of `exog` that are collinear with the fixed effects, e.g.
+    variables that are constant within the levels of a factor, are not
+    identified and are handled like other collinear columns by the
+    pseudoinverse.
+
+    With two factors `k_absorbed` is exact. With more than two factors, one
+    redundant level is assumed for each additional factor, which can
+    understate the residual degrees of freedom.
+
+    The cluster robust covariance, ``cov_type='cluster'``, uses
+    `stats.sandwich_covariance.cov_cluster` and its small sample correction,
+    which does not count the fixed effects. This is appropriate if the fixed
+    effects are nested within the clusters, e.g. firm fixed effects and
+    clustering by firm.
+
+    Examples
+    --------
+    >>> mod = AbsorbingLS(y, x, absorb=data[['firm', 'year']])
+    >>> res = mod.fit(cov_type='cluster', cov_kwds={'groups': data['firm']})
+    """ % {'params': base._model_params_doc,
+           'extra_params': base._extra_param_doc}
+
+    def __init__(self, endog, exog, absorb, weights=1., tol=1e-8,
+                 maxiter=1000, missing='none', hasconst=None, **kwargs):
+        if missing != 'none':
+            raise ValueError("missing='%s' is not supported, only "
+                             "missing='none'" % missing)
+        # needed in whiten, which is called during initialization
+        self.absorb = _get_groups(absorb)
+        self.tol = tol
+        self.maxiter = maxiter
+        super(AbsorbingLS, self).__init__(endog, exog, weights=weights,
+                                          missing=missing, hasconst=hasconst,
+                                          **kwargs)
+        if self.k_constant:
+            raise ValueError('exog must not include a constant, it is '
+                             'absorbed by the fixed effects')
+        self.k_absorbed = _absorbed_dof(self.absorb)
+
+    def whiten(self, X):
+        """
+        Remove the fixed effects from X and multiply by sqrt(weights)
+        """
+        X = np.asarray(X)
+        sqrt_w = np.sqrt(self.weights)
+        X = within_transform(X, self.absorb, weights=self.weights,
+                             tol=self.tol, maxiter=self.maxiter)
+        if X.ndim == 1:
+            return sqrt_w * X
+        return sqrt_w[:, None] * X
+
+    def _wexog_blocks(self):
+        # the within transformation couples the rows, so wexog is created
+        wexog = self.wexog
+        for sl in _row_blocks(*wexog.shape):
+            yield sl, wexog[sl]
+
+    @property
+    def df_model(self):
+        """
+        The model degrees of freedom, the rank of the transformed exog.
+        """
+        if self._df_model is None:
+            if self.rank is None:
+                self.rank = np_matrix_rank(self.wexog)
+            self._df_model = float(self.rank)
+        return self._df_model
+
+    @df_model.setter
+    def df_model(self, value):
+        self._df_model = value
+
+    @property
+    def df_resid(self):
+        """
+        The residual degrees of freedom, the number of observations minus the
+        rank of the transformed exog and minus `k_absorbed`.
+        """
+        if self._df_resid is None:
+            if self.rank is None:
+                self.rank = np_matrix_rank(self.wexog)
+            self._df_resid = self.nobs - self.rank - self.k_absorbed
+        return self._df_resid
+
+    @df_resid.setter
+    def df_resid(self, value):
+        self._df_resid = value
+
+    def fit(self, method="pinv", cov_type='nonrobust', cov_kwds=None,
+            use_t=None, **kwargs):
+        """
+        Full fit of the model.
+
+        The parameters are estimated by least squares on the transformed
+        data. See `RegressionModel.fit` for a description of the options.
+
+        Returns
+        -------
+        An AbsorbingLSResults instance.
+        """
+        # the degrees of freedom need k_absorbed, so set them before the
+        # generic fit uses the rank of wexog only
+        self.df_model
+        self.df_resid
+        res = super(AbsorbingLS, self).fit(method=method, **kwargs)
+        lfit = AbsorbingLSResults(
+            self, res.params,
+            normalized_cov_params=res.normalized_cov_params,
+            cov_type=cov_type, cov_kwds=cov_kwds, use_t=use_t)
+        return RegressionResultsWrapper(lfit)
+
+
+class AbsorbingLSResults(RegressionResults):
+    """
+    Results class for least squares with absorbed fixed effects
+
+    The residuals are the residuals of the regression that includes the
+    fixed effects, and the fitted values include the fixed effects. The
+    prediction for new exog does not include the fixed effects.
+
+    `rsquared` is the within R-squared, i.e. computed from the transformed
+    endog.
+    """
+
+    @cache_readonly
+    def resid(self):
+        return self.wresid / np.sqrt(self.model.weights)
+
+    @cache_readonly
+    def fittedvalues(self):
+        return self.model.endog - self.resid
+
+    @cache_readonly
+    def k_absorbed(self):
+        return self.model.k_absorbed
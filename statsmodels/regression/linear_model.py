@@ -39,6 +39,7 @@ import numpy as np
 from scipy.linalg import toeplitz
 from scipy import stats
 from scipy import optimize
+from scipy import sparse
 
 from statsmodels.compat.numpy import np_matrix_rank
 from statsmodels.tools.tools import add_constant, chain_dot, pinv_extended
@@ -53,6 +54,8 @@ from statsmodels.tools.sm_exceptions import InvalidTestWarning
 
 # need import in module instead of lazily to copy `__doc__`
 from . import _prediction as pred
+from ._tools import (_qr_r_update, _row_blocks, _sparse_lstsq,
+                     _sparse_normalized_cov_params)
 
 __docformat__ = 'restructuredtext en'
 
@@ -175,15 +178,22 @@ class RegressionModel(base.LikelihoodModel):
 
     Intended for subclassing.
     """
+    # whether the model can keep a scipy.sparse exog sparse
+    _sparse_exog = False
+
     def __init__(self, endog, exog, **kwargs):
+        if sparse.issparse(exog) and not self._sparse_exog:
+            raise ValueError("A scipy.sparse exog is not supported by %s, "
+                             "use OLS or WLS" % self.__class__.__name__)
         super(RegressionModel, self).__init__(endog, exog, **kwargs)
         self._data_attr.extend(['pinv_wexog', 'wendog', 'wexog', 'weights'])
 
     def initialize(self):
-        self.wexog = self.whiten(self.exog)
+        # wexog is created when it is first used, see the wexog property
+        self._wexog = None
         self.wendog = self.whiten(self.endog)
         # overwrite nobs from class Model:
-        self.nobs = float(self.wexog.shape[0])
+        self.nobs = float(self.wendog.shape[0])
 
         self._df_model = None
         self._df_resid = None
@@ -222,11 +232,47 @@ class RegressionModel(base.LikelihoodModel):
     def df_resid(self, value):
         self._df_resid = value
 
+    @property
+    def wexog(self):
+        """
+        The whitened design matrix, computed when it is first used.
+        """
+        wexog = getattr(self, '_wexog', None)
+        if wexog is None and self.exog is not None:
+            wexog = self._wexog = self.whiten(self.exog)
+        return wexog
+
+    @wexog.setter
+    def wexog(self, value):
+        self._wexog = value
+
+    def _wexog_blocks(self):
+        """
+        Iterate over blocks of rows of the whitened design matrix
+
+        Yields the slice of the rows and the corresponding block of
+        `wexog`.  If `wexog` has not been created and the model whitens
+        each row separately, then only one block at a time is whitened
+        and `wexog` is not created.
+        """
+        wexog = getattr(self, '_wexog', None)
+        if wexog is None and not hasattr(self, '_whiten_rows'):
+            wexog = self.wexog
+
+        if wexog is None:
+            nobs, k_vars = self.exog.shape
+            for sl in _row_blocks(nobs, k_vars):
+                yield sl, self._whiten_rows(self.exog[sl], sl)
+        else:
+            nobs, k_vars = wexog.shape
+            for sl in _row_blocks(nobs, k_vars):
+                yield sl, wexog[sl]
+
     def whiten(self, X):
         raise NotImplementedError("Subclasses should implement.")
 
     def fit(self, method="pinv", cov_type='nonrobust', cov_kwds=None,
-            use_t=None, **kwargs):
+            use_t=None, low_memory=False, **kwargs):
         """
         Full fit of the model.
 
@@ -238,7 +284,10 @@ class RegressionModel(base.LikelihoodModel):
         method : str, optional
             Can be "pinv", "qr".  "pinv" uses the Moore-Penrose pseudoinverse
             to solve the least squares problem. "qr" uses the QR
-            factorization.
+            factorization.  If `exog` is a scipy.sparse matrix, then `method`
+            can be "lsmr" or "lsqr" for the iterative solvers in
+            scipy.sparse.linalg, or "normal" for the sparse normal equations.
+            "pinv" is replaced by "lsmr" in this case.
         cov_type : str, optional
             See `regression.linear_model.RegressionResults` for a description
             of the available covariance estimators
@@ -250,6 +299,14 @@ class RegressionModel(base.LikelihoodModel):
             p-values.  Default behavior depends on cov_type. See
             `linear_model.RegressionResults.get_robustcov_results` for
             implementation details.
+        low_memory : bool, optional
+            If True, then the least squares problem is solved with a QR
+            factorization that is updated with blocks of rows of the
+            whitened data, and `method` is ignored.  Neither `pinv_wexog`
+            nor the Q factor are computed, and for models that whiten each
+            observation separately, i.e. OLS and WLS, `wexog` is not created.
+            The heteroscedasticity robust covariances and the residuals are
+            also computed without `wexog` in this case.
 
         Returns
         -------
@@ -264,8 +321,35 @@ class RegressionModel(base.LikelihoodModel):
         -----
         The fit method uses the pseudoinverse of the design/exogenous variables
         to solve the least squares minimization.
-        """
-        if method == "pinv":
+
+        If `exog` is sparse, then neither `exog` nor `wexog` is densified,
+        and the design is assumed to have full column rank. The
+        `normalized_cov_params` of the results instance, a dense k by k
+        matrix, is only computed when it is needed, e.g. for `bse`.
+        """
+        if sparse.issparse(self.exog):
+            if method == 'pinv':
+                method = 'lsmr'
+            beta = _sparse_lstsq(self.wexog, self.wendog, method=method)
+            # computed by the results instance if needed
+            self.normalized_cov_params = None
+            self.wexog_singular_values = None
+            self.rank = self.exog.shape[1]
+
+        elif low_memory:
+            R = None
+            for sl, wexog in self._wexog_blocks():
+                if R is None:
+                    R = np.zeros((0, wexog.shape[1] + 1))
+                R = _qr_r_update(R, wexog, self.wendog[sl])
+            k_vars = R.shape[1] - 1
+            pinv_R, singular_values = pinv_extended(R[:, :k_vars])
+            self.normalized_cov_params = np.dot(pinv_R, pinv_R.T)
+            self.wexog_singular_values = singular_values
+            self.rank = np_matrix_rank(np.diag(singular_values))
+            beta = np.dot(pinv_R, R[:, k_vars])
+
+        elif method == "pinv":
             if not (hasattr(self, 'pinv_wexog') and
                     hasattr(self, 'normalized_cov_params') and
                     hasattr(self, 'rank')):
@@ -342,6 +426,8 @@ class RegressionModel(base.LikelihoodModel):
         if exog is None:
             exog = self.exog
 
+        if sparse.issparse(exog):
+            return exog.dot(params)
         return np.dot(exog, params)
 
     def get_distribution(self, params, scale, exog=None, dist_class=None):
@@ -527,7 +613,12 @@ class GLS(RegressionModel):
         """
         # TODO: combine this with OLS/WLS loglike and add _det_sigma argument
         nobs2 = self.nobs / 2.0
-        SSR = np.sum((self.wendog - np.dot(self.wexog, params))**2, axis=0)
+        if getattr(self, '_wexog', None) is None:
+            # don't create wexog, see low_memory in fit
+            wresid = self.whiten(self.endog - self.exog.dot(params))
+        else:
+            wresid = self.wendog - self.wexog.dot(params)
+        SSR = np.sum(wresid**2, axis=0)
         llf = -np.log(SSR) * nobs2      # concentrated likelihood
         llf -= (1+np.log(np.pi/nobs2))*nobs2  # with likelihood constant
         if np.any(self.sigma):
@@ -642,6 +733,8 @@ class WLS(RegressionModel):
     """ % {'params': base._model_params_doc,
            'extra_params': base._missing_param_doc + base._extra_param_doc}
 
+    _sparse_exog = True
+
     def __init__(self, endog, exog, weights=1., missing='none', hasconst=None,
                  **kwargs):
         weights = np.array(weights)
@@ -680,12 +773,22 @@ class WLS(RegressionModel):
         sqrt(weights)*X
         """
 
+        if sparse.issparse(X):
+            return sparse.diags(np.sqrt(self.weights)).dot(X)
         X = np.asarray(X)
         if X.ndim == 1:
             return X * np.sqrt(self.weights)
         elif X.ndim == 2:
             return np.sqrt(self.weights)[:, None]*X
 
+    def _whiten_rows(self, X, rows):
+        """
+        Whiten the 2-d block `X` that holds the observations in `rows`
+        """
+        if sparse.issparse(X):
+            return sparse.diags(np.sqrt(self.weights[rows])).dot(X)
+        return np.sqrt(self.weights[rows])[:, None] * X
+
     def loglike(self, params):
         """
         Returns the value of the gaussian log-likelihood function at params.
@@ -710,7 +813,12 @@ class WLS(RegressionModel):
         where :math:`W` is a diagonal matrix
         """
         nobs2 = self.nobs / 2.0
-        SSR = np.sum((self.wendog - np.dot(self.wexog, params))**2, axis=0)
+        if getattr(self, '_wexog', None) is None:
+            # don't create wexog, see low_memory in fit
+            wresid = self.whiten(self.endog - self.exog.dot(params))
+        else:
+            wresid = self.wendog - self.wexog.dot(params)
+        SSR = np.sum(wresid**2, axis=0)
         llf = -np.log(SSR) * nobs2      # concentrated likelihood
         llf -= (1+np.log(np.pi/nobs2))*nobs2  # with constant
         llf += 0.5 * np.sum(np.log(self.weights))
@@ -834,7 +942,7 @@ class OLS(WLS):
         """
         nobs2 = self.nobs / 2.0
         nobs = float(self.nobs)
-        resid = self.endog - np.dot(self.exog, params)
+        resid = self.endog - self.exog.dot(params)
         if hasattr(self, 'offset'):
             resid -= self.offset
         ssr = np.sum(resid**2)
@@ -852,6 +960,9 @@ class OLS(WLS):
         """
         return Y
 
+    def _whiten_rows(self, X, rows):
+        return X
+
     def score(self, params, scale=None):
         """
         Evaluate the score function at a given point.
@@ -1462,6 +1573,19 @@ class RegressionResults(base.LikelihoodModelResults):
     def __str__(self):
         self.summary()
 
+    @property
+    def normalized_cov_params(self):
+        ncp = self.__dict__.get('normalized_cov_params')
+        if ncp is None and sparse.issparse(self.model.exog):
+            # not computed in fit for a sparse exog
+            ncp = _sparse_normalized_cov_params(self.model.wexog)
+            self.__dict__['normalized_cov_params'] = ncp
+        return ncp
+
+    @normalized_cov_params.setter
+    def normalized_cov_params(self, value):
+        self.__dict__['normalized_cov_params'] = value
+
     def conf_int(self, alpha=.05, cols=None):
         """
         Returns the confidence interval of the fitted parameters.
@@ -1484,7 +1608,7 @@ class RegressionResults(base.LikelihoodModelResults):
 
     @cache_readonly
     def nobs(self):
-        return float(self.model.wexog.shape[0])
+        return float(self.model.wendog.shape[0])
 
     @cache_readonly
     def fittedvalues(self):
@@ -1492,6 +1616,9 @@ class RegressionResults(base.LikelihoodModelResults):
 
     @cache_readonly
     def wresid(self):
+        if getattr(self.model, '_wexog', None) is None:
+            # wexog has not been created, e.g. fit with low_memory
+            return self.model.whiten(self.resid)
         return self.model.wendog - self.model.predict(
             self.params, self.model.wexog)
 
@@ -1614,9 +1741,12 @@ class RegressionResults(base.LikelihoodModelResults):
         """
         if self._wexog_singular_values is not None:
             eigvals = self._wexog_singular_values ** 2
+        elif sparse.issparse(self.model.wexog):
+            wexog = self.model.wexog
+            eigvals = np.linalg.linalg.eigvalsh(wexog.T.dot(wexog).toarray())
         else:
-            eigvals = np.linalg.linalg.eigvalsh(np.dot(self.model.wexog.T,
-                                                       self.model.wexog))
+            wexog = self.model.wexog
+            eigvals = np.linalg.linalg.eigvalsh(np.dot(wexog.T, wexog))
         return np.sort(eigvals)[::-1]
 
     @cache_readonly
@@ -1631,10 +1761,35 @@ class RegressionResults(base.LikelihoodModelResults):
 
     # TODO: make these properties reset bse
     def _HCCM(self, scale):
-        H = np.dot(self.model.pinv_wexog,
-                   scale[:, None] * self.model.pinv_wexog.T)
+        pinv_wexog = getattr(self.model, 'pinv_wexog', None)
+        if pinv_wexog is not None:
+            H = np.dot(pinv_wexog, scale[:, None] * pinv_wexog.T)
+        else:
+            # no pinv_wexog, e.g. fit with low_memory, use blocks of wexog
+            ncp = self.normalized_cov_params
+            meat = np.zeros(ncp.shape)
+            for sl, wexog in self.model._wexog_blocks():
+                if sparse.issparse(wexog):
+                    swexog = sparse.diags(scale[sl]).dot(wexog)
+                    meat += wexog.T.dot(swexog).toarray()
+                else:
+                    meat += np.dot(wexog.T, scale[sl, None] * wexog)
+            H = chain_dot(ncp, meat, ncp)
         return H
 
+    def _wexog_leverage(self):
+        """
+        Diagonal of the hat matrix of the whitened design matrix
+        """
+        ncp = self.normalized_cov_params
+        h = np.empty(self.model.wendog.shape[0])
+        for sl, wexog in self.model._wexog_blocks():
+            if sparse.issparse(wexog):
+                h[sl] = np.asarray(wexog.multiply(wexog.dot(ncp)).sum(1))[:, 0]
+            else:
+                h[sl] = (np.dot(wexog, ncp) * wexog).sum(1)
+        return h
+
     @cache_readonly
     def cov_HC0(self):
         """
@@ -1661,10 +1816,7 @@ class RegressionResults(base.LikelihoodModelResults):
         See statsmodels.RegressionResults
         """
 
-        # probably could be optimized
-        h = np.diag(chain_dot(self.model.wexog,
-                              self.normalized_cov_params,
-                              self.model.wexog.T))
+        h = self._wexog_leverage()
         self.het_scale = self.wresid**2/(1-h)
         cov_HC2 = self._HCCM(self.het_scale)
         return cov_HC2
@@ -1674,8 +1826,7 @@ class RegressionResults(base.LikelihoodModelResults):
         """
         See statsmodels.RegressionResults
         """
-        h = np.diag(chain_dot(
-            self.model.wexog, self.normalized_cov_params, self.model.wexog.T))
+        h = self._wexog_leverage()
         self.het_scale = (self.wresid / (1 - h))**2
         cov_HC3 = self._HCCM(self.het_scale)
         return cov_HC3
@@ -2052,6 +2203,8 @@ class RegressionResults(base.LikelihoodModelResults):
 
             - `groups` array_like, integer (required) :
                   index of clusters or groups
+                  If 2-dim, then each column is a cluster variable and the
+                  multiway cluster robust covariance is computed.
             - `use_correction` bool (optional) :
                   If True the sandwich covariance is calculated with a small
                   sample correction.
@@ -2188,7 +2341,7 @@ class RegressionResults(base.LikelihoodModelResults):
                 self, nlags=maxlags, weights_func=weights_func,
                 use_correction=use_correction)
         elif cov_type.lower() == 'cluster':
-            # cluster robust standard errors, one- or two-way
+            # cluster robust standard errors, one- or multi-way
             groups = kwds['groups']
             if not hasattr(groups, 'shape'):
                 groups = np.asarray(groups).T
@@ -2214,16 +2367,19 @@ class RegressionResults(base.LikelihoodModelResults):
                 if adjust_df:
                     # need to find number of groups
                     # duplicate work
-                    n_groups0 = len(np.unique(groups[:, 0]))
-                    n_groups1 = len(np.unique(groups[:, 1]))
-                    self.n_groups = (n_groups0, n_groups1)
-                    n_groups = min(n_groups0, n_groups1)  # use for adjust_df
-
-                # Note: sw.cov_cluster_2groups has 3 returns
-                res.cov_params_default = sw.cov_cluster_2groups(
-                    self, groups, use_correction=use_correction)[0]
+                    self.n_groups = tuple(len(np.unique(g))
+                                          for g in groups.T)
+                    n_groups = min(self.n_groups)  # use for adjust_df
+
+                if groups.shape[1] == 2:
+                    # Note: sw.cov_cluster_2groups has 3 returns
+                    res.cov_params_default = sw.cov_cluster_2groups(
+                        self, groups, use_correction=use_correction)[0]
+                else:
+                    res.cov_params_default = sw.cov_cluster_multi(
+                        self, groups, use_correction=use_correction)
             else:
-                raise ValueError('only two groups are supported')
+                raise ValueError('groups needs to be 1-dim or 2-dim')
             res.cov_kwds['description'] = (
                 'Standard Errors are robust to' +
                 'cluster correlation ' + '(' + cov_type + ')')
@@ -143,6 +143,7 @@ Therefore, optimization methods requiring the Hessian matrix such as
 the Newton-Raphson algorithm cannot be used for model fitting.
 """
 
+import re
 import numpy as np
 import statsmodels.base.model as base
 from scipy.optimize import fmin_ncg, fmin_cg, fmin_bfgs, fmin
@@ -150,6 +151,7 @@ from statsmodels.tools.decorators import cache_readonly
 from statsmodels.tools import data as data_tools
 from scipy.stats.distributions import norm
 from scipy import sparse
+import scipy.sparse.linalg
 import pandas as pd
 import patsy
 from statsmodels.compat.collections import OrderedDict
@@ -159,6 +161,13 @@ from statsmodels.tools.sm_exceptions import ConvergenceWarning
 from statsmodels.base._penalties import Penalty
 from statsmodels.compat.numpy import np_matrix_rank
 from pandas import DataFrame
+import statsmodels.tools.numdiff as nd
+
+try:
+    from sksparse.cholmod import cholesky as cholmod_cholesky
+    has_cholmod = True
+except ImportError:
+    has_cholmod = False
 
 
 def _dot(x, y):
@@ -414,6 +423,91 @@ class MixedLMParams(object):
         return pa
 
 
+def _sparse_factor(qmat):
+    """
+    Factor a sparse symmetric positive definite matrix.
+
+    Parameters
+    ----------
+    qmat : sparse matrix
+        The matrix to factor.
+
+    Returns
+    -------
+    solve : function
+        A function that takes a dense `rhs` and returns the solution
+        of qmat * x = rhs.
+    logdet : real
+        The log determinant of `qmat`.
+
+    Notes
+    -----
+    The sparse Cholesky factorization of scikit-sparse (CHOLMOD) is
+    used if it is installed, otherwise the sparse LU factorization of
+    scipy (SuperLU) with a symmetric fill-reducing ordering and no
+    pivoting.
+    """
+
+    qmat = sparse.csc_matrix(qmat)
+    if has_cholmod:
+        factor = cholmod_cholesky(qmat)
+        return factor, factor.logdet()
+
+    lu = sparse.linalg.splu(qmat, permc_spec="MMD_AT_PLUS_A",
+                            diag_pivot_thresh=0.,
+                            options=dict(SymmetricMode=True))
+    logdet = np.sum(np.log(np.abs(lu.U.diagonal())))
+    return lu.solve, logdet
+
+
+def _smw_qmat(s, AtA, BI, di):
+    """
+    Returns A'A / s + B^-1, where the inverse matrix of B is block
+    diagonal with upper left block BI and a diagonal lower right
+    block with diagonal elements di.
+    """
+
+    m = BI.shape[0]
+    if sparse.issparse(AtA):
+        bi = sparse.diags(di)
+        if m > 0:
+            bi = sparse.block_diag((BI, bi))
+        return AtA / s + bi
+
+    qmat = AtA / s
+    qmat[0:m, 0:m] += BI
+    ix = np.arange(m, AtA.shape[0])
+    qmat[ix, ix] += di
+    return qmat
+
+
+def _smw_sparse(s, A, AtA, BI, di):
+    """
+    Solver and log determinant of s*I + A*B*A' for a sparse A, from a
+    single sparse factorization of A'A / s + B^-1.
+
+    See `_smw_solver` and `_smw_logdet` for the arguments.
+
+    Returns
+    -------
+    solver : function
+        A function that takes `rhs` as an input argument and returns
+        a solution to the linear system.
+    logdet : real
+        The log determinant of s*I + A*B*A' less that of B.
+    """
+
+    qsolve, qmat_logdet = _sparse_factor(_smw_qmat(s, AtA, BI, di))
+
+    def solver(rhs):
+        if sparse.issparse(rhs):
+            rhs = rhs.toarray()
+        ql = A.dot(qsolve(np.asarray(A.T.dot(rhs))))
+        return rhs / s - ql / s**2
+
+    return solver, A.shape[0] * np.log(s) + qmat_logdet
+
+
 def _smw_solver(s, A, AtA, BI, di):
     """
     Solves the system (s*I + A*B*A') * x = rhs for an arbitrary rhs.
@@ -441,24 +535,15 @@ def _smw_solver(s, A, AtA, BI, di):
     """
 
     # Use SMW identity
-    qmat = AtA / s
-    m = BI.shape[0]
-    qmat[0:m, 0:m] += BI
-    ix = np.arange(m, A.shape[1])
-    qmat[ix, ix] += di
     if sparse.issparse(A):
-        qi = sparse.linalg.inv(qmat)
-        qmati = A.dot(qi.T).T
-    else:
-        qmati = np.linalg.solve(qmat, A.T)
+        return _smw_sparse(s, A, AtA, BI, di)[0]
+
+    qmat = _smw_qmat(s, AtA, BI, di)
+    qmati = np.linalg.solve(qmat, A.T)
 
     def solver(rhs):
-        if sparse.issparse(A):
-            ql = qmati.dot(rhs)
-            ql = A.dot(ql)
-        else:
-            ql = np.dot(qmati, rhs)
-            ql = np.dot(A, ql)
+        ql = np.dot(qmati, rhs)
+        ql = np.dot(A, ql)
         rslt = rhs / s - ql / s**2
         if sparse.issparse(rslt):
             rslt = np.asarray(rslt.todense())
@@ -493,19 +578,33 @@ def _smw_logdet(s, A, AtA, BI, di, B_logdet):
     The log determinant of s*I + A*B*A'.
     """
 
+    if sparse.issparse(A):
+        return B_logdet + _smw_sparse(s, A, AtA, BI, di)[1]
+
     p = A.shape[0]
     ld = p * np.log(s)
-    qmat = AtA / s
-    m = BI.shape[0]
-    qmat[0:m, 0:m] += BI
-    ix = np.arange(m, A.shape[1])
-    qmat[ix, ix] += di
-    if sparse.issparse(qmat):
-        qmat = qmat.todense()
+    qmat = _smw_qmat(s, AtA, BI, di)
     _, ld1 = np.linalg.slogdet(qmat)
     return B_logdet + ld + ld1
 
 
+# A variance components formula giving indicators for the levels of a
+# single variable.
+_indicator_formula = re.compile(r"^\s*0\s*\+\s*C\(\s*(\w+)\s*\)\s*$")
+
+
+def _sparse_indicators(x):
+    """
+    Returns a sparse matrix of indicators for the sorted distinct
+    values of `x`.
+    """
+
+    codes, levels = pd.factorize(x, sort=True)
+    n = len(codes)
+    return sparse.csr_matrix((np.ones(n), (np.arange(n), codes)),
+                             shape=(n, len(levels)))
+
+
 class MixedLM(base.LikelihoodModel):
     """
     An object specifying a linear mixed effects model.  Use the `fit`
@@ -535,6 +634,10 @@ class MixedLM(base.LikelihoodModel):
         lower triangle of the random effects covariance matrix.
     missing : string
         The approach to missing data handling
+    numdiff : bool
+        If True, the score and Hessian are obtained by numerically
+        differentiating the log-likelihood rather than from their
+        analytic expressions.  See Notes.
 
     Notes
     -----
@@ -555,6 +658,15 @@ class MixedLM(base.LikelihoodModel):
     the covariance structure are set (using the `free` argument to
     `fit`) that cannot be expressed in terms of the Cholesky factor L.
 
+    Crossed random effects can be fit by placing all observations in
+    a single group and using sparse indicator matrices in `exog_vc`
+    (e.g. `from_formula` with `use_sparse=True`).  The log-likelihood
+    is then evaluated with a sparse Cholesky factorization, using
+    scikit-sparse (CHOLMOD) when it is installed and SuperLU
+    otherwise.  The analytic score and Hessian form dense arrays with
+    one column per random effect, so `numdiff=True` should be used
+    when there are many levels.
+
     Examples
     --------
     A basic mixed model with fixed effects for the columns of
@@ -593,7 +705,7 @@ class MixedLM(base.LikelihoodModel):
 
     def __init__(self, endog, exog, groups, exog_re=None,
                  exog_vc=None, use_sqrt=True, missing='none',
-                 **kwargs):
+                 numdiff=False, **kwargs):
 
         _allowed_kwargs = ["missing_idx", "design_info", "formula"]
         for x in kwargs.keys():
@@ -601,6 +713,7 @@ class MixedLM(base.LikelihoodModel):
                 raise ValueError("argument %s not permitted for MixedLM initialization" % x)
 
         self.use_sqrt = use_sqrt
+        self.numdiff = numdiff
 
         # Some defaults
         self.reml = True
@@ -629,7 +742,7 @@ class MixedLM(base.LikelihoodModel):
                                       exog_re=exog_re, missing=missing,
                                       **kwargs)
 
-        self._init_keys.extend(["use_sqrt", "exog_vc"])
+        self._init_keys.extend(["use_sqrt", "exog_vc", "numdiff"])
 
         self.k_fe = exog.shape[1] # Number of fixed effects parameters
 
@@ -716,6 +829,10 @@ class MixedLM(base.LikelihoodModel):
         # Precompute this
         self._lin, self._quad = self._reparam()
 
+        # The groups are stacked by size and random effects design
+        # (see `_buckets`) unless a random effects design is sparse
+        self._use_buckets = not any(sparse.issparse(x) for x in self._aex_r)
+
 
     def _setup_vcomp(self, exog_vc):
         if exog_vc is None:
@@ -903,6 +1020,13 @@ class MixedLM(base.LikelihoodModel):
                 for group_ix, group in enumerate(kylist):
                     ii = gb.groups[group]
                     vcg = vc_formula[vc_name]
+                    match = _indicator_formula.match(vcg)
+                    if use_sparse and match is not None:
+                        # Build the indicators directly, the dense
+                        # design matrix has one column per level.
+                        exog_vc[vc_name][group] = _sparse_indicators(
+                            data.loc[ii, match.group(1)])
+                        continue
                     mat = patsy.dmatrix(vcg, data.loc[ii, :], eval_env=eval_env,
                                         return_type='dataframe')
                     if use_sparse:
@@ -1166,6 +1290,10 @@ class MixedLM(base.LikelihoodModel):
                 mat = np.concatenate((self.exog_li[group_ix], self.endog_li[group_ix][:, None]), axis=1)
                 self._endex_li.append(mat)
 
+        if self._use_buckets:
+            sums = self._bucket_sums(np.zeros(self.k_fe), cov_re_inv, vcomp)
+            return np.linalg.solve(sums["xtvix"], sums["xtvir"])
+
         xtxy = 0.
         for group_ix, group in enumerate(self.group_labels):
             vc_var = self._expand_vcomp(vcomp, group)
@@ -1298,6 +1426,241 @@ class MixedLM(base.LikelihoodModel):
         return ex
 
 
+    @cache_readonly
+    def _buckets(self):
+        # The stacked copies of the data are only made when they are
+        # first used
+        return self._make_buckets()
+
+    def _make_buckets(self, max_groups=1000):
+        """
+        Stack the groups having the same number of observations and
+        the same random effects design.
+
+        Parameters
+        ----------
+        max_groups : integer
+            The largest number of groups in a bucket, larger sets of
+            groups are split so as to bound the size of the
+            temporaries in `_bucket_moments`.
+
+        Returns
+        -------
+        A list of dictionaries holding the stacked data of the groups
+        in each bucket.  The random effects design matrices need to be
+        dense, if one is sparse then the likelihood is evaluated group
+        by group.
+
+        Notes
+        -----
+        Each bucket also holds `dV`, an array of matrices E_j such
+        that the derivative of the marginal covariance matrix of a
+        group with respect to the j^th covariance parameter is
+        Z * E_j * Z', where Z is the random effects design matrix of
+        the group (including the variance components).
+        """
+
+        # The number of columns of each variance component in a group
+        def vc_cols(group):
+            return tuple(self.exog_vc[k][group].shape[1]
+                         if group in self.exog_vc[k] else 0
+                         for k in self._vc_names)
+
+        keys = OrderedDict()
+        for group_ix, group in enumerate(self.group_labels):
+            key = (len(self.endog_li[group_ix]), vc_cols(group))
+            keys.setdefault(key, []).append(group_ix)
+
+        k_re, k_re2 = self.k_re, self.k_re2
+        buckets = []
+        for (_, cols), group_ixs in keys.items():
+
+            # The variance component of each column of Z beyond the
+            # standard random effects
+            vc_ix = np.repeat(np.arange(self.k_vc), cols)
+            q = k_re + len(vc_ix)
+
+            dV = np.zeros((k_re2 + self.k_vc, q, q))
+            jj = 0
+            for j1 in range(k_re):
+                for j2 in range(j1 + 1):
+                    dV[jj, j1, j2] = dV[jj, j2, j1] = 1
+                    jj += 1
+            ix = np.arange(k_re, q)
+            dV[k_re2 + vc_ix, ix, ix] = 1
+
+            for i in range(0, len(group_ixs), max_groups):
+                gix = group_ixs[i:i + max_groups]
+                exog = np.array([self.exog_li[k] for k in gix])
+                exog_re = np.array([self._aex_r[k] if q > 0 else
+                                    np.empty((len(self.endog_li[k]), 0))
+                                    for k in gix])
+                buckets.append(dict(
+                    endog=np.array([self.endog_li[k] for k in gix]),
+                    exog=exog, exog_re=exog_re,
+                    ex2_r=np.array([self._aex_r2[k] if q > 0 else
+                                    np.empty((0, 0)) for k in gix]),
+                    ex_rx=np.einsum('gni,gnj->gij', exog_re, exog),
+                    exog2=np.einsum('gni,gnj->gij', exog, exog),
+                    vc_ix=vc_ix, dV=dV))
+
+        return buckets
+
+
+    def _bucket_moments(self, fe_params, cov_re_inv, vcomp):
+        """
+        A generator that yields the quadratic forms of the inverse
+        marginal covariance matrices of the groups in each bucket.
+
+        Parameters
+        ----------
+        fe_params : array-like
+            The fixed effects parameters, the residuals are taken
+            with respect to these.
+        cov_re_inv : array-like
+            The inverse of the random effects covariance matrix.
+        vcomp : array-like
+            The variance components parameters.
+
+        Yields
+        ------
+        A bucket and a dictionary of arrays with the groups in the
+        first axis: the log determinant of V less that of the random
+        effects covariance matrix (`logdet`), resid' V^{-1}
+        resid (`rvir`), exog' V^{-1} resid (`xtvir`), exog' V^{-1}
+        exog (`xtvix`), Z' V^{-1} Z (`zvz`), Z' V^{-1} resid (`zvir`)
+        and Z' V^{-1} exog (`zvx`), where V is the marginal
+        covariance matrix of a group and Z its random effects design
+        matrix.
+
+        Notes
+        -----
+        All the quantities follow from Z'Z, Z'exog and Z'resid by the
+        Sherman-Morrison-Woodbury identity V^{-1} = I - Z Q^{-1} Z',
+        where Q = Z'Z + B^{-1} (see `_smw_solver`), using stacked
+        solves and determinants of Q.
+        """
+
+        k_re = self.k_re
+        for bucket in self._buckets:
+
+            exog, exog_re = bucket["exog"], bucket["exog_re"]
+            ex2_r, ex_rx = bucket["ex2_r"], bucket["ex_rx"]
+            vc_ix = bucket["vc_ix"]
+            q = ex2_r.shape[1]
+
+            resid = bucket["endog"]
+            if self.k_fe > 0:
+                resid = resid - np.dot(exog, fe_params)
+
+            ex_rr = np.einsum('gni,gn->gi', exog_re, resid)
+            rr = np.einsum('gn,gn->g', resid, resid)
+            xr = np.einsum('gnj,gn->gj', exog, resid)
+
+            if q == 0:
+                zero = np.zeros((len(resid), 0))
+                yield bucket, dict(
+                    logdet=np.zeros(len(resid)), rvir=rr, xtvir=xr,
+                    xtvix=bucket["exog2"], zvz=ex2_r, zvir=zero,
+                    zvx=ex_rx)
+                continue
+
+            vc_var = vcomp[vc_ix]
+            qmat = ex2_r.copy()
+            qmat[:, 0:k_re, 0:k_re] += cov_re_inv
+            ix = np.arange(k_re, q)
+            qmat[:, ix, ix] += 1 / vc_var
+            _, logdet = np.linalg.slogdet(qmat)
+            logdet += np.sum(np.log(vc_var))
+
+            # Q^{-1} Z'resid, Q^{-1} Z'exog and Q^{-1} Z'Z
+            rhs = np.concatenate((ex_rr[:, :, None], ex_rx, ex2_r), axis=2)
+            sol = np.linalg.solve(qmat, rhs)
+            sol_r, sol_x = sol[:, :, 0], sol[:, :, 1:1 + self.k_fe]
+            sol_z = sol[:, :, 1 + self.k_fe:]
+
+            yield bucket, dict(
+                logdet=logdet,
+                rvir=rr - np.einsum('gi,gi->g', ex_rr, sol_r),
+                xtvir=xr - np.einsum('gij,gi->gj', ex_rx, sol_r),
+                xtvix=bucket["exog2"] - np.einsum('gij,gik->gjk', ex_rx,
+                                                  sol_x),
+                zvz=ex2_r - np.einsum('gij,gjk->gik', ex2_r, sol_z),
+                zvir=ex_rr - np.einsum('gij,gj->gi', ex2_r, sol_r),
+                zvx=ex_rx - np.einsum('gij,gjk->gik', ex2_r, sol_x))
+
+
+    def _bucket_sums(self, fe_params, cov_re_inv, vcomp, deriv=0):
+        """
+        Returns the sums over the groups of the quantities from which
+        the log-likelihood and its derivatives are computed.
+
+        Parameters
+        ----------
+        fe_params, cov_re_inv, vcomp :
+            See `_bucket_moments`.
+        deriv : integer
+            Additionally compute the sums needed for the score if 1,
+            and for the Hessian if 2.
+
+        Returns
+        -------
+        A dictionary with the sums over all groups of the moments of
+        `_bucket_moments`, and the following terms for the covariance
+        parameters, where dV_j is the derivative of V with respect to
+        the j^th covariance parameter:
+
+        * `dlv` : trace(V^{-1} dV_j)
+        * `rvavr` : resid' V^{-1} dV_j V^{-1} resid
+        * `xtax` : exog' V^{-1} dV_j V^{-1} exog
+        * `xtavr` (deriv=2) : exog' V^{-1} dV_j V^{-1} resid
+        * `rvavavr` (deriv=2) :
+          resid' V^{-1} dV_k V^{-1} dV_j V^{-1} resid
+        * `tvava` (deriv=2) : trace(V^{-1} dV_k V^{-1} dV_j)
+        * `xtavavx` (deriv=2) :
+          exog' V^{-1} dV_k V^{-1} dV_j V^{-1} exog
+        """
+
+        sums = {}
+
+        def add(key, value):
+            sums[key] = sums.get(key, 0.) + value
+
+        for bucket, mom in self._bucket_moments(fe_params, cov_re_inv,
+                                                vcomp):
+            add("logdet", mom["logdet"].sum())
+            add("rvir", mom["rvir"].sum())
+            add("xtvir", mom["xtvir"].sum(0))
+            add("xtvix", mom["xtvix"].sum(0))
+            if deriv == 0:
+                continue
+
+            dV, zvz, zvx = bucket["dV"], mom["zvz"], mom["zvx"]
+
+            # dV_j Z' V^{-1} resid and dV_j Z' V^{-1} exog
+            dvr = np.einsum('aij,gj->gai', dV, mom["zvir"])
+            dvx = np.einsum('aij,gjk->gaik', dV, zvx)
+
+            add("dlv", np.einsum('gij,aij->a', zvz, dV))
+            add("rvavr", np.einsum('gi,gai->a', mom["zvir"], dvr))
+            add("xtax", np.einsum('gij,gaik->ajk', zvx, dvx))
+            if deriv == 1:
+                continue
+
+            # Z' V^{-1} Z dV_j, stacked over the groups and parameters,
+            # and its products with Z' V^{-1} resid and Z' V^{-1} exog
+            zvdv = np.einsum('gij,ajk->gaik', zvz, dV)
+            zvdvr = np.einsum('gaij,gj->gai', zvdv, mom["zvir"])
+            zvdvx = np.einsum('gaij,gjk->gaik', zvdv, zvx)
+
+            add("xtavr", np.einsum('gij,gai->aj', zvx, dvr))
+            add("rvavavr", np.einsum('gbi,gai->ab', dvr, zvdvr))
+            add("tvava", np.einsum('gbij,gaji->ab', zvdv, zvdv))
+            add("xtavavx", np.einsum('gbij,gail->abjl', dvx, zvdvx))
+
+        return sums
+
+
     def loglike(self, params, profile_fe=True):
         """
         Evaluate the (profile) log-likelihood of the linear mixed
@@ -1362,30 +1725,43 @@ class MixedLM(base.LikelihoodModel):
         if (self.fe_pen is not None):
             likeval -= self.fe_pen.func(fe_params)
 
-        xvx, qf = 0., 0.
-        for k, group in enumerate(self.group_labels):
+        if self._use_buckets and cov_re_inv is not None:
+            sums = self._bucket_sums(fe_params, cov_re_inv, vcomp)
+            likeval -= (sums["logdet"] +
+                        self.n_groups * cov_re_logdet) / 2.
+            qf, xvx = sums["rvir"], sums["xtvix"]
+        else:
+            xvx, qf = 0., 0.
+            for k, group in enumerate(self.group_labels):
 
-            vc_var = self._expand_vcomp(vcomp, group)
-            cov_aug_logdet = cov_re_logdet + np.sum(np.log(vc_var))
+                vc_var = self._expand_vcomp(vcomp, group)
+                cov_aug_logdet = cov_re_logdet + np.sum(np.log(vc_var))
 
-            exog = self.exog_li[k]
-            ex_r, ex2_r = self._aex_r[k], self._aex_r2[k]
-            solver = _smw_solver(1., ex_r, ex2_r, cov_re_inv, 1 / vc_var)
+                exog = self.exog_li[k]
+                ex_r, ex2_r = self._aex_r[k], self._aex_r2[k]
 
-            resid = resid_all[self.row_indices[group]]
+                # Part 1 of the log likelihood (for both ML and REML)
+                if sparse.issparse(ex_r):
+                    # One factorization for the solver and determinant
+                    solver, ld = _smw_sparse(1., ex_r, ex2_r, cov_re_inv,
+                                             1 / vc_var)
+                    ld += cov_aug_logdet
+                else:
+                    solver = _smw_solver(1., ex_r, ex2_r, cov_re_inv,
+                                         1 / vc_var)
+                    ld = _smw_logdet(1., ex_r, ex2_r, cov_re_inv, 1 / vc_var, cov_aug_logdet)
+                likeval -= ld / 2.
 
-            # Part 1 of the log likelihood (for both ML and REML)
-            ld = _smw_logdet(1., ex_r, ex2_r, cov_re_inv, 1 / vc_var, cov_aug_logdet)
-            likeval -= ld / 2.
+                resid = resid_all[self.row_indices[group]]
 
-            # Part 2 of the log likelihood (for both ML and REML)
-            u = solver(resid)
-            qf += np.dot(resid, u)
+                # Part 2 of the log likelihood (for both ML and REML)
+                u = solver(resid)
+                qf += np.dot(resid, u)
 
-            # Adjustment for REML
-            if self.reml:
-                mat = solver(exog)
-                xvx += np.dot(exog.T, mat)
+                # Adjustment for REML
+                if self.reml:
+                    mat = solver(exog)
+                    xvx += np.dot(exog.T, mat)
 
         if self.reml:
             likeval -= (self.n_totobs - self.k_fe) * np.log(qf) / 2.
@@ -1435,15 +1811,16 @@ class MixedLM(base.LikelihoodModel):
                 yield jj, mat_l, mat_r, vsl, vsr, j1 == j2
                 jj += 1
 
-        # Variance components
-        for ky in self._vc_names:
+        # Variance components, indexed by their position in
+        # `_vc_names` whether or not the group has all of them
+        for j, ky in enumerate(self._vc_names):
+            jj = self.k_re2 + j
+            if max_ix is not None and jj > max_ix:
+                return
             if group in self.exog_vc[ky]:
-                if max_ix is not None and jj > max_ix:
-                    return
                 mat = self.exog_vc[ky][group]
                 axmat = solver(mat)
                 yield jj, mat, mat, axmat, axmat, True
-                jj += 1
 
 
     def score(self, params, profile_fe=True):
@@ -1462,6 +1839,9 @@ class MixedLM(base.LikelihoodModel):
                                                self.k_re, self.use_sqrt,
                                                has_fe=False)
 
+        if self.numdiff:
+            return self._score_numdiff(params, profile_fe)
+
         if profile_fe:
             params.fe_params = self.get_fe_params(params.cov_re, params.vcomp)
 
@@ -1481,6 +1861,29 @@ class MixedLM(base.LikelihoodModel):
             return np.concatenate((score_fe, score_re, score_vc))
 
 
+    def _score_numdiff(self, params, profile_fe):
+        """
+        Returns the score vector of the log-likelihood by central
+        differences, in the parameterization of `score`.
+        """
+
+        has_fe = not profile_fe
+        packed = params.get_packed(use_sqrt=self.use_sqrt, has_fe=has_fe)
+
+        def loglike(x):
+            par = MixedLMParams.from_packed(x, self.k_fe, self.k_re,
+                                            self.use_sqrt, has_fe=has_fe)
+            return self.loglike(par, profile_fe=profile_fe)
+
+        score = np.atleast_1d(nd.approx_fprime(packed, loglike,
+                                               centered=True))
+
+        if self._freepat is not None:
+            score *= self._freepat.get_packed(use_sqrt=False, has_fe=has_fe)
+
+        return score
+
+
     def score_full(self, params, calc_fe):
         """
         Returns the score with respect to untransformed parameters.
@@ -1562,57 +1965,67 @@ class MixedLM(base.LikelihoodModel):
         # resid' V^{-1} dV/dQ_jj V^{-1} resid (a scalar)
         rvavr = np.zeros(self.k_re2 + self.k_vc)
 
-        for group_ix, group in enumerate(self.group_labels):
-
-            vc_var = self._expand_vcomp(vcomp, group)
-
-            exog = self.exog_li[group_ix]
-            ex_r, ex2_r = self._aex_r[group_ix], self._aex_r2[group_ix]
-            solver = _smw_solver(1., ex_r, ex2_r, cov_re_inv, 1 / vc_var)
+        if self._use_buckets and cov_re_inv is not None:
+            sums = self._bucket_sums(fe_params, cov_re_inv, vcomp, deriv=1)
+            if self.k_re > 0:
+                score_re -= 0.5 * sums["dlv"][0:self.k_re2]
+            if self.k_vc > 0:
+                score_vc -= 0.5 * sums["dlv"][self.k_re2:]
+            rvir, xtvir, xtvix = sums["rvir"], sums["xtvir"], sums["xtvix"]
+            xtax, rvavr = list(sums["xtax"]), sums["rvavr"]
+        else:
+            for group_ix, group in enumerate(self.group_labels):
 
-            # The residuals
-            resid = self.endog_li[group_ix]
-            if self.k_fe > 0:
-                expval = np.dot(exog, fe_params)
-                resid = resid - expval
+                vc_var = self._expand_vcomp(vcomp, group)
 
-            if self.reml:
-                viexog = solver(exog)
-                xtvix += np.dot(exog.T, viexog)
+                exog = self.exog_li[group_ix]
+                ex_r, ex2_r = self._aex_r[group_ix], self._aex_r2[group_ix]
+                solver = _smw_solver(1., ex_r, ex2_r, cov_re_inv, 1 / vc_var)
 
-            # Contributions to the covariance parameter gradient
-            vir = solver(resid)
-            for jj, matl, matr, vsl, vsr, sym in self._gen_dV_dPar(ex_r, solver, group):
-                dlv[jj] = _dotsum(matr, vsl)
-                if not sym:
-                    dlv[jj] += _dotsum(matl, vsr)
-
-                ul = _dot(vir, matl)
-                ur = ul.T if sym else _dot(matr.T, vir)
-                ulr = np.dot(ul, ur)
-                rvavr[jj] += ulr
-                if not sym:
-                    rvavr[jj] += ulr.T
+                # The residuals
+                resid = self.endog_li[group_ix]
+                if self.k_fe > 0:
+                    expval = np.dot(exog, fe_params)
+                    resid = resid - expval
 
                 if self.reml:
-                    ul = _dot(viexog.T, matl)
-                    ur = ul.T if sym else _dot(matr.T, viexog)
+                    viexog = solver(exog)
+                    xtvix += np.dot(exog.T, viexog)
+
+                # Contributions to the covariance parameter gradient
+                vir = solver(resid)
+                dlv[:] = 0
+                for jj, matl, matr, vsl, vsr, sym in self._gen_dV_dPar(ex_r, solver, group):
+                    dlv[jj] = _dotsum(matr, vsl)
+                    if not sym:
+                        dlv[jj] += _dotsum(matl, vsr)
+
+                    ul = _dot(vir, matl)
+                    ur = ul.T if sym else _dot(matr.T, vir)
                     ulr = np.dot(ul, ur)
-                    xtax[jj] += ulr
+                    rvavr[jj] += ulr
                     if not sym:
-                        xtax[jj] += ulr.T
+                        rvavr[jj] += ulr.T
 
-            # Contribution of log|V| to the covariance parameter
-            # gradient.
-            if self.k_re > 0:
-                score_re -= 0.5 * dlv[0:self.k_re2]
-            if self.k_vc > 0:
-                score_vc -= 0.5 * dlv[self.k_re2:]
+                    if self.reml:
+                        ul = _dot(viexog.T, matl)
+                        ur = ul.T if sym else _dot(matr.T, viexog)
+                        ulr = np.dot(ul, ur)
+                        xtax[jj] += ulr
+                        if not sym:
+                            xtax[jj] += ulr.T
 
-            rvir += np.dot(resid, vir)
+                # Contribution of log|V| to the covariance parameter
+                # gradient.
+                if self.k_re > 0:
+                    score_re -= 0.5 * dlv[0:self.k_re2]
+                if self.k_vc > 0:
+                    score_vc -= 0.5 * dlv[self.k_re2:]
 
-            if calc_fe:
-                xtvir += np.dot(exog.T, vir)
+                rvir += np.dot(resid, vir)
+
+                if calc_fe:
+                    xtvir += np.dot(exog.T, vir)
 
         fac = self.n_totobs
         if self.reml:
@@ -1709,6 +2122,16 @@ class MixedLM(base.LikelihoodModel):
                                                use_sqrt=self.use_sqrt,
                                                has_fe=True)
 
+        if self.numdiff:
+            packed = params.get_packed(use_sqrt=False, has_fe=True)
+
+            def loglike(x):
+                par = MixedLMParams.from_packed(x, self.k_fe, self.k_re,
+                                                use_sqrt=False, has_fe=True)
+                return self.loglike(par, profile_fe=False)
+
+            return nd.approx_hess(packed, loglike)
+
         fe_params = params.fe_params
         vcomp = params.vcomp
         cov_re = params.cov_re
@@ -1733,84 +2156,93 @@ class MixedLM(base.LikelihoodModel):
         B = np.zeros(m)
         D = np.zeros((m, m))
         F = [[0.] * m for k in range(m)]
-        for k, group in enumerate(self.group_labels):
+        if self._use_buckets:
+            sums = self._bucket_sums(fe_params, cov_re_inv, vcomp, deriv=2)
+            rvir, xtvix = sums["rvir"], sums["xtvix"]
+            xtax, B = list(sums["xtax"]), sums["rvavr"]
+            hess_fere += sums["xtavr"]
+            hess_re += sums["tvava"] / 2
+            D += 2 * sums["rvavavr"]
+            F = [[x + x.T for x in row] for row in sums["xtavavx"]]
+        else:
+            for k, group in enumerate(self.group_labels):
 
-            vc_var = self._expand_vcomp(vcomp, group)
+                vc_var = self._expand_vcomp(vcomp, group)
 
-            exog = self.exog_li[k]
-            ex_r, ex2_r = self._aex_r[k], self._aex_r2[k]
-            solver = _smw_solver(1., ex_r, ex2_r, cov_re_inv, 1 / vc_var)
+                exog = self.exog_li[k]
+                ex_r, ex2_r = self._aex_r[k], self._aex_r2[k]
+                solver = _smw_solver(1., ex_r, ex2_r, cov_re_inv, 1 / vc_var)
 
-            # The residuals
-            resid = self.endog_li[k]
-            if self.k_fe > 0:
-                expval = np.dot(exog, fe_params)
-                resid = resid - expval
-
-            viexog = solver(exog)
-            xtvix += np.dot(exog.T, viexog)
-            vir = solver(resid)
-            rvir += np.dot(resid, vir)
+                # The residuals
+                resid = self.endog_li[k]
+                if self.k_fe > 0:
+                    expval = np.dot(exog, fe_params)
+                    resid = resid - expval
 
-            for jj1, matl1, matr1, vsl1, vsr1, sym1 in self._gen_dV_dPar(ex_r, solver, group):
+                viexog = solver(exog)
+                xtvix += np.dot(exog.T, viexog)
+                vir = solver(resid)
+                rvir += np.dot(resid, vir)
 
-                ul = _dot(viexog.T, matl1)
-                ur = _dot(matr1.T, vir)
-                hess_fere[jj1, :] += np.dot(ul, ur)
-                if not sym1:
-                    ul = _dot(viexog.T, matr1)
-                    ur = _dot(matl1.T, vir)
-                    hess_fere[jj1, :] += np.dot(ul, ur)
+                for jj1, matl1, matr1, vsl1, vsr1, sym1 in self._gen_dV_dPar(ex_r, solver, group):
 
-                if self.reml:
                     ul = _dot(viexog.T, matl1)
-                    ur = ul if sym1 else np.dot(viexog.T, matr1)
-                    ulr = _dot(ul, ur.T)
-                    xtax[jj1] += ulr
+                    ur = _dot(matr1.T, vir)
+                    hess_fere[jj1, :] += np.dot(ul, ur)
                     if not sym1:
-                        xtax[jj1] += ulr.T
-
-                ul = _dot(vir, matl1)
-                ur = ul if sym1 else _dot(vir, matr1)
-                B[jj1] += np.dot(ul, ur) * (1 if sym1 else 2)
+                        ul = _dot(viexog.T, matr1)
+                        ur = _dot(matl1.T, vir)
+                        hess_fere[jj1, :] += np.dot(ul, ur)
 
-                # V^{-1} * dV/d_theta
-                E = [(vsl1, matr1)]
-                if not sym1:
-                    E.append((vsr1, matl1))
+                    if self.reml:
+                        ul = _dot(viexog.T, matl1)
+                        ur = ul if sym1 else np.dot(viexog.T, matr1)
+                        ulr = _dot(ul, ur.T)
+                        xtax[jj1] += ulr
+                        if not sym1:
+                            xtax[jj1] += ulr.T
+
+                    ul = _dot(vir, matl1)
+                    ur = ul if sym1 else _dot(vir, matr1)
+                    B[jj1] += np.dot(ul, ur) * (1 if sym1 else 2)
+
+                    # V^{-1} * dV/d_theta
+                    E = [(vsl1, matr1)]
+                    if not sym1:
+                        E.append((vsr1, matl1))
 
-                for jj2, matl2, matr2, vsl2, vsr2, sym2 in self._gen_dV_dPar(ex_r, solver, group, jj1):
+                    for jj2, matl2, matr2, vsl2, vsr2, sym2 in self._gen_dV_dPar(ex_r, solver, group, jj1):
 
-                    re = sum([_multi_dot_three(matr2.T, x[0], x[1].T) for x in E])
-                    vt = 2 * _dot(_multi_dot_three(vir[None, :], matl2, re), vir[:, None])
+                        re = sum([_multi_dot_three(matr2.T, x[0], x[1].T) for x in E])
+                        vt = 2 * _dot(_multi_dot_three(vir[None, :], matl2, re), vir[:, None])
 
-                    if not sym2:
-                        le = sum([_multi_dot_three(matl2.T, x[0], x[1].T) for x in E])
-                        vt += 2 * _dot(_multi_dot_three(vir[None, :], matr2, le), vir[:, None])
+                        if not sym2:
+                            le = sum([_multi_dot_three(matl2.T, x[0], x[1].T) for x in E])
+                            vt += 2 * _dot(_multi_dot_three(vir[None, :], matr2, le), vir[:, None])
 
-                    D[jj1, jj2] += vt
-                    if jj1 != jj2:
-                        D[jj2, jj1] += vt
+                        D[jj1, jj2] += vt
+                        if jj1 != jj2:
+                            D[jj2, jj1] += vt
 
-                    rt = _dotsum(vsl2, re.T) / 2
-                    if not sym2:
-                        rt += _dotsum(vsr2, le.T) / 2
+                        rt = _dotsum(vsl2, re.T) / 2
+                        if not sym2:
+                            rt += _dotsum(vsr2, le.T) / 2
 
-                    hess_re[jj1, jj2] += rt
-                    if jj1 != jj2:
-                        hess_re[jj2, jj1] += rt
+                        hess_re[jj1, jj2] += rt
+                        if jj1 != jj2:
+                            hess_re[jj2, jj1] += rt
 
-                    if self.reml:
-                        ev = sum([_dot(x[0], _dot(x[1].T, viexog)) for x in E])
-                        u1 = _dot(viexog.T, matl2)
-                        u2 = _dot(matr2.T, ev)
-                        um = np.dot(u1, u2)
-                        F[jj1][jj2] += um + um.T
-                        if not sym2:
-                            u1 = np.dot(viexog.T, matr2)
-                            u2 = np.dot(matl2.T, ev)
+                        if self.reml:
+                            ev = sum([_dot(x[0], _dot(x[1].T, viexog)) for x in E])
+                            u1 = _dot(viexog.T, matl2)
+                            u2 = _dot(matr2.T, ev)
                             um = np.dot(u1, u2)
                             F[jj1][jj2] += um + um.T
+                            if not sym2:
+                                u1 = np.dot(viexog.T, matr2)
+                                u2 = np.dot(matl2.T, ev)
+                                um = np.dot(u1, u2)
+                                F[jj1][jj2] += um + um.T
 
         hess_fe -= fac * xtvix / rvir
         hess_re = hess_re - 0.5 * fac * (D/rvir - np.outer(B, B) / rvir**2)
@@ -1863,24 +2295,27 @@ class MixedLM(base.LikelihoodModel):
         except np.linalg.LinAlgError:
             cov_re_inv = None
 
-        qf = 0.
-        for group_ix, group in enumerate(self.group_labels):
+        if self._use_buckets and cov_re_inv is not None:
+            qf = self._bucket_sums(fe_params, cov_re_inv, vcomp)["rvir"]
+        else:
+            qf = 0.
+            for group_ix, group in enumerate(self.group_labels):
 
-            vc_var = self._expand_vcomp(vcomp, group)
+                vc_var = self._expand_vcomp(vcomp, group)
 
-            exog = self.exog_li[group_ix]
-            ex_r, ex2_r = self._aex_r[group_ix], self._aex_r2[group_ix]
+                exog = self.exog_li[group_ix]
+                ex_r, ex2_r = self._aex_r[group_ix], self._aex_r2[group_ix]
 
-            solver = _smw_solver(1., ex_r, ex2_r, cov_re_inv, 1 / vc_var)
+                solver = _smw_solver(1., ex_r, ex2_r, cov_re_inv, 1 / vc_var)
 
-            # The residuals
-            resid = self.endog_li[group_ix]
-            if self.k_fe > 0:
-                expval = np.dot(exog, fe_params)
-                resid = resid - expval
+                # The residuals
+                resid = self.endog_li[group_ix]
+                if self.k_fe > 0:
+                    expval = np.dot(exog, fe_params)
+                    resid = resid - expval
 
-            mat = solver(resid)
-            qf += np.dot(resid, mat)
+                mat = solver(resid)
+                qf += np.dot(resid, mat)
 
         if self.reml:
             qf /= (self.n_totobs - self.k_fe)
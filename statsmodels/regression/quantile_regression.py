@@ -3,7 +3,9 @@
 '''
 Quantile regression model
 
-Model parameters are estimated using iterated reweighted least squares. The
+Model parameters are estimated using iterated reweighted least squares or
+using the Frisch-Newton interior point algorithm, optionally combined with
+the preprocessing of Portnoy and Koenker (1997) for large samples. The
 asymptotic covariance matrix estimated using kernel density estimation.
 
 Author: Vincent Arel-Bundock
@@ -21,7 +23,7 @@ from statsmodels.compat.python import range
 import numpy as np
 import warnings
 import scipy.stats as stats
-from scipy.linalg import pinv
+from scipy.linalg import pinv, cholesky, solve_triangular
 from scipy.stats import norm
 from statsmodels.tools.tools import chain_dot
 from statsmodels.compat.numpy import np_matrix_rank
@@ -36,7 +38,7 @@ class QuantReg(RegressionModel):
     '''Quantile Regression
 
     Estimate a quantile regression model using iterative reweighted least
-    squares.
+    squares or the Frisch-Newton interior point method.
 
     Parameters
     ----------
@@ -73,6 +75,10 @@ class QuantReg(RegressionModel):
     * Chamberlain, G. (1994). Quantile regression, censoring, and the structure of wages. In Advances in Econometrics, Vol. 1: Sixth World Congress, ed. C. A. Sims, 171-209. Cambridge: Cambridge University Press.
     * Hall, P., and S. Sheather. (1988). On the distribution of the Studentized quantile. Journal of the Royal Statistical Society, Series B 50: 381-391.
 
+    Interior point methods (used by the fit method):
+
+    * Portnoy, S. and R. Koenker (1997). The Gaussian hare and the Laplacian tortoise: computability of squared-error versus absolute-error estimators. Statistical Science 12: 279-300.
+
     Keywords: Least Absolute Deviation(LAD) Regression, Quantile Regression,
     Regression, Robust Estimation.
     '''
@@ -87,8 +93,8 @@ class QuantReg(RegressionModel):
         return data
 
     def fit(self, q=.5, vcov='robust', kernel='epa', bandwidth='hsheather',
-            max_iter=1000, p_tol=1e-6, **kwargs):
-        '''Solve by Iterative Weighted Least Squares
+            max_iter=1000, p_tol=1e-6, method='irls', seed=0, **kwargs):
+        """Estimate a quantile regression model
 
         Parameters
         ----------
@@ -116,9 +122,84 @@ class QuantReg(RegressionModel):
             - hsheather: Hall-Sheather (1988)
             - bofinger: Bofinger (1975)
             - chamberlain: Chamberlain (1994)
-        '''
 
-        if q < 0 or q > 1:
+        max_iter : int
+            Maximum number of iterations of the solver.
+        p_tol : float
+            Convergence tolerance. For ``irls`` this is the largest change
+            in the parameters, for ``fn`` and ``pfn`` it is the duality gap
+            of the linear program.
+        method : string
+            Algorithm used to compute the parameters:
+
+            - irls : iteratively reweighted least squares
+            - fn : Frisch-Newton interior point method (Portnoy and Koenker,
+              1997)
+            - pfn : Frisch-Newton interior point method after the
+              preprocessing of Portnoy and Koenker (1997), which solves the
+              problem on a subsample and a few pseudo-observations. This is
+              much faster than ``fn`` if nobs is large.
+
+        seed : int or RandomState
+            Seed or random number generator for the subsamples of ``pfn``.
+            The default is 0, so that the fit does not depend on, and does
+            not change, the state of numpy's global random number generator.
+
+        Returns
+        -------
+        results : QuantRegResults
+
+        See Also
+        --------
+        fit_quantiles : fit the model for several quantiles in one call
+
+        Notes
+        -----
+        ``fn`` and ``pfn`` require that exog has full column rank. The
+        subsample of ``pfn`` only affects the computing time, the solution
+        is checked against all observations.
+        """
+
+        return self.fit_quantiles([q], vcov=vcov, kernel=kernel,
+                                  bandwidth=bandwidth, max_iter=max_iter,
+                                  p_tol=p_tol, method=method, seed=seed,
+                                  **kwargs)[0]
+
+    def fit_quantiles(self, q, vcov='robust', kernel='epa',
+                      bandwidth='hsheather', max_iter=1000, p_tol=1e-6,
+                      method='irls', seed=0, **kwargs):
+        """Estimate a quantile regression model for several quantiles
+
+        Parameters
+        ----------
+        q : array-like
+            Quantiles, each of which must be between 0 and 1
+        vcov, kernel, bandwidth, max_iter, p_tol, seed
+            See `fit`.
+        method : string
+            ``irls``, ``fn`` or ``pfn``, see `fit`. The default is ``irls``,
+            as in `fit`.
+
+        Returns
+        -------
+        results : list of QuantRegResults
+            The results for each element of `q`.
+
+        Notes
+        -----
+        With ``fn`` all quantiles start from the same least squares fit.
+        If nobs is small, the interior point iterations for several
+        quantiles run together, and a quantile leaves the iterations once it
+        has converged. With ``pfn`` the preliminary fit on the subsample is
+        computed for all quantiles in one call, and the subsample design is
+        factored only once. The cross product of exog that is used in the
+        covariance matrix is computed once for all quantiles.
+        """
+
+        q = np.atleast_1d(np.asarray(q, dtype=np.float64))
+        if q.ndim != 1:
+            raise ValueError('q must be a scalar or a 1-d array')
+        if np.any(q < 0) or np.any(q > 1):
             raise Exception('p must be between 0 and 1')
 
         kern_names = ['biw', 'cos', 'epa', 'gau', 'par']
@@ -136,13 +217,58 @@ class QuantReg(RegressionModel):
         else:
             raise Exception("bandwidth must be in 'hsheather', 'bofinger', 'chamberlain'")
 
-        endog = self.endog
-        exog = self.exog
-        nobs = self.nobs
+        if vcov not in ('robust', 'iid'):
+            raise Exception("vcov must be 'robust' or 'iid'")
+
+        if method not in ('irls', 'fn', 'pfn'):
+            raise ValueError("method must be 'irls', 'fn' or 'pfn'")
+
         exog_rank = np_matrix_rank(self.exog)
         self.rank = exog_rank
         self.df_model = float(self.rank - self.k_constant)
         self.df_resid = self.nobs - self.rank
+
+        if method == 'irls':
+            fits = [self._fit_irls(qi, max_iter, p_tol) for qi in q]
+        else:
+            if exog_rank < self.exog.shape[1]:
+                raise ValueError("method '%s' requires exog to have full "
+                                 "column rank" % method)
+            if np.any(q <= 0) or np.any(q >= 1):
+                raise ValueError("method '%s' requires 0 < q < 1" % method)
+            if method == 'fn':
+                params, n_iter = _fn_solve(self.exog, self.endog, q,
+                                           max_iter, p_tol)
+            else:
+                params, n_iter = _pfn_solve(self.exog, self.endog, q,
+                                            max_iter, p_tol, seed=seed)
+            if np.any(n_iter >= max_iter):
+                warnings.warn("Maximum number of iterations (" +
+                              str(max_iter) + ") reached.",
+                              IterationLimitWarning)
+            fits = [(params[:, j], n_iter[j], None) for j in range(len(q))]
+
+        xtxi = pinv(np.dot(self.exog.T, self.exog))
+        results = []
+        for qi, (beta, n_iter, history) in zip(q, fits):
+            lfit = self._make_results(qi, beta, vcov, kernel, bandwidth,
+                                      xtxi)
+            lfit.iterations = n_iter
+            lfit.history = history
+            results.append(RegressionResultsWrapper(lfit))
+
+        return results
+
+    def _fit_irls(self, q, max_iter, p_tol):
+        """
+        Solve by Iterative Weighted Least Squares
+
+        Returns the parameters, the number of iterations and the history.
+        """
+
+        endog = self.endog
+        exog = self.exog
+        exog_rank = self.rank
         n_iter = 0
         xstar = exog
 
@@ -192,11 +318,24 @@ class QuantReg(RegressionModel):
             warnings.warn("Maximum number of iterations (" + str(max_iter) + 
                           ") reached.", IterationLimitWarning)
 
+        return beta, n_iter, history
+
+    def _make_results(self, q, beta, vcov, kernel, bandwidth, xtxi):
+        """
+        Create the results instance for the parameters of quantile q
+
+        `xtxi` is the pseudo-inverse of exog.T * exog.
+        """
+
+        endog = self.endog
+        exog = self.exog
+        nobs = self.nobs
+
         e = endog - np.dot(exog, beta)
         # Greene (2008, p.407) writes that Stata 6 uses this bandwidth:
         # h = 0.9 * np.std(e) / (nobs**0.2)
         # Instead, we calculate bandwidth as in Stata 12
-        iqre = stats.scoreatpercentile(e, 75) - stats.scoreatpercentile(e, 25)
+        iqre = np.diff(np.percentile(e, [25, 75]))[0]
         h = bandwidth(nobs, q)
         h = min(np.std(endog),
                 iqre / 1.34) * (norm.ppf(q + h) - norm.ppf(q - h))
@@ -205,23 +344,317 @@ class QuantReg(RegressionModel):
 
         if vcov == 'robust':
             d = np.where(e > 0, (q/fhat0)**2, ((1-q)/fhat0)**2)
-            xtxi = pinv(np.dot(exog.T, exog))
             xtdx = np.dot(exog.T * d[np.newaxis, :], exog)
             vcov = chain_dot(xtxi, xtdx, xtxi)
-        elif vcov == 'iid':
-            vcov = (1. / fhat0)**2 * q * (1 - q) * pinv(np.dot(exog.T, exog))
         else:
-            raise Exception("vcov must be 'robust' or 'iid'")
+            vcov = (1. / fhat0)**2 * q * (1 - q) * xtxi
 
         lfit = QuantRegResults(self, beta, normalized_cov_params=vcov)
 
         lfit.q = q
-        lfit.iterations = n_iter
         lfit.sparsity = 1. / fhat0
         lfit.bandwidth = h
-        lfit.history = history
 
-        return RegressionResultsWrapper(lfit)
+        return lfit
+
+
+def _weighted_gram(exog, weights):
+    """
+    Compute exog.T * diag(weights[:, j]) * exog for each column j
+
+    Returns an array with shape (m, k, k), where m is the number of columns
+    of `weights` and k is the number of columns of `exog`.
+    """
+    k_vars = exog.shape[1]
+    gram = np.empty((weights.shape[1], k_vars, k_vars))
+    for i in range(k_vars):
+        gram[:, i, :] = np.dot((exog[:, i:i+1] * weights).T, exog)
+    return gram
+
+
+def _step_length(v, dv):
+    """
+    Largest step t for each column such that v + t * dv >= 0, for v >= 0
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # fmin skips the nan of 0 / 0, zero entries that do not move
+        t = np.fmin.reduce(dv / v, axis=0)
+        return np.where(t < 0, -1 / t, np.inf)
+
+
+def _fn_solve(exog, endog, q, max_iter=1000, p_tol=1e-6, step=0.99995):
+    """
+    Frisch-Newton interior point method for quantile regression
+
+    The dual of the quantile regression problem
+
+        max_a  endog' a  subject to  exog' a = (1 - q) exog' 1,  0 <= a <= 1
+
+    is solved with Mehrotra's predictor-corrector method, following
+    `rq.fit.fnb` of the R package quantreg.  The parameters are the
+    Lagrange multipliers of the equality constraints.
+
+    Parameters
+    ----------
+    exog : ndarray
+        nobs x k design matrix with full column rank
+    endog : ndarray
+        1-d response
+    q : ndarray
+        1-d array of quantiles in (0, 1).
+    max_iter : int
+        Maximum number of iterations.
+    p_tol : float
+        Tolerance for the duality gap.
+    step : float
+        Fraction of the largest feasible step that is taken.
+
+    Returns
+    -------
+    params : ndarray
+        k x len(q) array of parameters
+    n_iter : ndarray
+        Number of iterations for each quantile
+
+    Notes
+    -----
+    All quantiles start from the same least squares fit. The iterations
+    for several quantiles run at the same time on (nobs, m) arrays, as
+    long as these stay small enough to be cache friendly; a quantile
+    leaves the iterations once it has converged.  For large nobs the
+    quantiles are solved one at a time.
+    """
+    nobs, k_vars = exog.shape
+    q = np.asarray(q, dtype=np.float64)
+    n_q = len(q)
+
+    beta0 = np.linalg.lstsq(exog, endog, rcond=-1)[0]
+    resid0 = endog - np.dot(exog, beta0)
+    resid0 = resid0 + 0.001 * (resid0 == 0)
+
+    params = np.empty((k_vars, n_q))
+    n_iter = np.zeros(n_q, dtype=int)
+    block = max(1, _FN_BLOCK_SIZE // nobs)
+    for start in range(0, n_q, block):
+        ix = slice(start, start + block)
+        params[:, ix], n_iter[ix] = _fn_iterate(exog, endog, q[ix], beta0,
+                                                resid0, max_iter, p_tol,
+                                                step)
+
+    return params, n_iter
+
+
+# Largest number of elements of the (nobs, m) arrays in _fn_iterate
+_FN_BLOCK_SIZE = 2**16
+
+
+def _fn_iterate(exog, endog, q, beta0, resid0, max_iter, p_tol, step):
+    """
+    Interior point iterations for the quantiles in q, see _fn_solve
+
+    `beta0` are the least squares estimates and `resid0` their residuals,
+    with exact zeros perturbed.
+    """
+    nobs, k_vars = exog.shape
+    n_q = len(q)
+
+    params = np.empty((k_vars, n_q))
+    n_iter = np.zeros(n_q, dtype=int)
+
+    # The gap is a difference of sums of the size of sum(abs(endog)) and can
+    # not get much smaller than that in floating point arithmetic
+    tol = max(p_tol, 1e-10 * np.abs(endog).sum())
+
+    # Primal variables x and s = 1 - x, dual variables y, z and w.  z and w
+    # are shifted away from zero, which keeps the iterates better centered
+    # than starting on the boundary and avoids many short steps for
+    # quantiles in the tails.
+    x = np.tile(1 - q, (nobs, 1))
+    s = 1 - x
+    y = np.tile(-beta0[:, None], (1, n_q))
+    shift = 0.1 * np.abs(resid0).mean()
+    z = np.tile(np.clip(-resid0, 0, None)[:, None] + shift, (1, n_q))
+    w = np.tile(np.clip(resid0, 0, None)[:, None] + shift, (1, n_q))
+    b = np.dot(exog.T, x)
+    c = -endog
+
+    active = np.arange(n_q)
+    it = 0
+    while True:
+        gap = np.dot(c, x) - (b * y).sum(0) + w.sum(0)
+        done = gap < tol
+        if it >= max_iter:
+            done[:] = True
+        if done.any():
+            params[:, active[done]] = -y[:, done]
+            n_iter[active[done]] = it
+            keep = ~done
+            if not keep.any():
+                break
+            active = active[keep]
+            x, s, y, z, w, b = (x[:, keep], s[:, keep], y[:, keep],
+                                z[:, keep], w[:, keep], b[:, keep])
+        it += 1
+
+        # Affine scaling (predictor) step
+        xinv = 1 / x
+        sinv = 1 / s
+        d = 1 / (z * xinv + w * sinv)
+        r = z - w
+        gram = _weighted_gram(exog, d)
+        dy = np.linalg.solve(gram, np.dot(exog.T, d * r).T[:, :, None])
+        dy = dy[:, :, 0].T
+        dx = d * (np.dot(exog, dy) - r)
+        dz = -z * (dx * xinv + 1)
+        dw = -w * (1 - dx * sinv)
+
+        fp = np.minimum(step * np.minimum(_step_length(x, dx),
+                                          _step_length(s, -dx)), 1)
+        fd = np.minimum(step * np.minimum(_step_length(w, dw),
+                                          _step_length(z, dz)), 1)
+
+        # Centering and corrector step where the full step is infeasible
+        corr = np.minimum(fp, fd) < 1
+        if corr.any():
+            mu = (z * x + w * s).sum(0)
+            g = ((z + fd * dz) * (x + fp * dx) +
+                 (w + fd * dw) * (s - fp * dx)).sum(0)
+            mu = mu * (g / mu)**3 / (2 * nobs)
+            # second order terms, dx * dz / x and ds * dw / s
+            dxdz = dx * dz * xinv
+            dsdw = -dx * dw * sinv
+            xi = mu * (xinv - sinv)
+            rhs = d * (r - xi + dxdz - dsdw)
+            dy2 = np.linalg.solve(gram, np.dot(exog.T, rhs).T[:, :, None])
+            dy2 = dy2[:, :, 0].T
+            dx2 = d * (np.dot(exog, dy2) + xi - r - dxdz + dsdw)
+            dz2 = mu * xinv - z - xinv * z * dx2 - dxdz
+            dw2 = mu * sinv - w + sinv * w * dx2 - dsdw
+            fp2 = np.minimum(step * np.minimum(_step_length(x, dx2),
+                                               _step_length(s, -dx2)), 1)
+            fd2 = np.minimum(step * np.minimum(_step_length(w, dw2),
+                                               _step_length(z, dz2)), 1)
+            if corr.all():
+                dx, dy, dz, dw, fp, fd = dx2, dy2, dz2, dw2, fp2, fd2
+            else:
+                dx = np.where(corr, dx2, dx)
+                dy = np.where(corr, dy2, dy)
+                dz = np.where(corr, dz2, dz)
+                dw = np.where(corr, dw2, dw)
+                fp = np.where(corr, fp2, fp)
+                fd = np.where(corr, fd2, fd)
+
+        dx *= fp
+        x += dx
+        s -= dx
+        y += fd * dy
+        w += fd * dw
+        z += fd * dz
+
+    return params, n_iter
+
+
+def _pfn_solve(exog, endog, q, max_iter=1000, p_tol=1e-6, m_factor=0.8,
+               seed=0):
+    """
+    Frisch-Newton interior point method with preprocessing
+
+    This follows `rq.fit.pfn` of the R package quantreg, see Portnoy and
+    Koenker (1997).  A preliminary estimate is computed from a subsample
+    of size m = ((k + 1) * nobs)**(2/3).  Observations whose residuals
+    are far enough from the preliminary fit, relative to the precision
+    of the fit at their design point, are collapsed into two
+    pseudo-observations, one for the observations above and one for those
+    below the fitted quantile.  The problem for the remaining
+    observations and the two pseudo-observations is solved, and the
+    solution is accepted if the signs of the residuals of all collapsed
+    observations are as assumed. Otherwise the misclassified observations
+    are added back, or, if there are too many of them, the subsample size
+    is doubled.
+
+    The preliminary estimates of all quantiles are computed on the same
+    subsample, so that it is drawn and factored only once. The subsamples
+    are drawn with `seed`, an int or a RandomState.
+
+    Returns the parameters, k x len(q), and the number of iterations of
+    the final interior point fit for each quantile.
+    """
+    nobs, k_vars = exog.shape
+    q = np.asarray(q, dtype=np.float64)
+    n_q = len(q)
+    if isinstance(seed, np.random.RandomState):
+        random_state = seed
+    else:
+        random_state = np.random.RandomState(seed)
+
+    def subsample(m):
+        ix = random_state.choice(nobs, m, replace=False)
+        # Standard deviations of the fitted values, up to the scale
+        fac = cholesky(np.dot(exog[ix].T, exog[ix]), lower=True)
+        band = np.sqrt((solve_triangular(fac, exog.T,
+                                         lower=True)**2).sum(0))
+        return ix, np.maximum(band, np.finfo(float).eps)
+
+    m = int(round(((k_vars + 1) * nobs)**(2. / 3)))
+    if m >= nobs:
+        return _fn_solve(exog, endog, q, max_iter, p_tol)
+
+    ix, band = subsample(m)
+    params0 = _fn_solve(exog[ix], endog[ix], q, max_iter, p_tol)[0]
+
+    params = np.empty((k_vars, n_q))
+    n_iter = np.zeros(n_q, dtype=int)
+    for j in range(n_q):
+        mj, bandj, beta = m, band, params0[:, j]
+        while True:
+            if mj >= nobs:
+                beta, it = _fn_solve(exog, endog, q[j:j+1], max_iter, p_tol)
+                params[:, j], n_iter[j] = beta[:, 0], it[0]
+                break
+
+            resid = endog - np.dot(exog, beta)
+            mm = m_factor * mj
+            lo = max(1. / nobs, q[j] - mm / (2. * nobs))
+            hi = min(q[j] + mm / (2. * nobs), (nobs - 1.) / nobs)
+            kappa = np.percentile(resid / bandj, [100 * lo, 100 * hi])
+            below = resid < bandj * kappa[0]
+            above = resid > bandj * kappa[1]
+
+            while True:
+                keep = ~(below | above)
+                xx = [exog[keep]]
+                yy = [endog[keep]]
+                for glob in below, above:
+                    if glob.any():
+                        xx.append(exog[glob].sum(0)[None, :])
+                        yy.append(endog[glob].sum(0)[None])
+                xx = np.concatenate(xx)
+                yy = np.concatenate(yy)
+                beta, it = _fn_solve(xx, yy, q[j:j+1], max_iter, p_tol)
+                beta, it = beta[:, 0], it[0]
+
+                resid = endog - np.dot(exog, beta)
+                above_bad = (resid < 0) & above
+                below_bad = (resid > 0) & below
+                n_bad = above_bad.sum() + below_bad.sum()
+                if n_bad == 0 or n_bad > 0.1 * mm:
+                    break
+                above &= ~above_bad
+                below &= ~below_bad
+
+            if n_bad == 0:
+                params[:, j], n_iter[j] = beta, it
+                break
+
+            # Too many misclassified observations, start over with a
+            # subsample of twice the size
+            mj = 2 * mj
+            if mj < nobs:
+                ix, bandj = subsample(mj)
+                beta = _fn_solve(exog[ix], endog[ix], q[j:j+1],
+                                 max_iter, p_tol)[0][:, 0]
+
+    return params, n_iter
 
 
 def _parzen(u):
@@ -0,0 +1,568 @@
+"""
+Least squares for data that is processed in blocks of rows
+
+The design matrix is never held in memory. The model consumes blocks of
+observations and only keeps the triangular factor of the QR decomposition of
+the (whitened) augmented design matrix ``[exog, endog]``, which is updated
+block by block, together with a few scalar summary statistics. Memory use is
+O(k**2) and does not depend on the number of observations.
+
+Heteroscedasticity robust covariances need the residuals, and are computed in
+a second pass over the data. This requires that the data source can be
+iterated over more than once.
+
+References
+----------
+Golub, G. H. and C. F. Van Loan. 2013. Matrix Computations, 4th ed.,
+    Section 6.5, Updating Matrix Factorizations.
+Miller, A. J. 1992. Algorithm AS 274: Least Squares Routines to Supplement
+    Those of Gentleman. Journal of the Royal Statistical Society. Series C,
+    41(2), 458-478.
+"""
+from __future__ import division
+
+import numpy as np
+
+from statsmodels.base.data import handle_data
+from statsmodels.compat.numpy import np_matrix_rank
+from statsmodels.regression.linear_model import (RegressionResults,
+                                                 RegressionResultsWrapper)
+from statsmodels.regression._tools import _qr_r_update
+from statsmodels.tools.decorators import cache_readonly, cache_writable
+from statsmodels.tools.tools import pinv_extended
+
+
+__all__ = ['StreamingLS', 'StreamingLSResults']
+
+
+def _iter_blocks(blocks):
+    """
+    Returns an iterator over the data blocks and a flag that is True if the
+    data source can be iterated over again.
+    """
+    if callable(blocks):
+        return iter(blocks()), True
+    it = iter(blocks)
+    return it, it is not blocks
+
+
+def _split_block(block):
+    """
+    Convert a (endog, exog[, weights]) block to arrays.
+    """
+    if len(block) == 2:
+        endog, exog = block
+        weights = None
+    elif len(block) == 3:
+        endog, exog, weights = block
+    else:
+        raise ValueError("data blocks need to be tuples of (endog, exog) "
+                         "or (endog, exog, weights)")
+
+    endog = np.asarray(endog, dtype=np.float64)
+    if endog.ndim == 2 and endog.shape[1] == 1:
+        endog = endog[:, 0]
+    exog = np.asarray(exog, dtype=np.float64)
+    if exog.ndim == 1:
+        exog = exog[:, None]
+    if exog.ndim != 2:
+        raise ValueError("exog is not 1d or 2d")
+    if len(endog) != len(exog):
+        raise ValueError("endog and exog blocks are different sizes")
+    if weights is not None:
+        weights = np.asarray(weights, dtype=np.float64)
+        if weights.ndim == 0:
+            weights = np.repeat(weights, len(endog))
+        if weights.shape != endog.shape:
+            raise ValueError('Weights must be scalar or same length as the '
+                             'data block')
+    return endog, exog, weights
+
+
+def _whiten_block(endog, exog, weights):
+    if weights is None:
+        return endog, exog
+    sqrt_w = np.sqrt(weights)
+    return sqrt_w * endog, sqrt_w[:, None] * exog
+
+
+class StreamingLS(object):
+    """
+    Ordinary or weighted least squares for data that is read in blocks
+
+    Parameters
+    ----------
+    blocks : iterable or callable
+        The data, as a sequence of tuples ``(endog, exog)`` or
+        ``(endog, exog, weights)`` each holding a block of consecutive
+        observations, e.g. the chunks of a csv or parquet reader. If
+        `blocks` is callable, then it is called without arguments and
+        needs to return a new iterator over the blocks each time it is
+        called. Heteroscedasticity robust covariances require a second pass
+        over the data, which is only possible if `blocks` is callable or a
+        container such as a list; a generator or other iterator can only be
+        consumed once.
+    hasconst : None or bool
+        Indicates whether the RHS includes a user-supplied constant. If True,
+        a constant is not checked for and k_constant is set to 1 and all
+        result statistics are calculated as if a constant is present. If
+        False, a constant is not checked for and k_constant is set to 0.
+        If None, then an explicit or implicit constant is detected from the
+        accumulated data.
+
+    Attributes
+    ----------
+    nobs : float
+        The total number of observations in all blocks.
+    exog_R : ndarray
+        The upper triangular factor of the QR decomposition of the whitened
+        augmented design matrix ``[wexog, wendog]``.
+    normalized_cov_params : ndarray
+        ``pinv(wexog.T wexog)`` computed from `exog_R`.
+    wexog_singular_values : ndarray
+        The singular values of the whitened design matrix.
+
+    Notes
+    -----
+    The data is processed when the model is created. The weights, if any,
+    are used in the same way as in `WLS`, i.e. the observations are
+    premultiplied by ``sqrt(weights)``. If the weights are not given for a
+    block, then they are set to one for that block.
+
+    Only the sufficient statistics are kept, so residuals, fitted values and
+    the statistics that are based on them, such as influence measures or
+    residual diagnostics, are not available in the results instance.
+
+    See Also
+    --------
+    statsmodels.regression.linear_model.OLS
+    statsmodels.regression.linear_model.WLS
+
+    Examples
+    --------
+    >>> import pandas as pd
+    >>> def blocks():
+    ...     for df in pd.read_csv('data.csv', chunksize=100000):
+    ...         yield df['y'], df[['const', 'x1', 'x2']]
+    >>> res = StreamingLS(blocks).fit(cov_type='HC1')
+    """
+
+    def __init__(self, blocks, hasconst=None):
+        self.blocks = blocks
+        self._hasconst = hasconst
+        self.initialize()
+
+    def initialize(self):
+        it, self._reiterable = _iter_blocks(self.blocks)
+
+        R = None
+        head = None
+        nobs = 0
+        sum_weights = 0.
+        mean_endog = 0.
+        m2_endog = 0.
+        uncentered_tss = 0.
+        sum_log_weights = 0.
+        for block in it:
+            endog, exog, weights = _split_block(block)
+            if head is None:
+                # keep the first row for the variable names
+                head = (block[0][:1], block[1][:1])
+                k_exog = exog.shape[1]
+                R = np.zeros((0, k_exog + 1))
+                exog_min = np.empty(k_exog)
+                exog_min.fill(np.inf)
+                exog_max = -exog_min
+                wsum_exog = np.zeros(k_exog)
+            elif exog.shape[1] != k_exog:
+                raise ValueError("all data blocks need to have the same "
+                                 "number of columns in exog")
+            n_block = len(endog)
+            if n_block == 0:
+                continue
+
+            wendog, wexog = _whiten_block(endog, exog, weights)
+            R = _qr_r_update(R, wexog, wendog)
+
+            if weights is None:
+                weights = np.ones(n_block)
+            else:
+                sum_log_weights += np.log(weights).sum()
+
+            # pairwise update of the weighted mean and centered sum of squares
+            wsum_block = weights.sum()
+            mean_block = np.dot(weights, endog) / wsum_block
+            m2_block = np.dot(weights, (endog - mean_block)**2)
+            delta = mean_block - mean_endog
+            wsum_total = sum_weights + wsum_block
+            mean_endog += delta * wsum_block / wsum_total
+            m2_endog += m2_block + delta**2 * sum_weights * wsum_block / \
+                wsum_total
+            sum_weights = wsum_total
+
+            uncentered_tss += np.dot(wendog, wendog)
+            wsum_exog += np.dot(weights, exog)
+            exog_min = np.minimum(exog_min, exog.min(0))
+            exog_max = np.maximum(exog_max, exog.max(0))
+            nobs += n_block
+
+        if head is None or nobs == 0:
+            raise ValueError("the data does not contain any observations")
+
+        self.nobs = float(nobs)
+        self.k_exog = k_exog
+        self.exog_R = R
+        self.uncentered_tss = uncentered_tss
+        self.centered_tss = m2_endog
+        self.sum_log_weights = sum_log_weights
+
+        Rx = R[:, :k_exog]
+        self._pinv_R, singular_values = pinv_extended(Rx)
+        self.normalized_cov_params = np.dot(self._pinv_R, self._pinv_R.T)
+        self.wexog_singular_values = singular_values
+        self.rank = np_matrix_rank(np.diag(singular_values))
+
+        self.k_constant, const_idx = self._handle_constant(
+            exog_min, exog_max, wsum_exog, sum_weights)
+
+        self.data = handle_data(head[0], head[1],
+                                hasconst=bool(self.k_constant))
+        self.data.k_constant = self.k_constant
+        self.data.const_idx = const_idx
+
+        self._df_model = float(self.rank - self.k_constant)
+        self._df_resid = self.nobs - self.rank
+
+    def _handle_constant(self, exog_min, exog_max, wsum_exog, sum_weights):
+        """
+        Detect the constant from the accumulated data, see ModelData.
+        """
+        hasconst = self._hasconst
+        if hasconst is not None:
+            return int(hasconst), None
+
+        const_idx = np.nonzero(exog_max == exog_min)[0]
+        values = exog_min[const_idx]
+        if (values == 1).any():
+            return 1, const_idx[values == 1][0]
+        elif (values != 0).any():
+            return 1, const_idx[values != 0][0]
+
+        # implicit constant: regress sqrt(weights) on wexog
+        # wexog.T sqrt(weights) = exog.T weights
+        fitted_ss = np.dot(wsum_exog,
+                           np.dot(self.normalized_cov_params, wsum_exog))
+        resid_ss = sum_weights - fitted_ss
+        return int(resid_ss <= 1e-8 * sum_weights), None
+
+    @property
+    def endog_names(self):
+        return self.data.ynames
+
+    @property
+    def exog_names(self):
+        return self.data.xnames
+
+    @property
+    def df_model(self):
+        """
+        The model degree of freedom, defined as the rank of the regressor
+        matrix minus 1 if a constant is included.
+        """
+        return self._df_model
+
+    @df_model.setter
+    def df_model(self, value):
+        self._df_model = value
+
+    @property
+    def df_resid(self):
+        """
+        The residual degree of freedom, defined as the number of observations
+        minus the rank of the regressor matrix.
+        """
+        return self._df_resid
+
+    @df_resid.setter
+    def df_resid(self, value):
+        self._df_resid = value
+
+    def fit(self, cov_type='nonrobust', cov_kwds=None, use_t=None):
+        """
+        Compute the least squares estimate from the accumulated data
+
+        Parameters
+        ----------
+        cov_type : str, optional
+            'nonrobust', 'fixed scale' or one of the heteroscedasticity
+            robust covariances 'HC0', 'HC1', 'HC2' and 'HC3'. The robust
+            covariances require a second pass over the data.
+        cov_kwds : dict or None, optional
+            Only used with 'fixed scale', see
+            `RegressionResults.get_robustcov_results`.
+        use_t : bool, optional
+            Flag indicating to use the Student's t distribution when computing
+            p-values.
+
+        Returns
+        -------
+        A StreamingLSResults instance.
+        """
+        if not (cov_type in ['nonrobust', 'fixed scale', 'fixed_scale'] or
+                cov_type.upper() in ('HC0', 'HC1', 'HC2', 'HC3')):
+            raise ValueError("cov_type %s is not available for StreamingLS"
+                             % cov_type)
+
+        R = self.exog_R
+        k_exog = self.k_exog
+        params = np.dot(self._pinv_R, R[:, k_exog])
+        # |[wexog, wendog] [params, -1]|**2 = |R [params, -1]|**2
+        wresid_R = np.dot(R, np.append(params, -1))
+        ssr = np.dot(wresid_R, wresid_R)
+
+        res = StreamingLSResults(
+            self, params, normalized_cov_params=self.normalized_cov_params,
+            ssr=ssr, cov_type=cov_type, cov_kwds=cov_kwds, use_t=use_t)
+        return RegressionResultsWrapper(res)
+
+    def _hc_meat(self, params, hc_types):
+        """
+        Compute the middle part of the HC sandwiches in one pass over the data
+
+        Parameters
+        ----------
+        params : ndarray
+            The parameter estimate at which the residuals are computed.
+        hc_types : list of str
+            Any of 'HC0', 'HC1', 'HC2' and 'HC3'.
+
+        Returns
+        -------
+        meats : dict
+            The sum over observations of ``het_scale * outer(wexog, wexog)``
+            for each of the requested types.
+        """
+        it, _ = _iter_blocks(self.blocks)
+        if not self._reiterable:
+            raise ValueError("robust covariances need a second pass over the "
+                             "data. `blocks` needs to be callable or a "
+                             "sequence that can be iterated over repeatedly")
+
+        k_exog = self.k_exog
+        ncp = self.normalized_cov_params
+        meats = dict((hc, np.zeros((k_exog, k_exog))) for hc in hc_types)
+        need_leverage = 'HC2' in hc_types or 'HC3' in hc_types
+        for block in it:
+            endog, exog, weights = _split_block(block)
+            wendog, wexog = _whiten_block(endog, exog, weights)
+            wresid = wendog - np.dot(wexog, params)
+            if need_leverage:
+                h = (np.dot(wexog, ncp) * wexog).sum(1)
+            for hc in hc_types:
+                if hc in ('HC0', 'HC1'):
+                    het_scale = wresid**2
+                elif hc == 'HC2':
+                    het_scale = wresid**2 / (1 - h)
+                else:
+                    het_scale = (wresid / (1 - h))**2
+                meats[hc] += np.dot(wexog.T, het_scale[:, None] * wexog)
+
+        if 'HC1' in meats:
+            meats['HC1'] *= self.nobs / self.df_resid
+        return meats
+
+    def predict(self, params, exog=None):
+        """
+        Return linear predicted values from a design matrix.
+
+        Parameters
+        ----------
+        params : array-like
+            Parameters of a linear model
+        exog : array-like
+            Design / exogenous data. This is not optional because the model
+            does not keep the data.
+
+        Returns
+        -------
+        An array of fitted values
+        """
+        if exog is None:
+            raise ValueError("exog is required, StreamingLS does not keep "
+                             "the data")
+        return np.dot(exog, params)
+
+
+class StreamingLSResults(RegressionResults):
+    """
+    Results class for a StreamingLS model.
+
+    The statistics are computed from the accumulated sufficient statistics.
+    Attributes that need the residuals or the design matrix, such as
+    `resid`, `fittedvalues` or `get_influence`, are not available.
+
+    See Also
+    --------
+    RegressionResults
+    """
+
+    def __init__(self, model, params, normalized_cov_params=None, scale=1.,
+                 ssr=None, cov_type='nonrobust', cov_kwds=None, use_t=None,
+                 **kwargs):
+        # needs to be available before the robust covariance is computed
+        self._ssr = ssr
+        super(StreamingLSResults, self).__init__(
+            model, params, normalized_cov_params=normalized_cov_params,
+            scale=scale, cov_type=cov_type, cov_kwds=cov_kwds, use_t=use_t,
+            **kwargs)
+
+    def get_robustcov_results(self, cov_type='HC1', use_t=None, **kwds):
+        if not (cov_type in ['fixed scale', 'fixed_scale'] or
+                cov_type.upper() in ('HC0', 'HC1', 'HC2', 'HC3')):
+            raise ValueError("cov_type %s is not available for StreamingLS"
+                             % cov_type)
+        if kwds.get('use_self', False):
+            return super(StreamingLSResults, self).get_robustcov_results(
+                cov_type=cov_type, use_t=use_t, **kwds)
+
+        res = self.__class__(self.model, self.params,
+                             normalized_cov_params=self.normalized_cov_params,
+                             ssr=self.ssr, use_t=self.use_t)
+        # reuse the already computed robust covariances
+        for hc in ('HC0', 'HC1', 'HC2', 'HC3'):
+            key = 'cov_' + hc
+            if key in self._cache:
+                res._cache[key] = self._cache[key]
+        return res.get_robustcov_results(cov_type=cov_type, use_t=use_t,
+                                         use_self=True, **kwds)
+
+    get_robustcov_results.__doc__ = \
+        RegressionResults.get_robustcov_results.__doc__
+
+    @cache_readonly
+    def nobs(self):
+        return self.model.nobs
+
+    @cache_readonly
+    def ssr(self):
+        return self._ssr
+
+    @cache_writable()
+    def scale(self):
+        return self.ssr / self.df_resid
+
+    @cache_readonly
+    def centered_tss(self):
+        return self.model.centered_tss
+
+    @cache_readonly
+    def uncentered_tss(self):
+        return self.model.uncentered_tss
+
+    @cache_readonly
+    def llf(self):
+        nobs2 = self.nobs / 2.
+        llf = -np.log(self.ssr) * nobs2
+        llf -= (1 + np.log(np.pi / nobs2)) * nobs2
+        llf += 0.5 * self.model.sum_log_weights
+        return llf
+
+    def _robust_covs(self, hc_type):
+        # compute all HC0 to HC3 meats in the same pass over the data
+        hc_types = [hc for hc in ('HC0', 'HC1', 'HC2', 'HC3')
+                    if 'cov_' + hc not in self._cache]
+        meats = self.model._hc_meat(self.params, hc_types)
+        ncp = self.normalized_cov_params
+        for hc in hc_types:
+            self._cache['cov_' + hc] = np.dot(ncp, np.dot(meats[hc], ncp))
+        return self._cache['cov_' + hc_type]
+
+    @cache_readonly
+    def cov_HC0(self):
+        """
+        See statsmodels.RegressionResults
+        """
+        return self._robust_covs('HC0')
+
+    @cache_readonly
+    def cov_HC1(self):
+        """
+        See statsmodels.RegressionResults
+        """
+        return self._robust_covs('HC1')
+
+    @cache_readonly
+    def cov_HC2(self):
+        """
+        See statsmodels.RegressionResults
+        """
+        return self._robust_covs('HC2')
+
+    @cache_readonly
+    def cov_HC3(self):
+        """
+        See statsmodels.RegressionResults
+        """
+        return self._robust_covs('HC3')
+
+    def summary(self, yname=None, xname=None, title=None, alpha=.05):
+        """Summarize the Regression Results
+
+        Parameters
+        -----------
+        yname : string, optional
+            Default is `y`
+        xname : list of strings, optional
+            Default is `var_##` for ## in p the number of regressors
+        title : string, optional
+            Title for the top table. If not None, then this replaces the
+            default title
+        alpha : float
+            significance level for the confidence intervals
+
+        Returns
+        -------
+        smry : Summary instance
+            this holds the summary tables and text, which can be printed or
+            converted to various output formats.
+
+        Notes
+        -----
+        The residual diagnostics of `RegressionResults.summary` are not
+        included because the residuals are not available.
+        """
+        top_left = [('Dep. Variable:', None),
+                    ('Model:', None),
+                    ('Method:', ['Least Squares']),
+                    ('Date:', None),
+                    ('Time:', None),
+                    ('No. Observations:', None),
+                    ('Df Residuals:', None),
+                    ('Df Model:', None),
+                    ('Covariance Type:', [self.cov_type]),
+                    ]
+
+        top_right = [('R-squared:', ["%#8.3f" % self.rsquared]),
+                     ('Adj. R-squared:', ["%#8.3f" % self.rsquared_adj]),
+                     ('F-statistic:', ["%#8.4g" % self.fvalue]),
+                     ('Prob (F-statistic):', ["%#6.3g" % self.f_pvalue]),
+                     ('Log-Likelihood:', None),
+                     ('AIC:', ["%#8.4g" % self.aic]),
+                     ('BIC:', ["%#8.4g" % self.bic]),
+                     ('Cond. No.', ["%#8.3g" % self.condition_number]),
+                     ]
+
+        if title is None:
+            title = self.model.__class__.__name__ + ' ' + "Regression Results"
+
+        from statsmodels.iolib.summary import Summary
+        smry = Summary()
+        smry.add_table_2cols(self, gleft=top_left, gright=top_right,
+                             yname=yname, xname=xname, title=title)
+        smry.add_table_params(self, yname=yname, xname=xname, alpha=alpha,
+                              use_t=self.use_t)
+
+        etext = ["[1] " + self.cov_kwds['description']]
+        etext.insert(0, "Warnings:")
+        smry.add_extra_txt(etext)
+        return smry
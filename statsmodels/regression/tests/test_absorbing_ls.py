@@ -0,0 +1,133 @@
+"""
+Tests for least squares with absorbed fixed effects
+"""
+import warnings
+
+import numpy as np
+import pandas as pd
+from numpy.testing import assert_allclose, assert_equal, assert_raises
+
+from statsmodels.regression.linear_model import WLS
+from statsmodels.regression.absorbing_ls import AbsorbingLS
+from statsmodels.tools.sm_exceptions import ConvergenceWarning
+
+
+class CheckAbsorbingLS(object):
+
+    @classmethod
+    def setup_class(cls):
+        np.random.seed(987125)
+        nobs = 600
+        firm = np.random.randint(0, 40, size=nobs)
+        year = np.random.randint(0, 8, size=nobs)
+        exog = np.random.randn(nobs, 2) + 0.1 * firm[:, None]
+        endog = exog.dot([1, -0.5]) + 0.3 * firm + np.sin(year)
+        endog += np.random.randn(nobs)
+        weights = cls.get_weights(nobs)
+
+        dummies = [(firm[:, None] == np.arange(40))]
+        absorb = [firm]
+        if cls.two_factors:
+            dummies.append(year[:, None] == np.arange(1, 8))
+            absorb.append(year)
+        exog_dummies = np.column_stack([exog] + dummies).astype(np.float64)
+
+        cls.firm = firm
+        cls.res1 = AbsorbingLS(endog, exog, absorb=absorb, weights=weights,
+                               tol=1e-12).fit()
+        cls.res2 = WLS(endog, exog_dummies, weights=weights).fit()
+
+    def test_results(self):
+        res1, res2 = self.res1, self.res2
+        assert_allclose(res1.params, res2.params[:2], rtol=1e-10)
+        assert_allclose(res1.bse, res2.bse[:2], rtol=1e-10)
+        assert_allclose(res1.resid, res2.resid, atol=1e-10)
+        assert_allclose(res1.fittedvalues, res2.fittedvalues, rtol=1e-10)
+        assert_allclose(res1.wresid, res2.wresid, atol=1e-10)
+        assert_allclose(res1.llf, res2.llf, rtol=1e-10)
+        assert_allclose(res1.scale, res2.scale, rtol=1e-10)
+        assert_equal(res1.df_resid, res2.df_resid)
+        assert_equal(res1.df_model, 2)
+
+    def test_cluster(self):
+        kwds = dict(groups=self.firm, use_correction=False,
+                    df_correction=False)
+        cov1 = self.res1.get_robustcov_results('cluster', **kwds).cov_params()
+        cov2 = self.res2.get_robustcov_results('cluster', **kwds).cov_params()
+        assert_allclose(cov1, cov2[:2, :2], rtol=1e-10)
+
+        # the small sample correction does not count the fixed effects
+        res = self.res1.model.fit(cov_type='cluster',
+                                  cov_kwds={'groups': self.firm})
+        n_groups, nobs = 40., self.res1.nobs
+        corr = n_groups / (n_groups - 1) * (nobs - 1) / (nobs - 2)
+        assert_allclose(res.cov_params(), cov1 * corr, rtol=1e-10)
+        assert_equal(res.df_resid_inference, n_groups - 1)
+
+
+class TestAbsorbingOLS(CheckAbsorbingLS):
+    two_factors = False
+
+    @staticmethod
+    def get_weights(nobs):
+        return 1.
+
+
+class TestAbsorbingWLS2(CheckAbsorbingLS):
+    two_factors = True
+
+    @staticmethod
+    def get_weights(nobs):
+        return np.random.uniform(0.5, 2, size=nobs)
+
+
+def test_disconnected():
+    # two sets of firms and workers that do not overlap
+    np.random.seed(987125)
+    nobs = 200
+    half = nobs // 2
+    firm = np.random.randint(0, 10, size=nobs)
+    firm[half:] += 10
+    worker = np.random.randint(0, 30, size=nobs)
+    worker[half:] += 30
+    exog = np.random.randn(nobs, 2)
+    endog = exog.sum(1) + 0.1 * firm + np.random.randn(nobs)
+
+    df = pd.DataFrame({'firm': firm, 'worker': worker})
+    mod = AbsorbingLS(endog, exog, absorb=df)
+    levels = len(np.unique(firm)) + len(np.unique(worker))
+    # one redundant level in each connected component
+    assert_equal(mod.k_absorbed, levels - 2)
+    dummies = np.column_stack([pd.get_dummies(firm).values,
+                               pd.get_dummies(worker).values])
+    res2 = WLS(endog, np.column_stack((exog, dummies))).fit()
+    assert_equal(mod.fit().df_resid, res2.df_resid)
+    assert_equal([g.name for g in mod.absorb], ['firm', 'worker'])
+
+
+def test_pandas():
+    np.random.seed(987125)
+    nobs = 100
+    data = pd.DataFrame(np.random.randn(nobs, 3), columns=['y', 'x1', 'x2'])
+    data['g'] = np.random.randint(0, 10, size=nobs)
+    res = AbsorbingLS(data['y'], data[['x1', 'x2']], absorb=data['g']).fit()
+    assert_equal(res.params.index.tolist(), ['x1', 'x2'])
+    assert_equal(res.resid.index.tolist(), data.index.tolist())
+
+
+def test_errors():
+    np.random.seed(987125)
+    nobs = 50
+    exog = np.column_stack((np.ones(nobs), np.random.randn(nobs)))
+    endog = np.random.randn(nobs)
+    groups = np.random.randint(0, 5, size=nobs)
+    assert_raises(ValueError, AbsorbingLS, endog, exog, groups)
+    assert_raises(ValueError, AbsorbingLS, endog, exog[:, 1:], groups,
+                  missing='drop')
+
+    # convergence warning with two factors and one sweep
+    groups2 = np.random.randint(0, 5, size=nobs)
+    with warnings.catch_warnings(record=True) as w:
+        warnings.simplefilter('always')
+        AbsorbingLS(endog, exog[:, 1:], [groups, groups2], maxiter=1)
+    assert any(issubclass(i.category, ConvergenceWarning) for i in w)
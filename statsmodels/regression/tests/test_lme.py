@@ -11,6 +11,7 @@ import statsmodels.tools.numdiff as nd
 import os
 import csv
 import scipy
+from scipy import sparse
 
 # TODO: add tests with unequal group sizes
 
@@ -168,6 +169,124 @@ class TestMixedLM(object):
         mdf2 = MixedLM(endog, exog, groups, np.ones(300)).fit()
         assert_almost_equal(mdf1.params, mdf2.params, decimal=8)
 
+    def test_buckets(self):
+        # The likelihood and its derivatives evaluated on the groups
+        # stacked by size agree with the group by group evaluation,
+        # with unequal group sizes and variance components missing
+        # from some groups.
+
+        np.random.seed(3235)
+        n_grp = 60
+        sizes = np.random.randint(2, 6, size=n_grp)
+        groups = np.repeat(np.arange(n_grp), sizes)
+        n = len(groups)
+        exog = np.random.normal(size=(n, 3))
+        exog_re = np.column_stack((np.ones(n), np.random.normal(size=n)))
+        exog_vc = np.random.normal(size=(n, 3))
+        endog = (exog.sum(1) + np.repeat(np.random.normal(size=n_grp), sizes)
+                 + np.random.normal(size=n))
+        vc = {"a": {}, "b": {}}
+        for i in range(n_grp):
+            ix = np.flatnonzero(groups == i)
+            vc["a"][i] = exog_vc[ix, 0:2]
+            if i % 3 > 0:
+                vc["b"][i] = exog_vc[ix, 2:3]
+
+        for kwargs in (dict(exog_re=exog_re, exog_vc=vc),
+                       dict(exog_vc=vc), {}):
+            for reml in False, True:
+                model1 = MixedLM(endog, exog, groups, **kwargs)
+                model2 = MixedLM(endog, exog, groups, **kwargs)
+                model2._use_buckets = False
+                for model in model1, model2:
+                    model.reml = reml
+                    model.cov_pen = None
+
+                cov_re = np.random.normal(size=(model1.k_re, model1.k_re))
+                cov_re = np.dot(cov_re.T, cov_re) + np.eye(model1.k_re)
+                vcomp = np.random.uniform(0.5, 1.5, size=model1.k_vc)
+                params = MixedLMParams.from_components(
+                    np.random.normal(size=3), cov_re=cov_re, vcomp=vcomp)
+
+                for meth in (lambda m: m.loglike(params),
+                             lambda m: m.loglike(params, profile_fe=False),
+                             lambda m: np.concatenate(
+                                 m.score_full(params, calc_fe=True)),
+                             lambda m: m.hessian(params),
+                             lambda m: m.get_fe_params(cov_re, vcomp),
+                             lambda m: m.get_scale(params.fe_params, cov_re,
+                                                   vcomp)):
+                    assert_allclose(meth(model1), meth(model2),
+                                    rtol=1e-10, atol=1e-12)
+                # The buckets are only built for model1
+                assert_equal('_buckets' in model1._cache, True)
+                assert_equal('_buckets' in getattr(model2, '_cache', {}),
+                             False)
+
+        # Sparse variance components are evaluated group by group
+        vc_sparse = dict((k, dict((g, sparse.csr_matrix(x))
+                                  for g, x in v.items()))
+                         for k, v in vc.items())
+        model = MixedLM(endog, exog, groups, exog_vc=vc_sparse)
+        assert_equal(model._use_buckets, False)
+
+    def test_crossed(self):
+        # Crossed random intercepts fit as variance components of a
+        # single group, with sparse and dense indicator matrices.
+
+        np.random.seed(3235)
+        n = 300
+        data = pd.DataFrame({"a": np.random.randint(0, 15, size=n),
+                             "b": np.random.randint(0, 10, size=n),
+                             "x": np.random.normal(size=n)})
+        data["y"] = (data.x + np.random.normal(size=15)[data.a] +
+                     np.random.normal(size=10)[data.b] +
+                     np.random.normal(size=n))
+        data["g"] = 1
+        vcf = {"a": "0 + C(a)", "b": "0 + C(b)"}
+
+        model1 = MixedLM.from_formula("y ~ x", groups="g", vc_formula=vcf,
+                                      data=data)
+        model2 = MixedLM.from_formula("y ~ x", groups="g", vc_formula=vcf,
+                                      use_sparse=True, data=data)
+        for k in "a", "b":
+            assert_equal(sparse.issparse(model2.exog_vc[k][1]), True)
+            assert_equal(model2.exog_vc[k][1].toarray(),
+                         model1.exog_vc[k][1])
+
+        params = MixedLMParams.from_components(
+            np.r_[0.1, 1.2], cov_re=np.eye(0), vcomp=np.r_[0.8, 1.3])
+        for model in model1, model2:
+            model.reml = True
+            model.cov_pen = None
+            model._freepat = None
+        assert_allclose(model2.loglike(params), model1.loglike(params),
+                        rtol=1e-10)
+        assert_allclose(model2.loglike(params, profile_fe=False),
+                        model1.loglike(params, profile_fe=False),
+                        rtol=1e-10)
+
+        # Numerical derivatives of the sparse likelihood
+        model3 = MixedLM.from_formula("y ~ x", groups="g", vc_formula=vcf,
+                                      use_sparse=True, numdiff=True,
+                                      data=data)
+        model3.reml = True
+        model3.cov_pen = None
+        model3._freepat = None
+        assert_allclose(model3.score(params.get_packed(use_sqrt=True)),
+                        model1.score(params.get_packed(use_sqrt=True)),
+                        rtol=1e-5)
+
+        # The analytic Hessian agrees with the likelihood at the MLE
+        result1 = model1.fit()
+        assert_allclose(model3.hessian(result1.params_object),
+                        model1.hessian(result1.params_object),
+                        rtol=1e-4, atol=1e-4)
+
+        result3 = model3.fit()
+        assert_allclose(result3.params, result1.params, rtol=1e-4)
+        assert_allclose(result3.bse, result1.bse, rtol=1e-3)
+
     def test_history(self):
 
         np.random.seed(3235)
@@ -2,7 +2,8 @@ from unittest import TestCase
 import scipy.stats
 import numpy as np
 import statsmodels.api as sm
-from numpy.testing import assert_allclose, assert_equal, assert_almost_equal
+from numpy.testing import (assert_allclose, assert_equal, assert_almost_equal,
+                           assert_)
 from patsy import dmatrices  # pylint: disable=E0611
 from statsmodels.regression.quantile_regression import QuantReg
 from .results_quantile_regression import (
@@ -253,3 +254,76 @@ def test_zero_resid():
     assert_allclose(res.bse, np.array([0.04455029, 0.01155251]), rtol=1e-4, atol=1e-20)
     assert_allclose(res.resid, np.array([-9.99982796e-08, 3.22583598e-02,
                                          -3.22574234e-02, 9.46361860e-07]), rtol=1e-4, atol=1e-20)
+
+
+def test_fn_methods():
+    # the interior point solvers agree with IRLS on the Engel data
+
+    data = sm.datasets.engel.load_pandas().data
+    y, X = dmatrices('foodexp ~ income', data, return_type='dataframe')
+    mod = QuantReg(y, X)
+    for q in [.1, .5, .75]:
+        res1 = mod.fit(q=q, vcov='iid')
+        for method in ['fn', 'pfn']:
+            res2 = mod.fit(q=q, vcov='iid', method=method)
+            assert_allclose(res2.params, res1.params, rtol=1e-6)
+            assert_allclose(res2.bse, res1.bse, rtol=1e-4)
+            assert_allclose(res2.prsquared, res1.prsquared, rtol=1e-6)
+            assert_equal(res2.q, q)
+
+
+def test_fit_quantiles():
+    np.random.seed(9876)
+    n = 5000
+    exog = np.column_stack((np.ones(n), np.random.normal(size=(n, 2))))
+    endog = (exog.sum(1) +
+             (1 + np.abs(exog[:, 1])) * np.random.standard_t(3, size=n))
+    mod = QuantReg(endog, exog)
+    qs = [0.05, 0.25, 0.5, 0.9]
+
+    # with n=5000 the preprocessing uses subsamples of about 730
+    results = {}
+    for method in ['fn', 'pfn']:
+        results[method] = mod.fit_quantiles(qs, method=method)
+        assert_equal(len(results[method]), len(qs))
+
+    for j, q in enumerate(qs):
+        res = mod.fit(q, method='fn')
+        res_fn = results['fn'][j]
+        res_pfn = results['pfn'][j]
+        assert_equal(res_fn.q, q)
+        assert_allclose(res_fn.params, res.params, rtol=1e-10)
+        assert_allclose(res_fn.bse, res.bse, rtol=1e-10)
+        assert_allclose(res_pfn.params, res.params, rtol=1e-6)
+
+        # the solution satisfies the optimality conditions: the
+        # subgradient of the check function contains zero
+        resid = res.resid
+        zero = np.abs(resid) < 1e-6
+        assert_equal(zero.sum(), exog.shape[1])
+        grad = np.dot(exog[~zero].T, q - (resid[~zero] < 0))
+        a = np.linalg.solve(exog[zero].T, -grad)
+        assert_(np.all(a >= q - 1 - 1e-8) and np.all(a <= q + 1e-8))
+
+    # the default method is the same as in fit
+    res1 = mod.fit_quantiles([0.5])[0]
+    res2 = mod.fit(0.5)
+    assert_equal(res1.iterations, res2.iterations)
+    assert_allclose(res1.params, res2.params, rtol=1e-13)
+
+
+def test_pfn_seed():
+    # the subsamples of pfn do not use the global random state
+    np.random.seed(9876)
+    n = 5000
+    exog = np.column_stack((np.ones(n), np.random.normal(size=(n, 2))))
+    endog = exog.sum(1) + np.random.standard_t(3, size=n)
+    mod = QuantReg(endog, exog)
+
+    state = np.random.get_state()
+    res1 = mod.fit(0.25, method='pfn')
+    assert_equal(np.random.get_state()[1], state[1])
+    res2 = mod.fit(0.25, method='pfn', seed=np.random.RandomState(0))
+    assert_equal(res2.params, res1.params)
+    res3 = mod.fit(0.25, method='pfn', seed=123)
+    assert_allclose(res3.params, res1.params, rtol=1e-6)
@@ -11,7 +11,7 @@ from numpy.testing import (assert_almost_equal, assert_approx_equal, assert_,
 from scipy.linalg import toeplitz
 from statsmodels.tools.tools import add_constant, categorical
 from statsmodels.compat.numpy import np_matrix_rank
-from statsmodels.regression.linear_model import OLS, WLS, GLS, yule_walker
+from statsmodels.regression.linear_model import OLS, WLS, GLS, GLSAR, yule_walker
 from statsmodels.datasets import longley
 from scipy.stats import t as student_t
 
@@ -1243,6 +1243,84 @@ def test_regularized_options():
     assert_allclose(result1.params, result2.params)
 
 
+def test_low_memory():
+    np.random.seed(987125)
+    nobs = 200
+    exog = add_constant(np.random.normal(size=(nobs, 3)))
+    endog = exog.sum(1) + np.random.normal(size=nobs) * (1 + exog[:, 1]**2)
+    weights = 1 + np.random.uniform(size=nobs)
+    for model in [OLS(endog, exog), WLS(endog, exog, weights=weights)]:
+        res1 = model.fit()
+        res2 = model.__class__(endog, exog,
+                               weights=model.weights).fit(low_memory=True)
+        # wexog and pinv_wexog are not created with low_memory
+        assert_(res2.model._wexog is None)
+        assert_(not hasattr(res2.model, 'pinv_wexog'))
+        assert_allclose(res2.params, res1.params, rtol=1e-10)
+        assert_allclose(res2.bse, res1.bse, rtol=1e-10)
+        assert_allclose(res2.wresid, res1.wresid, rtol=1e-8, atol=1e-10)
+        assert_allclose(res2.llf, res1.llf, rtol=1e-10)
+        assert_allclose(res2.rsquared, res1.rsquared, rtol=1e-10)
+        assert_equal(res2.model.rank, res1.model.rank)
+        assert_allclose(res2.model.wexog_singular_values,
+                        res1.model.wexog_singular_values, rtol=1e-10)
+        for cov_type in ['HC0', 'HC1', 'HC2', 'HC3']:
+            cov1 = getattr(res1, 'cov_' + cov_type)
+            cov2 = getattr(res2, 'cov_' + cov_type)
+            assert_allclose(cov2, cov1, rtol=1e-8)
+        assert_(res2.model._wexog is None)
+
+    res1 = OLS(endog, exog).fit()
+    res2 = OLS(endog, exog).fit(cov_type='HC1', low_memory=True)
+    assert_allclose(res2.bse, res1.HC1_se, rtol=1e-8)
+    infl = res2.get_influence()
+    assert_allclose(infl.hat_matrix_diag,
+                    res1.get_influence().hat_matrix_diag, rtol=1e-8)
+
+
+def test_sparse():
+    from scipy import sparse
+    from statsmodels.tools.grouputils import dummy_sparse
+    np.random.seed(987125)
+    nobs = 300
+    groups = np.random.randint(0, 20, size=nobs)
+    x = np.random.normal(size=(nobs, 2))
+    exog_sparse = sparse.hstack([dummy_sparse(groups), x]).tocsr()
+    exog = exog_sparse.toarray()
+    endog = groups * 0.1 + x.sum(1) + np.random.normal(size=nobs)
+    weights = 1 + np.random.uniform(size=nobs)
+    for klass, kwds in [(OLS, {}), (WLS, {'weights': weights})]:
+        res1 = klass(endog, exog, **kwds).fit()
+        for method in ['lsmr', 'lsqr', 'normal']:
+            model = klass(endog, exog_sparse, **kwds)
+            assert_(sparse.issparse(model.exog))
+            res2 = model.fit(method=method)
+            assert_allclose(res2.params, res1.params, rtol=1e-8, atol=1e-9)
+            assert_allclose(res2.bse, res1.bse, rtol=1e-8)
+            assert_allclose(res2.llf, res1.llf, rtol=1e-10)
+            assert_allclose(res2.rsquared, res1.rsquared, rtol=1e-10)
+            assert_allclose(res2.fvalue, res1.fvalue, rtol=1e-8)
+            assert_equal(res2.df_model, res1.df_model)
+            assert_allclose(res2.resid, res1.resid, rtol=1e-8, atol=1e-10)
+            assert_allclose(res2.wresid, res1.wresid, rtol=1e-8, atol=1e-10)
+            assert_allclose(res2.condition_number, res1.condition_number,
+                            rtol=1e-6)
+        # exog of the model stays sparse
+        assert_(sparse.issparse(res2.model.wexog))
+        assert_allclose(res2.predict(exog_sparse[:5]), res1.predict(exog[:5]),
+                        rtol=1e-8)
+        for cov_type in ['HC0', 'HC3']:
+            res1 = klass(endog, exog, **kwds).fit(cov_type=cov_type)
+            res2 = klass(endog, exog_sparse, **kwds).fit(cov_type=cov_type)
+            assert_allclose(res2.bse, res1.bse, rtol=1e-8)
+        res2.summary()
+
+    assert_raises(ValueError, OLS(endog, exog_sparse).fit, method='qr')
+    # models that whiten with a full matrix do not support a sparse exog
+    assert_raises(ValueError, GLS, endog, exog_sparse, sigma=weights)
+    assert_raises(ValueError, GLSAR, endog, exog_sparse, rho=1)
+
+
 if __name__ == "__main__":
 
     import nose
@@ -408,11 +408,14 @@ class TestOLSRobustCluster2Input(CheckOLSRobustCluster, CheckOLSRobustNewMixin):
         self.rtol = 1e-6
         self.rtolh = 1e-10
 
-    def test_too_many_groups(self):
+    def test_3way_identical(self):
+        # inclusion-exclusion with three identical cluster variables gives
+        # the one-way cluster robust covariance
         long_groups = self.groups.reshape(-1, 1)
         groups3 = np.hstack((long_groups, long_groups, long_groups))
-        assert_raises(ValueError, self.res1.get_robustcov_results,'cluster',
-                      groups=groups3, use_correction=True, use_t=True)
+        res = self.res1.get_robustcov_results('cluster', groups=groups3,
+                                              use_correction=True, use_t=True)
+        assert_allclose(res.cov_params(), self.cov_robust2, rtol=1e-10)
 
     def test_2way_dataframe(self):
         import pandas as pd
@@ -0,0 +1,118 @@
+"""
+Tests for least squares on data in blocks
+"""
+import numpy as np
+import pandas as pd
+from numpy.testing import assert_allclose, assert_equal, assert_raises
+
+from statsmodels.regression.linear_model import OLS, WLS
+from statsmodels.regression.streaming_ls import StreamingLS
+
+
+class CheckStreamingLS(object):
+
+    @classmethod
+    def setup_data(cls):
+        np.random.seed(987125)
+        nobs = 500
+        exog = np.column_stack((np.ones(nobs), np.random.randn(nobs, 3)))
+        endog = exog.dot([1, 0.5, -0.2, 0])
+        endog += np.random.randn(nobs) * (1 + np.abs(exog[:, 1]))
+        cls.endog = endog
+        cls.exog = exog
+        cls.weights = np.random.uniform(0.5, 2, size=nobs)
+        cls.nobs = nobs
+
+    def blocks(self):
+        for start in range(0, self.nobs, 77):
+            sl = slice(start, start + 77)
+            if self.use_weights:
+                yield self.endog[sl], self.exog[sl], self.weights[sl]
+            else:
+                yield self.endog[sl], self.exog[sl]
+
+    def test_results(self):
+        res1 = StreamingLS(self.blocks).fit()
+        res2 = self.res2
+        attrs = ['params', 'bse', 'ssr', 'scale', 'rsquared', 'rsquared_adj',
+                 'centered_tss', 'uncentered_tss', 'fvalue', 'llf', 'aic',
+                 'bic', 'condition_number', 'df_model', 'df_resid', 'nobs']
+        for attr in attrs:
+            assert_allclose(getattr(res1, attr), getattr(res2, attr),
+                            rtol=1e-10, err_msg=attr)
+        assert_equal(res1.model.k_constant, 1)
+        assert_equal(res1.model.data.const_idx, 0)
+
+    def test_robust(self):
+        res1 = StreamingLS(self.blocks).fit(cov_type='HC1')
+        res2 = self.res2
+        assert_allclose(res1.bse, res2.HC1_se, rtol=1e-10)
+        for hc in ['HC0', 'HC1', 'HC2', 'HC3']:
+            assert_allclose(getattr(res1, hc + '_se'),
+                            getattr(res2, hc + '_se'), rtol=1e-10)
+
+        res1 = StreamingLS(self.blocks).fit()
+        res1r = res1.get_robustcov_results('HC3')
+        assert_allclose(res1r.bse, res2.HC3_se, rtol=1e-10)
+        assert_allclose(res1.bse, res2.bse, rtol=1e-10)
+        assert_equal(res1r.cov_type, 'HC3')
+
+
+class TestStreamingOLS(CheckStreamingLS):
+
+    @classmethod
+    def setup_class(cls):
+        cls.setup_data()
+        cls.use_weights = False
+        cls.res2 = OLS(cls.endog, cls.exog).fit()
+
+
+class TestStreamingWLS(CheckStreamingLS):
+
+    @classmethod
+    def setup_class(cls):
+        cls.setup_data()
+        cls.use_weights = True
+        cls.res2 = WLS(cls.endog, cls.exog, weights=cls.weights).fit()
+
+
+def test_pandas_names():
+    np.random.seed(3478)
+    df = pd.DataFrame(np.random.randn(100, 3), columns=['y', 'x1', 'x2'])
+    blocks = [(df['y'][:60], df[['x1', 'x2']][:60]),
+              (df['y'][60:], df[['x1', 'x2']][60:])]
+    res = StreamingLS(blocks).fit()
+    res2 = OLS(df['y'], df[['x1', 'x2']]).fit()
+    assert_equal(res.model.exog_names, ['x1', 'x2'])
+    assert_equal(res.model.endog_names, 'y')
+    assert_equal(res.model.k_constant, 0)
+    assert_allclose(res.params, res2.params, rtol=1e-10)
+    assert_allclose(res.rsquared, res2.rsquared, rtol=1e-10)
+    assert_equal(list(res.params.index), ['x1', 'x2'])
+
+
+def test_implicit_constant():
+    np.random.seed(3478)
+    groups = np.repeat(np.arange(3), 20)
+    exog = np.column_stack(((groups[:, None] == np.arange(3)).astype(float),
+                            np.random.randn(60)))
+    endog = np.random.randn(60)
+    res = StreamingLS([(endog[:30], exog[:30]), (endog[30:], exog[30:])]).fit()
+    res2 = OLS(endog, exog).fit()
+    assert_equal(res.model.k_constant, 1)
+    assert_allclose(res.rsquared, res2.rsquared, rtol=1e-10)
+
+
+def test_single_pass_iterator():
+    np.random.seed(3478)
+    exog = np.random.randn(50, 2)
+    endog = np.random.randn(50)
+    blocks = ((endog[i:i + 10], exog[i:i + 10]) for i in range(0, 50, 10))
+    mod = StreamingLS(blocks)
+    res = mod.fit()
+    assert_allclose(res.params, OLS(endog, exog).fit().params, rtol=1e-10)
+    assert_raises(ValueError, mod.fit, cov_type='HC0')
+    assert_raises(ValueError, mod.fit, cov_type='cluster')
+    # the model does not keep the data
+    for name in ['resid', 'wresid', 'fittedvalues']:
+        assert_equal(hasattr(res, name), False)
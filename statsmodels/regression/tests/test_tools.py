@@ -37,3 +37,14 @@ class TestMinimalWLS(TestCase):
         minres = _MinimalWLS(self.endog2, self.exog2, weights=self.weights2).fit()
         assert_allclose(res.params, minres.params)
         assert_allclose(res.resid, minres.resid)
+
+    def test_qr_blocked(self):
+        for endog, exog, weights in [(self.endog1, self.exog1, 1.0),
+                                     (self.endog1, self.exog1, self.weights1),
+                                     (self.endog2, self.exog2, self.weights2)]:
+            res = _MinimalWLS(endog, exog, weights=weights).fit()
+            minres = _MinimalWLS(endog, exog, weights=weights)
+            minres = minres.fit(method='qr_blocked')
+            assert_allclose(minres.params, res.params)
+            assert_allclose(minres.resid, res.resid, atol=1e-12)
+            assert_allclose(minres.scale, res.scale)
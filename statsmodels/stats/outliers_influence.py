@@ -218,7 +218,11 @@ class OLSInfluence(object):
         -----
         temporarily calculated here, this should go to model class
         '''
-        return (self.exog * self.results.model.pinv_wexog.T).sum(1)
+        pinv_wexog = getattr(self.results.model, 'pinv_wexog', None)
+        if pinv_wexog is None:
+            # e.g. fit with low_memory, pinv_wexog is not available
+            return self.results._wexog_leverage()
+        return (self.exog * pinv_wexog.T).sum(1)
 
     @cache_readonly
     def resid_press(self):
@@ -102,13 +102,17 @@ Statistics 90, no. 3 (2008): 414–427.
 
 """
 from statsmodels.compat.python import range
+from itertools import combinations
+
 import pandas as pd
 import numpy as np
+from scipy import signal, sparse
 
-from statsmodels.tools.grouputils import Group
 from statsmodels.stats.moment_helpers import se_cov
+from statsmodels.regression._tools import _row_blocks
 
-__all__ = ['cov_cluster', 'cov_cluster_2groups', 'cov_hac', 'cov_nw_panel',
+__all__ = ['cov_cluster', 'cov_cluster_2groups', 'cov_cluster_multi',
+           'cov_hac', 'cov_nw_panel',
            'cov_white_simple',
            'cov_hc0', 'cov_hc1', 'cov_hc2', 'cov_hc3',
            'se_cov', 'weights_bartlett', 'weights_uniform']
@@ -260,6 +264,70 @@ def _get_sandwich_arrays(results, cov_type=''):
     return xu, hessian_inv
 
 
+def _get_sandwich_blocks(results, cov_type=''):
+    """Helper function to get the scores for blocks of rows
+
+    Returns
+    -------
+    scores : callable
+        ``scores(rows)`` returns the (len(rows), k_params) array of scores,
+        x_i * u_i, for the observations in `rows`, a slice or an index array.
+    nobs : int
+        number of observations
+    k_params : int
+        number of parameters
+    hessian_inv : ndarray
+        inverse hessian, the bread of the sandwich
+
+    Notes
+    -----
+    For linear models the scores are computed from the corresponding rows of
+    the whitened exog and the whitened residuals, so the (nobs, k_params)
+    array of scores is never created. If the model whitens each observation
+    separately and `wexog` has not been created, e.g. after
+    ``fit(low_memory=True)``, then `wexog` is not created either. In all
+    other cases the scores are computed by `_get_sandwich_arrays`.
+    """
+    model = getattr(results, 'model', None)
+    if (model is None or hasattr(model, 'jac') or
+            hasattr(model, 'score_obs') or hasattr(model, 'freq_weights') or
+            not hasattr(results, 'wresid')):
+        xu, hessian_inv = _get_sandwich_arrays(results, cov_type=cov_type)
+        if xu.ndim == 1:
+            xu = xu[:, None]
+
+        def scores(rows):
+            return xu[rows]
+
+        nobs, k_params = xu.shape
+        return scores, nobs, k_params, hessian_inv
+
+    if hasattr(results, '_results'):
+        # remove wrapper
+        results = results._results
+    wresid = np.asarray(results.wresid)
+    hessian_inv = np.asarray(results.normalized_cov_params)
+
+    if (getattr(model, '_wexog', None) is None and
+            hasattr(model, '_whiten_rows')):
+        def wexog_rows(rows):
+            return model._whiten_rows(model.exog[rows], rows)
+    else:
+        wexog = model.wexog
+
+        def wexog_rows(rows):
+            return wexog[rows]
+
+    def scores(rows):
+        x = wexog_rows(rows)
+        if sparse.issparse(x):
+            x = x.toarray()
+        return x * wresid[rows, None]
+
+    nobs, k_params = len(wresid), hessian_inv.shape[0]
+    return scores, nobs, k_params, hessian_inv
+
+
 def _HCCM1(results, scale):
     '''
     sandwich with pinv(x) * scale * pinv(x).T
@@ -394,13 +462,34 @@ def S_hac_simple(x, nlags=None, weights_func=weights_bartlett):
         nlags = int(np.floor(4 * (n_periods / 100.)**(2./9.)))
 
     weights = weights_func(nlags)
+    blocks = (x[sl] for sl in _row_blocks(n_periods, x.shape[1]))
+    return _S_hac_blocks(blocks, weights, x.shape[1])
 
-    S = weights[0] * np.dot(x.T, x)  #weights[0] just for completeness, is 1
 
-    for lag in range(1, nlags+1):
-        s = np.dot(x[lag:].T, x[:-lag])
-        S += weights[lag] * (s + s.T)
+def _S_hac_blocks(blocks, weights, k_vars):
+    '''inner covariance matrix for HAC from consecutive blocks of rows
+
+    All lags are handled in one pass. The kernel weighted sum of the lagged
+    rows, z_t = sum_l weights[l] x_{t-l} for l = 1, ..., nlags, is computed
+    with a linear filter, and
+
+        S = weights[0] x'x + x'z + z'x
 
+    which needs one matrix product instead of one for each lag. The last
+    nlags rows of a block are carried over to the next block.
+    '''
+    nlags = len(weights) - 1
+    kernel = np.concatenate(([0.], weights[1:]))
+    S = np.zeros((k_vars, k_vars))
+    x_prev = np.zeros((0, k_vars))
+    for x in blocks:
+        S += weights[0] * np.dot(x.T, x)
+        if nlags > 0:
+            x_ext = np.concatenate((x_prev, x), axis=0)
+            z = signal.lfilter(kernel, [1.], x_ext, axis=0)[len(x_prev):]
+            s = np.dot(x.T, z)
+            S += s + s.T
+            x_prev = x_ext[-nlags:]
     return S
 
 def S_white_simple(x):
@@ -444,12 +533,49 @@ def group_sums(x, group):
 
     #TODO: transpose return in group_sum, need test coverage first
 
-    # re-label groups or bincount takes too much memory
+    # re-label groups or the result takes too much memory
     if np.max(group) > 2 * x.shape[0]:
         group = pd.factorize(group)[0]
 
-    return np.array([np.bincount(group, weights=x[:, col])
-                            for col in range(x.shape[1])])
+    group = np.asarray(group)
+    return _group_sums_blocks(lambda rows: x[rows], group, np.max(group) + 1,
+                              x.shape[0], x.shape[1])
+
+
+def _group_sums_blocks(scores, group, n_groups, nobs, k_vars):
+    '''sum rows within groups, the data is computed in blocks of rows
+
+    Parameters
+    ----------
+    scores : callable
+        ``scores(rows)`` returns the rows of the data for a slice
+    group : ndarray, int
+        group labels in range(n_groups)
+    n_groups : int
+        number of groups
+    nobs : int
+        number of rows
+    k_vars : int
+        number of columns of the data
+
+    Returns
+    -------
+    sums : ndarray, (k_vars, n_groups)
+
+    Notes
+    -----
+    Each block has at least n_groups rows, so that the temporary arrays are
+    not larger than the result and the cost of the bincounts is linear in
+    nobs.
+    '''
+    block_size = max(2**17 // max(k_vars, 1), n_groups)
+    sums = np.zeros((k_vars, n_groups))
+    for sl in _row_blocks(nobs, k_vars, block_size=block_size):
+        x = scores(sl).T
+        g = group[sl]
+        for col in range(k_vars):
+            sums[col] += np.bincount(g, weights=x[col], minlength=n_groups)
+    return sums
 
 
 def S_hac_groupsum(x, time, nlags=None, weights_func=weights_bartlett):
@@ -517,6 +643,82 @@ def cov_crosssection_0(results, group):
     cov = _HCCM1(results, scale)
     return cov
 
+def _combine_codes(codes):
+    '''labels for the intersection of several integer coded factors
+
+    Parameters
+    ----------
+    codes : ndarray, int, (nobs, n_factors)
+        codes in range(n_levels) for each factor
+
+    Returns
+    -------
+    cell : ndarray
+        label of the cell, i.e. the intersection of all factors, in
+        range(n_cells) for each observation
+    cell_codes : ndarray, (n_cells, n_factors)
+        the codes of the factors for each cell
+
+    Notes
+    -----
+    The factors are combined pairwise with a hash table, not with a sort.
+    The intermediate labels stay below nobs**2, so they cannot overflow.
+    '''
+    cell = codes[:, 0]
+    for col in range(1, codes.shape[1]):
+        pair = cell.astype(np.int64) * (codes[:, col].max() + 1) + codes[:, col]
+        cell = pd.factorize(pair)[0]
+    n_cells = cell.max() + 1 if len(cell) else 0
+    # first observation in each cell
+    first = np.empty(n_cells, dtype=np.intp)
+    first[cell[::-1]] = np.arange(len(cell) - 1, -1, -1)
+    return cell, codes[first]
+
+
+def _cov_cluster_terms(results, groups, use_correction=True):
+    '''cluster robust covariances for the intersections of several clusters
+
+    The scores are summed within the cells, i.e. the intersections of all
+    cluster variables, in one pass over the data. The group sums for the
+    intersection of any subset of the cluster variables are sums of the cell
+    sums, so the data is not used again.
+
+    Returns
+    -------
+    covs : dict
+        maps a tuple of indices into groups to the cluster robust covariance
+        matrix for the clusters formed by the intersection of these groups
+    '''
+    scores, nobs, k_params, hessian_inv = _get_sandwich_blocks(
+        results, cov_type='clu')
+
+    codes = np.column_stack([pd.factorize(np.asarray(group))[0]
+                             for group in groups])
+    cell, cell_codes = _combine_codes(codes)
+    cell_sums = _group_sums_blocks(scores, cell, len(cell_codes), nobs,
+                                   k_params).T
+
+    n_factors = codes.shape[1]
+    covs = {}
+    for n_sub in range(1, n_factors + 1):
+        for subset in combinations(range(n_factors), n_sub):
+            if n_sub == n_factors:
+                sums = cell_sums
+            else:
+                group_c, sub_codes = _combine_codes(cell_codes[:, subset])
+                sums = _group_sums_blocks(lambda rows: cell_sums[rows],
+                                          group_c, len(sub_codes),
+                                          len(cell_codes), k_params).T
+            n_groups = sums.shape[0]
+            cov_c = _HCCM2(hessian_inv, np.dot(sums.T, sums))
+            if use_correction:
+                cov_c *= (n_groups / (n_groups - 1.) *
+                          ((nobs-1.) / float(nobs - k_params)))
+            covs[subset] = cov_c
+
+    return covs
+
+
 def cov_cluster(results, group, use_correction=True):
     '''cluster robust covariance matrix
 
@@ -526,8 +728,7 @@ def cov_cluster(results, group, use_correction=True):
     Parameters
     ----------
     results : result instance
-       result of a regression, uses results.model.exog and results.resid
-       TODO: this should use wexog instead
+       result of a regression, uses results.model.wexog and results.wresid
     use_correction : bool
        If true (default), then the small sample correction factor is used.
 
@@ -541,26 +742,9 @@ def cov_cluster(results, group, use_correction=True):
     same result as Stata in UCLA example and same as Peterson
 
     '''
-    #TODO: currently used version of groupsums requires 2d resid
-    xu, hessian_inv = _get_sandwich_arrays(results, cov_type='clu')
-
-    if not hasattr(group, 'dtype') or group.dtype != np.dtype('int'):
-        clusters, group = np.unique(group, return_inverse=True)
-    else:
-        clusters = np.unique(group)
-
-    scale = S_crosssection(xu, group)
-
-    nobs, k_params = xu.shape
-    n_groups = len(clusters) #replace with stored group attributes if available
+    return _cov_cluster_terms(results, [group],
+                              use_correction=use_correction)[(0,)]
 
-    cov_c = _HCCM2(hessian_inv, scale)
-
-    if use_correction:
-        cov_c *= (n_groups / (n_groups - 1.) *
-                  ((nobs-1.) / float(nobs - k_params)))
-
-    return cov_c
 
 def cov_cluster_2groups(results, group, group2=None, use_correction=True):
     '''cluster robust covariance matrix for two groups/clusters
@@ -568,8 +752,7 @@ def cov_cluster_2groups(results, group, group2=None, use_correction=True):
     Parameters
     ----------
     results : result instance
-       result of a regression, uses results.model.exog and results.resid
-       TODO: this should use wexog instead
+       result of a regression, uses results.model.wexog and results.wresid
     use_correction : bool
        If true (default), then the small sample correction factor is used.
 
@@ -589,6 +772,10 @@ def cov_cluster_2groups(results, group, group2=None, use_correction=True):
     -----
 
     verified against Peterson's table, (4 decimal print precision)
+
+    See Also
+    --------
+    cov_cluster_multi : for more than two clusters
     '''
 
     if group2 is None:
@@ -600,26 +787,65 @@ def cov_cluster_2groups(results, group, group2=None, use_correction=True):
     else:
         group0 = group
         group1 = group2
-        group = (group0, group1)
-
 
-    cov0 = cov_cluster(results, group0, use_correction=use_correction)
-    #[0] because we get still also returns bse
-    cov1 = cov_cluster(results, group1, use_correction=use_correction)
+    covs = _cov_cluster_terms(results, [group0, group1],
+                              use_correction=use_correction)
+    cov0, cov1 = covs[(0,)], covs[(1,)]
 
-    group_intersection = Group(group)
-    #cov of cluster formed by intersection of two groups
-    cov01 = cov_cluster(results,
-                        group_intersection.group_int,
-                        use_correction=use_correction)
-
-    #robust cov matrix for union of groups
-    cov_both = cov0 + cov1 - cov01
+    #robust cov matrix for union of groups, cov of cluster formed by
+    #intersection of two groups is counted twice
+    cov_both = cov0 + cov1 - covs[(0, 1)]
 
     #return all three (for now?)
     return cov_both, cov0, cov1
 
 
+def cov_cluster_multi(results, groups, use_correction=True):
+    '''cluster robust covariance matrix for several non-nested clusters
+
+    Parameters
+    ----------
+    results : result instance
+       result of a regression, uses results.model.wexog and results.wresid
+    groups : array_like, (nobs, n_groups) or list of array_like
+        the cluster variables, one column or list element for each
+    use_correction : bool
+       If true (default), then the small sample correction factor is used
+       for each term.
+
+    Returns
+    -------
+    cov : ndarray, (k_vars, k_vars)
+        multiway cluster robust covariance matrix for parameter estimates
+
+    Notes
+    -----
+    This is the inclusion-exclusion formula of Cameron, Gelbach and Miller
+    (2011): the sum over all non-empty subsets of the cluster variables of
+    the cluster robust covariance for the intersection of the subset, with
+    sign (-1)**(size of subset + 1). With two cluster variables the result
+    is the same as `cov_cluster_2groups`. The result is not guaranteed to be
+    positive semi-definite.
+
+    The scores are summed within the intersection of all cluster variables
+    in one pass over the data, and the covariance for each subset is
+    computed from these sums.
+    '''
+    if isinstance(groups, pd.DataFrame):
+        groups = [groups[col] for col in groups.columns]
+    elif not isinstance(groups, (list, tuple)):
+        groups = np.asarray(groups)
+        if groups.ndim == 1:
+            groups = groups[:, None]
+        groups = list(groups.T)
+
+    covs = _cov_cluster_terms(results, groups, use_correction=use_correction)
+    cov = 0
+    for subset, cov_c in covs.items():
+        cov = cov + (-1)**(len(subset) + 1) * cov_c
+    return cov
+
+
 def cov_white_simple(results, use_correction=True):
     '''
     heteroscedasticity robust covariance matrix (White)
@@ -627,8 +853,7 @@ def cov_white_simple(results, use_correction=True):
     Parameters
     ----------
     results : result instance
-       result of a regression, uses results.model.exog and results.resid
-       TODO: this should use wexog instead
+       result of a regression, uses results.model.wexog and results.wresid
 
     Returns
     -------
@@ -648,13 +873,14 @@ def cov_white_simple(results, use_correction=True):
         with small sample corrections
 
     '''
-    xu, hessian_inv = _get_sandwich_arrays(results)
-    sigma = S_white_simple(xu)
+    scores, nobs, k_params, hessian_inv = _get_sandwich_blocks(results)
+    sigma = np.zeros((k_params, k_params))
+    for sl in _row_blocks(nobs, k_params):
+        sigma += S_white_simple(scores(sl))
 
     cov_w = _HCCM2(hessian_inv, sigma)  #add bread to sandwich
 
     if use_correction:
-        nobs, k_params = xu.shape
         cov_w *= nobs / float(nobs - k_params)
 
     return cov_w
@@ -672,8 +898,7 @@ def cov_hac_simple(results, nlags=None, weights_func=weights_bartlett,
     Parameters
     ----------
     results : result instance
-       result of a regression, uses results.model.exog and results.resid
-       TODO: this should use wexog instead
+       result of a regression, uses results.model.wexog and results.wresid
     nlags : int or None
         highest lag to include in kernel window. If None, then
         nlags = floor[4(T/100)^(2/9)] is used.
@@ -694,13 +919,15 @@ def cov_hac_simple(results, nlags=None, weights_func=weights_bartlett,
     options might change when other kernels besides Bartlett are available.
 
     '''
-    xu, hessian_inv = _get_sandwich_arrays(results)
-    sigma = S_hac_simple(xu, nlags=nlags, weights_func=weights_func)
+    scores, nobs, k_params, hessian_inv = _get_sandwich_blocks(results)
+    if nlags is None:
+        nlags = int(np.floor(4 * (nobs / 100.)**(2./9.)))
+    blocks = (scores(sl) for sl in _row_blocks(nobs, k_params))
+    sigma = _S_hac_blocks(blocks, weights_func(nlags), k_params)
 
     cov_hac = _HCCM2(hessian_inv, sigma)
 
     if use_correction:
-        nobs, k_params = xu.shape
         cov_hac *= nobs / float(nobs - k_params)
 
     return cov_hac
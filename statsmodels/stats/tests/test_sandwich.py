@@ -10,7 +10,7 @@ Created on Sat Dec 17 08:39:16 2011
 Author: Josef Perktold
 """
 import numpy as np
-from numpy.testing import assert_almost_equal
+from numpy.testing import assert_allclose, assert_almost_equal, assert_equal
 
 from statsmodels.regression.linear_model import OLS, GLSAR
 from statsmodels.tools.tools import add_constant
@@ -89,6 +89,103 @@ def test_hac_simple():
     cov4 = sw.cov_hac_simple(res_olsg, nlags=4, use_correction=False)
     assert_almost_equal(cov3, cov4, decimal=14)
 
+
+def test_hac_blocks():
+    # compare with the loop over lags, blocks shorter than nlags included
+    np.random.seed(987125)
+    x = np.random.randn(200, 3)
+    for nlags in [0, 1, 5, 30]:
+        for weights_func in [sw.weights_bartlett, sw.weights_uniform]:
+            weights = weights_func(nlags)
+            S_loop = weights[0] * np.dot(x.T, x)
+            for lag in range(1, nlags + 1):
+                s = np.dot(x[lag:].T, x[:-lag])
+                S_loop += weights[lag] * (s + s.T)
+
+            S = sw.S_hac_simple(x, nlags=nlags, weights_func=weights_func)
+            assert_allclose(S, S_loop, rtol=1e-12)
+            blocks = [x[:7], x[7:10], x[10:111], x[111:]]
+            S = sw._S_hac_blocks(blocks, weights, 3)
+            assert_allclose(S, S_loop, rtol=1e-12)
+
+
+def test_group_sums():
+    np.random.seed(987125)
+    x = np.random.randn(300, 3)
+    group = np.random.randint(0, 20, size=300)
+    group[group == 5] = 6  # empty group
+    expected = np.array([np.bincount(group, weights=x[:, col])
+                         for col in range(3)])
+    assert_allclose(sw.group_sums(x, group), expected, rtol=1e-12)
+
+
+class TestCovClusterMulti(object):
+
+    @classmethod
+    def setup_class(cls):
+        np.random.seed(987125)
+        nobs = 500
+        exog = add_constant(np.random.randn(nobs, 2))
+        cls.groups = np.column_stack([np.random.randint(0, k, size=nobs)
+                                      for k in [20, 10, 4]])
+        endog = exog.sum(1) + np.random.randn(nobs)
+        endog += np.random.randn(20)[cls.groups[:, 0]]
+        cls.exog, cls.endog = exog, endog
+        cls.res = OLS(endog, exog).fit()
+
+    def test_3way(self):
+        # inclusion-exclusion with the intersections formed by Group
+        from itertools import combinations
+        from statsmodels.tools.grouputils import Group
+        res, groups = self.res, self.groups
+        cov_expected = 0
+        for n_sub in [1, 2, 3]:
+            for subset in combinations(range(3), n_sub):
+                g = Group(groups[:, list(subset)]).group_int
+                cov_expected = cov_expected + (-1)**(n_sub + 1) * (
+                    sw.cov_cluster(res, g))
+        cov = sw.cov_cluster_multi(res, groups)
+        assert_allclose(cov, cov_expected, rtol=1e-10)
+
+        res_c = res.model.fit(cov_type='cluster',
+                              cov_kwds={'groups': groups})
+        assert_allclose(res_c.cov_params(), cov, rtol=1e-10)
+        assert_equal(res_c.df_resid_inference, 3)
+
+        cov2 = sw.cov_cluster_multi(res, groups[:, :2])
+        assert_allclose(cov2, sw.cov_cluster_2groups(res, groups[:, :2])[0],
+                        rtol=1e-10)
+
+    def test_cluster_scores(self):
+        # the cluster sums of the scores
+        res, group = self.res, self.groups[:, 0]
+        xu = res.model.wexog * res.wresid[:, None]
+        sums = np.array([xu[group == g].sum(0) for g in range(20)])
+        cov_expected = np.dot(res.normalized_cov_params,
+                              np.dot(sums.T, sums)).dot(
+                                  res.normalized_cov_params)
+        cov = sw.cov_cluster(res, group, use_correction=False)
+        assert_allclose(cov, cov_expected, rtol=1e-10)
+
+        # string labels
+        cov = sw.cov_cluster(res, np.array(['g%d' % g for g in group]),
+                             use_correction=False)
+        assert_allclose(cov, cov_expected, rtol=1e-10)
+
+    def test_low_memory(self):
+        # wexog is not created by the fit or by the sandwich
+        res_lm = OLS(self.endog, self.exog).fit(low_memory=True)
+        assert_equal(res_lm.model._wexog, None)
+        for cov_type, kwds in [('cluster', {'groups': self.groups}),
+                               ('HAC', {'maxlags': 3}),
+                               ('HC0', {})]:
+            cov1 = res_lm.get_robustcov_results(cov_type, **kwds).cov_params()
+            cov2 = self.res.get_robustcov_results(cov_type,
+                                                  **kwds).cov_params()
+            assert_allclose(cov1, cov2, rtol=1e-10)
+        assert_equal(res_lm.model._wexog, None)
+
+
 if __name__ == '__main__':
     import nose
     nose.runmodule(argv=[__file__, '-vvs', '-x'], exit=False)
@@ -96,6 +96,14 @@ def _is_using_ndarray(endog, exog):
             (isinstance(exog, np.ndarray) or exog is None))
 
 
+def _is_sparse(x):
+    """
+    Returns true if x is a scipy.sparse matrix
+    """
+    from scipy import sparse
+    return sparse.issparse(x)
+
+
 def _is_using_pandas(endog, exog):
     # TODO: Remove WidePanel when finished with it
     klasses = (pd.Series, pd.DataFrame, pd.WidePanel, pd.Panel)
@@ -29,11 +29,14 @@ need more efficient loop if groups are sorted -> see GroupSorted.group_iter
 """
 from __future__ import print_function
 from statsmodels.compat.python import lrange, lzip, range
+import warnings
+
 import numpy as np
 import pandas as pd
 from statsmodels.compat.numpy import npc_unique
 from statsmodels.compat.pandas import sort_values
 import statsmodels.tools.data as data_util
+from statsmodels.tools.sm_exceptions import ConvergenceWarning
 from pandas.core.index import Index, MultiIndex
 
 
@@ -177,11 +180,102 @@ def dummy_sparse(groups):
 
     indptr = np.arange(len(groups)+1)
     data = np.ones(len(groups), dtype=np.int8)
-    indi = sparse.csr_matrix((data, g, indptr))
+    indi = sparse.csr_matrix((data, groups, indptr))
 
     return indi
 
 
+def within_transform(x, groups, weights=None, tol=1e-8, maxiter=1000):
+    """sweep out the fixed effects of several factors from x
+
+    The fixed effects are removed by the method of alternating projections,
+    i.e. x is demeaned within the levels of each factor in turn until the
+    demeaned x does not change anymore. The result is the residual of the
+    (weighted) least squares projection of x on the dummy variables of all
+    factors, which is never created.
+
+    Parameters
+    ----------
+    x : array_like, 1d (nobs,) or 2d (nobs, k)
+        data to be transformed
+    groups : list
+        list of factors, each either a Group instance or a 1d array with the
+        level of the factor for each observation
+    weights : None or array_like, 1d (nobs,)
+        weights for the weighted least squares projection
+    tol : float
+        convergence tolerance. Iterations for a column of x stop when the
+        largest change of an element in a sweep over all factors, relative to
+        the root mean square of the column, is smaller than `tol`.
+    maxiter : int
+        maximum number of sweeps over all factors
+
+    Returns
+    -------
+    x_within : ndarray
+        x with the fixed effects removed, same shape as x
+
+    Notes
+    -----
+    With a single factor one sweep is exact. With several factors the rate of
+    convergence depends on how strongly the factors are connected, e.g. for
+    workers and firms on how many workers move between firms.
+
+    References
+    ----------
+    Gaure, S. 2013. OLS with multiple high dimensional category variables.
+        Computational Statistics & Data Analysis, 66, 8-18.
+    """
+    x = np.array(x, dtype=np.float64)
+    is_1d = x.ndim == 1
+    if is_1d:
+        x = x[:, None]
+    nobs = x.shape[0]
+
+    groups = [g if isinstance(g, Group) else Group(np.asarray(g))
+              for g in groups]
+    if weights is None:
+        weights = np.ones(nobs)
+    else:
+        weights = np.asarray(weights, dtype=np.float64)
+    wsums = []
+    for g in groups:
+        if len(g.group_int) != nobs:
+            raise ValueError('groups and x need to have the same length')
+        wsum = np.bincount(g.group_int, weights=weights,
+                           minlength=g.n_groups)
+        wsum[wsum == 0] = 1
+        wsums.append(wsum)
+
+    scale = np.sqrt(np.mean(x**2, 0))
+    scale[scale == 0] = 1
+    active = np.arange(x.shape[1])
+    for _ in range(maxiter):
+        xa = x[:, active]
+        xa_old = xa.copy()
+        for g, wsum in zip(groups, wsums):
+            wx = xa * weights[:, None]
+            means = np.column_stack([
+                np.bincount(g.group_int, weights=wx[:, col],
+                            minlength=g.n_groups)
+                for col in range(xa.shape[1])]) / wsum[:, None]
+            xa -= means[g.group_int]
+        x[:, active] = xa
+        if len(groups) == 1:
+            break
+        change = np.max(np.abs(xa - xa_old), 0) / scale[active]
+        active = active[change > tol]
+        if len(active) == 0:
+            break
+    else:
+        warnings.warn('within_transform did not converge in %d iterations'
+                      % maxiter, ConvergenceWarning)
+
+    if is_1d:
+        x = x[:, 0]
+    return x
+
+
 class Group(object):
 
     def __init__(self, group, name=''):
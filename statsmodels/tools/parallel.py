@@ -73,3 +73,23 @@ def parallel_func(func, n_jobs, verbose=5):
         my_func = func
         parallel = list
     return parallel, my_func, n_jobs
+
+
+def _get_n_jobs(n_jobs, n_tasks):
+    """number of workers for the thread and process pools
+
+    If `n_jobs` is None, then the minimum of the number of tasks and the
+    number of cpus is used. Negative values follow the joblib convention,
+    -1 is all cpus, -2 all but one, ...
+    """
+    if n_jobs is None or n_jobs < 1:
+        import multiprocessing
+        try:
+            n_cpu = multiprocessing.cpu_count()
+        except NotImplementedError:
+            n_cpu = 1
+        if n_jobs is None:
+            n_jobs = min(n_cpu, n_tasks)
+        else:
+            n_jobs = max(n_cpu + 1 + n_jobs, 1)
+    return n_jobs
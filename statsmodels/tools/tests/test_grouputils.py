@@ -1,6 +1,7 @@
 import numpy as np
 import pandas as pd
-from statsmodels.tools.grouputils import Grouping
+from statsmodels.tools.grouputils import (Group, Grouping, dummy_sparse,
+                                         within_transform)
 from statsmodels.tools.tools import categorical
 from statsmodels.datasets import grunfeld, anes96
 from pandas.util import testing as ptesting
@@ -248,3 +249,36 @@ def test_init_api():
     grouping = Grouping(list_groups)
     np.testing.assert_array_equal(grouping.group_names,
                                   ['group0', 'group1', 'group2'])
+
+
+def test_dummy_sparse_function():
+    groups = np.array([0, 0, 2, 1, 1, 2, 0])
+    indi = dummy_sparse(groups)
+    expected = (groups[:, None] == np.arange(3)).astype(np.int8)
+    np.testing.assert_equal(indi.toarray(), expected)
+
+
+def test_within_transform():
+    np.random.seed(987125)
+    nobs = 300
+    g0 = np.random.randint(0, 20, size=nobs)
+    g1 = np.random.randint(0, 5, size=nobs)
+    x = np.random.randn(nobs, 2) + g0[:, None]
+    weights = np.random.uniform(0.5, 2, size=nobs)
+    dummies = np.column_stack(((g0[:, None] == np.arange(20)),
+                               (g1[:, None] == np.arange(1, 5))))
+    dummies = dummies.astype(np.float64)
+
+    for w in [None, weights]:
+        w_ = np.ones(nobs) if w is None else w
+        sw = np.sqrt(w_)[:, None]
+        # residual of the weighted projection on the dummies
+        beta = np.linalg.lstsq(sw * dummies, sw * x)[0]
+        expected = x - dummies.dot(beta)
+        xw = within_transform(x, [g0, g1], weights=w, tol=1e-12)
+        np.testing.assert_allclose(xw, expected, atol=1e-9)
+
+        xw = within_transform(x[:, 0], [Group(g0)], weights=w)
+        beta = np.linalg.lstsq(sw * dummies[:, :20], sw * x[:, :1])[0]
+        expected = x[:, 0] - dummies[:, :20].dot(beta)[:, 0]
+        np.testing.assert_allclose(xw, expected, atol=1e-12)
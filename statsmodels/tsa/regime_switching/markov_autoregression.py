@@ -13,8 +13,97 @@ import statsmodels.base.wrapper as wrap
 from statsmodels.tsa.tsatools import lagmat
 from statsmodels.tsa.regime_switching import (
     markov_switching, markov_regression)
+from statsmodels.tsa.regime_switching._hamilton_filter import (
+    shamilton_filter_ar, dhamilton_filter_ar, chamilton_filter_ar,
+    zhamilton_filter_ar)
 from statsmodels.tsa.statespace.tools import (
-    constrain_stationary_univariate, unconstrain_stationary_univariate)
+    constrain_stationary_univariate, unconstrain_stationary_univariate,
+    find_best_blas_type)
+
+prefix_hamilton_filter_ar_map = {
+    's': shamilton_filter_ar, 'd': dhamilton_filter_ar,
+    'c': chamilton_filter_ar, 'z': zhamilton_filter_ar
+}
+
+
+def cy_hamilton_filter_ar(initial_probabilities, regime_transition, resid,
+                          ar_coeffs, variance, prune_tol=0):
+    """
+    Hamilton filter of a Markov switching autoregression
+
+    Parameters
+    ----------
+    initial_probabilities : array
+        Array of initial probabilities, shaped (k_regimes,).
+    regime_transition : array
+        Matrix of regime transition probabilities, shaped either
+        (k_regimes, k_regimes, 1) or if there are time-varying transition
+        probabilities (k_regimes, k_regimes, nobs + order).
+    resid : array
+        The endogenous variable less the regression on the exogenous
+        variables in each regime, including the `order` presample periods,
+        shaped (k_regimes, nobs + order).
+    ar_coeffs : array
+        Autoregressive coefficients in each regime, shaped
+        (k_regimes, order).
+    variance : array
+        Variance of the error term in each regime, shaped (k_regimes,).
+    prune_tol : float, optional
+        Histories of the last `order` regimes whose filtered probability is
+        below `prune_tol` are dropped and the remaining probabilities
+        renormalized. Default is 0, which gives the exact filter.
+
+    Returns
+    -------
+    filtered_marginal_probabilities : array
+        Array containing Pr[S_t=s_t | Y_t] - the probability of being in each
+        regime conditional on time t information. Shaped (k_regimes, nobs).
+    joint_likelihoods : array
+        Array of likelihoods f(y_t | Y_{t-1}), shaped (nobs,).
+
+    Notes
+    -----
+    The likelihoods conditional on the last `order+1` regimes are computed
+    within the filter loop, so that unlike `cy_hamilton_filter` neither they
+    nor the joint probabilities are stored for each period, and the
+    likelihoods of pruned histories and of transitions with probability zero
+    are not computed. The memory used is of the order of
+    nobs * k_regimes + k_regimes**(order + 1).
+
+    See Also
+    --------
+    statsmodels.tsa.regime_switching.markov_switching.cy_hamilton_filter
+    """
+    # Dimensions
+    k_regimes, order = ar_coeffs.shape
+    nobs = resid.shape[1] - order
+
+    prefix, dtype, _ = find_best_blas_type((
+        initial_probabilities, regime_transition, resid, ar_coeffs,
+        variance))
+
+    # Pr[S_0, ..., S_{-r}]
+    initial_joint_probabilities = (
+        markov_switching._initial_joint_probabilities(
+            np.asarray(initial_probabilities, dtype=dtype),
+            regime_transition, order))
+    regime_transition = markov_switching._filter_regime_transition(
+        regime_transition, order, nobs)
+
+    # Storage
+    filtered_marginal_probabilities = np.zeros((k_regimes, nobs),
+                                               dtype=dtype)
+    joint_likelihoods = np.zeros(nobs, dtype=dtype)
+
+    variance = np.asarray(variance, dtype=dtype)
+    func = prefix_hamilton_filter_ar_map[prefix]
+    func(nobs, k_regimes, order, np.asarray(regime_transition, dtype=dtype),
+         initial_joint_probabilities.ravel(), np.asarray(resid, dtype=dtype),
+         np.asarray(ar_coeffs, dtype=dtype),
+         1. / np.sqrt(2 * np.pi * variance), -0.5 / variance,
+         prune_tol, joint_likelihoods, filtered_marginal_probabilities)
+
+    return filtered_marginal_probabilities, joint_likelihoods
 
 
 class MarkovAutoregression(markov_regression.MarkovRegression):
@@ -61,6 +150,12 @@ class MarkovAutoregression(markov_regression.MarkovRegression):
         Whether or not there is regime-specific heteroskedasticity, i.e.
         whether or not the error term has a switching variance. Default is
         False.
+    prune_tol : float, optional
+        In the loglikelihood evaluation, histories of the last `order` regimes
+        whose filtered probability is below `prune_tol` are dropped and the
+        remaining probabilities renormalized, an approximation which avoids
+        computing the likelihoods of unlikely histories. Default is 0, which
+        gives the exact loglikelihood.
 
     Notes
     -----
@@ -98,10 +193,11 @@ class MarkovAutoregression(markov_regression.MarkovRegression):
     def __init__(self, endog, k_regimes, order, trend='c', exog=None,
                  exog_tvtp=None, switching_ar=True, switching_trend=True,
                  switching_exog=False, switching_variance=False,
-                 dates=None, freq=None, missing='none'):
+                 dates=None, freq=None, missing='none', prune_tol=0):
 
         # Properties
         self.switching_ar = switching_ar
+        self.prune_tol = prune_tol
 
         # Switching options
         if self.switching_ar is True or self.switching_ar is False:
@@ -230,13 +326,113 @@ class MarkovAutoregression(markov_regression.MarkovRegression):
         # Compute the conditional likelihoods
         variance = params[self.parameters['variance']].squeeze()
         if self.switching_variance:
-            variance = np.reshape(variance, (self.k_regimes, 1, 1))
+            variance = np.reshape(variance,
+                                  (self.k_regimes,) + (1,) * (self.order + 1))
 
         conditional_likelihoods = (
             np.exp(-0.5 * resid**2 / variance) / np.sqrt(2 * np.pi * variance))
 
         return conditional_likelihoods
 
+    def _filter_ar(self, params, regime_transition=None):
+        """
+        Hamilton filter computing the conditional likelihoods within the loop
+
+        Returns the filtered marginal probabilities and the joint likelihoods.
+        """
+        # Get the regime transition matrix if not provided
+        if regime_transition is None:
+            regime_transition = self.regime_transition_matrix(params)
+        initial_probabilities = self.initial_probabilities(
+            params, regime_transition)
+
+        # y_t - x_t beta^{(S_t)}, including the presample periods
+        dtype = np.promote_types(np.float64, params.dtype)
+        resid = np.zeros((self.k_regimes, self.nobs + self.order),
+                         dtype=dtype)
+        resid[:] = self.orig_endog
+        if self._k_exog > 0:
+            for i in range(self.k_regimes):
+                resid[i] -= np.dot(self.orig_exog,
+                                   params[self.parameters[i, 'exog']])
+
+        ar_coeffs = np.array([params[self.parameters[i, 'autoregressive']]
+                              for i in range(self.k_regimes)])
+        variance = np.zeros(self.k_regimes, dtype=dtype)
+        variance[:] = params[self.parameters['variance']]
+
+        return cy_hamilton_filter_ar(
+            initial_probabilities, regime_transition, resid, ar_coeffs,
+            variance, prune_tol=self.prune_tol)
+
+    def loglikeobs(self, params, transformed=True):
+        """
+        Loglikelihood evaluation for each period
+
+        Parameters
+        ----------
+        params : array_like
+            Array of parameters at which to evaluate the loglikelihood
+            function.
+        transformed : boolean, optional
+            Whether or not `params` is already transformed. Default is True.
+
+        Notes
+        -----
+        The conditional likelihoods are computed within the Hamilton filter
+        loop (see `cy_hamilton_filter_ar`), so that the joint probabilities of
+        the last `order+1` regimes are not stored for each period. If
+        `prune_tol` is positive, unlikely histories are dropped.
+        """
+        if self.order == 0:
+            return super(MarkovAutoregression, self).loglikeobs(
+                params, transformed=transformed)
+
+        params = np.array(params, ndmin=1)
+
+        if not transformed:
+            params = self.transform_params(params)
+
+        return np.log(self._filter_ar(params)[1])
+
+    def loglike_batch(self, params, transformed=True, n_threads=1):
+        """
+        Loglikelihood evaluation at many parameter vectors
+
+        Parameters
+        ----------
+        params : array_like
+            Array of parameters with one parameter vector in each row.
+        transformed : boolean, optional
+            Whether or not `params` is already transformed. Default is True.
+        n_threads : int or None, optional
+            The number of threads used to run the Hamilton filters. If None,
+            the number of cpus is used. Default is 1.
+
+        Returns
+        -------
+        loglike : ndarray
+            The loglikelihood at each parameter vector.
+
+        Notes
+        -----
+        If `prune_tol` is positive, then the approximate loglikelihood of
+        `loglike` is computed for each parameter vector in turn, and
+        `n_threads` is not used. Otherwise, the exact loglikelihoods are
+        computed with the batched Hamilton filter, see
+        `MarkovSwitching.loglike_batch`.
+        """
+        if self.order == 0 or not self.prune_tol > 0:
+            return super(MarkovAutoregression, self).loglike_batch(
+                params, transformed=transformed, n_threads=n_threads)
+
+        params = np.atleast_2d(params)
+        if not transformed:
+            params = np.array([self.transform_params(x) for x in params])
+
+        return np.array([np.sum(np.log(self._filter_ar(x)[1]))
+                         for x in params])
+
     def filter(self, *args, **kwargs):
         kwargs.setdefault('results_class', MarkovAutoregressionResults)
         kwargs.setdefault('results_wrapper_class',
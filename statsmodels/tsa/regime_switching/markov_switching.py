@@ -22,14 +22,19 @@ from statsmodels.tools.decorators import cache_readonly, resettable_cache
 from statsmodels.tools.eval_measures import aic, bic, hqic
 from statsmodels.tools.tools import pinv_extended
 from statsmodels.tools.sm_exceptions import EstimationWarning
+from statsmodels.tools.parallel import _get_n_jobs
 import statsmodels.base.wrapper as wrap
 
 
 from statsmodels.tsa.statespace.tools import find_best_blas_type
 from statsmodels.tsa.regime_switching._hamilton_filter import (
-    shamilton_filter, dhamilton_filter, chamilton_filter, zhamilton_filter)
+    shamilton_filter, dhamilton_filter, chamilton_filter, zhamilton_filter,
+    shamilton_filter_batch, dhamilton_filter_batch, chamilton_filter_batch,
+    zhamilton_filter_batch)
 from statsmodels.tsa.regime_switching._kim_smoother import (
-    skim_smoother, dkim_smoother, ckim_smoother, zkim_smoother)
+    skim_smoother, dkim_smoother, ckim_smoother, zkim_smoother,
+    skim_smoother_batch, dkim_smoother_batch, ckim_smoother_batch,
+    zkim_smoother_batch)
 
 prefix_hamilton_filter_map = {
     's': shamilton_filter, 'd': dhamilton_filter,
@@ -41,6 +46,16 @@ prefix_kim_smoother_map = {
     'c': ckim_smoother, 'z': zkim_smoother
 }
 
+prefix_hamilton_filter_batch_map = {
+    's': shamilton_filter_batch, 'd': dhamilton_filter_batch,
+    'c': chamilton_filter_batch, 'z': zhamilton_filter_batch
+}
+
+prefix_kim_smoother_batch_map = {
+    's': skim_smoother_batch, 'd': dkim_smoother_batch,
+    'c': ckim_smoother_batch, 'z': zkim_smoother_batch
+}
+
 
 def _prepare_exog(exog):
     k_exog = 0
@@ -262,62 +277,188 @@ def cy_hamilton_filter(initial_probabilities, regime_transition,
         information. Shaped (k_regimes,) * (order + 1) + (nobs,).
     """
 
+    results = cy_hamilton_filter_batch(initial_probabilities[:, None],
+                                       regime_transition,
+                                       conditional_likelihoods[..., None])
+    return tuple(x[..., 0] for x in results)
+
+
+def _batch_threads(run, n_series, n_threads):
+    """
+    Call `run` with slices of the series of a batch, in a pool of threads
+    unless `n_threads` is one. The Cython loops over the series release the
+    GIL, so that the threads run in parallel.
+    """
+    n_threads = _get_n_jobs(n_threads, n_series)
+    if n_threads <= 1 or n_series < 2:
+        run(slice(None))
+        return
+
+    bounds = np.linspace(0, n_series, min(n_threads, n_series) + 1)
+    bounds = bounds.astype(int)
+
+    from multiprocessing.pool import ThreadPool
+    pool = ThreadPool(len(bounds) - 1)
+    try:
+        pool.map(lambda i: run(slice(bounds[i], bounds[i + 1])),
+                 range(len(bounds) - 1))
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def _series_last(x, dtype=None):
+    """
+    Copy of `x`, whose last two axes index the periods and the series,
+    stored with the series in the first axis and the periods in the second,
+    so that the regimes of each period are contiguous. `x` may also be a
+    shape, for zeros.
+    """
+    if isinstance(x, tuple):
+        base = np.zeros(x[:-3:-1] + x[:-2], dtype=dtype)
+    else:
+        axes = (x.ndim - 1, x.ndim - 2) + tuple(range(x.ndim - 2))
+        base = np.ascontiguousarray(np.transpose(x, axes), dtype=dtype)
+    return np.transpose(base, tuple(range(2, base.ndim)) + (1, 0))
+
+
+def _flatten_regimes(x, k_joint):
+    """View of a `_series_last` array with the regime axes flattened"""
+    base = np.transpose(x, (x.ndim - 1, x.ndim - 2) + tuple(range(x.ndim - 2)))
+    return base.reshape(base.shape[:2] + (k_joint,)).T
+
+
+def _initial_joint_probabilities(initial_probabilities, regime_transition,
+                                 order):
+    """
+    Pr[S_0, ..., S_{-r}], from the initial probabilities of S_{-r} and the
+    regime transition matrix, which has a last axis for the series if the
+    initial probabilities have one
+    """
+    tmp = initial_probabilities
+    shape = (regime_transition.shape[0], regime_transition.shape[1])
+    transition_t = 0
+    for i in range(order):
+        if regime_transition.shape[2] > 1:
+            transition_t = i
+        tmp = np.reshape(regime_transition[:, :, transition_t],
+                         shape + (1,) * i + (-1,) * (tmp.ndim - i - 1)) * tmp
+    return tmp
+
+
+def _filter_regime_transition(regime_transition, order, nobs):
+    """
+    Subset of the regime transition matrices applying to the filtered periods
+    """
+    if regime_transition.shape[2] > 1:
+        regime_transition = regime_transition[:, :, order:]
+        # If there are fewer time-varying transition matrices than periods
+        # (as in MarkovRegression), the last one is repeated rather than
+        # read past the end of the array
+        if regime_transition.shape[2] < nobs:
+            regime_transition = np.concatenate(
+                (regime_transition,) + (regime_transition[:, :, -1:],) *
+                (nobs - regime_transition.shape[2]), axis=2)
+    return regime_transition
+
+
+def cy_hamilton_filter_batch(initial_probabilities, regime_transition,
+                             conditional_likelihoods, n_threads=1):
+    """
+    Hamilton filter of a batch of series or parameter vectors
+
+    Parameters
+    ----------
+    initial_probabilities : array
+        Array of initial probabilities, shaped (k_regimes, n_series).
+    regime_transition : array
+        Matrix of regime transition probabilities, shaped either
+        (k_regimes, k_regimes, 1) or if there are time-varying transition
+        probabilities (k_regimes, k_regimes, nobs), with an optional last
+        axis of length n_series if they differ between the series.
+    conditional_likelihoods : array
+        Array of likelihoods conditional on the last `order+1` regimes,
+        shaped (k_regimes,)*(order + 1) + (nobs, n_series).
+    n_threads : int or None, optional
+        The number of threads among which the series are split. If None,
+        the number of cpus is used. Default is 1.
+
+    Returns
+    -------
+    filtered_marginal_probabilities : array
+        Shaped (k_regimes, nobs, n_series).
+    predicted_joint_probabilities : array
+        Shaped (k_regimes,) * (order + 1) + (nobs, n_series).
+    joint_likelihoods : array
+        Shaped (nobs, n_series).
+    filtered_joint_probabilities : array
+        Shaped (k_regimes,) * (order + 1) + (nobs, n_series).
+
+    Notes
+    -----
+    The output is that of `cy_hamilton_filter` for each series, stacked
+    along the last axis. The loop over the series runs in Cython without
+    the GIL.
+
+    See Also
+    --------
+    cy_hamilton_filter
+    """
     # Dimensions
     k_regimes = len(initial_probabilities)
-    nobs = conditional_likelihoods.shape[-1]
-    order = conditional_likelihoods.ndim - 2
-    dtype = conditional_likelihoods.dtype
+    nobs, n_series = conditional_likelihoods.shape[-2:]
+    order = conditional_likelihoods.ndim - 3
+    k_joint = k_regimes**(order + 1)
+    if regime_transition.ndim == 3:
+        regime_transition = regime_transition[..., None]
+
+    prefix, dtype, _ = find_best_blas_type((
+        initial_probabilities, regime_transition, conditional_likelihoods))
+    regime_transition = np.asarray(regime_transition, dtype=dtype)
 
     # Storage
-    # Pr[S_t = s_t | Y_t]
-    filtered_marginal_probabilities = (
-        np.zeros((k_regimes, nobs), dtype=dtype))
     # Pr[S_t = s_t, ... S_{t-r} = s_{t-r} | Y_{t-1}]
-    # Has k_regimes^(order+1) elements
-    predicted_joint_probabilities = np.zeros(
-        (k_regimes,) * (order + 1) + (nobs,), dtype=dtype)
+    predicted_joint_probabilities = _series_last(
+        (k_regimes,) * (order + 1) + (nobs, n_series), dtype)
     # f(y_t | Y_{t-1})
-    joint_likelihoods = np.zeros((nobs,), dtype)
-    # Pr[S_t = s_t, ... S_{t-r+1} = s_{t-r+1} | Y_t]
-    # Has k_regimes^order elements
-    filtered_joint_probabilities = np.zeros(
-        (k_regimes,) * (order + 1) + (nobs + 1,), dtype=dtype)
+    joint_likelihoods = _series_last((nobs, n_series), dtype)
+    # Pr[S_t = s_t, ... S_{t-r} = s_{t-r} | Y_t]
+    filtered_joint_probabilities = _series_last(
+        (k_regimes,) * (order + 1) + (nobs + 1, n_series), dtype)
 
     # Initial probabilities
-    filtered_marginal_probabilities[:, 0] = initial_probabilities
-    tmp = np.copy(initial_probabilities)
-    shape = (k_regimes, k_regimes)
-    transition_t = 0
-    for i in range(order):
-        if regime_transition.shape[-1] > 1:
-            transition_t = i
-        tmp = np.reshape(regime_transition[..., transition_t],
-                         shape + (1,) * i) * tmp
-    filtered_joint_probabilities[..., 0] = tmp
+    filtered_joint_probabilities[..., 0, :] = _initial_joint_probabilities(
+        np.asarray(initial_probabilities, dtype=dtype), regime_transition,
+        order)
 
     # Get appropriate subset of transition matrix
-    if regime_transition.shape[-1] > 1:
-        regime_transition = regime_transition[..., order:]
+    regime_transition = _filter_regime_transition(regime_transition, order,
+                                                  nobs)
 
     # Run Cython filter iterations
-    prefix, dtype, _ = find_best_blas_type((
-        regime_transition, conditional_likelihoods, joint_likelihoods,
-        predicted_joint_probabilities, filtered_joint_probabilities))
-    func = prefix_hamilton_filter_map[prefix]
-    func(nobs, k_regimes, order, regime_transition,
-         conditional_likelihoods.reshape(k_regimes**(order+1), nobs),
-         joint_likelihoods,
-         predicted_joint_probabilities.reshape(k_regimes**(order+1), nobs),
-         filtered_joint_probabilities.reshape(k_regimes**(order+1), nobs+1))
+    func = prefix_hamilton_filter_batch_map[prefix]
+    regime_transition = _series_last(regime_transition, dtype)
+    conditional = _flatten_regimes(
+        _series_last(conditional_likelihoods, dtype), k_joint)
+    predicted = _flatten_regimes(predicted_joint_probabilities, k_joint)
+    filtered = _flatten_regimes(filtered_joint_probabilities, k_joint)
+    shared = regime_transition.shape[3] == 1
+
+    def run(sl):
+        func(nobs, k_regimes, order,
+             regime_transition if shared else regime_transition[..., sl],
+             conditional[..., sl], joint_likelihoods[:, sl],
+             predicted[..., sl], filtered[..., sl])
+    _batch_threads(run, n_series, n_threads)
 
     # S_t | t
-    filtered_marginal_probabilities = filtered_joint_probabilities[..., 1:]
-    for i in range(1, filtered_marginal_probabilities.ndim - 1):
+    filtered_marginal_probabilities = filtered_joint_probabilities[..., 1:, :]
+    for i in range(order):
         filtered_marginal_probabilities = np.sum(
-            filtered_marginal_probabilities, axis=-2)
+            filtered_marginal_probabilities, axis=-3)
 
     return (filtered_marginal_probabilities, predicted_joint_probabilities,
-            joint_likelihoods, filtered_joint_probabilities[..., 1:])
+            joint_likelihoods, filtered_joint_probabilities[..., 1:, :])
 
 
 def py_kim_smoother(regime_transition, predicted_joint_probabilities,
@@ -439,36 +580,90 @@ def cy_kim_smoother(regime_transition, predicted_joint_probabilities,
         regime conditional on all information. Shaped (k_regimes, nobs).
     """
 
+    results = cy_kim_smoother_batch(regime_transition,
+                                    predicted_joint_probabilities[..., None],
+                                    filtered_joint_probabilities[..., None])
+    return tuple(x[..., 0] for x in results)
+
+
+def cy_kim_smoother_batch(regime_transition, predicted_joint_probabilities,
+                          filtered_joint_probabilities, n_threads=1):
+    """
+    Kim smoother of a batch of series or parameter vectors
+
+    Parameters
+    ----------
+    regime_transition : array
+        Matrix of regime transition probabilities, shaped either
+        (k_regimes, k_regimes, 1) or if there are time-varying transition
+        probabilities (k_regimes, k_regimes, nobs), with an optional last
+        axis of length n_series if they differ between the series.
+    predicted_joint_probabilities : array
+        Shaped (k_regimes,) * (order + 1) + (nobs, n_series).
+    filtered_joint_probabilities : array
+        Shaped (k_regimes,) * (order + 1) + (nobs, n_series).
+    n_threads : int or None, optional
+        The number of threads among which the series are split. If None,
+        the number of cpus is used. Default is 1.
+
+    Returns
+    -------
+    smoothed_joint_probabilities : array
+        Shaped (k_regimes,) * (order + 1) + (nobs, n_series).
+    smoothed_marginal_probabilities : array
+        Shaped (k_regimes, nobs, n_series).
+
+    Notes
+    -----
+    The output is that of `cy_kim_smoother` for each series, stacked along
+    the last axis. The loop over the series runs in Cython without the GIL.
+
+    See Also
+    --------
+    cy_kim_smoother
+    """
     # Dimensions
     k_regimes = filtered_joint_probabilities.shape[0]
-    nobs = filtered_joint_probabilities.shape[-1]
-    order = filtered_joint_probabilities.ndim - 2
-    dtype = filtered_joint_probabilities.dtype
-
-    # Storage
-    smoothed_joint_probabilities = np.zeros(
-        (k_regimes,) * (order + 1) + (nobs,), dtype=dtype)
+    nobs, n_series = filtered_joint_probabilities.shape[-2:]
+    order = filtered_joint_probabilities.ndim - 3
+    k_joint = k_regimes**(order + 1)
+    if regime_transition.ndim == 3:
+        regime_transition = regime_transition[..., None]
 
     # Get appropriate subset of transition matrix
-    if regime_transition.shape[-1] == nobs + order:
-        regime_transition = regime_transition[..., order:]
+    if regime_transition.shape[2] == nobs + order:
+        regime_transition = regime_transition[:, :, order:]
 
-    # Run Cython smoother iterations
     prefix, dtype, _ = find_best_blas_type((
         regime_transition, predicted_joint_probabilities,
         filtered_joint_probabilities))
-    func = prefix_kim_smoother_map[prefix]
-    func(nobs, k_regimes, order, regime_transition,
-         predicted_joint_probabilities.reshape(k_regimes**(order+1), nobs),
-         filtered_joint_probabilities.reshape(k_regimes**(order+1), nobs),
-         smoothed_joint_probabilities.reshape(k_regimes**(order+1), nobs))
+    regime_transition = _series_last(regime_transition, dtype)
+
+    # Storage
+    smoothed_joint_probabilities = _series_last(
+        (k_regimes,) * (order + 1) + (nobs, n_series), dtype)
+
+    # Run Cython smoother iterations
+    func = prefix_kim_smoother_batch_map[prefix]
+    predicted = _flatten_regimes(
+        _series_last(predicted_joint_probabilities, dtype), k_joint)
+    filtered = _flatten_regimes(
+        _series_last(filtered_joint_probabilities, dtype), k_joint)
+    smoothed = _flatten_regimes(smoothed_joint_probabilities, k_joint)
+    shared = regime_transition.shape[3] == 1
+
+    def run(sl):
+        func(nobs, k_regimes, order,
+             regime_transition if shared else regime_transition[..., sl],
+             predicted[..., sl], filtered[..., sl], smoothed[..., sl])
+    _batch_threads(run, n_series, n_threads)
 
     # Get smoothed marginal probabilities S_t | T by integrating out
     # S_{t-k+1}, S_{t-k+2}, ..., S_{t-1}
     smoothed_marginal_probabilities = smoothed_joint_probabilities
-    for i in range(1, smoothed_marginal_probabilities.ndim - 1):
+    for i in range(order):
         smoothed_marginal_probabilities = np.sum(
-            smoothed_marginal_probabilities, axis=-2)
+            smoothed_marginal_probabilities, axis=-3)
 
     return smoothed_joint_probabilities, smoothed_marginal_probabilities
 
@@ -1139,6 +1334,63 @@ class MarkovSwitching(tsbase.TimeSeriesModel):
         """
         return np.sum(self.loglikeobs(params, transformed))
 
+    def loglike_batch(self, params, transformed=True, n_threads=1):
+        """
+        Loglikelihood evaluation at many parameter vectors
+
+        Parameters
+        ----------
+        params : array_like
+            Array of parameters with one parameter vector in each row.
+        transformed : boolean, optional
+            Whether or not `params` is already transformed. Default is True.
+        n_threads : int or None, optional
+            The number of threads used to run the Hamilton filters. If None,
+            the number of cpus is used. Default is 1.
+
+        Returns
+        -------
+        loglike : ndarray
+            The loglikelihood at each parameter vector.
+
+        Notes
+        -----
+        The regime transition matrices and conditional likelihoods of all
+        parameter vectors are stacked and filtered in one call to
+        `cy_hamilton_filter_batch`, which runs without the GIL.
+
+        The loglikelihood is computed with the default Hamilton filter from
+        `_conditional_likelihoods`, so that it is equal to `loglike` only if
+        the model does not change the filter or `loglikeobs`. Subclasses
+        that do need to override this method.
+
+        See Also
+        --------
+        loglike
+        """
+        params = np.atleast_2d(params)
+        if not transformed:
+            params = np.array([self.transform_params(x) for x in params])
+
+        regime_transition = []
+        initial_probabilities = []
+        conditional_likelihoods = []
+        for x in params:
+            transition = self.regime_transition_matrix(x)
+            regime_transition.append(transition)
+            initial_probabilities.append(
+                self.initial_probabilities(x, transition))
+            conditional_likelihoods.append(self._conditional_likelihoods(x))
+
+        def stack(arrays):
+            # The parameter vectors are stacked along a new last axis
+            return np.concatenate([x[..., None] for x in arrays], axis=-1)
+
+        joint_likelihoods = cy_hamilton_filter_batch(
+            stack(initial_probabilities), stack(regime_transition),
+            stack(conditional_likelihoods), n_threads=n_threads)[2]
+        return np.sum(np.log(joint_likelihoods), axis=0)
+
     def score(self, params, transformed=True):
         """
         Compute the score function at params.
@@ -1191,7 +1443,7 @@ class MarkovSwitching(tsbase.TimeSeriesModel):
     def fit(self, start_params=None, transformed=True, cov_type='approx',
             cov_kwds=None, method='bfgs', maxiter=100, full_output=1, disp=0,
             callback=None, return_params=False, em_iter=5, search_reps=0,
-            search_iter=5, search_scale=1., **kwargs):
+            search_iter=5, search_scale=1., search_threads=1, **kwargs):
         """
         Fits the model by maximum likelihood via Hamilton filter.
 
@@ -1252,6 +1504,9 @@ class MarkovSwitching(tsbase.TimeSeriesModel):
             search parameter repetitions.
         search_scale : float or array, optional.
             Scale of variates for random start parameter search.
+        search_threads : int or None, optional
+            Number of threads among which the search parameter repetitions
+            are split. If None, the number of cpus is used. Default is 1.
         **kwargs
             Additional keyword arguments to pass to the optimizer.
 
@@ -1272,7 +1527,7 @@ class MarkovSwitching(tsbase.TimeSeriesModel):
             start_params = self._start_params_search(
                 search_reps, start_params=start_params,
                 transformed=transformed, em_iter=search_iter,
-                scale=search_scale)
+                scale=search_scale, n_threads=search_threads)
             transformed = True
 
         # Get better start params through EM algorithm
@@ -1463,7 +1718,7 @@ class MarkovSwitching(tsbase.TimeSeriesModel):
         return regime_transition
 
     def _start_params_search(self, reps, start_params=None, transformed=True,
-                             em_iter=5, scale=1.):
+                             em_iter=5, scale=1., n_threads=1):
         """
         Search for starting parameters as random permutations of a vector
 
@@ -1483,12 +1738,19 @@ class MarkovSwitching(tsbase.TimeSeriesModel):
             Scale of variates for random start parameter search. Can be given
             as an array of length equal to the number of parameters or as a
             single scalar.
+        n_threads : int or None, optional
+            Number of threads among which the repetitions are split. If None,
+            the number of cpus is used. Default is 1.
 
         Notes
         -----
         This is a private method for finding good starting parameters for MLE
         by scoring, where the defaults have been set heuristically.
 
+        The Hamilton filter and Kim smoother release the GIL, so that the
+        EM iterations of the repetitions run concurrently in threads. The
+        result does not depend on the number of threads.
+
         """
         if start_params is None:
             start_params = self.start_params
@@ -1514,23 +1776,36 @@ class MarkovSwitching(tsbase.TimeSeriesModel):
         for i in range(self.k_params):
             variates[:, i] = scale[i] * np.random.uniform(-0.5, 0.5, size=reps)
 
+        def search(variates):
+            try:
+                proposed_params = self._fit_em(
+                    start_params + variates, transformed=False,
+                    maxiter=em_iter, return_params=True)
+                return proposed_params, self.loglike(proposed_params)
+            except:
+                return None, -np.inf
+
+        # The warnings filters are global, so they are set for all threads
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            n_threads = _get_n_jobs(n_threads, reps)
+            if n_threads > 1 and reps > 1:
+                from multiprocessing.pool import ThreadPool
+                pool = ThreadPool(n_threads)
+                try:
+                    proposed = pool.map(search, variates)
+                finally:
+                    pool.terminate()
+                    pool.join()
+            else:
+                proposed = [search(x) for x in variates]
+
         llf = self.loglike(start_params, transformed=False)
         params = start_params
-        for i in range(reps):
-            with warnings.catch_warnings():
-                warnings.simplefilter("ignore")
-
-                try:
-                    proposed_params = self._fit_em(
-                        start_params + variates[i], transformed=False,
-                        maxiter=em_iter, return_params=True)
-                    proposed_llf = self.loglike(proposed_params)
-
-                    if proposed_llf > llf:
-                        llf = proposed_llf
-                        params = self.untransform_params(proposed_params)
-                except:
-                    pass
+        for proposed_params, proposed_llf in proposed:
+            if proposed_llf > llf:
+                llf = proposed_llf
+                params = self.untransform_params(proposed_params)
 
         # Return transformed parameters
         return self.transform_params(params)
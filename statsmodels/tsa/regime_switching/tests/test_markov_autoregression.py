@@ -11,6 +11,7 @@ import os
 import numpy as np
 import pandas as pd
 from statsmodels.tools import add_constant
+from statsmodels.tools.numdiff import approx_fprime_cs
 from statsmodels.tsa.regime_switching import markov_autoregression
 from numpy.testing import assert_equal, assert_allclose, assert_raises
 from nose.exc import SkipTest
@@ -210,6 +211,66 @@ def test_conditional_likelihoods():
     assert_allclose(mod_conditional_likelihoods[2, :, :],
                     conditional_likelihoods[2, :, :])
 
+    # AR(2), k_regimes=2, switching variance
+    mod = markov_autoregression.MarkovAutoregression(
+        rgnp, k_regimes=2, order=2, switching_variance=True)
+    params = np.r_[0.9, 0.2, 1., 0.5, 0.5, 2., 0.3, -0.1, 0.1, 0.05]
+    resid = mod._resid(params)
+    variance = np.reshape([0.5, 2.], (2, 1, 1, 1))
+    assert_allclose(mod._conditional_likelihoods(params),
+                    np.exp(-0.5 * resid**2 / variance) /
+                    np.sqrt(2 * np.pi * variance))
+
+
+def test_filter_ar():
+    # The filter computing the conditional likelihoods within the loop gives
+    # the output of the Hamilton filter
+    exog = np.cos(np.arange(len(rgnp)))
+    exog_tvtp = add_constant(np.sin(np.arange(len(rgnp))))
+    models = [
+        (dict(k_regimes=2, order=4),
+         np.r_[0.75, 0.1, 1.2, -0.3, 0.6, 0.1, 0.05, -0.1, -0.05, 0.1, 0.,
+               0.05, 0.02]),
+        (dict(k_regimes=3, order=2, exog=exog, switching_variance=True),
+         np.r_[0.8, 0.1, 0.1, 0.1, 0.8, 0.1, -0.5, 0.5, 1.5, 0.2,
+               0.5, 1., 2., 0.3, 0.1, -0.1, 0.1, 0.2, 0.05]),
+        (dict(k_regimes=2, order=1, exog_tvtp=exog_tvtp, switching_ar=False),
+         np.r_[1., 0.2, -1., -0.3, 1.2, -0.3, 0.6, 0.3]),
+    ]
+    for kwargs, params in models:
+        mod = markov_autoregression.MarkovAutoregression(rgnp, **kwargs)
+        res = mod.filter(params)
+        assert_allclose(mod.loglikeobs(params), res.llf_obs)
+        marginal, joint_likelihoods = mod._filter_ar(params)
+        assert_allclose(marginal.T, res.filtered_marginal_probabilities)
+
+        # Complex step derivatives
+        assert_allclose(mod.score(params),
+                        approx_fprime_cs(params, lambda x: np.sum(
+                            np.log(mod._filter(x)[5]))), atol=1e-7)
+
+        # Pruning histories with negligible probability
+        mod.prune_tol = 1e-12
+        assert_allclose(mod.loglike(params), res.llf)
+        mod.prune_tol = 0.05
+        llf = mod.loglike(params)
+        assert_equal(np.isfinite(llf), True)
+        assert_equal(np.abs(llf - res.llf) > 1e-8, True)
+
+        # The batched loglikelihood uses the pruned filter
+        params_batch = np.array([params, mod.start_params])
+        assert_allclose(mod.loglike_batch(params_batch),
+                        [mod.loglike(x) for x in params_batch])
+        mod.prune_tol = 0
+        assert_allclose(mod.loglike_batch(params_batch),
+                        [mod.loglike(x) for x in params_batch])
+
+    # Zero transition probabilities are skipped
+    mod = markov_autoregression.MarkovAutoregression(rgnp, k_regimes=2,
+                                                     order=2)
+    params = np.r_[1., 0.1, 1.2, -0.3, 0.6, 0.1, 0.05, -0.1, -0.05]
+    assert_allclose(mod.loglike(params), mod.filter(params).llf)
+
 
 class MarkovAutoregression(object):
     @classmethod
@@ -315,3 +315,83 @@ def test_partials_logistic():
             desired = np.diag(evaluated[:, j, t] - evaluated[:, j, t]**2)
             desired[0, 1] = desired[1, 0] = -np.multiply(*evaluated[:, j, t])
             assert_allclose(partials[..., j, t], desired)
+
+
+def check_batch_models():
+    from statsmodels.tsa.regime_switching import (
+        markov_autoregression, markov_regression)
+    rs = np.random.RandomState(1234)
+    nobs = 100
+    endog = rs.randn(nobs).cumsum() * 0.1 + rs.randn(nobs)
+    exog_tvtp = np.c_[np.ones(nobs), rs.randn(nobs)]
+    yield markov_autoregression.MarkovAutoregression(
+        endog, k_regimes=2, order=2, switching_ar=False)
+    yield markov_regression.MarkovRegression(
+        endog, k_regimes=3, exog_tvtp=exog_tvtp)
+
+
+def test_hamilton_filter_batch():
+    for mod in check_batch_models():
+        rs = np.random.RandomState(1234)
+        untransformed = mod.untransform_params(mod.start_params)
+        params = [mod.transform_params(untransformed +
+                                       0.5 * rs.randn(mod.k_params))
+                  for i in range(5)]
+        desired = [mod._filter(x)[3:] for x in params]
+
+        regime_transition = np.concatenate([
+            mod.regime_transition_matrix(x)[..., None] for x in params],
+            axis=-1)
+        initial_probabilities = np.concatenate([
+            mod.initial_probabilities(x, regime_transition[..., i])[..., None]
+            for i, x in enumerate(params)], axis=-1)
+        conditional_likelihoods = np.concatenate([
+            mod._conditional_likelihoods(x)[..., None] for x in params],
+            axis=-1)
+        for n_threads in [1, 2]:
+            actual = markov_switching.cy_hamilton_filter_batch(
+                initial_probabilities, regime_transition,
+                conditional_likelihoods, n_threads=n_threads)
+            for i in range(len(params)):
+                for j in range(4):
+                    assert_allclose(actual[j][..., i], desired[i][j])
+
+            smoothed = markov_switching.cy_kim_smoother_batch(
+                regime_transition, actual[1], actual[3], n_threads=n_threads)
+            for i in range(len(params)):
+                desired_smoothed = markov_switching.py_kim_smoother(
+                    regime_transition[..., i], desired[i][1], desired[i][3])
+                assert_allclose(smoothed[0][..., i], desired_smoothed[0])
+                assert_allclose(smoothed[1][..., i], desired_smoothed[1])
+
+        # Shared regime transition probabilities
+        actual = markov_switching.cy_hamilton_filter_batch(
+            initial_probabilities[:, [0, 0]], regime_transition[..., 0],
+            conditional_likelihoods[..., :2])
+        desired = markov_switching.cy_hamilton_filter_batch(
+            initial_probabilities[:, [0, 0]], regime_transition[..., [0, 0]],
+            conditional_likelihoods[..., :2])
+        for j in range(4):
+            assert_allclose(actual[j], desired[j])
+
+
+def test_loglike_batch():
+    for mod in check_batch_models():
+        rs = np.random.RandomState(1234)
+        untransformed = (mod.untransform_params(mod.start_params) +
+                         0.5 * rs.randn(4, mod.k_params))
+        desired = [mod.loglike(x, transformed=False) for x in untransformed]
+        assert_allclose(mod.loglike_batch(untransformed, transformed=False),
+                        desired)
+        assert_allclose(mod.loglike_batch(
+            [mod.transform_params(x) for x in untransformed], n_threads=2),
+            desired)
+
+
+def test_start_params_search_threads():
+    mod = next(check_batch_models())
+    np.random.seed(1234)
+    desired = mod._start_params_search(6)
+    np.random.seed(1234)
+    actual = mod._start_params_search(6, n_threads=3)
+    assert_allclose(actual, desired)
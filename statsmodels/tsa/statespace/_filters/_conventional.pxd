@@ -27,6 +27,11 @@ cdef int supdating_conventional(sKalmanFilter kfilter, sStatespace model)
 cdef int sprediction_conventional(sKalmanFilter kfilter, sStatespace model)
 cdef np.float32_t sloglikelihood_conventional(sKalmanFilter kfilter, sStatespace model, np.float32_t determinant)
 
+cdef int supdating_chandrasekhar(sKalmanFilter kfilter, sStatespace model)
+cdef int sprediction_chandrasekhar(sKalmanFilter kfilter, sStatespace model)
+cdef int schandrasekhar_initialize(sKalmanFilter kfilter, sStatespace model)
+cdef int schandrasekhar_update_m(sKalmanFilter kfilter, sStatespace model)
+
 # Double precision
 cdef int dforecast_missing_conventional(dKalmanFilter kfilter, dStatespace model)
 cdef int dupdating_missing_conventional(dKalmanFilter kfilter, dStatespace model)
@@ -38,6 +43,11 @@ cdef int dupdating_conventional(dKalmanFilter kfilter, dStatespace model)
 cdef int dprediction_conventional(dKalmanFilter kfilter, dStatespace model)
 cdef np.float64_t dloglikelihood_conventional(dKalmanFilter kfilter, dStatespace model, np.float64_t determinant)
 
+cdef int dupdating_chandrasekhar(dKalmanFilter kfilter, dStatespace model)
+cdef int dprediction_chandrasekhar(dKalmanFilter kfilter, dStatespace model)
+cdef int dchandrasekhar_initialize(dKalmanFilter kfilter, dStatespace model)
+cdef int dchandrasekhar_update_m(dKalmanFilter kfilter, dStatespace model)
+
 # Single precision complex
 cdef int cforecast_missing_conventional(cKalmanFilter kfilter, cStatespace model)
 cdef int cupdating_missing_conventional(cKalmanFilter kfilter, cStatespace model)
@@ -49,6 +59,11 @@ cdef int cupdating_conventional(cKalmanFilter kfilter, cStatespace model)
 cdef int cprediction_conventional(cKalmanFilter kfilter, cStatespace model)
 cdef np.complex64_t cloglikelihood_conventional(cKalmanFilter kfilter, cStatespace model, np.complex64_t determinant)
 
+cdef int cupdating_chandrasekhar(cKalmanFilter kfilter, cStatespace model)
+cdef int cprediction_chandrasekhar(cKalmanFilter kfilter, cStatespace model)
+cdef int cchandrasekhar_initialize(cKalmanFilter kfilter, cStatespace model)
+cdef int cchandrasekhar_update_m(cKalmanFilter kfilter, cStatespace model)
+
 # Double precision complex
 cdef int zforecast_missing_conventional(zKalmanFilter kfilter, zStatespace model)
 cdef int zupdating_missing_conventional(zKalmanFilter kfilter, zStatespace model)
@@ -59,3 +74,8 @@ cdef int zforecast_conventional(zKalmanFilter kfilter, zStatespace model)
 cdef int zupdating_conventional(zKalmanFilter kfilter, zStatespace model)
 cdef int zprediction_conventional(zKalmanFilter kfilter, zStatespace model)
 cdef np.complex128_t zloglikelihood_conventional(zKalmanFilter kfilter, zStatespace model, np.complex128_t determinant)
+
+cdef int zupdating_chandrasekhar(zKalmanFilter kfilter, zStatespace model)
+cdef int zprediction_chandrasekhar(zKalmanFilter kfilter, zStatespace model)
+cdef int zchandrasekhar_initialize(zKalmanFilter kfilter, zStatespace model)
+cdef int zchandrasekhar_update_m(zKalmanFilter kfilter, zStatespace model)
@@ -19,6 +19,7 @@ cdef int FILTER_UNIVARIATE       # ibid., Chapter 6.4
 cdef int FILTER_COLLAPSED        # ibid., Chapter 6.5
 cdef int FILTER_EXTENDED         # ibid., Chapter 10.2
 cdef int FILTER_UNSCENTED        # ibid., Chapter 10.3
+cdef int FILTER_CHANDRASEKHAR    # Herbst (2015)
 cdef int SMOOTHER_CLASSICAL      # ibid., Chapter 4.6.1
 cdef int SMOOTHER_ALTERNATIVE    # 
 
@@ -88,6 +89,10 @@ cdef class sKalmanFilter(object):
     cdef readonly np.float32_t [::1,:] converged_kalman_gain
     cdef readonly np.float32_t converged_determinant
 
+    # ### Chandrasekhar recursions
+    cdef readonly int k_chandrasekhar
+    cdef readonly np.float32_t [::1,:] CW, CM, CMW, CtmpW, CtmpM
+
     # ### Temporary arrays
     cdef readonly np.float32_t [::1,:] forecast_error_fac
     cdef readonly int [:] forecast_error_ipiv
@@ -214,6 +219,10 @@ cdef class dKalmanFilter(object):
     cdef readonly np.float64_t [::1,:] converged_kalman_gain
     cdef readonly np.float64_t converged_determinant
 
+    # ### Chandrasekhar recursions
+    cdef readonly int k_chandrasekhar
+    cdef readonly np.float64_t [::1,:] CW, CM, CMW, CtmpW, CtmpM
+
     # ### Temporary arrays
     cdef readonly np.float64_t [::1,:] forecast_error_fac
     cdef readonly int [:] forecast_error_ipiv
@@ -340,6 +349,10 @@ cdef class cKalmanFilter(object):
     cdef readonly np.complex64_t [::1,:] converged_kalman_gain
     cdef readonly np.complex64_t converged_determinant
 
+    # ### Chandrasekhar recursions
+    cdef readonly int k_chandrasekhar
+    cdef readonly np.complex64_t [::1,:] CW, CM, CMW, CtmpW, CtmpM
+
     # ### Temporary arrays
     cdef readonly np.complex64_t [::1,:] forecast_error_fac
     cdef readonly int [:] forecast_error_ipiv
@@ -466,6 +479,10 @@ cdef class zKalmanFilter(object):
     cdef readonly np.complex128_t [::1,:] converged_kalman_gain
     cdef readonly np.complex128_t converged_determinant
 
+    # ### Chandrasekhar recursions
+    cdef readonly int k_chandrasekhar
+    cdef readonly np.complex128_t [::1,:] CW, CM, CMW, CtmpW, CtmpM
+
     # ### Temporary arrays
     cdef readonly np.complex128_t [::1,:] forecast_error_fac
     cdef readonly int [:] forecast_error_ipiv
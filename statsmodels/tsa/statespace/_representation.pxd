@@ -52,6 +52,8 @@ cdef class sStatespace(object):
     cdef readonly np.float32_t [::1,:] collapse_obs_cov
     cdef readonly np.float32_t [::1,:] collapse_cholesky
     cdef readonly np.float32_t collapse_loglikelihood
+    cdef int _k_collapse
+    cdef int _collapse_diagonal
 
     # Pointers
     cdef np.float32_t * _obs
@@ -125,6 +127,8 @@ cdef class dStatespace(object):
     cdef readonly np.float64_t [::1,:] collapse_obs_cov
     cdef readonly np.float64_t [::1,:] collapse_cholesky
     cdef readonly np.float64_t collapse_loglikelihood
+    cdef int _k_collapse
+    cdef int _collapse_diagonal
 
     # Pointers
     cdef np.float64_t * _obs
@@ -198,6 +202,8 @@ cdef class cStatespace(object):
     cdef readonly np.complex64_t [::1,:] collapse_obs_cov
     cdef readonly np.complex64_t [::1,:] collapse_cholesky
     cdef readonly np.complex64_t collapse_loglikelihood
+    cdef int _k_collapse
+    cdef int _collapse_diagonal
 
     # Pointers
     cdef np.complex64_t * _obs
@@ -271,6 +277,8 @@ cdef class zStatespace(object):
     cdef readonly np.complex128_t [::1,:] collapse_obs_cov
     cdef readonly np.complex128_t [::1,:] collapse_cholesky
     cdef readonly np.complex128_t collapse_loglikelihood
+    cdef int _k_collapse
+    cdef int _collapse_diagonal
 
     # Pointers
     cdef np.complex128_t * _obs
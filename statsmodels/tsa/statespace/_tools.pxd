@@ -24,6 +24,11 @@ cdef int _dldl(np.float64_t * A, int n) except *
 cdef int _cldl(np.complex64_t * A, int n) except *
 cdef int _zldl(np.complex128_t * A, int n) except *
 
+cdef int _scholesky(np.float32_t * A, int n, int lda, int lower) except *
+cdef int _dcholesky(np.float64_t * A, int n, int lda, int lower) except *
+cdef int _ccholesky(np.complex64_t * A, int n, int lda, int lower) except *
+cdef int _zcholesky(np.complex128_t * A, int n, int lda, int lower) except *
+
 cpdef int sldl(np.float32_t [::1, :] A) except *
 cpdef int dldl(np.float64_t [::1, :] A) except *
 cpdef int cldl(np.complex64_t [::1, :] A) except *
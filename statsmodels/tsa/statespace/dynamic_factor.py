@@ -134,11 +134,20 @@ class DynamicFactor(MLEModel):
       then the matrices :math:C_i` are diagonal, otherwise they are general
       VAR matrices.
 
+    When there are many more observed series than factors, there are no
+    exogenous variables and `error_order = 0`, the observation vector can be
+    collapsed onto the factors by setting `mod.ssm.filter_collapsed = True`
+    (see [2]_), so that the Kalman filter recursions only involve matrices of
+    the dimension of the state vector. The loglikelihood is unchanged.
+
     References
     ----------
     .. [1] Lutkepohl, Helmut. 2007.
        New Introduction to Multiple Time Series Analysis.
        Berlin: Springer.
+    .. [2] Jungbacker, Borus, and Siem Jan Koopman. 2014.
+       "Likelihood-Based Dynamic Factor Analysis for Measurement and
+       Forecasting." The Econometrics Journal 18 (2): C1-21.
 
     """
 
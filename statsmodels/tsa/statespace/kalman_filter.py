@@ -13,6 +13,7 @@ from .representation import OptionWrapper, Representation, FrozenRepresentation
 from .tools import (validate_vector_shape, validate_matrix_shape,
                     reorder_missing_matrix, reorder_missing_vector)
 from . import tools
+from statsmodels.tools.parallel import _get_n_jobs
 from statsmodels.tools.sm_exceptions import ValueWarning
 
 # Define constants
@@ -24,6 +25,7 @@ FILTER_UNIVARIATE = 0x10       # ibid., Chapter 6.4
 FILTER_COLLAPSED = 0x20        # ibid., Chapter 6.5
 FILTER_EXTENDED = 0x40         # ibid., Chapter 10.2
 FILTER_UNSCENTED = 0x80        # ibid., Chapter 10.3
+FILTER_CHANDRASEKHAR = 0x100   # Herbst (2015)
 
 INVERT_UNIVARIATE = 0x01
 SOLVE_LU = 0x02
@@ -134,7 +136,7 @@ class KalmanFilter(Representation):
     filter_methods = [
         'filter_conventional', 'filter_exact_initial', 'filter_augmented',
         'filter_square_root', 'filter_univariate', 'filter_collapsed',
-        'filter_extended', 'filter_unscented'
+        'filter_extended', 'filter_unscented', 'filter_chandrasekhar'
     ]
 
     filter_conventional = OptionWrapper('filter_method', FILTER_CONVENTIONAL)
@@ -169,6 +171,11 @@ class KalmanFilter(Representation):
     """
     (bool) Flag for unscented Kalman filtering. Not implemented.
     """
+    filter_chandrasekhar = OptionWrapper('filter_method',
+                                         FILTER_CHANDRASEKHAR)
+    """
+    (bool) Flag for filtering with Chandrasekhar recursions.
+    """
 
     inversion_methods = [
         'invert_univariate', 'solve_lu', 'invert_lu', 'solve_cholesky',
@@ -413,7 +420,17 @@ class KalmanFilter(Representation):
             method if both are specified.
         FILTER_COLLAPSED = 0x20
             Collapsed approach to Kalman filtering. Will be used *in addition*
-            to conventional or univariate filtering.
+            to conventional or univariate filtering. The observation vector
+            is collapsed onto the states that have a nonzero column in the
+            design matrix, and the loglikelihood is corrected accordingly.
+        FILTER_CHANDRASEKHAR = 0x100
+            Chandrasekhar recursions for the predicted state covariance
+            matrix. Will be used *in addition* to conventional filtering, and
+            requires time-invariant system matrices (the intercepts may be
+            time-varying), no missing data and the default filter timing. It
+            is fastest with a stationary initialization and a small number of
+            observed variables relative to the number of states. Has no
+            effect together with univariate filtering.
 
         Note that only the first method is available if using a Scipy version
         older than 0.16.
@@ -1545,6 +1562,83 @@ class FilterResults(FrozenRepresentation):
                         self.design[:, :, design_t].T
                     ) + self.obs_cov[:, :, obs_cov_t]
 
+    def update_filter_appended(self, previous, results):
+        """
+        Update the filter results from those of two consecutive samples
+
+        Parameters
+        ----------
+        previous : FilterResults
+            Filter output for the first observations of the sample.
+        results : FilterResults
+            Filter output for the remaining observations, from a filter
+            initialized with the last predicted state and predicted state
+            covariance matrix of `previous`.
+
+        Notes
+        -----
+        This method is rarely required except for internal usage.
+        """
+        # Only the smoother output may be missing
+        if ((previous.conserve_memory | results.conserve_memory) &
+                ~MEMORY_NO_SMOOTHING):
+            raise ValueError('Filter output can only be appended if it is'
+                             ' stored for every period.')
+
+        # State initialization
+        self.initial_state = previous.initial_state
+        self.initial_state_cov = previous.initial_state_cov
+
+        # Save Kalman filter parameters
+        self.filter_method = results.filter_method
+        self.inversion_method = results.inversion_method
+        self.stability_method = results.stability_method
+        self.conserve_memory = results.conserve_memory
+        self.filter_timing = results.filter_timing
+        self.tolerance = results.tolerance
+        self.loglikelihood_burn = previous.loglikelihood_burn
+
+        # Save Kalman filter output
+        self.converged = results.converged
+        self.period_converged = results.period_converged
+        if self.converged:
+            self.period_converged += previous.nobs
+
+        def concatenate(first, second):
+            if first is None or second is None:
+                return None
+            return np.concatenate([first, second], axis=-1)
+
+        # The predicted state of the last period of `previous` is the initial
+        # state of `results`
+        self.predicted_state = concatenate(previous.predicted_state[..., :-1],
+                                           results.predicted_state)
+        self.predicted_state_cov = concatenate(
+            previous.predicted_state_cov[..., :-1],
+            results.predicted_state_cov)
+
+        for name in ['filtered_state', 'filtered_state_cov', 'tmp1', 'tmp2',
+                     'tmp3', 'tmp4', 'forecasts', 'forecasts_error',
+                     'forecasts_error_cov', 'llf_obs', 'collapsed_forecasts',
+                     'collapsed_forecasts_error',
+                     'collapsed_forecasts_error_cov', '_kalman_gain',
+                     '_standardized_forecasts_error']:
+            setattr(self, name, concatenate(getattr(previous, name),
+                                            getattr(results, name)))
+
+        # Raw Kalman filter output in periods with missing observations
+        self.missing_forecasts = None
+        self.missing_forecasts_error = None
+        self.missing_forecasts_error_cov = None
+        if np.sum(self.nmissing) > 0:
+            for name in ['forecasts', 'forecasts_error',
+                         'forecasts_error_cov']:
+                first = getattr(previous, 'missing_' + name)
+                second = getattr(results, 'missing_' + name)
+                setattr(self, 'missing_' + name, concatenate(
+                    getattr(previous, name) if first is None else first,
+                    getattr(results, name) if second is None else second))
+
     @property
     def kalman_gain(self):
         """
@@ -1770,7 +1864,11 @@ class FilterResults(FrozenRepresentation):
             for name, shape in self.shapes.items():
                 if name == 'obs':
                     continue
-                if representation[name].shape[-1] == 1:
+                # Note: with a single observation, the shape of a time-varying
+                # matrix is that of a time-invariant one
+                time_invariant = (representation[name].shape[-1] == 1 and
+                                  not (self.nobs == 1 and name in kwargs))
+                if time_invariant:
                     if name in kwargs:
                         warn(warning % (name, name), ValueWarning)
                 elif name not in kwargs:
@@ -2031,3 +2129,259 @@ class PredictionResults(FilterResults):
             setattr(self, _attr, value)
 
         return getattr(self, _attr)
+
+
+def _batch_array(name, value, n_series, ndim, dtype):
+    # Stack a matrix (ndim=2) or vector (ndim=1) that is either shared by all
+    # series or given for each series along the first axis, and move the
+    # series axis last in Fortran order as expected by the Cython filter
+    value = np.asarray(value, dtype=dtype)
+    if value.ndim == ndim:
+        value = np.repeat(value[None], n_series, axis=0)
+    elif value.ndim != ndim + 1 or value.shape[0] != n_series:
+        raise ValueError('Invalid shape for %s: requires %d dimensions, or'
+                         ' %d with %d series in the first dimension, got %s'
+                         % (name, ndim, ndim + 1, n_series, value.shape))
+    return np.require(np.rollaxis(value, 0, value.ndim),
+                      requirements=['F', 'W'])
+
+
+def _batch_stationary_init(transition, state_intercept, selected_state_cov):
+    # Unconditional mean and covariance of the states of each series, with
+    # the series in the first axis. The Lyapunov equation is solved for all
+    # series at once in the vectorized form
+    # vec(P) = (I - T \otimes T)^{-1} vec(R Q R')
+    n_series, k_states = transition.shape[:2]
+    eye = np.eye(k_states)
+    initial_state = np.linalg.solve(eye - transition,
+                                    state_intercept[..., None])[..., 0]
+    kron = (transition[:, :, None, :, None] *
+            transition[:, None, :, None, :]).reshape(
+                n_series, k_states**2, k_states**2)
+    initial_state_cov = np.linalg.solve(
+        np.eye(k_states**2) - kron,
+        selected_state_cov.reshape(n_series, k_states**2, 1))
+    return initial_state, initial_state_cov.reshape(n_series, k_states,
+                                                    k_states)
+
+
+def _stationary_init_partials(transition, state_intercept, selected_state_cov,
+                              partial_transition, partial_state_intercept,
+                              partial_selected_state_cov):
+    # Unconditional mean and covariance of the states and their partial
+    # derivatives, which are given in the last axis of the partial arrays.
+    # Differentiating P = T P T' + Q gives the Lyapunov equations
+    # dP = T dP T' + (dT P T' + T P dT' + dQ), which are solved with one
+    # factorization of I - T \otimes T
+    k_states = transition.shape[0]
+    eye = np.eye(k_states)
+    initial_state, initial_state_cov = _batch_stationary_init(
+        transition[None], state_intercept[None], selected_state_cov[None])
+    initial_state = initial_state[0]
+    initial_state_cov = initial_state_cov[0]
+
+    partial_initial_state = np.linalg.solve(
+        eye - transition,
+        np.einsum('ijp,j->ip', partial_transition, initial_state) +
+        partial_state_intercept)
+    tmp = np.einsum('ijp,jk,lk->ilp', partial_transition, initial_state_cov,
+                    transition)
+    rhs = tmp + tmp.transpose(1, 0, 2) + partial_selected_state_cov
+    kron = (transition[:, None, :, None] *
+            transition[None, :, None, :]).reshape(k_states**2, k_states**2)
+    partial_initial_state_cov = np.linalg.solve(
+        np.eye(k_states**2) - kron, rhs.reshape(k_states**2, -1))
+    partial_initial_state_cov = partial_initial_state_cov.reshape(
+        k_states, k_states, -1)
+    return (initial_state, initial_state_cov, partial_initial_state,
+            partial_initial_state_cov)
+
+
+def batch_loglike(endog, design, obs_cov, transition, selection, state_cov,
+                  obs_intercept=None, state_intercept=None,
+                  initial_state=None, initial_state_cov=None,
+                  loglikelihood_burn=0, n_threads=1):
+    r"""
+    Loglikelihood of many independent state space models in one filter call
+
+    The conventional Kalman filter is applied to each series with its own
+    time-invariant system matrices. All models need to have the same
+    dimensions. The loop over the series and periods runs in a single
+    compiled function that releases the GIL.
+
+    Parameters
+    ----------
+    endog : array_like
+        The observed series, with shape (n_series, nobs) for univariate
+        series or (n_series, nobs, k_endog). If the first dimension is one,
+        then all models are applied to the same series.
+    design : array_like
+        The design matrix :math:`Z`, with shape (k_endog, k_states) if it is
+        the same for all series or (n_series, k_endog, k_states).
+    obs_cov : array_like
+        The observation covariance matrix :math:`H`, with shape
+        (k_endog, k_endog) or (n_series, k_endog, k_endog).
+    transition : array_like
+        The transition matrix :math:`T`, with shape (k_states, k_states) or
+        (n_series, k_states, k_states).
+    selection : array_like
+        The selection matrix :math:`R`, with shape (k_states, k_posdef) or
+        (n_series, k_states, k_posdef).
+    state_cov : array_like
+        The state covariance matrix :math:`Q`, with shape
+        (k_posdef, k_posdef) or (n_series, k_posdef, k_posdef).
+    obs_intercept : array_like, optional
+        The observation intercept :math:`d`, with shape (k_endog,) or
+        (n_series, k_endog). Default is zero.
+    state_intercept : array_like, optional
+        The state intercept :math:`c`, with shape (k_states,) or
+        (n_series, k_states). Default is zero.
+    initial_state : array_like, optional
+        The mean of the initial state, with shape (k_states,) or
+        (n_series, k_states). Default is the unconditional mean if
+        `initial_state_cov` is not given, otherwise zero.
+    initial_state_cov : array_like, optional
+        The covariance of the initial state, with shape (k_states, k_states)
+        or (n_series, k_states, k_states). Default is the unconditional
+        covariance, which requires that all models are stationary.
+    loglikelihood_burn : int, optional
+        The number of initial periods during which the loglikelihood is not
+        recorded. Default is 0.
+    n_threads : int or None, optional
+        The number of threads among which the series are split. If None,
+        the number of cpus is used. Default is 1.
+
+    Returns
+    -------
+    loglike : ndarray
+        The loglikelihood of each series, with shape (n_series,). It is NaN
+        for series for which the forecast error covariance matrix is not
+        positive definite in some period.
+
+    Notes
+    -----
+    This is equivalent to filtering each series with `KalmanFilter` using
+    the conventional filter and Cholesky solver, but avoids the creation of
+    one model and one filter per series. Missing observations are allowed if
+    all elements of the observation in a period are missing.
+
+    See Also
+    --------
+    KalmanFilter.loglike
+    """
+    if loglikelihood_burn < 0:
+        raise ValueError('loglikelihood_burn must be nonnegative')
+
+    endog = np.asarray(endog)
+    if endog.ndim == 2:
+        endog = endog[:, :, None]
+    elif endog.ndim != 3:
+        raise ValueError('endog must have 2 or 3 dimensions')
+    n_endog, nobs, k_endog = endog.shape
+    if np.ndim(transition) < 2 or np.ndim(selection) < 2:
+        raise ValueError('transition and selection must be matrices')
+    k_states, k_posdef = np.shape(selection)[-2:]
+
+    if obs_intercept is None:
+        obs_intercept = np.zeros(k_endog)
+    if state_intercept is None:
+        state_intercept = np.zeros(k_states)
+    arrays = [endog, design, obs_intercept, obs_cov, transition,
+              state_intercept, selection, state_cov]
+    if initial_state is not None:
+        arrays.append(initial_state)
+    if initial_state_cov is not None:
+        arrays.append(initial_state_cov)
+    prefix, dtype, _ = tools.find_best_blas_type(
+        [np.asarray(x) for x in arrays])
+    func = tools.prefix_batch_loglike_map[prefix]
+    if func is None:
+        raise NotImplementedError('Batch filtering is not available in'
+                                  ' compatibility mode.')
+
+    missing = np.isnan(endog)
+    if np.any(missing.any(axis=2) & ~missing.all(axis=2)):
+        raise ValueError('Partially missing observations are not supported'
+                         ' in batch filtering')
+
+    shapes = [('design', design, 2, (k_endog, k_states)),
+              ('obs_intercept', obs_intercept, 1, (k_endog,)),
+              ('obs_cov', obs_cov, 2, (k_endog, k_endog)),
+              ('transition', transition, 2, (k_states, k_states)),
+              ('state_intercept', state_intercept, 1, (k_states,)),
+              ('selection', selection, 2, (k_states, k_posdef)),
+              ('state_cov', state_cov, 2, (k_posdef, k_posdef))]
+    if initial_state is not None:
+        shapes.append(('initial_state', initial_state, 1, (k_states,)))
+    if initial_state_cov is not None:
+        shapes.append(('initial_state_cov', initial_state_cov, 2,
+                       (k_states, k_states)))
+
+    # The number of series is given by the stacked arrays, or by endog if
+    # all system matrices are shared
+    sizes = set(np.shape(value)[0] for _, value, ndim, _ in shapes
+                if np.ndim(value) == ndim + 1)
+    if n_endog != 1:
+        sizes.add(n_endog)
+    if len(sizes) > 1:
+        raise ValueError('The number of series differs between endog and'
+                         ' the system matrices: %s' % sorted(sizes))
+    n_series = sizes.pop() if sizes else 1
+
+    stacked = {}
+    for name, value, ndim, shape in shapes:
+        value = _batch_array(name, value, n_series, ndim, dtype)
+        if value.shape[:-1] != shape:
+            raise ValueError('Invalid shape for %s: requires %s for each'
+                             ' series, got %s' % (name, shape,
+                                                  value.shape[:-1]))
+        stacked[name] = value
+
+    if initial_state_cov is None:
+        # The initialization is computed with the series in the first axis
+        transition_ = np.rollaxis(stacked['transition'], -1)
+        selection_ = np.rollaxis(stacked['selection'], -1)
+        selected_state_cov = np.einsum(
+            'nij,njk,nlk->nil', selection_,
+            np.rollaxis(stacked['state_cov'], -1), selection_)
+        mean, cov = _batch_stationary_init(
+            transition_, np.rollaxis(stacked['state_intercept'], -1),
+            selected_state_cov)
+        if initial_state is None:
+            stacked['initial_state'] = np.asfortranarray(mean.T)
+        stacked['initial_state_cov'] = np.asfortranarray(
+            np.rollaxis(cov, 0, 3))
+    elif initial_state is None:
+        stacked['initial_state'] = np.zeros((k_states, n_series), dtype,
+                                            order='F')
+
+    endog = np.require(np.transpose(endog, (2, 1, 0)), dtype=dtype,
+                       requirements=['F', 'W'])
+    names = ['design', 'obs_intercept', 'obs_cov', 'transition',
+             'state_intercept', 'selection', 'state_cov', 'initial_state',
+             'initial_state_cov']
+    arrays = [stacked[name] for name in names]
+
+    n_threads = _get_n_jobs(n_threads, n_series)
+    if n_threads <= 1 or n_series < 2:
+        return func(endog, *(arrays + [loglikelihood_burn]))
+
+    # Slices along the last axis of the Fortran ordered arrays are
+    # contiguous, and the filter releases the GIL for each slice
+    bounds = np.linspace(0, n_series, min(n_threads, n_series) + 1)
+    bounds = bounds.astype(int)
+
+    def filter_slice(i):
+        sl = slice(bounds[i], bounds[i + 1])
+        endog_sl = endog[..., sl] if n_endog > 1 else endog
+        return func(endog_sl, *([x[..., sl] for x in arrays] +
+                                [loglikelihood_burn]))
+
+    from multiprocessing.pool import ThreadPool
+    pool = ThreadPool(len(bounds) - 1)
+    try:
+        loglike = pool.map(filter_slice, range(len(bounds) - 1))
+    finally:
+        pool.terminate()
+        pool.join()
+    return np.concatenate(loglike)
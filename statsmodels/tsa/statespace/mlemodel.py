@@ -14,7 +14,11 @@ from scipy.stats import norm
 
 from .simulation_smoother import SimulationSmoother
 from .kalman_smoother import SmootherResults
-from .kalman_filter import (INVERT_UNIVARIATE, SOLVE_LU)
+from .kalman_filter import (
+    INVERT_UNIVARIATE, SOLVE_LU, SOLVE_CHOLESKY, INVERT_CHOLESKY,
+    FILTER_CONVENTIONAL, STABILITY_FORCE_SYMMETRY, TIMING_INIT_PREDICTED,
+    FilterResults, batch_loglike, _stationary_init_partials)
+from . import tools
 import statsmodels.tsa.base.tsa_model as tsbase
 import statsmodels.base.wrapper as wrap
 from statsmodels.tools.numdiff import (_get_epsilon, approx_hess_cs,
@@ -135,6 +139,41 @@ class MLEModel(tsbase.TimeSeriesModel):
         # Other dimensions, now that `ssm` is available
         self.k_endog = self.ssm.k_endog
 
+    def clone(self, endog, exog=None, **kwargs):
+        """
+        Clone the state space model with new data
+
+        Parameters
+        ----------
+        endog : array_like
+            The observed time-series process :math:`y`
+        exog : array_like, optional
+            Array of exogenous regressors, shaped nobs x k.
+        **kwargs
+            Keyword arguments that override those used to construct this
+            model.
+
+        Returns
+        -------
+        model : MLEModel
+            A model of the same class and specification as this one, applied
+            to the new data.
+
+        Notes
+        -----
+        This method must be implemented by subclasses that support it, for
+        example as `self._clone_from_init_kwds(endog, exog, **kwargs)`.
+        """
+        raise NotImplementedError('This model does not support cloning.')
+
+    def _clone_from_init_kwds(self, endog, exog=None, **kwargs):
+        # Create a model of the same class from the keyword arguments used to
+        # construct this one
+        init_kwds = self._get_init_kwds()
+        init_kwds.update(kwargs)
+        init_kwds['exog'] = exog
+        return self.__class__(endog, **init_kwds)
+
     def __setitem__(self, key, value):
         return self.ssm.__setitem__(key, value)
 
@@ -694,6 +733,115 @@ class MLEModel(tsbase.TimeSeriesModel):
 
         return self.ssm.loglikeobs(complex_step=complex_step, **kwargs)
 
+    def loglike_batch(self, params, transformed=True, n_threads=1):
+        """
+        Loglikelihood evaluation at many parameter vectors
+
+        Parameters
+        ----------
+        params : array_like
+            Array of parameters with one parameter vector in each row.
+        transformed : boolean, optional
+            Whether or not `params` is already transformed. Default is True.
+        n_threads : int or None, optional
+            The number of threads used to run the Kalman filters. If None,
+            the number of cpus is used. Default is 1.
+
+        Returns
+        -------
+        loglike : ndarray
+            The loglikelihood at each parameter vector. It is NaN if the
+            forecast error covariance matrix is not positive definite, or if
+            `loglike` raises a `LinAlgError` for the parameter vector.
+
+        Notes
+        -----
+        The model is updated with each parameter vector in turn and a copy of
+        the system matrices and of the initialization is stacked, so that the
+        filters run in `kalman_filter.batch_loglike` without the GIL and can
+        be split among threads. The batch filter is the conventional filter
+        with a Cholesky solver that forces the symmetry of the predicted state
+        covariance matrix. It is only used if the filter, inversion and
+        stability methods and the filter timing of the model select the same
+        filter, as the defaults do, if the system matrices are time-invariant
+        and if the observations are either fully observed or fully missing in
+        each period. Otherwise `loglike` is called for each parameter vector.
+
+        After the call, the model is updated with the last parameter vector.
+
+        See Also
+        --------
+        loglike
+        statsmodels.tsa.statespace.kalman_filter.batch_loglike
+        """
+        params = np.atleast_2d(params)
+        if not transformed:
+            params = np.array([self.transform_params(x) for x in params])
+
+        ssm = self.ssm
+        names = ['design', 'obs_intercept', 'obs_cov', 'transition',
+                 'state_intercept', 'selection', 'state_cov']
+        missing = np.isnan(ssm.endog)
+        # the inversion method selected by the filter needs to be a Cholesky
+        # factorization, or the equivalent univariate inversion
+        inversion_method = ssm.inversion_method
+        cholesky = bool(
+            (inversion_method & INVERT_UNIVARIATE and ssm.k_endog == 1) or
+            inversion_method & SOLVE_CHOLESKY or
+            (inversion_method & INVERT_CHOLESKY and
+             not inversion_method & SOLVE_LU))
+        use_batch = (not ssm._compatibility_mode and
+                     ssm.filter_method == FILTER_CONVENTIONAL and cholesky and
+                     ssm.stability_method == STABILITY_FORCE_SYMMETRY and
+                     ssm.filter_timing == TIMING_INIT_PREDICTED and
+                     not np.any(missing.any(0) & ~missing.all(0)))
+
+        matrices = dict((name, []) for name in names)
+        initial_state = []
+        initial_state_cov = []
+        for x in params:
+            if not use_batch:
+                break
+            self.update(x, transformed=True)
+            # time-varying matrices have the periods in the last axis
+            if any(ssm[name].ndim > len(ssm.shapes[name]) - 1
+                   for name in names):
+                use_batch = False
+            elif ssm.initialization == 'known':
+                initial_state.append(ssm._initial_state)
+                initial_state_cov.append(ssm._initial_state_cov)
+            elif ssm.initialization == 'approximate_diffuse':
+                initial_state.append(np.zeros(ssm.k_states))
+                initial_state_cov.append(
+                    np.eye(ssm.k_states) * ssm._initial_variance)
+            elif ssm.initialization != 'stationary':
+                use_batch = False
+            for name in names:
+                matrices[name].append(np.array(ssm[name]))
+
+        # the initialization could depend on the parameters
+        if len(initial_state_cov) not in [0, len(params)]:
+            use_batch = False
+
+        if not use_batch:
+            loglike = np.empty(len(params))
+            for i, x in enumerate(params):
+                try:
+                    loglike[i] = self.loglike(x, transformed=True)
+                except np.linalg.LinAlgError:
+                    loglike[i] = np.nan
+            return loglike
+
+        if len(initial_state_cov) == 0:
+            initial_state = initial_state_cov = None
+
+        loglike = batch_loglike(
+            ssm.endog.T[None, :, :], initial_state=initial_state,
+            initial_state_cov=initial_state_cov,
+            loglikelihood_burn=ssm.loglikelihood_burn, n_threads=n_threads,
+            **matrices)
+        return loglike
+
     def simulation_smoother(self, simulation_output=None, **kwargs):
         r"""
         Retrieve a simulation smoother for the state space model.
@@ -1018,6 +1166,127 @@ class MLEModel(tsbase.TimeSeriesModel):
 
         return -partials / 2.
 
+    def _system_matrix_partials(self, params):
+        """
+        System matrices and their partial derivatives with respect to params
+
+        The partial derivatives are computed by complex step differentiation
+        of `update`, which does not require running the filter. The partial
+        derivatives are in an additional last axis of the arrays.
+        """
+        params = np.array(params, ndmin=1)
+        names = ['design', 'obs_intercept', 'obs_cov', 'transition',
+                 'state_intercept', 'selection', 'state_cov']
+        # the initialization can be set by `update`
+        self.update(params, transformed=True)
+        if self.ssm.initialization == 'known':
+            names += ['initial_state', 'initial_state_cov']
+
+        epsilon = _get_epsilon(params, 2., None, len(params))
+        increments = np.identity(len(params)) * 1j * epsilon
+        partials = dict((name, []) for name in names)
+        for i, ih in enumerate(increments):
+            self.update(params + ih, transformed=True, complex_step=True)
+            for name in names:
+                partials[name].append(
+                    np.imag(getattr(self.ssm, '_' + name)) / epsilon[i])
+
+        self.update(params, transformed=True)
+        matrices = dict((name, np.real(getattr(self.ssm, '_' + name)))
+                        for name in names)
+        partials = dict((name, np.concatenate([v[..., None] for v in value],
+                                              axis=-1))
+                        for name, value in partials.items())
+        return matrices, partials
+
+    def _score_obs_analytic(self, params, **kwargs):
+        """
+        Score of each observation from the tangent-linear Kalman filter
+
+        The derivatives of the predicted state and state covariance matrix
+        with respect to the parameters are propagated together with the
+        conventional Kalman filter, so that the score is computed in a single
+        pass. The partial derivatives of the system matrices are computed by
+        complex step differentiation of `update`.
+        """
+        params = np.array(params, ndmin=1)
+        ssm = self.ssm
+        func = tools.prefix_loglike_score_map.get('d')
+        missing = np.isnan(ssm.endog)
+        if func is None or ssm._complex_endog:
+            raise NotImplementedError('The analytic score is not available'
+                                      ' in compatibility mode or with'
+                                      ' complex data.')
+        if np.any(missing.any(0) & ~missing.all(0)):
+            raise NotImplementedError('The analytic score does not support'
+                                      ' partially missing observations.')
+
+        matrices, partials = self._system_matrix_partials(params)
+        if ssm.initialization not in ['known', 'approximate_diffuse',
+                                      'stationary']:
+            raise RuntimeError('Statespace model not initialized.')
+
+        # $R Q R'$ and its partial derivatives, with the periods of the
+        # selection and state covariance matrices repeated to a common length
+        n_t = max(matrices['selection'].shape[-1],
+                  matrices['state_cov'].shape[-1])
+
+        def repeat_periods(value):
+            if value.shape[2] == n_t:
+                return value
+            return np.repeat(value, n_t, axis=2)
+
+        selection = repeat_periods(matrices['selection'])
+        state_cov = repeat_periods(matrices['state_cov'])
+        partial_selection = repeat_periods(partials['selection'])
+        partial_state_cov = repeat_periods(partials['state_cov'])
+        selected_state_cov = np.einsum('ijt,jkt,lkt->ilt', selection,
+                                       state_cov, selection)
+        tmp = np.einsum('ijtp,jkt,lkt->iltp', partial_selection, state_cov,
+                        selection)
+        partial_selected_state_cov = (
+            tmp + tmp.transpose(1, 0, 2, 3) +
+            np.einsum('ijt,jktp,lkt->iltp', selection, partial_state_cov,
+                      selection))
+
+        k_states = ssm.k_states
+        k_params = len(params)
+        if ssm.initialization == 'known':
+            initial_state = matrices['initial_state']
+            initial_state_cov = matrices['initial_state_cov']
+            partial_initial_state = partials['initial_state']
+            partial_initial_state_cov = partials['initial_state_cov']
+        elif ssm.initialization == 'approximate_diffuse':
+            initial_state = np.zeros(k_states)
+            initial_state_cov = np.eye(k_states) * ssm._initial_variance
+            partial_initial_state = np.zeros((k_states, k_params))
+            partial_initial_state_cov = np.zeros((k_states, k_states,
+                                                  k_params))
+        else:
+            (initial_state, initial_state_cov, partial_initial_state,
+             partial_initial_state_cov) = _stationary_init_partials(
+                matrices['transition'][..., 0],
+                matrices['state_intercept'][..., 0],
+                selected_state_cov[..., 0],
+                partials['transition'][..., 0, :],
+                partials['state_intercept'][..., 0, :],
+                partial_selected_state_cov[..., 0, :])
+
+        arrays = [ssm.endog, matrices['design'], matrices['obs_intercept'],
+                  matrices['obs_cov'], matrices['transition'],
+                  matrices['state_intercept'], selected_state_cov,
+                  initial_state, initial_state_cov,
+                  partials['design'], partials['obs_intercept'],
+                  partials['obs_cov'], partials['transition'],
+                  partials['state_intercept'], partial_selected_state_cov,
+                  partial_initial_state, partial_initial_state_cov]
+        arrays = [np.asfortranarray(x, dtype=np.float64) for x in arrays]
+        _, score_obs = func(*(arrays + [ssm.loglikelihood_burn]))
+        return score_obs
+
+    def _score_analytic(self, params, **kwargs):
+        return np.sum(self._score_obs_analytic(params, **kwargs), axis=0)
+
     _score_param_names = ['transformed', 'score_method',
                           'approx_complex_step', 'approx_centered']
     _score_param_defaults = [True, 'approx', None, False]
@@ -1042,8 +1311,13 @@ class MLEModel(tsbase.TimeSeriesModel):
 
         Notes
         -----
-        This is a numerical approximation, calculated using first-order complex
-        step differentiation on the `loglike` method.
+        By default this is a numerical approximation, calculated using
+        first-order complex step differentiation on the `loglike` method. With
+        `score_method='analytic'` the score is instead computed in a single
+        pass of the Kalman filter extended by its tangent-linear recursions,
+        which propagate the derivatives of the predicted state and its
+        covariance matrix with respect to each parameter. This requires a real
+        `endog` without partially missing observations.
 
         Both \*args and \*\*kwargs are necessary because the optimizer from
         `fit` must call this function and only supports passing arguments via
@@ -1073,6 +1347,8 @@ class MLEModel(tsbase.TimeSeriesModel):
         if method == 'harvey':
             score = self._score_harvey(
                 params, approx_complex_step=approx_complex_step, **kwargs)
+        elif method == 'analytic':
+            score = self._score_analytic(params, **kwargs)
         elif method == 'approx' and approx_complex_step:
             score = self._score_complex_step(params, **kwargs)
         elif method == 'approx':
@@ -1105,8 +1381,10 @@ class MLEModel(tsbase.TimeSeriesModel):
 
         Notes
         -----
-        This is a numerical approximation, calculated using first-order complex
-        step differentiation on the `loglikeobs` method.
+        By default this is a numerical approximation, calculated using
+        first-order complex step differentiation on the `loglikeobs` method.
+        With `score_method='analytic'` it is computed by the tangent-linear
+        Kalman filter recursions, see `score`.
         """
         params = np.array(params, ndmin=1)
 
@@ -1125,6 +1403,13 @@ class MLEModel(tsbase.TimeSeriesModel):
             score = self._score_obs_harvey(
                 params, transformed=transformed,
                 approx_complex_step=approx_complex_step, **kwargs)
+        elif method == 'analytic':
+            if not transformed:
+                transform_score = self.transform_jacobian(params)
+                params = self.transform_params(params)
+            score = self._score_obs_analytic(params, **kwargs)
+            if not transformed:
+                score = np.dot(score, transform_score.T)
         elif method == 'approx' and approx_complex_step:
             # the default epsilon can be too small
             epsilon = _get_epsilon(params, 2., None, len(params))
@@ -1166,7 +1451,9 @@ class MLEModel(tsbase.TimeSeriesModel):
 
         Notes
         -----
-        This is a numerical approximation.
+        This is a numerical approximation. With `hessian_method='analytic'` it
+        is computed by centered finite differences of the analytic score, see
+        `score`.
 
         Both \*args and \*\*kwargs are necessary because the optimizer from
         `fit` must call this function and only supports passing arguments via
@@ -1203,6 +1490,9 @@ class MLEModel(tsbase.TimeSeriesModel):
                 params, transformed=transformed,
                 approx_complex_step=approx_complex_step,
                 approx_centered=approx_centered, **kwargs)
+        elif method == 'analytic':
+            return self._hessian_analytic(
+                params, transformed=transformed, **kwargs)
         elif method == 'approx' and approx_complex_step:
             return self._hessian_complex_step(
                 params, transformed=transformed, **kwargs)
@@ -1259,6 +1549,21 @@ class MLEModel(tsbase.TimeSeriesModel):
 
         return hessian / (self.nobs - self.ssm.loglikelihood_burn)
 
+    def _hessian_analytic(self, params, **kwargs):
+        """
+        Hessian matrix computed by centered finite differences of the
+        analytic score, which needs 2 k_params filter passes.
+        """
+        params = np.array(params, ndmin=1)
+        kwargs['transformed'] = kwargs.get('transformed', True)
+        kwargs['score_method'] = 'analytic'
+        epsilon = _get_epsilon(params, 3., None, len(params)) / 2
+        hessian = approx_fprime(params, self.score, epsilon=epsilon,
+                                kwargs=kwargs, centered=True)
+        hessian = (hessian + hessian.T) / 2
+
+        return hessian / (self.nobs - self.ssm.loglikelihood_burn)
+
     @property
     def start_params(self):
         """
@@ -1502,6 +1807,19 @@ class MLEModel(tsbase.TimeSeriesModel):
         raise NotImplementedError
 
 
+def _append_data(data, new_data):
+    # Append new observations to the original data of a model
+    if isinstance(data, (pd.Series, pd.DataFrame)):
+        if not isinstance(new_data, (pd.Series, pd.DataFrame)):
+            raise ValueError('New observations must be given as a Pandas'
+                             ' object if the data of the model is.')
+        return pd.concat([data, new_data])
+    data = np.asarray(data)
+    new_data = np.asarray(new_data)
+    return np.concatenate(
+        [data, new_data.reshape((-1,) + data.shape[1:])], axis=0)
+
+
 class MLEResults(tsbase.TimeSeriesModelResults):
     r"""
     Class to hold results from fitting a state space model.
@@ -2513,6 +2831,123 @@ class MLEResults(tsbase.TimeSeriesModelResults):
                                    measurement_shocks, state_shocks,
                                    initial_state)
 
+    def _get_extension_cov_kwargs(self):
+        # The parameters of extended or appended results are not re-estimated,
+        # so their covariance matrix is that of these results
+        if self.cov_type == 'none' or len(self.params) == 0:
+            return {'cov_type': 'none'}
+        return {'cov_type': 'custom', 'cov_kwds': {
+            'custom_cov_type': self.cov_type,
+            'custom_cov_params': self.cov_params_default,
+            'custom_description': self.cov_kwds.get('description', '')}}
+
+    def extend(self, endog, exog=None, **kwargs):
+        """
+        Filter new observations that directly follow the sample
+
+        Parameters
+        ----------
+        endog : array_like
+            The new observations of the time-series process :math:`y`.
+        exog : array_like, optional
+            The new observations of the exogenous regressors, required if the
+            model has exogenous regressors.
+        **kwargs
+            Keyword arguments that override those used to construct the
+            model. See `MLEModel.clone`.
+
+        Returns
+        -------
+        results : MLEResults
+            Results for the new observations only, from a model that is
+            initialized with the last predicted state and predicted state
+            covariance matrix of these results. The parameters and their
+            covariance matrix are those of these results.
+
+        Notes
+        -----
+        Only the new observations are filtered, so that the cost does not
+        depend on the number of observations in this sample. The loglikelihood
+        of the returned results is that of the new observations conditional on
+        this sample, so that the loglikelihood of the combined sample is
+        `self.llf + results.llf`, and its forecasts start after the last new
+        observation.
+
+        See Also
+        --------
+        append
+        """
+        if self.filter_results.memory_no_predicted:
+            raise ValueError('Extending results requires the predicted state'
+                             ' of the last period, which is not available if'
+                             ' the `memory_no_predicted` option is set.')
+        if self.model.data.orig_exog is not None and exog is None:
+            raise ValueError('New observations of the exogenous regressors'
+                             ' are required to extend the results of a model'
+                             ' with exogenous regressors.')
+
+        mod = self.model.clone(endog, exog=exog, **kwargs)
+        mod.initialize_known(self.predicted_state[:, -1],
+                             self.predicted_state_cov[:, :, -1])
+        mod.loglikelihood_burn = max(self.loglikelihood_burn - self.nobs, 0)
+        for name in ['filter_method', 'inversion_method', 'stability_method',
+                     'tolerance']:
+            setattr(mod.ssm, name, getattr(self.filter_results, name))
+
+        return mod.filter(self.params, **self._get_extension_cov_kwargs())
+
+    def append(self, endog, exog=None, **kwargs):
+        """
+        Append new observations that directly follow the sample
+
+        Parameters
+        ----------
+        endog : array_like
+            The new observations of the time-series process :math:`y`. Must
+            be a Pandas object if the data of the model is.
+        exog : array_like, optional
+            The new observations of the exogenous regressors, required if the
+            model has exogenous regressors.
+        **kwargs
+            Keyword arguments that override those used to construct the
+            model. See `MLEModel.clone`.
+
+        Returns
+        -------
+        results : MLEResults
+            Results for the combined sample, with the parameters and
+            parameter covariance matrix of these results.
+
+        Notes
+        -----
+        The history is not filtered again: the filter output of the combined
+        sample is that of these results followed by that of `extend` applied
+        to the new observations, so that the cost only depends on the number
+        of new observations (and on copying the stored output). The returned
+        results do not include smoothed output.
+
+        See Also
+        --------
+        extend
+        """
+        extension = self.extend(endog, exog=exog, **kwargs)
+
+        endog = _append_data(self.model.data.orig_endog, endog)
+        if exog is not None:
+            exog = _append_data(self.model.data.orig_exog, exog)
+        mod = self.model.clone(endog, exog=exog, **kwargs)
+        mod.update(self.params)
+
+        mod.ssm._initialize_representation()
+        filter_results = FilterResults(mod.ssm)
+        filter_results.update_filter_appended(self.filter_results,
+                                              extension.filter_results)
+
+        results_class = extension._results.__class__
+        return extension.__class__(results_class(
+            mod, self.params, filter_results,
+            **self._get_extension_cov_kwargs()))
+
     def impulse_responses(self, steps=1, impulse=0, orthogonalized=False,
                           cumulative=False, **kwargs):
         """
@@ -91,6 +91,10 @@ class SARIMAX(MLEModel):
     hamilton_representation : boolean, optional
         Whether or not to use the Hamilton representation of an ARMA process
         (if True) or the Harvey representation (if False). Default is False.
+    trend_offset : int, optional
+        The offset at which to start time trend values. Default is 1, so that
+        if `trend='t'` the trend is equal to 1, 2, ..., nobs. Typically is only
+        set when the model is created by extending a previous dataset.
     **kwargs
         Keyword arguments may be used to provide default values for state space
         matrices or for Kalman filtering options. See `Representation`, and
@@ -282,7 +286,7 @@ class SARIMAX(MLEModel):
                  measurement_error=False, time_varying_regression=False,
                  mle_regression=True, simple_differencing=False,
                  enforce_stationarity=True, enforce_invertibility=True,
-                 hamilton_representation=False, **kwargs):
+                 hamilton_representation=False, trend_offset=1, **kwargs):
 
         # Model parameters
         self.seasonal_periods = seasonal_order[3]
@@ -293,6 +297,7 @@ class SARIMAX(MLEModel):
         self.enforce_stationarity = enforce_stationarity
         self.enforce_invertibility = enforce_invertibility
         self.hamilton_representation = hamilton_representation
+        self.trend_offset = trend_offset
 
         # Save given orders
         self.order = order
@@ -535,7 +540,8 @@ class SARIMAX(MLEModel):
                             'measurement_error', 'time_varying_regression',
                             'mle_regression', 'simple_differencing',
                             'enforce_stationarity', 'enforce_invertibility',
-                            'hamilton_representation'] + list(kwargs.keys())
+                            'hamilton_representation', 'trend_offset'] + \
+            list(kwargs.keys())
         # TODO: I think the kwargs or not attached, need to recover from ???
 
     def _get_init_kwds(self):
@@ -547,6 +553,9 @@ class SARIMAX(MLEModel):
 
         return kwds
 
+    def clone(self, endog, exog=None, **kwargs):
+        return self._clone_from_init_kwds(endog, exog=exog, **kwargs)
+
     def prepare_data(self):
         endog, exog = super(SARIMAX, self).prepare_data()
 
@@ -582,7 +591,8 @@ class SARIMAX(MLEModel):
 
         # Cache the arrays for calculating the intercept from the trend
         # components
-        time_trend = np.arange(1, self.nobs + 1)
+        time_trend = np.arange(self.trend_offset,
+                               self.trend_offset + self.nobs)
         self._trend_data = np.zeros((self.nobs, self.k_trend))
         i = 0
         for k in self.polynomial_trend.nonzero()[0]:
@@ -1861,6 +1871,19 @@ class SARIMAXResults(MLEResults):
         """
         return self._params_ma
 
+    def extend(self, endog, exog=None, **kwargs):
+        # The new observations cannot be differenced without those that
+        # precede them
+        if (self.model.simple_differencing and
+                self.model.orig_k_diff + self.model.orig_k_seasonal_diff > 0):
+            raise ValueError('Cannot extend the results of a model that uses'
+                             ' simple differencing.')
+        # The time trend continues from the end of the sample
+        kwargs.setdefault('trend_offset',
+                          self.model.trend_offset + self.nobs)
+        return super(SARIMAXResults, self).extend(endog, exog=exog, **kwargs)
+    extend.__doc__ = MLEResults.extend.__doc__
+
     def get_prediction(self, start=None, end=None, dynamic=False, index=None,
                        exog=None, **kwargs):
         """
@@ -7,6 +7,8 @@ License: Simplified-BSD
 from __future__ import division, absolute_import, print_function
 
 import numpy as np
+from statsmodels.tools.tools import Bunch
+from .kalman_filter import MEMORY_NO_SMOOTHING
 from .kalman_smoother import KalmanSmoother
 from . import tools
 
@@ -279,6 +281,16 @@ class SimulationSmoother(KalmanSmoother):
         return results
 
 
+def _cholesky(matrix):
+    # Lower triangular factor of a positive semi-definite matrix (e.g. the
+    # observation covariance matrix of a model without measurement error)
+    try:
+        return np.linalg.cholesky(matrix)
+    except np.linalg.LinAlgError:
+        eigvals, eigvecs = np.linalg.eigh(matrix)
+        return eigvecs * np.maximum(eigvals, 0)**0.5
+
+
 class SimulationSmoothResults(object):
     r"""
     Results from applying the Kalman smoother and/or filter to a state space
@@ -591,3 +603,281 @@ class SimulationSmoothResults(object):
         # Note: simulation_output=-1 corresponds to whatever was setup when
         # the simulation smoother was constructed
         self._simulation_smoother.simulate(simulation_output)
+
+    def _get_batch_quantities(self):
+        # The predicted state covariance matrices and Kalman gains do not
+        # depend on the data, so that they are computed from a single pass of
+        # the Kalman filter over the actual data, and shared by all draws.
+        # The quantities of period t are computed when they are needed, so
+        # that only the filter output is stored for all periods.
+        res = self.model.filter(conserve_memory=MEMORY_NO_SMOOTHING)
+        k_states = res.k_states
+
+        def get(name, t):
+            mat = getattr(res, name)
+            return mat[..., 0] if mat.shape[-1] == 1 else mat[..., t]
+
+        def quantities(t):
+            design = get('design', t)
+            obs_cov = get('obs_cov', t)
+            transition = get('transition', t)
+            predicted_state_cov = res.predicted_state_cov[:, :, t]
+            observed = ~res.missing[:, t].astype(bool)
+
+            # Kalman filter quantities for the observed elements of y_t
+            design_o = design[observed]
+            n_observed = design_o.shape[0]
+            if n_observed > 0:
+                forecasts_error_cov_inv = np.linalg.inv(
+                    np.dot(np.dot(design_o, predicted_state_cov),
+                           design_o.T) +
+                    obs_cov[np.ix_(observed, observed)])
+                design_o_inv = np.dot(design_o.T, forecasts_error_cov_inv)
+                kalman_gain = np.dot(np.dot(transition, predicted_state_cov),
+                                     design_o_inv)
+            else:
+                # Nothing is observed, the Kalman gain is zero
+                forecasts_error_cov_inv = np.zeros((0, 0))
+                design_o_inv = np.zeros((k_states, 0))
+                kalman_gain = np.zeros((k_states, 0))
+            return Bunch(
+                observed=observed, design=design, design_o=design_o,
+                obs_cov=obs_cov, obs_cov_chol=_cholesky(obs_cov),
+                obs_cov_o=obs_cov[:, observed],
+                obs_intercept=get('obs_intercept', t),
+                transition=transition,
+                state_intercept=get('state_intercept', t),
+                selection=get('selection', t),
+                state_cov_selection=np.dot(get('state_cov', t),
+                                           get('selection', t).T),
+                state_cov_chol=_cholesky(get('state_cov', t)),
+                predicted_state_cov=predicted_state_cov,
+                forecasts_error_cov_inv=forecasts_error_cov_inv,
+                design_o_inv=design_o_inv, kalman_gain=kalman_gain,
+                transition_l=transition - np.dot(kalman_gain, design_o))
+
+        initial = Bunch(state=res.initial_state,
+                        state_cov_chol=_cholesky(res.initial_state_cov))
+        return res.endog, initial, quantities
+
+    def _simulate_batch(self, endog, initial, quantities, simulation_output,
+                        disturbance_variates, initial_state_variates):
+        nsimulations = initial_state_variates.shape[0]
+        nobs = self.model.nobs
+        k_endog = self.model.k_endog
+        k_states = self.model.k_states
+        k_posdef = self.model.k_posdef
+        simulate_state = bool(simulation_output & SIMULATION_STATE)
+        simulate_disturbance = bool(simulation_output &
+                                    SIMULATION_DISTURBANCE)
+
+        # Disturbance variates are ordered as in `simulate`, with all the
+        # measurement disturbances first, and are (nobs x k) for each draw
+        end = nobs * k_endog
+        measurement_variates = disturbance_variates[:, :end].reshape(
+            nsimulations, nobs, k_endog)
+        state_variates = disturbance_variates[:, end:].reshape(
+            nsimulations, nobs, k_posdef)
+
+        # 1. Generate y_t^+, alpha_t^+ for all draws, and the Kalman filter
+        #    over y_t^* = y_t - y_t^+ (its mean recursions only, since the
+        #    covariance recursions are the same as for the actual data)
+        generated_state = np.zeros((nobs, k_states, nsimulations))
+        measurement_disturbance = np.zeros((nobs, k_endog, nsimulations))
+        state_disturbance = np.zeros((nobs, k_posdef, nsimulations))
+        predicted_state = np.zeros((nobs, k_states, nsimulations))
+        forecasts_error = []
+
+        state = initial.state[:, None] + np.dot(initial.state_cov_chol,
+                                                initial_state_variates.T)
+        filtered = np.zeros((k_states, nsimulations))
+        for t in range(nobs):
+            q = quantities(t)
+            generated_state[t] = state
+            measurement_disturbance[t] = np.dot(q.obs_cov_chol,
+                                                measurement_variates[:, t].T)
+            state_disturbance[t] = np.dot(q.state_cov_chol,
+                                          state_variates[:, t].T)
+
+            generated_obs = (q.obs_intercept[q.observed, None] +
+                             np.dot(q.design_o, state) +
+                             measurement_disturbance[t, q.observed])
+            state = (q.state_intercept[:, None] +
+                     np.dot(q.transition, state) +
+                     np.dot(q.selection, state_disturbance[t]))
+
+            predicted_state[t] = filtered
+            forecasts_error.append(endog[q.observed, t, None] - generated_obs -
+                                   np.dot(q.design_o, filtered))
+            filtered = (np.dot(q.transition, filtered) +
+                        np.dot(q.kalman_gain, forecasts_error[t]))
+
+        # 2. Smoothed states and disturbances given y_t^*, from the backwards
+        #    recursion of the disturbance smoother
+        #    (Durbin and Koopman, 2012, Chapter 4.5)
+        scaled_smoothed_estimator = np.zeros((k_states, nsimulations))
+        for t in range(nobs - 1, -1, -1):
+            q = quantities(t)
+            if simulate_disturbance:
+                smoothing_error = (
+                    np.dot(q.forecasts_error_cov_inv, forecasts_error[t]) -
+                    np.dot(q.kalman_gain.T, scaled_smoothed_estimator))
+                measurement_disturbance[t] += np.dot(q.obs_cov_o,
+                                                     smoothing_error)
+                state_disturbance[t] += np.dot(q.state_cov_selection,
+                                               scaled_smoothed_estimator)
+            scaled_smoothed_estimator = (
+                np.dot(q.design_o_inv, forecasts_error[t]) +
+                np.dot(q.transition_l.T, scaled_smoothed_estimator))
+            if simulate_state:
+                generated_state[t] += (
+                    predicted_state[t] +
+                    np.dot(q.predicted_state_cov, scaled_smoothed_estimator))
+
+        # 3. The simulated values combine the generated values and the
+        #    smoothed values given y_t^*
+        out = Bunch(simulated_state=None,
+                    simulated_measurement_disturbance=None,
+                    simulated_state_disturbance=None)
+        if simulate_state:
+            out.simulated_state = generated_state.transpose(2, 1, 0)
+        if simulate_disturbance:
+            out.simulated_measurement_disturbance = (
+                measurement_disturbance.transpose(2, 1, 0))
+            out.simulated_state_disturbance = (
+                state_disturbance.transpose(2, 1, 0))
+        return out
+
+    def simulate_batch(self, nsimulations, simulation_output=-1,
+                       disturbance_variates=None,
+                       initial_state_variates=None):
+        r"""
+        Perform simulation smoothing for many draws at once
+
+        Parameters
+        ----------
+        nsimulations : int
+            The number of draws.
+        simulation_output : integer, optional
+            Bitmask controlling simulation output. Default is to use the
+            simulation output defined in object initialization.
+        disturbance_variates : array_like, optional
+            Random values to use as disturbance variates, distributed standard
+            Normal, with shape `(nsimulations, nobs * (k_endog + k_posdef))`.
+            Each row is ordered as the `disturbance_variates` argument of
+            `simulate`. If not specified, random variates are drawn.
+        initial_state_variates : array_like, optional
+            Random values to use as initial state variates, with shape
+            `(nsimulations, k_states)`. If not specified, random variates are
+            drawn.
+
+        Returns
+        -------
+        out : Bunch
+            Bunch with the attributes `simulated_state`, an array with shape
+            `(nsimulations, k_states, nobs)`, and
+            `simulated_measurement_disturbance` and
+            `simulated_state_disturbance`, arrays with shapes
+            `(nsimulations, k_endog, nobs)` and
+            `(nsimulations, k_posdef, nobs)`. Output that is not included in
+            `simulation_output` is None.
+
+        Notes
+        -----
+        The draws are the same as those of `simulate` with the same variates,
+        but the Kalman filter is applied only once to the actual data: the
+        predicted state covariance matrices and Kalman gains do not depend on
+        the data, so that each draw only requires the recursions for the
+        means, which are computed for all draws at once. The Kalman gain and
+        the inverse of the forecast error covariance matrix of each period are
+        recomputed from the filter output when they are needed, so that
+        besides the filter output, which includes the predicted state
+        covariance matrices of all periods, the memory required is
+        proportional to `nsimulations * nobs * k_states`; see
+        `iter_simulate_batch` to bound it.
+
+        See Also
+        --------
+        simulate
+        iter_simulate_batch
+        """
+        if simulation_output == -1:
+            simulation_output = self.simulation_output
+
+        n_disturbance_variates = (
+            self.model.nobs * (self.model.k_endog + self.model.k_posdef))
+        if disturbance_variates is None:
+            disturbance_variates = np.random.normal(
+                size=(nsimulations, n_disturbance_variates))
+        disturbance_variates = np.asarray(disturbance_variates,
+                                          dtype=self.dtype)
+        if initial_state_variates is None:
+            initial_state_variates = np.random.normal(
+                size=(nsimulations, self.model.k_states))
+        initial_state_variates = np.asarray(initial_state_variates,
+                                            dtype=self.dtype)
+
+        if not disturbance_variates.shape == (nsimulations,
+                                              n_disturbance_variates):
+            raise ValueError('Invalid shape of disturbance variates. Required'
+                             ' %s, got %s.'
+                             % (str((nsimulations, n_disturbance_variates)),
+                                str(disturbance_variates.shape)))
+        if not initial_state_variates.shape == (nsimulations,
+                                                self.model.k_states):
+            raise ValueError('Invalid shape of initial state variates.'
+                             ' Required %s, got %s.'
+                             % (str((nsimulations, self.model.k_states)),
+                                str(initial_state_variates.shape)))
+
+        return self._simulate_batch(
+            *(self._get_batch_quantities() +
+              (simulation_output, disturbance_variates,
+               initial_state_variates)))
+
+    def iter_simulate_batch(self, nsimulations, chunksize=100,
+                            simulation_output=-1):
+        r"""
+        Iterate over chunks of draws from the simulation smoother
+
+        Parameters
+        ----------
+        nsimulations : int
+            The total number of draws.
+        chunksize : int, optional
+            The maximum number of draws in each chunk. Default is 100.
+        simulation_output : integer, optional
+            Bitmask controlling simulation output. Default is to use the
+            simulation output defined in object initialization.
+
+        Yields
+        ------
+        out : Bunch
+            Output of `simulate_batch` for each chunk of draws.
+
+        Notes
+        -----
+        The Kalman filter is applied to the actual data only once for all the
+        chunks, and the memory required is bounded by the size of a chunk.
+
+        See Also
+        --------
+        simulate_batch
+        """
+        if simulation_output == -1:
+            simulation_output = self.simulation_output
+        if chunksize < 1:
+            raise ValueError('Invalid chunk size; must be positive.')
+
+        n_disturbance_variates = (
+            self.model.nobs * (self.model.k_endog + self.model.k_posdef))
+        quantities = self._get_batch_quantities()
+        for start in range(0, nsimulations, chunksize):
+            n = min(chunksize, nsimulations - start)
+            disturbance_variates = np.random.normal(
+                size=(n, n_disturbance_variates)).astype(self.dtype)
+            initial_state_variates = np.random.normal(
+                size=(n, self.model.k_states)).astype(self.dtype)
+            yield self._simulate_batch(
+                *(quantities + (simulation_output, disturbance_variates,
+                                initial_state_variates)))
@@ -15,6 +15,7 @@ from statsmodels.tsa.filters.hp_filter import hpfilter
 from statsmodels.tools.data import _is_using_pandas
 from statsmodels.tsa.tsatools import lagmat
 from .mlemodel import MLEModel, MLEResults, MLEResultsWrapper
+from .kalman_filter import KalmanFilter
 from scipy.linalg import solve_discrete_lyapunov
 from statsmodels.tools.tools import Bunch
 from statsmodels.tools.sm_exceptions import (ValueWarning, OutputWarning,
@@ -317,6 +318,7 @@ class UnobservedComponents(MLEModel):
         self.ar_order = autoregressive if autoregressive is not None else 0
         self.autoregressive = self.ar_order > 0
         self.irregular = irregular
+        self._manual_initialization = False
 
         self.stochastic_level = stochastic_level
         self.stochastic_trend = stochastic_trend
@@ -544,6 +546,9 @@ class UnobservedComponents(MLEModel):
 
         return kwds
 
+    def clone(self, endog, exog=None, **kwargs):
+        return self._clone_from_init_kwds(endog, exog=exog, **kwargs)
+
     def setup(self):
         """
         Setup the structural time series representation
@@ -644,6 +649,25 @@ class UnobservedComponents(MLEModel):
         idx = np.diag_indices(self.ssm.k_posdef)
         self._idx_state_cov = ('state_cov', idx[0], idx[1])
 
+    def initialize_known(self, initial_state, initial_state_cov):
+        self._manual_initialization = True
+        self.ssm.initialize_known(initial_state, initial_state_cov)
+    initialize_known.__doc__ = KalmanFilter.initialize_known.__doc__
+
+    def initialize_approximate_diffuse(self, variance=None):
+        self._manual_initialization = True
+        self.ssm.initialize_approximate_diffuse(variance)
+    initialize_approximate_diffuse.__doc__ = (
+        KalmanFilter.initialize_approximate_diffuse.__doc__
+    )
+
+    def initialize_stationary(self):
+        self._manual_initialization = True
+        self.ssm.initialize_stationary()
+    initialize_stationary.__doc__ = (
+        KalmanFilter.initialize_stationary.__doc__
+    )
+
     def initialize_state(self):
         # Initialize the AR component as stationary, the rest as approximately
         # diffuse
@@ -965,7 +989,8 @@ class UnobservedComponents(MLEModel):
             offset += self.k_exog
 
         # Initialize the state
-        self.initialize_state()
+        if not self._manual_initialization:
+            self.initialize_state()
 
 
 class UnobservedComponentsResults(MLEResults):
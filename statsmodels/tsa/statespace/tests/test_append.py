@@ -0,0 +1,145 @@
+"""
+Tests for extending and appending to fitted results
+
+License: Simplified-BSD
+"""
+from __future__ import division, absolute_import, print_function
+
+import numpy as np
+import pandas as pd
+from numpy.testing import assert_allclose, assert_equal, assert_raises
+
+from statsmodels.tsa.statespace import sarimax, structural, varmax
+
+
+def check_append(res, desired, endog, exog=None):
+    # Extending gives the output of the new observations conditional on the
+    # sample, and appending gives that of the combined sample
+    ext = res.extend(endog, exog=exog)
+    assert_equal(ext.nobs, len(endog))
+    assert_allclose(res.llf + ext.llf, desired.llf)
+    assert_allclose(ext.llf_obs, desired.llf_obs[res.nobs:])
+    assert_allclose(ext.filtered_state,
+                    desired.filtered_state[:, res.nobs:], atol=1e-8)
+
+    app = res.append(endog, exog=exog)
+    assert_equal(app.nobs, desired.nobs)
+    assert_allclose(app.llf, desired.llf)
+    for name in ['llf_obs', 'filtered_state', 'filtered_state_cov',
+                 'predicted_state', 'predicted_state_cov', 'forecasts',
+                 'forecasts_error', 'forecasts_error_cov',
+                 'standardized_forecasts_error']:
+        assert_allclose(getattr(app, name), getattr(desired, name),
+                        atol=1e-8)
+
+    # The parameters are not re-estimated
+    assert_allclose(app.params, res.params)
+    assert_allclose(app.bse, res.bse)
+    assert_allclose(ext.bse, res.bse)
+    return ext, app
+
+
+def test_sarimax():
+    rs = np.random.RandomState(1234)
+    nobs = 100
+    endog = rs.randn(nobs).cumsum() + 0.1 * np.arange(nobs)
+    endog[20] = np.nan
+    exog = rs.randn(nobs, 1)
+    fcast_exog = np.ones((5, 1))
+
+    for order in [(1, 0, 1), (1, 1, 1)]:
+        full = sarimax.SARIMAX(endog, exog=exog, order=order, trend='ct')
+        params = full.start_params
+        desired = full.filter(params)
+
+        mod = sarimax.SARIMAX(endog[:80], exog=exog[:80], order=order,
+                              trend='ct')
+        res = mod.filter(params)
+        ext, app = check_append(res, desired, endog[80:], exog=exog[80:])
+
+        # The time trend continues from the end of the sample
+        assert_equal(ext.model.trend_offset, 81)
+        assert_allclose(ext.forecast(5, exog=fcast_exog),
+                        desired.forecast(5, exog=fcast_exog))
+        assert_allclose(app.forecast(5, exog=fcast_exog),
+                        desired.forecast(5, exog=fcast_exog))
+
+    # New exogenous observations are required
+    assert_raises(ValueError, res.extend, endog[80:])
+
+    # Simple differencing needs the preceding observations
+    mod = sarimax.SARIMAX(endog[:80], order=(1, 1, 0),
+                          simple_differencing=True)
+    res = mod.filter([0.5, 1.])
+    assert_raises(ValueError, res.extend, endog[80:])
+
+
+def test_sarimax_pandas():
+    rs = np.random.RandomState(1234)
+    index = pd.date_range(start='2000-01', periods=50, freq='M')
+    endog = pd.Series(rs.randn(50), index=index)
+
+    full = sarimax.SARIMAX(endog, order=(1, 0, 0))
+    desired = full.filter([0.5, 1.])
+    res = sarimax.SARIMAX(endog[:40], order=(1, 0, 0)).filter([0.5, 1.])
+    ext, app = check_append(res, desired, endog[40:])
+
+    assert_equal(app.fittedvalues.index.equals(index), True)
+    assert_equal(ext.forecast(1).index[0], pd.Timestamp('2004-03-31'))
+    assert_allclose(app.forecast(3), desired.forecast(3))
+
+    # New observations must also be Pandas objects
+    assert_raises(ValueError, res.append, endog[40:].values)
+
+
+def test_unobserved_components():
+    rs = np.random.RandomState(1234)
+    endog = rs.randn(60).cumsum()
+    exog = rs.randn(60, 1)
+    full = structural.UnobservedComponents(endog, 'llevel', exog=exog)
+    params = [1., 0.5, 0.2]
+    desired = full.filter(params)
+
+    mod = structural.UnobservedComponents(endog[:50], 'llevel',
+                                          exog=exog[:50])
+    res = mod.filter(params)
+    ext, app = check_append(res, desired, endog[50:], exog=exog[50:])
+    assert_allclose(app.forecast(2, exog=np.ones((2, 1))),
+                    desired.forecast(2, exog=np.ones((2, 1))))
+
+
+def test_invalid():
+    rs = np.random.RandomState(1234)
+    endog = rs.randn(50, 2)
+
+    # Models that do not support cloning
+    mod = varmax.VARMAX(endog[:40], order=(1, 0), trend='nc')
+    res = mod.filter(mod.start_params)
+    assert_raises(NotImplementedError, res.extend, endog[40:])
+
+    # The predicted state of the last period must be stored
+    mod = sarimax.SARIMAX(endog[:40, 0], order=(1, 0, 0))
+    mod.ssm.memory_no_predicted = True
+    res = mod.filter([0.5, 1.], cov_type='none')
+    assert_raises(ValueError, res.extend, endog[40:, 0])
+
+
+def test_sarimax_single():
+    # Online updating with one observation at a time
+    rs = np.random.RandomState(1234)
+    endog = rs.randn(50).cumsum()
+    params = [0.1, 0.01, 0.5, 1.]
+    desired = sarimax.SARIMAX(endog, order=(1, 0, 0),
+                              trend='ct').filter(params)
+
+    res = sarimax.SARIMAX(endog[:45], order=(1, 0, 0),
+                          trend='ct').filter(params)
+    llf = res.llf
+    for t in range(45, 50):
+        ext = res.extend(endog[t:t + 1])
+        llf += ext.llf
+        res = res.append(endog[t:t + 1])
+    assert_allclose(llf, desired.llf)
+    assert_allclose(res.llf, desired.llf)
+    assert_allclose(ext.forecast(5), desired.forecast(5))
+    assert_allclose(res.forecast(5), desired.forecast(5))
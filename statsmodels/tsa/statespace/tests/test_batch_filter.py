@@ -0,0 +1,134 @@
+"""
+Tests for the batch Kalman filter loglikelihood
+
+License: Simplified-BSD
+"""
+from __future__ import division, absolute_import, print_function
+
+import numpy as np
+from numpy.testing import assert_allclose, assert_equal, assert_raises
+
+from statsmodels.tsa.statespace.sarimax import SARIMAX
+from statsmodels.tsa.statespace.kalman_filter import (KalmanFilter,
+                                                      batch_loglike)
+
+
+def _sarimax_batch(n_series=10, nobs=50, seed=1234):
+    rs = np.random.RandomState(seed)
+    endog = rs.randn(n_series, nobs).cumsum(1) * 0.1 + rs.randn(n_series, nobs)
+    params = np.column_stack([rs.uniform(-0.5, 0.5, n_series),
+                              rs.uniform(-0.3, 0.3, n_series),
+                              rs.uniform(-0.5, 0.5, n_series),
+                              rs.uniform(0.5, 2, n_series)])
+    return endog, params
+
+
+def _sarimax_matrices(endog, params, **kwargs):
+    names = ['design', 'obs_cov', 'transition', 'selection', 'state_cov']
+    matrices = dict((name, []) for name in names)
+    llf = []
+    for i in range(endog.shape[0]):
+        # tolerance=0 disables the steady-state shortcut of the filter
+        mod = SARIMAX(endog[i], order=(2, 0, 1), tolerance=0, **kwargs)
+        llf.append(mod.loglike(params[i]))
+        for name in names:
+            matrices[name].append(mod.ssm[name].copy())
+    matrices = dict((name, np.array(value))
+                    for name, value in matrices.items())
+    return np.array(llf), matrices
+
+
+def test_sarimax():
+    endog, params = _sarimax_batch()
+    endog[:, 5] = np.nan
+    endog[2, 10] = np.nan
+    llf, matrices = _sarimax_matrices(endog, params)
+
+    res = batch_loglike(endog, **matrices)
+    assert_equal(res.shape, (10,))
+    assert_allclose(res, llf, rtol=1e-12)
+    res = batch_loglike(endog, n_threads=3, **matrices)
+    assert_allclose(res, llf, rtol=1e-12)
+
+    # 3-dim endog and shared matrices
+    res = batch_loglike(endog[:, :, None], matrices['design'][0],
+                        matrices['obs_cov'][0], matrices['transition'],
+                        matrices['selection'], matrices['state_cov'])
+    assert_allclose(res, llf, rtol=1e-12)
+
+
+def test_complex():
+    endog, params = _sarimax_batch(n_series=3)
+    llf, matrices = _sarimax_matrices(endog, params)
+    matrices['transition'] = matrices['transition'] + 0j
+    res = batch_loglike(endog, **matrices)
+    assert_equal(res.dtype, np.complex128)
+    assert_allclose(res.real, llf, rtol=1e-12)
+
+
+def test_known_initialization():
+    rs = np.random.RandomState(0)
+    n_series, nobs, k_endog, k_states = 4, 30, 2, 3
+    endog = rs.randn(n_series, nobs, k_endog)
+    endog[:, 3] = np.nan
+    design = rs.randn(n_series, k_endog, k_states)
+    obs_intercept = rs.randn(n_series, k_endog)
+    obs_cov = np.eye(k_endog) * 0.5
+    transition = rs.uniform(-0.3, 0.3, (n_series, k_states, k_states))
+    state_intercept = rs.randn(k_states)
+    selection = np.eye(k_states)
+    state_cov = np.eye(k_states)
+    initial_state = rs.randn(n_series, k_states)
+    initial_state_cov = np.eye(k_states) * 10
+
+    llf = []
+    for i in range(n_series):
+        kf = KalmanFilter(k_endog=k_endog, k_states=k_states,
+                          loglikelihood_burn=2, tolerance=0)
+        kf.bind(endog[i].T.copy(order='F'))
+        kf['design'] = design[i]
+        kf['obs_intercept'] = obs_intercept[i]
+        kf['obs_cov'] = obs_cov
+        kf['transition'] = transition[i]
+        kf['state_intercept'] = state_intercept
+        kf['selection'] = selection
+        kf['state_cov'] = state_cov
+        kf.initialize_known(initial_state[i], initial_state_cov)
+        llf.append(kf.loglike())
+
+    res = batch_loglike(endog, design, obs_cov, transition, selection,
+                        state_cov, obs_intercept=obs_intercept,
+                        state_intercept=state_intercept,
+                        initial_state=initial_state,
+                        initial_state_cov=initial_state_cov,
+                        loglikelihood_burn=2)
+    assert_allclose(res, llf, rtol=1e-12)
+
+
+def test_invalid():
+    endog, params = _sarimax_batch(n_series=3)
+    llf, matrices = _sarimax_matrices(endog, params)
+
+    # a negative variance gives a NaN loglikelihood for that series only
+    matrices['obs_cov'][1] = -100
+    res = batch_loglike(endog, **matrices)
+    assert_equal(np.isnan(res), [False, True, False])
+    assert_allclose(res[[0, 2]], llf[[0, 2]], rtol=1e-12)
+
+    # partially missing observations
+    endog3 = np.repeat(endog[:, :, None], 2, axis=2)
+    endog3[0, 1, 0] = np.nan
+    assert_raises(ValueError, batch_loglike, endog3, np.ones((2, 2)),
+                  np.eye(2), matrices['transition'], matrices['selection'],
+                  matrices['state_cov'])
+
+    # wrong number of series and wrong shapes
+    assert_raises(ValueError, batch_loglike, endog,
+                  matrices['design'][:2], matrices['obs_cov'],
+                  matrices['transition'], matrices['selection'],
+                  matrices['state_cov'])
+    assert_raises(ValueError, batch_loglike, endog, np.ones((1, 3)),
+                  matrices['obs_cov'], matrices['transition'],
+                  matrices['selection'], matrices['state_cov'])
+    assert_raises(ValueError, batch_loglike, endog, **dict(
+        matrices, obs_cov=1.))
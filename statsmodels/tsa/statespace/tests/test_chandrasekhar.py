@@ -0,0 +1,114 @@
+"""
+Tests for the Chandrasekhar recursions
+
+License: Simplified-BSD
+"""
+from __future__ import division, absolute_import, print_function
+
+import numpy as np
+from numpy.testing import assert_allclose, assert_equal, assert_raises
+from nose.exc import SkipTest
+
+from statsmodels.tsa.statespace import sarimax, varmax
+from statsmodels.tsa.statespace.tools import compatibility_mode
+from statsmodels.tsa.statespace.kalman_filter import (
+    FILTER_CHANDRASEKHAR, INVERT_UNIVARIATE, INVERT_CHOLESKY, INVERT_LU,
+    SOLVE_CHOLESKY, SOLVE_LU)
+
+
+def check_equivalent(mod, params, k_chandrasekhar=None, atol=1e-12):
+    # Results from the Chandrasekhar recursions must match those of the
+    # conventional filter (the convergence check is disabled so that the
+    # recursions run over the full sample)
+    mod.ssm.tolerance = 0
+    mod.ssm.filter_chandrasekhar = False
+    desired = mod.smooth(params)
+    mod.ssm.filter_chandrasekhar = True
+    res = mod.smooth(params)
+    mod.ssm.filter_chandrasekhar = False
+
+    assert_equal(res.filter_results.filter_method & FILTER_CHANDRASEKHAR,
+                 FILTER_CHANDRASEKHAR)
+    if k_chandrasekhar is not None:
+        assert_equal(mod.ssm._kalman_filter.k_chandrasekhar, k_chandrasekhar)
+    assert_allclose(res.llf_obs, desired.llf_obs)
+    assert_allclose(res.filtered_state, desired.filtered_state, atol=atol)
+    assert_allclose(res.filtered_state_cov, desired.filtered_state_cov,
+                    atol=atol)
+    assert_allclose(res.predicted_state_cov, desired.predicted_state_cov,
+                    atol=atol)
+    assert_allclose(res.forecasts_error_cov, desired.forecasts_error_cov)
+    assert_allclose(res.smoothed_state, desired.smoothed_state, atol=atol)
+    assert_allclose(res.smoothed_state_cov, desired.smoothed_state_cov,
+                    atol=atol)
+
+
+def test_sarimax():
+    if compatibility_mode:
+        raise SkipTest
+    rs = np.random.RandomState(1234)
+    endog = rs.randn(200)
+
+    # Stationary initialization: the recursions have rank k_endog
+    mod = sarimax.SARIMAX(endog, order=(1, 0, 1),
+                          seasonal_order=(1, 0, 1, 4), trend='c')
+    params = [0.1, 0.5, 0.2, 0.3, -0.2, 1.5]
+    for inversion_method in [SOLVE_CHOLESKY, SOLVE_LU, INVERT_CHOLESKY,
+                             INVERT_LU]:
+        mod.ssm.inversion_method = INVERT_UNIVARIATE | inversion_method
+        check_equivalent(mod, params, k_chandrasekhar=1)
+
+    # Approximate diffuse initialization: full rank, and the initial
+    # variance of 1e6 limits the accuracy of the covariance matrices
+    mod = sarimax.SARIMAX(endog, order=(1, 1, 1))
+    check_equivalent(mod, [0.5, 0.2, 1.], k_chandrasekhar=mod.k_states,
+                     atol=1e-9)
+
+
+def test_varmax():
+    if compatibility_mode:
+        raise SkipTest
+    rs = np.random.RandomState(1234)
+    endog = rs.randn(100, 2)
+    mod = varmax.VARMAX(endog, order=(1, 1), measurement_error=True)
+    check_equivalent(mod, mod.start_params)
+
+
+def test_score():
+    # The complex-step derivative of the loglikelihood also goes through the
+    # Chandrasekhar recursions
+    if compatibility_mode:
+        raise SkipTest
+    rs = np.random.RandomState(1234)
+    endog = rs.randn(200)
+    mod = sarimax.SARIMAX(endog, order=(2, 0, 1), tolerance=0)
+    params = [0.5, -0.2, 0.3, 1.2]
+    desired = mod.score(params)
+    mod.ssm.filter_chandrasekhar = True
+    assert_allclose(mod.score(params), desired, rtol=1e-6)
+
+
+def test_invalid():
+    if compatibility_mode:
+        raise SkipTest
+    rs = np.random.RandomState(1234)
+    endog = rs.randn(50)
+
+    # Missing data
+    endog_missing = endog.copy()
+    endog_missing[10] = np.nan
+    mod = sarimax.SARIMAX(endog_missing, order=(1, 0, 0))
+    mod.ssm.filter_chandrasekhar = True
+    assert_raises(RuntimeError, mod.loglike, [0.5, 1.])
+
+    # Time-varying system matrices
+    mod = sarimax.SARIMAX(endog, order=(1, 0, 0), exog=np.arange(50),
+                          mle_regression=False)
+    mod.ssm.filter_chandrasekhar = True
+    assert_raises(RuntimeError, mod.loglike, [0.5, 1.])
+
+    # Alternative timing
+    mod = sarimax.SARIMAX(endog, order=(1, 0, 0))
+    mod.ssm.timing_init_filtered = True
+    mod.ssm.filter_chandrasekhar = True
+    assert_raises(RuntimeError, mod.loglike, [0.5, 1.])
@@ -693,3 +693,42 @@ class TestDFMClassicalSmoothing(TestDFM):
                      SMOOTH_CLASSICAL)
         assert_equal(self.model._kalman_smoother._smooth_method,
                      SMOOTH_CLASSICAL)
+
+
+def test_dynamic_factor_lags():
+    # The design matrix of a dynamic factor model with factor lags has zero
+    # columns, so that the observations are collapsed onto the current
+    # factors only
+    from statsmodels.tsa.statespace.dynamic_factor import DynamicFactor
+    rs = np.random.RandomState(1234)
+    nobs, k_endog, k_factors = 100, 10, 2
+    factors = rs.randn(nobs, k_factors).cumsum(0) * 0.1
+    endog = factors.dot(rs.randn(k_factors, k_endog)) + rs.randn(nobs, k_endog)
+    endog[5, :3] = np.nan
+    endog[7] = np.nan
+
+    mod = DynamicFactor(endog, k_factors=k_factors, factor_order=2)
+    params = np.r_[rs.randn(k_endog * k_factors) * 0.5,
+                   1 + rs.uniform(size=k_endog),
+                   [0.3, 0, 0, 0.3, 0.1, 0, 0, 0.1]]
+
+    desired = mod.smooth(params)
+    desired_score = mod.score(params)
+    mod.ssm.filter_collapsed = True
+    res = mod.smooth(params)
+
+    assert_allclose(res.llf_obs, desired.llf_obs)
+    assert_allclose(res.filtered_state, desired.filtered_state, atol=1e-10)
+    assert_allclose(res.filtered_state_cov, desired.filtered_state_cov,
+                    atol=1e-10)
+    assert_allclose(res.smoothed_state, desired.smoothed_state, atol=1e-10)
+    assert_allclose(res.smoothed_state_cov, desired.smoothed_state_cov,
+                    atol=1e-10)
+    # Complex-step differentiation through the collapse
+    assert_allclose(mod.score(params), desired_score, rtol=1e-6)
+
+    # Non-diagonal observation covariance matrix
+    mod.ssm['obs_cov'] = np.eye(k_endog) + 0.1
+    llf = mod.ssm.loglike()
+    mod.ssm.filter_collapsed = False
+    assert_allclose(llf, mod.ssm.loglike())
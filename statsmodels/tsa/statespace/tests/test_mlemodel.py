@@ -17,6 +17,7 @@ from statsmodels.tsa.statespace import (sarimax, varmax, kalman_filter,
 from statsmodels.tsa.statespace.mlemodel import MLEModel, MLEResultsWrapper
 from statsmodels.tsa.statespace.tools import compatibility_mode
 from statsmodels.datasets import nile
+from statsmodels.tools.numdiff import approx_fprime
 from numpy.testing import assert_almost_equal, assert_equal, assert_allclose, assert_raises
 from nose.exc import SkipTest
 from statsmodels.tsa.statespace.tests.results import results_sarimax, results_var_misc
@@ -402,6 +403,126 @@ def test_filter():
     assert_equal(res.cov_type, 'oim')
 
 
+def test_loglike_batch():
+    if compatibility_mode:
+        raise SkipTest('batch filtering is not available in compatibility'
+                       ' mode')
+    rs = np.random.RandomState(1234)
+    endog = rs.randn(200).cumsum() * 0.1 + rs.randn(200)
+    endog[[5, 20]] = np.nan
+    params = np.column_stack([rs.uniform(-0.5, 0.5, 10),
+                              rs.uniform(-0.3, 0.3, 10),
+                              rs.uniform(-0.5, 0.5, 10),
+                              rs.uniform(0.5, 2, 10)])
+
+    # tolerance=0 disables the steady-state shortcut of the filter
+    mod = sarimax.SARIMAX(endog, order=(2, 0, 1), tolerance=0)
+    desired = [mod.loglike(x) for x in params]
+    assert_allclose(mod.loglike_batch(params), desired)
+    assert_allclose(mod.loglike_batch(params, n_threads=3), desired)
+    assert_allclose(mod.loglike_batch(params[0]), desired[:1])
+
+    unconstrained = np.array([mod.untransform_params(x) for x in params])
+    assert_allclose(mod.loglike_batch(unconstrained, transformed=False),
+                    desired)
+
+    # approximate diffuse initialization and loglikelihood burn
+    mod = sarimax.SARIMAX(endog, order=(2, 0, 1), tolerance=0,
+                          initialization='approximate_diffuse',
+                          loglikelihood_burn=3)
+    desired = [mod.loglike(x) for x in params]
+    assert_allclose(mod.loglike_batch(params, n_threads=2), desired)
+
+    # the filter options that differ from those of the batch filter are
+    # respected by calling loglike for each parameter vector
+    calls = []
+
+    def loglike(params, *args, **kwargs):
+        calls.append(params)
+        return MLEModel.loglike(mod, params, *args, **kwargs)
+
+    mod.loglike = loglike
+    mod.loglike_batch(params)
+    assert_equal(len(calls), 0)
+    defaults = dict(filter_method=kalman_filter.FILTER_CONVENTIONAL,
+                    inversion_method=(kalman_filter.INVERT_UNIVARIATE |
+                                      kalman_filter.SOLVE_CHOLESKY),
+                    stability_method=kalman_filter.STABILITY_FORCE_SYMMETRY,
+                    filter_timing=kalman_filter.TIMING_INIT_PREDICTED)
+    for name, value in [('filter_method', kalman_filter.FILTER_UNIVARIATE),
+                        ('inversion_method', kalman_filter.SOLVE_LU),
+                        ('stability_method', 0),
+                        ('filter_timing', kalman_filter.TIMING_INIT_FILTERED)]:
+        for option in defaults:
+            setattr(mod.ssm, option, defaults[option])
+        setattr(mod.ssm, name, value)
+        desired = [MLEModel.loglike(mod, x) for x in params]
+        del calls[:]
+        assert_allclose(mod.loglike_batch(params), desired)
+        assert_equal(len(calls), len(params))
+
+    # time-varying state intercept, computed with loglike
+    mod = sarimax.SARIMAX(endog, order=(2, 0, 1), trend='c', tolerance=0)
+    params = np.column_stack([rs.randn(10) * 0.1, params])
+    desired = [mod.loglike(x) for x in params]
+    assert_allclose(mod.loglike_batch(params), desired)
+
+
+def test_score_analytic():
+    if compatibility_mode:
+        raise SkipTest('analytic score is not available in compatibility'
+                       ' mode')
+    rs = np.random.RandomState(1234)
+    endog = rs.randn(100).cumsum() * 0.1 + rs.randn(100)
+    endog[[5, 20]] = np.nan
+    exog = rs.randn(100, 2)
+
+    mod = sarimax.SARIMAX(endog, exog=exog, order=(1, 0, 1), trend='ct',
+                          measurement_error=True)
+    params = np.r_[0.1, 0.01, 0.5, -0.3, 0.3, 0.2, 1., 0.5]
+    desired = mod.score(params)
+    assert_allclose(mod.score(params, method='analytic'), desired, rtol=1e-7)
+    score_obs = mod.score_obs(params, method='analytic')
+    assert_equal(score_obs.shape, (100, 8))
+    assert_allclose(score_obs.sum(0), desired, rtol=1e-7)
+    assert_allclose(score_obs, mod.score_obs(params), rtol=1e-6, atol=1e-8)
+
+    unconstrained = mod.untransform_params(params)
+    assert_allclose(mod.score_obs(unconstrained, transformed=False,
+                                  method='analytic').sum(0),
+                    mod.score(unconstrained, transformed=False), rtol=1e-6)
+
+    assert_allclose(mod.hessian(params, method='analytic'),
+                    mod.hessian(params), rtol=1e-4, atol=1e-6)
+    # the score of untransformed parameters uses the finite difference
+    # Jacobian of the transformation, which limits the precision
+    desired = approx_fprime(
+        unconstrained, lambda x: mod.score(x, transformed=False),
+        centered=True) / mod.nobs
+    assert_allclose(mod.hessian(unconstrained, transformed=False,
+                                method='analytic'),
+                    (desired + desired.T) / 2, rtol=2e-2, atol=1e-4)
+
+    # diffuse initialization of the seasonal model
+    mod = sarimax.SARIMAX(endog, order=(1, 1, 1), seasonal_order=(1, 0, 0, 4))
+    params = np.r_[0.3, 0.2, 0.3, 1.]
+    assert_allclose(mod.score(params, method='analytic'), mod.score(params),
+                    rtol=1e-7)
+
+    # multivariate model
+    endog2 = rs.randn(50, 2)
+    mod = varmax.VARMAX(endog2, order=(1, 0))
+    params = mod.start_params
+    assert_allclose(mod.score(params, method='analytic'), mod.score(params),
+                    rtol=1e-6, atol=1e-6)
+
+    # partially missing observations are not supported
+    endog2[3, 0] = np.nan
+    mod = varmax.VARMAX(endog2, order=(1, 0))
+    assert_raises(NotImplementedError, mod.score, mod.start_params,
+                  method='analytic')
+
+
 def test_params():
     mod = MLEModel([1,2], **kwargs)
 
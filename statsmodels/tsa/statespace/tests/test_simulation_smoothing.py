@@ -623,3 +623,109 @@ def test_simulation_smoothing_obs_intercept():
     sim.simulate(disturbance_variates=np.zeros(mod.nobs * 2),
                  initial_state_variates=np.zeros(1))
     assert_equal(sim.simulated_state[0], 0)
+
+
+def check_simulate_batch(mod, nsimulations=3):
+    # Batched draws must match those of `simulate` with the same variates
+    sim = mod.simulation_smoother()
+    rs = np.random.RandomState(1234)
+    disturbance_variates = rs.randn(
+        nsimulations, mod.nobs * (mod.k_endog + mod.ssm.k_posdef))
+    initial_state_variates = rs.randn(nsimulations, mod.k_states)
+    out = sim.simulate_batch(nsimulations,
+                             disturbance_variates=disturbance_variates,
+                             initial_state_variates=initial_state_variates)
+
+    assert_equal(out.simulated_state.shape,
+                 (nsimulations, mod.k_states, mod.nobs))
+    for i in range(nsimulations):
+        sim.simulate(disturbance_variates=disturbance_variates[i],
+                     initial_state_variates=initial_state_variates[i])
+        assert_allclose(out.simulated_state[i], sim.simulated_state,
+                        atol=1e-9)
+        assert_allclose(out.simulated_measurement_disturbance[i],
+                        sim.simulated_measurement_disturbance, atol=1e-9)
+        assert_allclose(out.simulated_state_disturbance[i],
+                        sim.simulated_state_disturbance, atol=1e-9)
+
+
+def test_simulate_batch():
+    rs = np.random.RandomState(1234)
+    endog = rs.randn(50).cumsum()
+
+    mod = sarimax.SARIMAX(endog, order=(2, 0, 0), measurement_error=True)
+    mod.update([0.5, 0.2, 1., 0.5])
+    check_simulate_batch(mod)
+
+    mod = structural.UnobservedComponents(endog, 'lltrend')
+    mod.update([1., 0.5, 0.1])
+    check_simulate_batch(mod)
+
+    # Invalid variates
+    sim = mod.simulation_smoother()
+    assert_raises(ValueError, sim.simulate_batch, 2,
+                  disturbance_variates=np.zeros((2, 10)))
+    assert_raises(ValueError, sim.simulate_batch, 2,
+                  initial_state_variates=np.zeros((3, mod.k_states)))
+
+
+def test_simulate_batch_missing():
+    # Periods in which every element of endog is missing, including the first
+    # and the last period, have a zero Kalman gain and no inversion
+    rs = np.random.RandomState(1234)
+    endog = rs.randn(50).cumsum()
+    endog[[0, 10, 11, 12, 49]] = np.nan
+    mod = structural.UnobservedComponents(endog, 'llevel')
+    mod.update([1., 0.5])
+    res = mod.smooth([1., 0.5])
+
+    sim = mod.simulation_smoother()
+    _, _, quantities = sim._get_batch_quantities()
+    q = quantities(10)
+    assert_equal(q.forecasts_error_cov_inv.shape, (0, 0))
+    assert_equal(q.kalman_gain.shape, (mod.k_states, 0))
+    assert_allclose(q.transition_l, q.transition)
+
+    np.random.seed(1234)
+    nsimulations = 4000
+    out = sim.simulate_batch(nsimulations)
+    std = res.smoothed_state_cov.diagonal().T**0.5
+    zscore = ((out.simulated_state.mean(0) - res.smoothed_state) /
+              (std / nsimulations**0.5))
+    assert_equal(np.all(np.abs(zscore) < 4), True)
+    assert_allclose(out.simulated_state.std(0), std, rtol=0.1)
+
+
+def test_simulate_batch_moments():
+    # Draws are from the distribution of the state conditional on the data,
+    # also with a state intercept and with missing data
+    rs = np.random.RandomState(1234)
+    endog = rs.randn(40, 2)
+    endog[5:10, 0] = np.nan
+    endog[20:22] = np.nan
+    mod = mlemodel.MLEModel(endog, k_states=2, k_posdef=2)
+    mod['design'] = np.eye(2)
+    mod['obs_cov'] = np.diag([0.5, 0.2])
+    mod['transition'] = np.array([[0.5, 0.1], [0.2, 0.3]])
+    mod['state_intercept'] = np.array([1., -0.5])
+    mod['selection'] = np.eye(2)
+    mod['state_cov'] = np.array([[1., 0.3], [0.3, 0.8]])
+    mod.initialize_stationary()
+    res = mod.smooth([])
+
+    np.random.seed(1234)
+    nsimulations = 4000
+    sim = mod.simulation_smoother(simulation_output=SIMULATION_STATE)
+    out = sim.simulate_batch(nsimulations)
+    assert_equal(out.simulated_measurement_disturbance, None)
+
+    std = res.smoothed_state_cov.diagonal().T**0.5
+    zscore = ((out.simulated_state.mean(0) - res.smoothed_state) /
+              (std / nsimulations**0.5))
+    assert_equal(np.all(np.abs(zscore) < 4), True)
+    assert_allclose(out.simulated_state.std(0), std, rtol=0.1)
+
+    # Chunks of draws
+    chunks = list(sim.iter_simulate_batch(250, chunksize=100))
+    assert_equal([chunk.simulated_state.shape[0] for chunk in chunks],
+                 [100, 100, 50])
@@ -1042,3 +1042,41 @@ class TestVARAutocovariancesUnivariateSmoothing(TestVARAutocovariances):
         assert_equal(self.model.ssm._kalman_smoother.smooth_method, 0)
         assert_equal(self.model.ssm._kalman_smoother._smooth_method,
                      SMOOTH_UNIVARIATE)
+
+
+def test_steady_state():
+    # Once the filter has converged, the steady-state matrices are reused;
+    # the results must match those of the filter without the convergence
+    # check, including the smoothed output which relies on the stored
+    # temporary arrays
+    if compatibility_mode:
+        raise SkipTest
+    from statsmodels.tsa.statespace import varmax
+    from statsmodels.tsa.statespace.kalman_filter import (
+        INVERT_UNIVARIATE, INVERT_CHOLESKY, INVERT_LU, SOLVE_CHOLESKY,
+        SOLVE_LU)
+    rs = np.random.RandomState(1234)
+    endog = rs.randn(200, 2)
+    mod = varmax.VARMAX(endog, order=(1, 0), measurement_error=True)
+    params = mod.start_params
+
+    for filter_method in [FILTER_CONVENTIONAL, FILTER_UNIVARIATE]:
+        for inversion_method in [SOLVE_CHOLESKY, SOLVE_LU, INVERT_CHOLESKY,
+                                 INVERT_LU]:
+            mod.ssm.filter_method = filter_method
+            mod.ssm.inversion_method = INVERT_UNIVARIATE | inversion_method
+            mod.ssm.tolerance = 1e-19
+            res = mod.smooth(params)
+            mod.ssm.tolerance = 0
+            desired = mod.smooth(params)
+
+            assert_equal(res.filter_results.converged, True)
+            assert_equal(desired.filter_results.converged, False)
+            assert_allclose(res.llf_obs, desired.llf_obs)
+            assert_allclose(res.filtered_state, desired.filtered_state)
+            assert_allclose(res.smoothed_state, desired.smoothed_state)
+            assert_allclose(res.smoothed_state_cov,
+                            desired.smoothed_state_cov, atol=1e-12)
+            assert_allclose(res.smoothed_measurement_disturbance,
+                            desired.smoothed_measurement_disturbance,
+                            atol=1e-12)
@@ -23,6 +23,8 @@ prefix_statespace_map = {}
 prefix_kalman_filter_map = {}
 prefix_kalman_smoother_map = {}
 prefix_simulation_smoother_map = {}
+prefix_batch_loglike_map = {}
+prefix_loglike_score_map = {}
 prefix_pacf_map = {}
 prefix_sv_map = {}
 prefix_reorder_missing_matrix_map = {}
@@ -36,7 +38,8 @@ prefix_copy_index_vector_map = {}
 def set_mode(compatibility=None):
     global compatibility_mode, has_trmm, prefix_statespace_map,        \
         prefix_kalman_filter_map, prefix_kalman_smoother_map,          \
-        prefix_simulation_smoother_map, prefix_pacf_map, prefix_sv_map
+        prefix_simulation_smoother_map, prefix_pacf_map, prefix_sv_map, \
+        prefix_batch_loglike_map, prefix_loglike_score_map
 
     # Determine mode automatically if none given
     if compatibility is None:
@@ -59,7 +62,8 @@ def set_mode(compatibility=None):
     if not compatibility:
         from scipy.linalg import cython_blas
         from . import (_representation, _kalman_filter, _kalman_smoother,
-                       _simulation_smoother, _tools)
+                       _simulation_smoother, _tools, _batch_filter,
+                       _tangent_filter)
         compatibility_mode = False
 
         prefix_statespace_map.update({
@@ -84,6 +88,16 @@ def set_mode(compatibility=None):
             'c': _simulation_smoother.cSimulationSmoother,
             'z': _simulation_smoother.zSimulationSmoother
         })
+        prefix_batch_loglike_map.update({
+            's': _batch_filter.sbatch_loglike,
+            'd': _batch_filter.dbatch_loglike,
+            'c': _batch_filter.cbatch_loglike,
+            'z': _batch_filter.zbatch_loglike
+        })
+        prefix_loglike_score_map.update({
+            's': _tangent_filter.sloglike_score_obs,
+            'd': _tangent_filter.dloglike_score_obs
+        })
         prefix_pacf_map.update({
             's': _tools._scompute_coefficients_from_multivariate_pacf,
             'd': _tools._dcompute_coefficients_from_multivariate_pacf,
@@ -157,6 +171,10 @@ def set_mode(compatibility=None):
         prefix_simulation_smoother_map.update({
             's': None, 'd': None, 'c': None, 'z': None
         })
+        prefix_batch_loglike_map.update({
+            's': None, 'd': None, 'c': None, 'z': None
+        })
+        prefix_loglike_score_map.update({'s': None, 'd': None})
         if has_trmm:
             prefix_pacf_map.update({
                 's': _statespace._scompute_coefficients_from_multivariate_pacf,
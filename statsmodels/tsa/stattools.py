@@ -5,12 +5,16 @@ from statsmodels.compat.python import (iteritems, range, lrange, string_types,
                                        lzip, zip, long)
 from statsmodels.compat.scipy import _next_regular
 
+from collections import OrderedDict
+import hashlib
+
 import numpy as np
 from numpy.linalg import LinAlgError
 from scipy import stats
 
 from statsmodels.regression.linear_model import OLS, yule_walker
 from statsmodels.tools.tools import add_constant, Bunch
+from statsmodels.tools.parallel import _get_n_jobs
 from statsmodels.tsa.tsatools import lagmat, lagmat2ds, add_trend
 from statsmodels.tsa.adfvalues import mackinnonp, mackinnoncrit
 from statsmodels.tsa._bds import bds
@@ -1058,8 +1062,95 @@ def _safe_arma_fit(y, order, model_kw, trend, fit_kw, start_params=None):
         return
 
 
+# memoized fits of arma_order_select_ic, maps a hash of the data, the order
+# and the options to a dict with the information criteria and the params
+_ARMA_IC_CACHE = OrderedDict()
+_ARMA_IC_CACHE_SIZE = 4096
+
+
+def _hash_update(h, obj):
+    """update the hash h with obj, arrays are hashed by their data"""
+    if isinstance(obj, dict):
+        for key in sorted(obj, key=repr):
+            h.update(repr(key).encode('utf-8'))
+            _hash_update(h, obj[key])
+    elif isinstance(obj, (list, tuple)):
+        h.update(repr(type(obj)).encode('utf-8'))
+        for item in obj:
+            _hash_update(h, item)
+    elif hasattr(obj, 'shape'):
+        # ndarray or pandas object
+        arr = np.asarray(obj)
+        h.update(repr((arr.dtype.str, arr.shape)).encode('utf-8'))
+        if arr.dtype == object:
+            h.update(repr(arr.tolist()).encode('utf-8'))
+        else:
+            h.update(np.ascontiguousarray(arr).tobytes())
+        index = getattr(obj, 'index', None)
+        if index is not None:
+            h.update(repr(list(index)).encode('utf-8'))
+    else:
+        h.update(repr(obj).encode('utf-8'))
+
+
+def _arma_ic_key(y, order, trend, model_kw, fit_kw, warm_start):
+    h = hashlib.sha1()
+    _hash_update(h, (y, order, trend, model_kw, fit_kw, warm_start))
+    return h.hexdigest()
+
+
+def _arma_ic_fit(args):
+    """fit one ARMA order, returns the information criteria and params
+
+    Module level function so that it can be used by a process pool. If the
+    fit from the warm start params fails, then the default start params are
+    used.
+    """
+    y, order, model_kw, trend, fit_kw, start_params, ic = args
+    mod = None
+    if start_params is not None:
+        mod = _safe_arma_fit(y, order, model_kw, trend, fit_kw,
+                             start_params)
+    if mod is None:
+        mod = _safe_arma_fit(y, order, model_kw, trend, fit_kw)
+    if mod is None:
+        return None
+    fit = dict((criteria, getattr(mod, criteria)) for criteria in ic)
+    fit['params'] = np.asarray(mod.params)
+    fit['llf'] = mod.llf
+    return fit
+
+
+def _arma_warm_start(fits, order):
+    """start params for order from the best fit of the neighboring orders
+
+    The neighbors are the orders with one AR or one MA lag less. The
+    additional lag gets a zero coefficient, so the start params are
+    stationary and invertible if the params of the neighbor are.
+    """
+    ar, ma = order
+    best = None
+    for k_ar, k_ma in [(ar - 1, ma), (ar, ma - 1)]:
+        fit = fits.get((k_ar, k_ma))
+        if fit is None:
+            continue
+        if best is None or fit['llf'] > best[2]['llf']:
+            best = (k_ar, k_ma, fit)
+    if best is None:
+        return None
+    k_ar, k_ma, fit = best
+    params = fit['params']
+    k_other = len(params) - k_ar - k_ma
+    return np.concatenate((params[:k_other],
+                           params[k_other:k_other + k_ar],
+                           np.zeros(ar - k_ar),
+                           params[k_other + k_ar:],
+                           np.zeros(ma - k_ma)))
+
+
 def arma_order_select_ic(y, max_ar=4, max_ma=2, ic='bic', trend='c',
-                         model_kw={}, fit_kw={}):
+                         model_kw={}, fit_kw={}, n_jobs=1, warm_start=False,
+                         cache=False):
     """
     Returns information criteria for many ARMA models
 
@@ -1080,6 +1171,27 @@ def arma_order_select_ic(y, max_ar=4, max_ma=2, ic='bic', trend='c',
         Keyword arguments to be passed to the ``ARMA`` model
     fit_kw : dict
         Keyword arguments to be passed to ``ARMA.fit``.
+    n_jobs : int or None
+        The number of processes used to fit the models. The default, 1, fits
+        the models in the current process. If None, then the number of cpus
+        is used, limited to the number of models. Negative values follow the
+        joblib convention, -1 uses all cpus.
+    warm_start : bool
+        If True, then the start params of each order are the estimated
+        params of a neighboring order with one AR or MA lag less, the one
+        with the larger loglikelihood, with a zero coefficient for the
+        additional lag. The models are then fit in sequence of p + q, and
+        the orders with the same p + q are fit in parallel. If the fit from
+        the warm start fails, then the default start params are used. The
+        optimizer can converge to a different local optimum than from the
+        default start params, which are computed for each order by a long
+        autoregression.
+    cache : bool
+        If True, then the fits are memoized. Repeated calls with the same
+        data, order and options use the stored information criteria and do
+        not fit the model again. The memoized fits are shared by all calls
+        in the process and are kept until the cache holds 4096 fits, after
+        which the least recently used fits are discarded. Default is False.
 
     Returns
     -------
@@ -1114,6 +1226,10 @@ def arma_order_select_ic(y, max_ar=4, max_ma=2, ic='bic', trend='c',
     therefore a little slow. An implementation using approximate estimates
     will be provided in the future. In the meantime, consider passing
     {method : 'css'} to fit_kw.
+
+    The models are independent unless `warm_start` is True, and with
+    ``n_jobs > 1`` they are fit in a pool of processes. The data and the
+    options need to be picklable in this case.
     """
     from pandas import DataFrame
 
@@ -1123,22 +1239,68 @@ def arma_order_select_ic(y, max_ar=4, max_ma=2, ic='bic', trend='c',
         ic = [ic]
     elif not isinstance(ic, (list, tuple)):
         raise ValueError("Need a list or a tuple for ic if not a string.")
+    if 'start_params' in fit_kw:
+        warm_start = False
+    ic_fit = sorted(set(ic) | set(['aic', 'bic', 'hqic']))
+
+    orders = [(ar, ma) for ar in ar_range for ma in ma_range
+              if not (ar == 0 and ma == 0 and trend == 'nc')]
+    if warm_start:
+        # orders with one lag less need to be fit first
+        batches = [[order for order in orders if sum(order) == n_lags]
+                   for n_lags in range(max_ar + max_ma + 1)]
+    else:
+        batches = [orders]
 
-    results = np.zeros((len(ic), max_ar + 1, max_ma + 1))
-
-    for ar in ar_range:
-        for ma in ma_range:
-            if ar == 0 and ma == 0 and trend == 'nc':
-                results[:, ar, ma] = np.nan
-                continue
-
-            mod = _safe_arma_fit(y, (ar, ma), model_kw, trend, fit_kw)
-            if mod is None:
-                results[:, ar, ma] = np.nan
-                continue
+    n_jobs = _get_n_jobs(n_jobs, len(orders))
+    pool = None
 
+    fits = {}
+    try:
+        for batch in batches:
+            tasks = []
+            keys = []
+            for order in batch:
+                key = _arma_ic_key(y, order, trend, model_kw, fit_kw,
+                                   warm_start)
+                if cache and key in _ARMA_IC_CACHE:
+                    fit = _ARMA_IC_CACHE.pop(key)
+                    _ARMA_IC_CACHE[key] = fit  # most recently used
+                    if fit is None or all(c in fit for c in ic):
+                        fits[order] = fit
+                        continue
+                start_params = None
+                if warm_start:
+                    start_params = _arma_warm_start(fits, order)
+                tasks.append((y, order, model_kw, trend, fit_kw,
+                              start_params, ic_fit))
+                keys.append((order, key))
+
+            if n_jobs > 1 and len(tasks) > 1:
+                if pool is None:
+                    import multiprocessing
+                    pool = multiprocessing.Pool(n_jobs)
+                fits_batch = pool.map(_arma_ic_fit, tasks)
+            else:
+                fits_batch = [_arma_ic_fit(task) for task in tasks]
+
+            for (order, key), fit in zip(keys, fits_batch):
+                fits[order] = fit
+                if cache:
+                    _ARMA_IC_CACHE[key] = fit
+                    while len(_ARMA_IC_CACHE) > _ARMA_IC_CACHE_SIZE:
+                        _ARMA_IC_CACHE.popitem(last=False)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    results = np.empty((len(ic), max_ar + 1, max_ma + 1))
+    results.fill(np.nan)
+    for (ar, ma), fit in iteritems(fits):
+        if fit is not None:
             for i, criteria in enumerate(ic):
-                results[i, ar, ma] = getattr(mod, criteria)
+                results[i, ar, ma] = fit[criteria]
 
     dfs = [DataFrame(res, columns=ma_range, index=ar_range) for res in results]
 
@@ -545,6 +545,36 @@ def test_arma_order_select_ic_failure():
         res = arma_order_select_ic(y)
 
 
+def test_arma_order_select_ic_options():
+    from statsmodels.tsa import stattools
+    from statsmodels.tsa.arima_process import arma_generate_sample
+
+    np.random.seed(2014)
+    y = arma_generate_sample([1, -.75, .25], [1, .65, .35], 250)
+    kwds = dict(max_ar=2, max_ma=2, ic=['aic', 'bic'], trend='nc')
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        stattools._ARMA_IC_CACHE.clear()
+        res1 = arma_order_select_ic(y, **kwds)
+        assert_equal(len(stattools._ARMA_IC_CACHE), 0)
+        res2 = arma_order_select_ic(y, n_jobs=2, cache=True, **kwds)
+        assert_equal(len(stattools._ARMA_IC_CACHE), 8)
+        res3 = arma_order_select_ic(y, warm_start=True, n_jobs=2, **kwds)
+
+    assert_allclose(res2.aic.values, res1.aic.values, rtol=1e-10)
+    assert_allclose(res2.bic.values, res1.bic.values, rtol=1e-10)
+    assert_allclose(res3.aic.values, res1.aic.values, rtol=1e-5)
+    assert_equal(res3.aic_min_order, res1.aic_min_order)
+
+    # the second call only uses the memoized fits
+    key = stattools._arma_ic_key(y, (1, 0), 'nc', {}, {}, False)
+    stattools._ARMA_IC_CACHE[key]['aic'] = -1e10
+    res4 = arma_order_select_ic(y, cache=True, **kwds)
+    assert_equal(res4.aic_min_order, (1, 0))
+    assert_allclose(res4.bic.values, res1.bic.values, rtol=1e-10)
+    stattools._ARMA_IC_CACHE.clear()
+
+
 def test_acf_fft_dataframe():
     # regression test #322
 